@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+🏈 SeaTrace In-Process Load Benchmark
+For the Commons Good! 🌊
+
+Drives the packet router and the four pillar services through httpx's
+ASGI transport - no ports, no containers, no deployed stack - at fixed
+concurrency levels and reports per endpoint:
+
+- req/s        completed requests per second
+- p50/p95/p99  request latency in ms
+- errors       non-2xx responses
+
+Results can be checked against a committed baseline: any endpoint whose
+throughput drops more than ``--threshold`` below its baseline fails the
+run (exit code 1). Baselines are machine-specific - record them on the
+runner that checks them (``--write-baseline``).
+
+The k6 scripts in tests/k6/ still cover the deployed stack end to end.
+
+Usage:
+    python scripts/bench/bench_asgi_load.py
+    python scripts/bench/bench_asgi_load.py --concurrency 1,16,64 --requests 2000
+    python scripts/bench/bench_asgi_load.py --endpoints router,deckside --check
+    python scripts/bench/bench_asgi_load.py --write-baseline
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "asgi_load_baseline.json"
+BODY_VARIANTS = 256
+
+
+def vessel_data(i: int) -> Dict[str, Any]:
+    return {
+        "vessel_id": f"WSP-{i % 500:03d}",
+        "catch_weight": 1250.5 + i % 97,
+        "species": ("Tuna", "Salmon", "Cod", "Halibut")[i % 4],
+    }
+
+
+def route_body(i: int) -> Dict[str, Any]:
+    return {"source": "vessel", "payload": dict(vessel_data(i), location={"lat": 47.6062, "lon": -122.3321})}
+
+
+def ingest_body(i: int) -> Dict[str, Any]:
+    return dict(route_body(i), correlation_id=f"bench-{i}")
+
+
+def process_body(i: int) -> Dict[str, Any]:
+    return {
+        "packet_id": f"bench-{i}",
+        "vessel_data": dict(vessel_data(i), location={"latitude": 47.6062, "longitude": -122.3321}),
+    }
+
+
+def store_body(i: int) -> Dict[str, Any]:
+    return {
+        "packet_id": f"bench-{i}",
+        "correlation_id": f"bench-{i}",
+        "vessel_data": vessel_data(i),
+        "validation_passed": True,
+    }
+
+
+def publish_body(i: int) -> Dict[str, Any]:
+    return {
+        "packet_id": f"bench-{i}",
+        "correlation_id": f"bench-{i}",
+        "publish_type": "listing",
+        "data": vessel_data(i),
+    }
+
+
+class Endpoint(NamedTuple):
+    name: str
+    module: str
+    method: str
+    path: str
+    body: Optional[Callable[[int], Dict[str, Any]]]
+
+
+# One representative hot path per app (health checks that call other
+# pillars over the network are left out on purpose)
+ENDPOINTS = [
+    Endpoint("router", "packet_switching.router", "POST", "/route", route_body),
+    Endpoint("seaside", "services.seaside.main", "POST", "/api/v1/ingest", ingest_body),
+    Endpoint("deckside", "services.deckside.main", "POST", "/api/v1/process", process_body),
+    Endpoint("dockside", "services.dockside.main", "POST", "/api/v1/store", store_body),
+    Endpoint("marketside", "services.marketside.main", "POST", "/api/v1/publish", publish_body),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def drive(client: httpx.AsyncClient, endpoint: Endpoint, bodies: List[bytes],
+                concurrency: int, requests: int) -> Dict[str, float]:
+    """Run ``requests`` calls with ``concurrency`` workers; returns throughput and latency"""
+    latencies: List[float] = []
+    errors = 0
+    issued = 0
+    headers = {"content-type": "application/json"}
+
+    async def worker():
+        nonlocal errors, issued
+        while issued < requests:
+            i = issued
+            issued += 1
+            content = bodies[i % len(bodies)] if bodies else None
+            start = time.perf_counter()
+            response = await client.request(endpoint.method, endpoint.path, content=content, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 300:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "errors": errors,
+    }
+
+
+async def run(endpoints: List[Endpoint], levels: List[int], requests: int, warmup: int,
+              quiet: bool) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """endpoint name → concurrency → stats"""
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    # The services print and log every request; keep that out of the report
+    sink = open(os.devnull, "w") if quiet else sys.stdout
+    try:
+        for endpoint in endpoints:
+            with contextlib.redirect_stdout(sink):
+                app = importlib.import_module(endpoint.module).app
+            bodies = (
+                [json.dumps(endpoint.body(i)).encode() for i in range(BODY_VARIANTS)]
+                if endpoint.body is not None else []
+            )
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                results[endpoint.name] = {}
+                for level in levels:
+                    with contextlib.redirect_stdout(sink):
+                        await drive(client, endpoint, bodies, level, warmup)
+                        stats = await drive(client, endpoint, bodies, level, requests)
+                    results[endpoint.name][str(level)] = stats
+                    print(f"{endpoint.name:<12}{endpoint.method + ' ' + endpoint.path:<24}{level:>6}"
+                          f"{stats['rps']:>12,.1f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                          f"{stats['p99_ms']:>10.2f}{stats['errors']:>8}")
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Dict[str, float]]], baseline: Dict[str, Any],
+            threshold: float) -> List[str]:
+    """
+    Throughput regressions against a baseline
+
+    Returns:
+        One line per (endpoint, concurrency) whose req/s fell more than
+        ``threshold`` (fraction) below the baseline; pairs missing from
+        either side are skipped
+    """
+    regressions = []
+    for name, levels in results.items():
+        for level, stats in levels.items():
+            base = baseline.get("results", {}).get(name, {}).get(level)
+            if not base or not base.get("rps"):
+                continue
+            change = stats["rps"] / base["rps"] - 1
+            if change < -threshold:
+                regressions.append(
+                    f"{name} @ {level}: {stats['rps']:,.1f} req/s vs baseline {base['rps']:,.1f} ({change:+.1%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="In-process ASGI load benchmark")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint and level")
+    parser.add_argument("--warmup", type=int, default=100, help="Untimed requests before each level")
+    parser.add_argument("--endpoints", default="", help="Comma-separated subset of: "
+                        + ",".join(e.name for e in ENDPOINTS))
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--check", action="store_true", help="Fail on throughput regressions vs the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed throughput drop (fraction)")
+    parser.add_argument("--write-baseline", action="store_true", help="Save these results as the baseline")
+    parser.add_argument("--verbose", action="store_true", help="Keep the services' own output")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    wanted = {name.strip() for name in args.endpoints.split(",") if name.strip()}
+    unknown = wanted - {e.name for e in ENDPOINTS}
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    endpoints = [e for e in ENDPOINTS if not wanted or e.name in wanted]
+
+    print(f"🏈 In-process load benchmark - {args.requests} requests per level")
+    print(f"{'app':<12}{'endpoint':<24}{'conc':>6}{'req/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    results = asyncio.run(run(endpoints, levels, args.requests, args.warmup, quiet=not args.verbose))
+
+    status = 0
+    if any(stats["errors"] for levels_ in results.values() for stats in levels_.values()):
+        print("❌ Some requests failed - results are not comparable")
+        status = 1
+
+    if args.write_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.setdefault("results", {}).update(results)
+        baseline["recorded"] = {
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "requests": args.requests,
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"📝 Baseline written to {args.baseline}")
+    elif args.check:
+        if not args.baseline.exists():
+            print(f"❌ No baseline at {args.baseline} (record one with --write-baseline)")
+            return 1
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for line in regressions:
+            print(f"❌ Throughput regression: {line}")
+        if regressions:
+            status = 1
+        else:
+            print(f"✅ Throughput within {args.threshold:.0%} of the baseline")
+
+    print("For the Commons Good! 🌊")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
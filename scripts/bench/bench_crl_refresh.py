@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+🏈 SeaTrace CRL Refresh Benchmark
+For the Commons Good! 🌊
+
+Cost of keeping a large revocation list fresh, full CRL vs delta feed,
+against the in-process RevocationFeed stand-in (httpx ASGI transport -
+no network, so transfer shows up as encode/decode time and bytes):
+
+- full refresh   fetch + parse + index of the whole CRL (what an hourly
+                 refetch costs every time)
+- delta refresh  fetch + apply of ``--changes`` adds/removes since the
+                 last sequence
+- bytes          response body size of each
+- lookup         ns per is_revoked() (hash set) vs a Bloom filter probe
+
+Usage:
+    python scripts/bench/bench_crl_refresh.py
+    python scripts/bench/bench_crl_refresh.py --entries 100000 --changes 1000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from common.licensing.crl_feed import RevocationFeed  # noqa: E402
+from common.licensing.revocation import RevocationService  # noqa: E402
+from common.licensing.token_cache import VerifiedTokenCache  # noqa: E402
+
+CRL_URL = "http://crl/crl/revoked.json"
+DELTA_URL = "http://crl/crl/delta"
+
+
+def make_service(feed: RevocationFeed, delta: bool) -> RevocationService:
+    return RevocationService(
+        CRL_URL,
+        delta_url=DELTA_URL if delta else None,
+        transport=httpx.ASGITransport(app=feed.app()),
+        token_cache=VerifiedTokenCache(),
+    )
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+async def run(args) -> None:
+    feed = RevocationFeed({f"L-{i:09d}": "bench" for i in range(args.entries)}, retention=args.changes * 10)
+    full_bytes = len(json.dumps(feed.snapshot()).encode())
+
+    full = make_service(feed, delta=False)
+    delta = make_service(feed, delta=True)
+    await delta.refresh()  # initial full fetch gives the delta client its sequence
+
+    full_s, delta_s = [], []
+    next_id = args.entries
+    for _ in range(args.runs):
+        since = feed.sequence
+        for i in range(args.changes):
+            if i % 10 == 9:
+                feed.reinstate(f"L-{next_id - 1:09d}")
+            else:
+                feed.revoke(f"L-{next_id:09d}", "bench")
+                next_id += 1
+        delta_bytes = len(json.dumps(feed.delta(since)).encode())
+        full_s.append(await timed(full.refresh()))
+        delta_s.append(await timed(delta.refresh()))
+
+    assert delta.snapshot.revoked.keys() == full.snapshot.revoked.keys() == feed.revoked.keys()
+
+    print(f"full refresh    {min(full_s) * 1000:>10,.1f} ms   {full_bytes / 1e6:>8,.1f} MB")
+    print(f"delta refresh   {min(delta_s) * 1000:>10,.1f} ms   {delta_bytes / 1e3:>8,.1f} kB")
+    print(f"speedup         {min(full_s) / min(delta_s):>10,.0f}x")
+
+    ids = [f"L-{i:09d}" for i in range(0, args.entries * 2, 7)][:200_000]
+    is_revoked = delta.is_revoked
+    start = time.perf_counter_ns()
+    for license_id in ids:
+        is_revoked(license_id)
+    set_ns = (time.perf_counter_ns() - start) / len(ids)
+
+    start = time.perf_counter()
+    bloom = delta.snapshot.bloom
+    bloom_build = time.perf_counter() - start
+    start = time.perf_counter_ns()
+    for license_id in ids:
+        license_id in bloom
+    bloom_ns = (time.perf_counter_ns() - start) / len(ids)
+    print(f"lookup          set {set_ns:>6,.0f} ns   bloom {bloom_ns:>6,.0f} ns "
+          f"(filter built on first use in {bloom_build:.1f} s)")
+
+    await full.stop()
+    await delta.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CRL full vs delta refresh benchmark")
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Revoked licenses")
+    parser.add_argument("--changes", type=int, default=100, help="Changes between refreshes")
+    parser.add_argument("--runs", type=int, default=3, help="Refreshes per mode (best is reported)")
+    args = parser.parse_args()
+
+    print(f"🏈 CRL refresh benchmark - {args.entries:,} revoked, {args.changes} changes per refresh")
+    asyncio.run(run(args))
+    print("For the Commons Good! 🌊")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+🏈 SeaTrace License Middleware Benchmark
+For the Commons Good! 🌊
+
+Per-request overhead of the license check, pure ASGI vs the previous
+``BaseHTTPMiddleware`` shape:
+
+- route match    ns per scope lookup: exact ``"METHOD:/path"`` set vs
+                 compiled RouteTrie, for literal routes and for templated
+                 routes (which the exact set cannot match at all)
+- public         µs per request to a public route without a token
+- licensed       µs per request with a (cached) PL token
+- streaming      µs per request to a streaming response
+
+The "basehttp" runs wrap the same license checks in a
+``BaseHTTPMiddleware`` with an exact-match route set, as the middleware
+was before; the difference is the task/memory-stream hop per request.
+Requests are driven straight through the ASGI callable (no HTTP client),
+so only middleware and app time is measured.
+
+Usage:
+    python scripts/bench/bench_license_middleware.py
+    python scripts/bench/bench_license_middleware.py --requests 20000 --routes 500
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+import nacl.signing
+from fastapi import HTTPException
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from common.licensing.middleware import LicenseMiddleware  # noqa: E402
+from common.licensing.route_trie import RouteTrie  # noqa: E402
+from common.licensing.token_cache import VerifiedTokenCache  # noqa: E402
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def make_token(signing_key: nacl.signing.SigningKey, **claims) -> str:
+    header = b64url(json.dumps({"alg": "EdDSA", "kid": "k1"}).encode())
+    payload = b64url(json.dumps(claims).encode())
+    signature = signing_key.sign(f"{header}.{payload}".encode()).signature
+    return f"{header}.{payload}.{b64url(signature)}"
+
+
+class BaseHTTPLicenseMiddleware(BaseHTTPMiddleware):
+    """The previous shape: same checks behind BaseHTTPMiddleware and an exact set"""
+
+    def __init__(self, app, license_middleware: LicenseMiddleware, public_routes):
+        super().__init__(app)
+        self.license = license_middleware
+        self.exact_routes = set(public_routes)
+
+    async def dispatch(self, request, call_next):
+        route_sig = f"{request.method}:{request.url.path}"
+        has_token = "x-st-license" in request.headers or "authorization" in request.headers
+        if not has_token:
+            if route_sig not in self.exact_routes:
+                return JSONResponse({"detail": "License required for this endpoint"}, status_code=403)
+            return await call_next(request)
+        try:
+            payload = await self.license._authorize(request.scope)
+        except HTTPException as e:
+            return JSONResponse({"detail": e.detail}, status_code=e.status_code)
+        request.state.license_claims = payload
+        response = await call_next(request)
+        response.headers["X-License-Type"] = payload.get("typ", "unknown")
+        response.headers["X-License-Id"] = payload.get("license_id", "")
+        return response
+
+
+async def app(scope, receive, send):
+    """Minimal app: plain text, or a 3-chunk stream on /stream"""
+    if scope["path"] == "/stream":
+        async def chunks():
+            for i in range(3):
+                yield b"chunk\n"
+        response = StreamingResponse(chunks(), media_type="text/plain")
+    else:
+        response = PlainTextResponse("ok")
+    await response(scope, receive, send)
+
+
+def make_scope(path: str, token: str = None):
+    headers = [(b"host", b"bench")]
+    if token:
+        headers.append((b"x-st-license", token.encode()))
+    return {"type": "http", "method": "GET", "path": path, "headers": headers,
+            "query_string": b"", "http_version": "1.1", "scheme": "http",
+            "server": ("bench", 80), "client": ("127.0.0.1", 1234), "root_path": ""}
+
+
+def make_receive():
+    """Empty body once, then wait (the client never disconnects)"""
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+    return receive
+
+
+async def bench_requests(asgi, scope, n: int) -> float:
+    async def send(message):
+        pass
+
+    # Warm up (token cache, lazy imports)
+    for _ in range(50):
+        await asgi(dict(scope, state={}), make_receive(), send)
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        await asgi(dict(scope, state={}), make_receive(), send)
+    return (time.perf_counter_ns() - start) / n / 1000
+
+
+def bench_match(routes, n: int):
+    paths = [f"/api/v1/r{i % (len(routes) // 2)}/items" for i in range(n)]
+    exact = set(routes)
+    start = time.perf_counter_ns()
+    for path in paths:
+        f"GET:{path}" in exact
+    exact_ns = (time.perf_counter_ns() - start) / n
+
+    trie = RouteTrie(routes)
+    start = time.perf_counter_ns()
+    for path in paths:
+        trie.match("GET", path)
+    trie_ns = (time.perf_counter_ns() - start) / n
+
+    templated = [f"/api/v1/t{i % (len(routes) // 2)}/retrieve/PKT-{i}" for i in range(n)]
+    start = time.perf_counter_ns()
+    for path in templated:
+        trie.match("GET", path)
+    template_ns = (time.perf_counter_ns() - start) / n
+    return exact_ns, trie_ns, template_ns
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="License middleware overhead benchmark")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per run")
+    parser.add_argument("--routes", type=int, default=200, help="Public routes in the scope")
+    args = parser.parse_args()
+
+    signing_key = nacl.signing.SigningKey.generate()
+    public_routes = (
+        [f"GET:/api/v1/r{i}/items" for i in range(args.routes)]
+        + [f"GET:/api/v1/t{i}/retrieve/{{packet_id}}" for i in range(args.routes)]
+        + ["GET:/public", "GET:/stream"]
+    )
+    license_middleware = LicenseMiddleware(
+        app,
+        public_scope_digest="sha256:bench",
+        public_routes=public_routes,
+        verify_keys_by_kid={"k1": base64.b64encode(bytes(signing_key.verify_key)).decode()},
+        token_cache=VerifiedTokenCache(),
+    )
+    legacy = BaseHTTPLicenseMiddleware(app, license_middleware, public_routes)
+    token = make_token(signing_key, typ="PL", license_id="L-BENCH", exp=time.time() + 3600)
+
+    print(f"🏈 License middleware benchmark - {args.requests} requests, {len(public_routes)} public routes")
+    exact_ns, trie_ns, template_ns = bench_match(public_routes, args.requests * 10)
+    print(f"route match  exact set {exact_ns:>8,.0f} ns   trie {trie_ns:>8,.0f} ns   "
+          f"trie (templated) {template_ns:>8,.0f} ns")
+
+    cases = [
+        ("public", make_scope("/public")),
+        ("licensed", make_scope("/api/v1/marketside/trade", token)),
+        ("streaming", make_scope("/stream")),
+    ]
+    print(f"{'case':<12}{'basehttp µs':>14}{'asgi µs':>12}{'speedup':>10}")
+    for name, scope in cases:
+        before = asyncio.run(bench_requests(legacy, scope, args.requests))
+        after = asyncio.run(bench_requests(license_middleware, scope, args.requests))
+        print(f"{name:<12}{before:>14,.1f}{after:>12,.1f}{before / after:>9,.2f}x")
+    print("For the Commons Good! 🌊")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+🏈 SeaTrace Packet Path Micro-Benchmark
+For the Commons Good! 🌊
+
+Compares IncomingPacket and CompactPacket on the switcher hot path:
+
+- ns/packet     construct + process_packet (hash, route) per packet
+- bytes/packet  memory allocated while building packets (tracemalloc)
+- blocks/packet live allocations held by each packet after construction
+- gen0 GCs      generation-0 collections triggered per 10k packets
+
+Usage:
+    python scripts/bench/bench_packet_path.py
+    python scripts/bench/bench_packet_path.py --packets 200000 --compiled
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from packet_switching.compact import CompactPacket  # noqa: E402
+from packet_switching.handler import IncomingPacket, WildFisheriesPacketSwitcher  # noqa: E402
+
+SOURCES = ("vessel", "catch", "processor", "market")
+
+
+def make_raw(n: int):
+    """Raw request dicts, built up front so they are not measured"""
+    return [
+        {
+            "source": SOURCES[i % 4],
+            "payload": {"vessel_id": f"WSP-{i % 500:03d}", "catch_id": f"C-{i}", "weight_kg": 120.5},
+            "signature": None,
+        }
+        for i in range(n)
+    ]
+
+
+def build(cls, raw):
+    return [cls(source=d["source"], payload=d["payload"], signature=d["signature"]) for d in raw]
+
+
+def measure_allocations(cls, raw):
+    """Bytes allocated and live blocks per packet while constructing"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    packets = build(cls, raw)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    blocks = sum(s.count_diff for s in stats if s.count_diff > 0)
+    n = len(packets)
+    return peak / n, blocks / n
+
+
+async def measure_throughput(cls, raw, compiled: bool):
+    """ns/packet through construct + process_packet, and gen0 GC count"""
+    switcher = WildFisheriesPacketSwitcher(compiled=compiled)
+    process = switcher.process_packet
+
+    # Warm up (compile, caches, first-touch allocations)
+    for d in raw[:1000]:
+        await process(cls(source=d["source"], payload=d["payload"], signature=d["signature"]))
+
+    gc.collect()
+    gen0_before = gc.get_stats()[0]["collections"]
+    start = time.perf_counter_ns()
+    for d in raw:
+        await process(cls(source=d["source"], payload=d["payload"], signature=d["signature"]))
+    elapsed = time.perf_counter_ns() - start
+    gen0 = gc.get_stats()[0]["collections"] - gen0_before
+
+    n = len(raw)
+    return elapsed / n, gen0 * 10_000 / n
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Packet hot-path micro-benchmark")
+    parser.add_argument("--packets", type=int, default=50_000, help="Packets per run")
+    parser.add_argument("--compiled", action="store_true", help="Use the compiled pipeline mode")
+    args = parser.parse_args()
+
+    print(f"🏈 Packet path benchmark - {args.packets} packets, "
+          f"{'compiled' if args.compiled else 'sequential'} pipeline")
+    print(f"{'packet':<16}{'ns/packet':>12}{'bytes/packet':>15}{'blocks/packet':>15}{'gen0/10k':>10}")
+
+    for cls in (IncomingPacket, CompactPacket):
+        # Fresh payload dicts per class so tracking wrappers are not shared
+        raw = make_raw(args.packets)
+        bytes_per, blocks_per = measure_allocations(cls, raw)
+        raw = make_raw(args.packets)
+        ns_per, gen0_per = asyncio.run(measure_throughput(cls, raw, args.compiled))
+        print(f"{cls.__name__:<16}{ns_per:>12,.0f}{bytes_per:>15,.1f}{blocks_per:>15,.2f}{gen0_per:>10,.2f}")
+
+    print("For the Commons Good! 🌊")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
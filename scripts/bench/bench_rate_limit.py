@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+🏈 SeaTrace Rate Limiter Benchmark
+For the Commons Good! 🌊
+
+Per-packet overhead of the RateLimitGuard with a large key space:
+
+- check          ns per RateLimitGuard.check() over N distinct vessels
+- process_packet ns per packet with and without the guard on the
+                 defensive line (the difference is the added overhead)
+
+Usage:
+    python scripts/bench/bench_rate_limit.py
+    python scripts/bench/bench_rate_limit.py --keys 100000 --packets 200000 --compiled
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from packet_switching.compact import CompactPacket  # noqa: E402
+from packet_switching.handler import RateLimitGuard, WildFisheriesPacketSwitcher  # noqa: E402
+from packet_switching.rate_limit import BucketPolicy, TokenBucketLimiter  # noqa: E402
+
+SOURCES = ("vessel", "catch", "processor", "market")
+
+
+def make_packets(n: int, keys: int):
+    rng = random.Random(42)
+    return [
+        CompactPacket(
+            source=SOURCES[i % 4],
+            payload={"vessel_id": f"WSP-{rng.randrange(keys):06d}"}
+        )
+        for i in range(n)
+    ]
+
+
+def make_guard() -> RateLimitGuard:
+    # Generous policy so the benchmark measures checks, not rejections
+    policy = BucketPolicy(rate=1e6, burst=1e6)
+    return RateLimitGuard(TokenBucketLimiter(policies={s: policy for s in SOURCES}))
+
+
+def bench_check(packets, keys: int) -> float:
+    guard = make_guard()
+    # Populate every bucket first so the run measures steady state
+    for i in range(keys):
+        guard.check(CompactPacket(source=SOURCES[i % 4], payload={"vessel_id": f"WSP-{i:06d}"}))
+
+    check = guard.check
+    start = time.perf_counter_ns()
+    for packet in packets:
+        check(packet)
+    return (time.perf_counter_ns() - start) / len(packets)
+
+
+async def bench_switcher(packets, guard, compiled: bool) -> float:
+    switcher = WildFisheriesPacketSwitcher(compiled=compiled)
+    if guard is not None:
+        switcher.defensive_line = [guard]
+    process = switcher.process_packet
+
+    start = time.perf_counter_ns()
+    for packet in packets:
+        await process(packet)
+    return (time.perf_counter_ns() - start) / len(packets)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rate limiter overhead benchmark")
+    parser.add_argument("--keys", type=int, default=100_000, help="Distinct vessel keys")
+    parser.add_argument("--packets", type=int, default=200_000, help="Packets per run")
+    parser.add_argument("--compiled", action="store_true", help="Use the compiled pipeline mode")
+    args = parser.parse_args()
+
+    packets = make_packets(args.packets, args.keys)
+    for packet in packets:
+        packet.hash()  # hash once up front; both runs then reuse the cache
+
+    print(f"🏈 Rate limiter benchmark - {args.keys} keys, {args.packets} packets, "
+          f"{'compiled' if args.compiled else 'sequential'} pipeline")
+
+    check_ns = bench_check(packets, args.keys)
+    print(f"RateLimitGuard.check          {check_ns:>10,.0f} ns/packet")
+
+    base_ns = asyncio.run(bench_switcher(packets, None, args.compiled))
+    guarded_ns = asyncio.run(bench_switcher(packets, make_guard(), args.compiled))
+    print(f"process_packet (no guard)     {base_ns:>10,.0f} ns/packet")
+    print(f"process_packet (guard)        {guarded_ns:>10,.0f} ns/packet")
+    print(f"added overhead                {guarded_ns - base_ns:>10,.0f} ns/packet")
+    print("For the Commons Good! 🌊")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
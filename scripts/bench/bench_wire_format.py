@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+🏈 SeaTrace Wire Format Benchmark
+For the Commons Good! 🌊
+
+Compares JSON and MessagePack for vessel packets:
+
+- bytes/packet  size on the (satellite) wire
+- ns/packet     body → CompactPacket decode time
+
+Usage:
+    python scripts/bench/bench_wire_format.py
+    python scripts/bench/bench_wire_format.py --packets 200000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import msgpack
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from common.wire import decode_body, packet_fields  # noqa: E402
+from packet_switching.compact import CompactPacket  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def make_packets(n: int):
+    return [
+        {
+            "source": "vessel",
+            "payload": {
+                "vessel_id": f"WSP-{i % 500:03d}",
+                "location": {"lat": 47.6062 + i * 1e-4, "lon": -122.3321},
+                "speed_knots": 8.5,
+                "heading": 270,
+                "catch_weight": 1250.75,
+                "species": "Tuna",
+            },
+            "signature": "ab" * 32,
+        }
+        for i in range(n)
+    ]
+
+
+def measure(bodies, decode) -> float:
+    """ns/packet for body → CompactPacket"""
+    for body in bodies[:1000]:
+        decode(body)
+    start = time.perf_counter_ns()
+    for body in bodies:
+        decode(body)
+    return (time.perf_counter_ns() - start) / len(bodies)
+
+
+def decode_json(body: bytes) -> CompactPacket:
+    return CompactPacket.from_dict(decode_body(body, "application/json"))
+
+
+def decode_msgpack(body: bytes) -> CompactPacket:
+    return CompactPacket.from_dict(packet_fields(decode_body(body, "application/msgpack")))
+
+
+def decode_orjson(body: bytes) -> CompactPacket:
+    return CompactPacket.from_dict(orjson.loads(body))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Wire format benchmark")
+    parser.add_argument("--packets", type=int, default=50_000, help="Packets per format")
+    args = parser.parse_args()
+
+    packets = make_packets(args.packets)
+    json_bodies = [json.dumps(p).encode() for p in packets]
+    runs = [
+        ("json", json_bodies, decode_json),
+        ("msgpack map", [msgpack.packb(p) for p in packets], decode_msgpack),
+        ("msgpack positional", [CompactPacket.from_dict(p).to_msgpack() for p in packets], decode_msgpack),
+    ]
+    if orjson is not None:
+        runs.append(("json (orjson)", json_bodies, decode_orjson))
+
+    print(f"🏈 Wire format benchmark - {args.packets} vessel packets")
+    print(f"{'format':<22}{'bytes/packet':>14}{'ns/packet':>12}")
+    for name, bodies, decode in runs:
+        size = sum(len(b) for b in bodies) / len(bodies)
+        print(f"{name:<22}{size:>14,.1f}{measure(bodies, decode):>12,.0f}")
+
+    print("For the Commons Good! 🌊")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,8 @@ import os
 from common.licensing.middleware import LicenseMiddleware
 from common.licensing.commons import router as commons_router
 from common.licensing.routes import router as license_router
+from common.licensing.revocation import RevocationService
+from public_keys.jwk_loader import Keyring
 
 # Load from environment in production
 PUBLIC_SCOPE_DIGEST = os.getenv("PUBLIC_SCOPE_DIGEST", "sha256:REPLACE_WITH_GENERATED")
@@ -15,6 +17,11 @@ VERIFY_KEYS = {
     "kid1": os.getenv("VERIFY_KEY_KID1", "REPLACE_WITH_BASE64_ED25519_VERIFY_KEY")
 }
 DEFAULT_KID = "kid1"
+# JWKS keyring (SEATRACE_JWKS_URL / SEATRACE_JWKS_PATH), else the keys above
+KEYRING = Keyring.from_env(fallback_keys=VERIFY_KEYS, default_kid=DEFAULT_KID)
+CRL_URL = os.getenv("CRL_URL", "https://seatrace.worldseafoodproducers.com/crl/revoked.json")
+# Revocation list (CRL_DELTA_URL / SEATRACE_CRL_CACHE / CRL_REFRESH_SECONDS)
+REVOCATION = RevocationService.from_env(CRL_URL)
 
 app = FastAPI(
     title="SeaTrace-ODOO Public API",
@@ -60,6 +67,11 @@ async def startup_event():
     global PUBLIC_ROUTES
     PUBLIC_ROUTES = get_public_routes()
     
+    # Load the CRL before serving (unless warm-started from the cache),
+    # then keep it fresh in the background
+    await REVOCATION.ensure_loaded()
+    REVOCATION.start()
+    
     # Add middleware
     app.add_middleware(
         LicenseMiddleware,
@@ -67,13 +79,23 @@ async def startup_event():
         public_routes=PUBLIC_ROUTES,
         verify_key=VERIFY_KEYS[DEFAULT_KID],
         verify_keys_by_kid=VERIFY_KEYS,
-        crl_url="https://seatrace.worldseafoodproducers.com/crl/revoked.json",
+        keyring=KEYRING,
+        crl_url=CRL_URL,
+        revocation=REVOCATION,
     )
     
+    KEYRING.start()
+    
     print(f"✓ Licensing middleware initialized")
     print(f"✓ Public routes: {len(PUBLIC_ROUTES)}")
     print(f"✓ Scope digest: {PUBLIC_SCOPE_DIGEST[:32]}...")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the keyring and CRL refresh tasks."""
+    await KEYRING.stop()
+    await REVOCATION.stop()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -14,10 +14,12 @@ import logging
 from common.licensing.middleware import LicenseMiddleware
 from common.licensing.commons import router as commons_router
 from common.licensing.routes import router as license_router
+from public_keys.jwk_loader import Keyring
 
 # Import 8-layer security
 from security.rate_limiting import limiter, rate_limit_exceeded_handler
 from security.tls_config import HTTPSRedirectMiddleware
+from security import crl_validator
 from security.crl_validator import init_crl_validator
 from security.secret_manager import get_secret
 
@@ -34,6 +36,8 @@ VERIFY_KEYS = {
     "kid1": get_secret("VERIFY_KEY_KID1", "REPLACE_WITH_BASE64_ED25519_VERIFY_KEY")
 }
 DEFAULT_KID = "kid1"
+# JWKS keyring (SEATRACE_JWKS_URL / SEATRACE_JWKS_PATH), else the keys above
+KEYRING = Keyring.from_env(fallback_keys=VERIFY_KEYS, default_kid=DEFAULT_KID)
 CRL_URL = get_secret("CRL_URL", "https://seatrace.worldseafoodproducers.com/crl/revoked.json")
 
 # Create FastAPI app
@@ -156,6 +160,18 @@ async def startup_event():
                 for method in route.methods:
                     PUBLIC_ROUTES.append(f"{method}:{route.path}")
     
+    # Initialize CRL validator (Layer 7) - its revocation service is
+    # shared with the licensing middleware
+    revocation = None
+    try:
+        revocation = init_crl_validator(CRL_URL, cache_ttl_hours=1, fail_open=True).service
+        # No warm-start cache: fetch once before serving
+        await revocation.ensure_loaded()
+        revocation.start()
+        logger.info("✅ Layer 7: CRL Validator initialized")
+    except Exception as e:
+        logger.warning(f"⚠️  Layer 7: CRL Validator failed to initialize: {e}")
+    
     # Add licensing middleware
     app.add_middleware(
         LicenseMiddleware,
@@ -163,15 +179,13 @@ async def startup_event():
         public_routes=PUBLIC_ROUTES,
         verify_key=VERIFY_KEYS[DEFAULT_KID],
         verify_keys_by_kid=VERIFY_KEYS,
+        keyring=KEYRING,
         crl_url=CRL_URL,
+        revocation=revocation,
     )
     
-    # Initialize CRL validator (Layer 7)
-    try:
-        init_crl_validator(CRL_URL, cache_ttl_hours=1, fail_open=True)
-        logger.info("✅ Layer 7: CRL Validator initialized")
-    except Exception as e:
-        logger.warning(f"⚠️  Layer 7: CRL Validator failed to initialize: {e}")
+    # Refresh the JWKS keyring in the background (no-op for static keys)
+    KEYRING.start()
     
     logger.info("✅ Licensing middleware initialized")
     logger.info(f"✅ Public routes: {len(PUBLIC_ROUTES)}")
@@ -186,6 +200,9 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("🏈 Shutting down SeaTrace-ODOO...")
+    await KEYRING.stop()
+    if crl_validator.crl_validator is not None:
+        await crl_validator.crl_validator.service.stop()
     logger.info("🌊 For the Commons Good!")
 
 # ============================================================================
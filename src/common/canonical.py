@@ -0,0 +1,356 @@
+"""
+🔐 SeaTrace Canonical Packet Encoding
+For the Commons Good! 🌊
+
+One canonical byte form per packet, encoded once and hashed once.
+
+Canonical form: JSON with sorted keys, compact separators and UTF-8 text
+(no ASCII escaping). Floats use Python's shortest round-trip repr and
+non-finite floats encode as ``null``. orjson is used as a fast path when
+installed; outputs orjson would format differently (exponent floats) fall
+back to the stdlib encoder, so digests never depend on which encoder a
+node has.
+
+Packets cache their canonical bytes and BLAKE2b digest. Payloads are
+wrapped in TrackedDict/TrackedList containers that bump a shared epoch on
+mutation, which invalidates the cache - including mutations of nested
+containers reached by indexing (``payload["location"]["lat"] = ...``).
+"""
+
+import dataclasses
+import enum
+import hashlib
+import json
+import re
+import uuid
+from datetime import date, datetime, time
+from typing import Any, FrozenSet, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None else 0
+)
+
+# Numbers (outside strings) that orjson renders differently from repr():
+# exponent forms and its positional 1e-5 band. False positives inside
+# strings only cost a fallback to the stdlib encoder.
+_ORJSON_DIVERGENT = re.compile(rb'(?:^|[\[,:])-?(?:\d+(?:\.\d+)?e|0\.0000)')
+
+# String literals, or bare non-finite tokens emitted by json.dumps
+_NON_FINITE = re.compile(rb'"(?:[^"\\]|\\.)*"|-?Infinity|NaN')
+
+
+def _default(obj: Any) -> Any:
+    """Shared fallback for types neither encoder handles natively"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return bytes(obj).hex()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "item"):  # NumPy scalars
+        return obj.item()
+    raise TypeError(f"Type is not canonically serializable: {type(obj).__name__}")
+
+
+def _null_non_finite(match: "re.Match[bytes]") -> bytes:
+    token = match.group(0)
+    return token if token[:1] == b'"' else b"null"
+
+
+def _stdlib_canonical(obj: Any) -> bytes:
+    data = json.dumps(
+        obj,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_default,
+    ).encode("utf-8")
+    if b"NaN" in data or b"Infinity" in data:
+        data = _NON_FINITE.sub(_null_non_finite, data)
+    return data
+
+
+def canonical_bytes(obj: Any) -> bytes:
+    """
+    Encode an object in SeaTrace canonical form
+
+    Args:
+        obj: JSON-compatible object (dicts, lists, str, numbers, None)
+
+    Returns:
+        Canonical UTF-8 JSON bytes
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Non-str keys, >64-bit ints, ... - the stdlib path handles them
+            pass
+        else:
+            if not _ORJSON_DIVERGENT.search(data):
+                return data
+    return _stdlib_canonical(obj)
+
+
+def digest(data: bytes) -> str:
+    """BLAKE2b hex digest of canonical bytes"""
+    return hashlib.blake2b(data).hexdigest()
+
+
+# ========================================
+# MUTATION-TRACKED PAYLOADS
+# ========================================
+
+class _Epoch:
+    """Mutation counter shared by a payload and its nested containers"""
+
+    __slots__ = ("n",)
+
+    def __init__(self):
+        self.n = 0
+
+
+def _wrap_child(value: Any, epoch: _Epoch) -> Any:
+    """Copy plain dicts/lists (recursively) into tracked containers on ``epoch``"""
+    if type(value) is dict:
+        child = TrackedDict({key: _wrap_child(item, epoch) for key, item in value.items()})
+        child._epoch = epoch
+        return child
+    if type(value) is list:
+        child = TrackedList([_wrap_child(item, epoch) for item in value])
+        child._epoch = epoch
+        return child
+    return value
+
+
+class TrackedDict(dict):
+    """
+    dict that bumps its epoch on every mutation
+
+    ``track()`` copies nested plain dicts/lists into tracked containers
+    sharing the epoch, so objects the caller still holds are detached
+    from the payload. Containers stored after tracking are wrapped on
+    first access through ``[]``/``get``; mutate those through the
+    payload, or call the owning packet's ``invalidate_canonical()``.
+    """
+
+    __slots__ = ("_epoch",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._epoch = _Epoch()
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is dict or type(value) is list:
+            value = _wrap_child(value, self._epoch)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._epoch.n += 1
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._epoch.n += 1
+
+    def pop(self, *args):
+        self._epoch.n += 1
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._epoch.n += 1
+        return dict.popitem(self)
+
+    def clear(self):
+        dict.clear(self)
+        self._epoch.n += 1
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._epoch.n += 1
+
+    def __ior__(self, other):
+        dict.update(self, other)
+        self._epoch.n += 1
+        return self
+
+    def __reduce__(self):
+        return (TrackedDict, (dict(self),))
+
+
+class TrackedList(list):
+    """list counterpart of TrackedDict"""
+
+    __slots__ = ("_epoch",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._epoch = _Epoch()
+
+    def __getitem__(self, index):
+        value = list.__getitem__(self, index)
+        if type(index) is int and (type(value) is dict or type(value) is list):
+            value = _wrap_child(value, self._epoch)
+            list.__setitem__(self, index, value)
+        return value
+
+    def _touch(self):
+        self._epoch.n += 1
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        self._touch()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._touch()
+
+    def __iadd__(self, other):
+        list.extend(self, other)
+        self._touch()
+        return self
+
+    def __imul__(self, n):
+        result = list.__imul__(self, n)
+        self._touch()
+        return result
+
+    def append(self, value):
+        list.append(self, value)
+        self._touch()
+
+    def extend(self, values):
+        list.extend(self, values)
+        self._touch()
+
+    def insert(self, index, value):
+        list.insert(self, index, value)
+        self._touch()
+
+    def pop(self, *args):
+        self._touch()
+        return list.pop(self, *args)
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._touch()
+
+    def clear(self):
+        list.clear(self)
+        self._touch()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._touch()
+
+    def reverse(self):
+        list.reverse(self)
+        self._touch()
+
+    def __reduce__(self):
+        return (TrackedList, (list(self),))
+
+
+def track(payload: Any) -> Any:
+    """
+    Wrap a payload so mutations can be detected (no-op if already tracked)
+
+    Nested dicts/lists are copied too, so a caller mutating its original
+    objects cannot leave a stale cached digest behind.
+    """
+    return _wrap_child(payload, _Epoch())
+
+
+def _epoch_of(payload: Any) -> int:
+    epoch = getattr(payload, "_epoch", None)
+    return epoch.n if epoch is not None else 0
+
+
+class CanonicalPacketMixin:
+    """
+    Memoized canonical bytes and digest for packet dataclasses
+
+    Subclasses list the hashed attributes in ``CANONICAL_FIELDS``. The
+    cache is dropped when any of those attributes is reassigned or when
+    the payload reports a mutation.
+    """
+
+    __slots__ = ()
+
+    CANONICAL_FIELDS: Tuple[str, ...] = ()
+    _CANONICAL_FIELD_SET: FrozenSet[str] = frozenset()
+
+    # (payload epoch, canonical bytes, digest) - class default avoids a
+    # per-instance allocation until the packet is first hashed. Bytes are
+    # None for a digest adopted from the previous hop.
+    _canonical_cache: Optional[Tuple[int, Optional[bytes], str]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._CANONICAL_FIELD_SET = frozenset(cls.CANONICAL_FIELDS)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "payload":
+            value = track(value)
+        if name in self._CANONICAL_FIELD_SET and self._canonical_cache is not None:
+            object.__setattr__(self, "_canonical_cache", None)
+        object.__setattr__(self, name, value)
+
+    def canonical_dict(self) -> dict:
+        """Hashed fields as a plain dict"""
+        return {name: getattr(self, name) for name in self.CANONICAL_FIELDS}
+
+    def _canonical_entry(self, need_bytes: bool = False) -> Tuple[int, Optional[bytes], str]:
+        epoch = _epoch_of(self.payload)
+        cache = self._canonical_cache
+        if cache is not None and cache[0] == epoch and (cache[1] is not None or not need_bytes):
+            return cache
+        data = canonical_bytes(self.canonical_dict())
+        cache = (epoch, data, digest(data))
+        object.__setattr__(self, "_canonical_cache", cache)
+        return cache
+
+    def canonical_bytes(self) -> bytes:
+        """Canonical encoding of the hashed fields (cached)"""
+        return self._canonical_entry(need_bytes=True)[1]
+
+    def canonical_digest(self) -> str:
+        """BLAKE2b hex digest of the canonical bytes (cached)"""
+        return self._canonical_entry()[2]
+
+    def adopt_digest(self, value: str) -> None:
+        """
+        Use a digest computed upstream instead of hashing again
+
+        The digest is pinned to the current payload; a later mutation
+        drops it and the next canonical_digest() hashes for real.
+        """
+        object.__setattr__(self, "_canonical_cache", (_epoch_of(self.payload), None, value))
+
+    def invalidate_canonical(self) -> None:
+        """Drop the cached encoding after untracked payload mutations"""
+        object.__setattr__(self, "_canonical_cache", None)
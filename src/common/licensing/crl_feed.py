@@ -0,0 +1,109 @@
+"""Sequence-numbered revocation feed for SeaTrace-ODOO.
+
+A small, self-contained CRL publisher that serves both the full list and
+the delta feed read by ``RevocationService``:
+
+- ``GET /crl/revoked.json``           full CRL with its ``sequence`` (ETag)
+- ``GET /crl/delta?since=<sequence>`` net adds/removes since a sequence;
+                                      410 when ``since`` is older than the
+                                      retained journal (the client then
+                                      falls back to the full CRL)
+
+Every revoke/reinstate call is one sequence step. Only the last
+``retention`` steps are kept for deltas. The feed runs in-process (tests,
+benchmarks, local development) - e.g. behind ``httpx.ASGITransport`` -
+or under uvicorn as a stand-in for the production CRL endpoint.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+
+
+class RevocationFeed:
+    """In-memory CRL with a bounded change journal.
+
+    Args:
+        revoked: Initial license_id -> reason
+        retention: Sequence steps kept for delta requests
+    """
+
+    def __init__(self, revoked: Optional[Dict[str, Optional[str]]] = None, retention: int = 10000):
+        self.revoked: Dict[str, Optional[str]] = dict(revoked or {})
+        self.sequence = 0
+        # (sequence, license_id, reason or None, revoked?)
+        self._journal: Deque[Tuple[int, str, Optional[str], bool]] = deque(maxlen=retention)
+
+    def revoke(self, license_id: str, reason: Optional[str] = None) -> int:
+        """Revoke a license; returns the new sequence."""
+        self.sequence += 1
+        self.revoked[license_id] = reason
+        self._journal.append((self.sequence, license_id, reason, True))
+        return self.sequence
+
+    def revoke_many(self, license_ids: Iterable[str], reason: Optional[str] = None) -> int:
+        for license_id in license_ids:
+            self.revoke(license_id, reason)
+        return self.sequence
+
+    def reinstate(self, license_id: str) -> int:
+        """Lift a revocation; returns the new sequence."""
+        self.sequence += 1
+        self.revoked.pop(license_id, None)
+        self._journal.append((self.sequence, license_id, None, False))
+        return self.sequence
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full CRL document"""
+        return {
+            "sequence": self.sequence,
+            "revoked": [{"license_id": k, "reason": v} for k, v in self.revoked.items()],
+        }
+
+    def delta(self, since: int) -> Optional[Dict[str, Any]]:
+        """Net changes after ``since``, or None if they are no longer retained."""
+        if since > self.sequence:
+            return None
+        oldest = self._journal[0][0] if self._journal else self.sequence + 1
+        if since < oldest - 1:
+            return None
+        added: Dict[str, Optional[str]] = {}
+        removed = set()
+        for sequence, license_id, reason, revoked in self._journal:
+            if sequence <= since:
+                continue
+            if revoked:
+                added[license_id] = reason
+                removed.discard(license_id)
+            else:
+                added.pop(license_id, None)
+                removed.add(license_id)
+        return {
+            "from": since,
+            "to": self.sequence,
+            "added": [{"license_id": k, "reason": v} for k, v in added.items()],
+            "removed": sorted(removed),
+        }
+
+    def app(self) -> FastAPI:
+        """ASGI app serving the full CRL and the delta feed"""
+        app = FastAPI(title="SeaTrace CRL feed")
+
+        @app.get("/crl/revoked.json")
+        def full(if_none_match: Optional[str] = Header(None)):
+            etag = f'"{self.sequence}"'
+            if if_none_match == etag:
+                return Response(status_code=304)
+            # Straight to JSON - no per-entry validation of a large list
+            return JSONResponse(self.snapshot(), headers={"ETag": etag})
+
+        @app.get("/crl/delta")
+        def delta(since: int = Query(..., ge=0)):
+            changes = self.delta(since)
+            if changes is None:
+                raise HTTPException(status_code=410, detail=f"Sequence {since} is no longer served")
+            return changes
+
+        return app
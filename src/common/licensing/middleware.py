@@ -2,22 +2,31 @@
 
 This middleware validates license tokens (PUL and PL) using Ed25519 signatures
 and enforces scope restrictions to prevent unauthorized access to premium features.
+
+It is a pure ASGI middleware: the license is checked from the request
+scope before the app runs (so before any body is read), and responses -
+streaming ones included - pass through untouched apart from the license
+headers. Route scopes are matched with a compiled ``RouteTrie``, so
+templated routes such as ``GET:/api/v1/retrieve/{packet_id}`` match.
 """
 
 import base64
 import json
 import time
-from typing import Dict, Optional, Set
+from typing import Dict, Optional
 
 import structlog
+from cryptography.exceptions import InvalidSignature
 from fastapi import HTTPException, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from public_keys.jwk_loader import Keyring
 
-try:
-    import nacl.signing
-    import nacl.exceptions
-except ImportError:
-    raise ImportError("PyNaCl required: pip install pynacl")
+from .revocation import RevocationService, RevocationUnavailable
+from .route_trie import RouteTrie
+from .token_cache import VerifiedTokenCache, default_token_cache, key_namespace
 
 logger = structlog.get_logger()
 
@@ -40,7 +49,7 @@ def _b64url_decode(s: str) -> bytes:
     return base64.urlsafe_b64decode(s + pad)
 
 
-class LicenseMiddleware(BaseHTTPMiddleware):
+class LicenseMiddleware:
     """Middleware to enforce license restrictions on API routes.
     
     Validates license tokens and enforces scope restrictions:
@@ -50,12 +59,15 @@ class LicenseMiddleware(BaseHTTPMiddleware):
     
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         public_scope_digest: str,
         public_routes: list[str],
         verify_key: Optional[str] = None,
         crl_url: Optional[str] = None,
         verify_keys_by_kid: Optional[Dict[str, str]] = None,
+        token_cache: Optional[VerifiedTokenCache] = None,
+        keyring: Optional[Keyring] = None,
+        revocation: Optional[RevocationService] = None,
     ):
         """Initialize license middleware.
         
@@ -63,39 +75,119 @@ class LicenseMiddleware(BaseHTTPMiddleware):
             app: FastAPI application
             public_scope_digest: SHA-256 digest of allowed public routes
             public_routes: List of route signatures allowed under PUL
+                (``"METHOD:/path"``, path templates allowed)
             verify_key: Base64-encoded Ed25519 public key (default)
             crl_url: Certificate Revocation List URL (optional)
             verify_keys_by_kid: Dict of kid -> verify_key for rotation
+            token_cache: Verified-token cache (default: the shared one)
+            keyring: Pre-parsed verification keys (e.g. from JWKS); built
+                from verify_key / verify_keys_by_kid when not given
+            revocation: Shared revocation service, started and stopped
+                by its owner; when not given, one is built for crl_url
+                (24h refresh) and run over the app's lifespan
         """
-        super().__init__(app)
+        self.app = app
         self.public_digest = public_scope_digest
-        self.public_routes: Set[str] = set(public_routes)
+        self.public_routes = RouteTrie(public_routes)
         self.verify_key = verify_key
         self.verify_keys_by_kid = verify_keys_by_kid or {}
         self.crl_url = crl_url
-        self._crl_cache: Optional[dict] = None
-        self._crl_cache_time: float = 0
+        self.token_cache = token_cache if token_cache is not None else default_token_cache()
+        self._owns_revocation = revocation is None and bool(crl_url)
+        if self._owns_revocation:
+            revocation = RevocationService(crl_url=crl_url, refresh_interval=24 * 3600,
+                                           token_cache=self.token_cache)
+        self.revocation = revocation
+        self.keyring = keyring if keyring is not None else self._static_keyring(
+            verify_key, self.verify_keys_by_kid
+        )
+    
+    @staticmethod
+    def _static_keyring(verify_key: Optional[str], verify_keys_by_kid: Dict[str, str]) -> Keyring:
+        """Keyring of the raw base64 keys; verify_key answers unknown kids."""
+        keys = dict(verify_keys_by_kid)
+        default_kid = None
+        if verify_key:
+            default_kid = next((kid for kid, key in keys.items() if key == verify_key), None)
+            if default_kid is None:
+                default_kid = "default"
+                keys.setdefault(default_kid, verify_key)
+        return Keyring.from_keys(keys, default_kid=default_kid)
+        
+    def _lifespan_receive(self, receive: Receive) -> Receive:
+        """Load and start our own revocation service on startup, stop it
+        (and its HTTP client) on shutdown."""
+        async def lifespan_receive() -> Message:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.revocation.ensure_loaded()
+                self.revocation.start()
+            elif message["type"] == "lifespan.shutdown":
+                await self.revocation.stop()
+            return message
+        return lifespan_receive
+        
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Validate the license, then run the app with license headers.
+        
+        Rejections are answered here with a JSON error body, before the
+        app (or anything that reads the request body) runs.
+        """
+        if scope["type"] == "lifespan" and self._owns_revocation:
+            await self.app(scope, self._lifespan_receive(receive), send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-    async def dispatch(self, request: Request, call_next):
-        """Process request with license validation.
+        try:
+            payload = await self._authorize(scope)
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code)
+            await response(scope, receive, send)
+            return
+        
+        if payload is None:
+            # Public route without a token
+            await self.app(scope, receive, send)
+            return
+        
+        # Attach license claims to request state
+        state = scope.setdefault("state", {})
+        state["license_claims"] = payload
+        license_headers = self._license_headers(payload)
+        
+        async def send_with_license(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", [])) + license_headers
+                # Add quota warning if present
+                if state.get("quota_warning"):
+                    headers.append((b"x-quota-warning", str(state["quota_warning"]).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        await self.app(scope, receive, send_with_license)
+    
+    async def _authorize(self, scope: Scope) -> Optional[dict]:
+        """Check the license of a request.
         
         Args:
-            request: Incoming HTTP request
-            call_next: Next middleware in chain
+            scope: ASGI HTTP scope
             
         Returns:
-            HTTP response
+            License claims, or None for a public route without a token
             
         Raises:
             HTTPException: If license validation fails
         """
+        headers = Headers(scope=scope)
         # Derive route signature "METHOD:/path"
-        route_sig = f"{request.method}:{request.url.path}"
+        route_sig = f"{scope['method']}:{scope['path']}"
         
         # Get license token from header or Authorization Bearer
-        lic_token = request.headers.get("x-st-license", "")
-        if not lic_token and "authorization" in request.headers:
-            auth = request.headers.get("authorization", "")
+        lic_token = headers.get("x-st-license", "")
+        if not lic_token:
+            auth = headers.get("authorization", "")
             if auth.startswith("Bearer "):
                 lic_token = auth.split("Bearer ")[-1]
         
@@ -107,16 +199,21 @@ class LicenseMiddleware(BaseHTTPMiddleware):
                     status_code=403,
                     detail="License required for this endpoint"
                 )
-            return await call_next(request)
+            return None
         
-        # Verify token signature with kid support
+        # Verify token signature with kid support (cached per token)
         try:
-            header, payload = self._verify_jws(lic_token)
+            header, payload = self._verify_cached(lic_token)
         except LicenseValidationError as e:
             raise HTTPException(status_code=401, detail=str(e))
         
         # Check revocation
-        if await self._is_revoked(payload.get("license_id")):
+        try:
+            revoked = self._is_revoked(payload.get("license_id"))
+        except RevocationUnavailable as e:
+            logger.error("license_revocation_unavailable", error=str(e))
+            raise HTTPException(status_code=503, detail="License revocation list unavailable")
+        if revoked:
             logger.error("license_revoked", 
                         license_id=payload.get("license_id"))
             raise HTTPException(
@@ -133,7 +230,7 @@ class LicenseMiddleware(BaseHTTPMiddleware):
             
         elif typ == "PL":
             # Private Limited License
-            await self._validate_pl(request, payload, route_sig)
+            await self._validate_pl(headers, payload, route_sig)
             
         else:
             logger.error("license_type_unsupported", type=typ)
@@ -142,22 +239,40 @@ class LicenseMiddleware(BaseHTTPMiddleware):
                 detail=f"Unsupported license type: {typ}"
             )
         
-        # Attach license claims to request state
-        request.state.license_claims = payload
-        
-        # Add license headers to response
-        response = await call_next(request)
-        response.headers["X-License-Type"] = payload.get("typ", "unknown")
-        response.headers["X-License-Id"] = payload.get("license_id", "")
-        response.headers["X-License-Org"] = payload.get("org", "")
+        return payload
+    
+    @staticmethod
+    def _license_headers(payload: dict) -> list:
+        """Raw response headers describing the license."""
+        headers = [
+            (b"x-license-type", str(payload.get("typ", "unknown")).encode("latin-1")),
+            (b"x-license-id", str(payload.get("license_id", "")).encode("latin-1")),
+            (b"x-license-org", str(payload.get("org", "")).encode("latin-1")),
+        ]
         if payload.get("tier"):
-            response.headers["X-License-Tier"] = payload.get("tier")
-        
-        # Add quota warning if present
-        if hasattr(request.state, "quota_warning"):
-            response.headers["X-Quota-Warning"] = request.state.quota_warning
+            headers.append((b"x-license-tier", str(payload["tier"]).encode("latin-1")))
+        return headers
+    
+    def _verify_cached(self, token: str) -> tuple[dict, dict]:
+        """Verify a token, or return its claims from the token cache.
         
-        return response
+        Args:
+            token: JWS compact serialization
+            
+        Returns:
+            Tuple of (header, payload) - shared, do not mutate
+            
+        Raises:
+            LicenseValidationError: If verification fails
+        """
+        # Namespaced by the key material, so a key rotation starts afresh
+        namespace = key_namespace("license", self.keyring.fingerprint)
+        cached = self.token_cache.get(token, namespace)
+        if cached is not None:
+            return cached
+        header, payload = self._verify_jws(token)
+        self.token_cache.put(token, namespace, (header, payload), payload.get("exp"))
+        return header, payload
     
     def _verify_jws(self, token: str) -> tuple[dict, dict]:
         """Verify JWS token with kid support.
@@ -184,10 +299,10 @@ class LicenseMiddleware(BaseHTTPMiddleware):
                 f"Unsupported alg; require EdDSA/Ed25519, got {header.get('alg')}"
             )
         
-        # Get verify key by kid
+        # Get pre-parsed verify key by kid
         kid = header.get("kid")
-        verify_key_b64 = self.verify_keys_by_kid.get(kid) or self.verify_key
-        if not verify_key_b64:
+        verify_key = self.keyring.get(kid)
+        if verify_key is None:
             raise LicenseValidationError(f"Unknown key id (kid): {kid}")
         
         # Verify signature
@@ -195,9 +310,8 @@ class LicenseMiddleware(BaseHTTPMiddleware):
         signature = _b64url_decode(s64)
         
         try:
-            verify_key = nacl.signing.VerifyKey(base64.b64decode(verify_key_b64))
-            verify_key.verify(message, signature)
-        except nacl.exceptions.BadSignatureError:
+            verify_key.verify(signature, message)
+        except InvalidSignature:
             raise LicenseValidationError("Invalid license signature")
         
         # Decode payload
@@ -252,11 +366,11 @@ class LicenseMiddleware(BaseHTTPMiddleware):
                 detail="License expired"
             )
     
-    async def _validate_pl(self, request: Request, payload: dict, route_sig: str):
+    async def _validate_pl(self, headers: Headers, payload: dict, route_sig: str):
         """Validate Private Limited License.
         
         Args:
-            request: FastAPI request object
+            headers: Request headers
             payload: Decoded license token payload
             route_sig: Route signature (METHOD:/path)
             
@@ -284,7 +398,7 @@ class LicenseMiddleware(BaseHTTPMiddleware):
         # Check domain binding (if specified)
         domain_bind = payload.get("domain_bind", [])
         if domain_bind:
-            host = request.headers.get("host", "").split(":")[0].lower()
+            host = headers.get("host", "").split(":")[0].lower()
             if host not in [d.lower() for d in domain_bind]:
                 logger.error("pl_domain_mismatch",
                             expected=domain_bind,
@@ -297,48 +411,33 @@ class LicenseMiddleware(BaseHTTPMiddleware):
         # Detailed entitlement checks handled by endpoint decorators
         # (features, limits, etc.)
     
-    async def _is_revoked(self, license_id: Optional[str]) -> bool:
-        """Check if license is revoked using CRL.
+    def _is_revoked(self, license_id: Optional[str]) -> bool:
+        """Check if license is revoked using the CRL snapshot.
+        
+        Never waits on the network: a stale CRL keeps answering while
+        one background refresh runs (stale-while-revalidate).
         
         Args:
             license_id: License identifier
             
         Returns:
             True if revoked, False otherwise
+            
+        Raises:
+            RevocationUnavailable: Fail-closed service without a CRL
         """
-        if not license_id or not self.crl_url:
+        if not license_id or self.revocation is None:
             return False
         
-        # Cache CRL for 24 hours
-        cache_ttl = 24 * 3600
-        now = time.time()
-        
-        if not self._crl_cache or now - self._crl_cache_time > cache_ttl:
-            try:
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    resp = await client.get(self.crl_url, timeout=5.0)
-                    resp.raise_for_status()
-                    self._crl_cache = resp.json()
-                    self._crl_cache_time = now
-                    logger.info("crl_refreshed", url=self.crl_url)
-            except Exception as e:
-                logger.error("crl_fetch_failed", error=str(e))
-                # Fail open on CRL fetch errors
-                return False
-        
-        # Check if license is in revoked list
-        revoked_list = self._crl_cache.get("revoked", [])
-        for entry in revoked_list:
-            if entry.get("license_id") == license_id:
-                logger.warning("license_revoked_crl",
-                              license_id=license_id,
-                              reason=entry.get("reason"))
-                return True
+        self.revocation.refresh_if_stale()
+        if self.revocation.is_revoked(license_id):
+            logger.warning("license_revoked_crl",
+                          license_id=license_id,
+                          reason=self.revocation.reason(license_id))
+            return True
         
         return False
 
-
 def require_feature(feature: str):
     """Decorator to require specific feature entitlement.
     
@@ -0,0 +1,566 @@
+"""License revocation service for SeaTrace-ODOO.
+
+One revocation list (CRL) for the license middleware and the Layer 7
+``CRLValidator``. Each fetched CRL is indexed once, at refresh time,
+into a snapshot:
+
+- a dict ``license_id -> reason`` - the authoritative membership test
+  on the request path (one hash probe)
+- a Bloom filter of the same ids - a compact negative filter for
+  callers that hold only the filter (built on first use, not per
+  refresh, and not consulted per request: in CPython a set probe is
+  cheaper than the k filter probes)
+
+Lookups never do I/O. A stale snapshot keeps answering while one
+background task re-fetches the CRL (stale-while-revalidate, with
+``If-None-Match``), and ``start()`` refreshes on a fixed interval. A
+fetched CRL is parsed, indexed and persisted in a worker thread; the
+event loop only swaps in the finished index. The
+last good CRL is persisted to ``cache_path`` and loaded at construction,
+so a restarted process enforces revocations before its first fetch.
+
+Delta feed: with a ``delta_url``, a service that knows its CRL
+``sequence`` asks only for the changes since then and applies the adds
+and removes to its index in place, O(changes) instead of O(list). A
+gap (HTTP 410, or a delta that does not start at our sequence) falls
+back to one full fetch. Applied deltas are appended to
+``<cache_path>.delta`` and replayed on warm start; a full fetch (or
+every ``journal_limit`` deltas, a compaction) rewrites ``cache_path``
+and drops the journal.
+
+Accepted CRL formats::
+
+    {"sequence": 42, "revoked": [{"license_id": "L-1", "reason": "stolen"}, ...]}
+    {"revoked_licenses": ["L-1", ...]}
+
+Delta format (``GET <delta_url>?since=<sequence>``)::
+
+    {"from": 42, "to": 45, "added": [{"license_id": ..., "reason": ...} | id, ...],
+     "removed": [id, ...]}
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import httpx
+import structlog
+from prometheus_client import Counter, Gauge
+
+from .token_cache import VerifiedTokenCache, default_token_cache
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+CRL_REFRESH = Counter(
+    'license_crl_refresh_total',
+    'License CRL refresh attempts',
+    ['result']  # updated, unchanged, not_modified, delta, gap, error
+)
+CRL_DELTA_CHANGES = Counter(
+    'license_crl_delta_changes_total',
+    'Revocation changes applied from the delta feed',
+    ['op']  # added, removed
+)
+CRL_ENTRIES = Gauge(
+    'license_crl_entries',
+    'Revoked licenses in the active CRL snapshot'
+)
+CRL_AGE = Gauge(
+    'license_crl_fetched_timestamp_seconds',
+    'When the active CRL snapshot was fetched'
+)
+
+# CRL entries per json.dumps call when persisting
+PERSIST_CHUNK = 10000
+
+
+class RevocationUnavailable(RuntimeError):
+    """No CRL is loaded and the service fails closed"""
+
+
+class CRLGap(ValueError):
+    """A delta cannot be applied - a full CRL fetch is needed"""
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (BLAKE2b double hashing).
+
+    Args:
+        capacity: Expected number of items
+        error_rate: Target false-positive rate
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(8, bits)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def of(cls, items: Iterable[str], capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str):
+        h = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(h[:8], "little")
+        h2 = int.from_bytes(h[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+def _entries(entries: Iterable[Any]) -> Dict[str, Optional[str]]:
+    # {"license_id", "reason"} dicts or bare ids -> {license_id: reason}
+    revoked: Dict[str, Optional[str]] = {}
+    for entry in entries:
+        license_id = entry.get("license_id") if isinstance(entry, Mapping) else entry
+        if license_id:
+            revoked[license_id] = entry.get("reason") if isinstance(entry, Mapping) else None
+    return revoked
+
+
+def parse_crl(document: Mapping[str, Any]) -> Dict[str, Optional[str]]:
+    """Revoked license ids (and reasons) of a CRL document.
+
+    Raises:
+        ValueError: Not a CRL document
+    """
+    if not isinstance(document, Mapping) or not (
+        "revoked" in document or "revoked_licenses" in document
+    ):
+        raise ValueError("CRL document has no 'revoked' or 'revoked_licenses' list")
+    revoked = _entries(document.get("revoked", []))
+    for license_id in document.get("revoked_licenses", []):
+        if license_id:
+            revoked.setdefault(license_id, None)
+    return revoked
+
+
+def _index_crl(content: bytes, current: Mapping[str, Any]):
+    # (document, revoked index, changed vs current) of a CRL response body.
+    # Runs in a worker thread: the object hook makes the C decoder call
+    # back per entry, so the event loop gets the GIL in between instead of
+    # waiting out one multi-second json.loads
+    document = json.loads(content, object_hook=_as_dict)
+    revoked = parse_crl(document)
+    return document, revoked, revoked.keys() != current.keys()
+
+
+def _as_dict(obj: Dict[str, Any]) -> Dict[str, Any]:
+    return obj
+
+
+@dataclass(frozen=True)
+class RevocationSnapshot:
+    """Index of one CRL
+
+    The ``revoked`` dict is updated in place by delta refreshes (no copy
+    of a large list per refresh); every other field is replaced.
+    """
+    revoked: Dict[str, Optional[str]] = field(default_factory=dict)
+    etag: Optional[str] = None
+    fetched_at: float = 0.0
+    # CRL sequence number (delta feed position), if the CRL has one
+    sequence: Optional[int] = None
+    error_rate: float = 0.001
+
+    @classmethod
+    def build(cls, revoked: Dict[str, Optional[str]], etag: Optional[str] = None,
+              fetched_at: Optional[float] = None, sequence: Optional[int] = None,
+              error_rate: float = 0.001) -> "RevocationSnapshot":
+        return cls(
+            revoked=revoked,
+            etag=etag,
+            fetched_at=time.time() if fetched_at is None else fetched_at,
+            sequence=sequence,
+            error_rate=error_rate,
+        )
+
+    @cached_property
+    def bloom(self) -> BloomFilter:
+        """Bloom filter of the revoked ids (built on first use)"""
+        return BloomFilter.of(self.revoked, capacity=len(self.revoked), error_rate=self.error_rate)
+
+    @property
+    def loaded(self) -> bool:
+        return self.fetched_at > 0
+
+
+class RevocationService:
+    """
+    🛡️ REVOCATION SERVICE - indexed CRL, refreshed off the request path
+
+    Args:
+        crl_url: CRL URL (None: only loaded or persisted CRLs are used)
+        cache_path: File the last good CRL is persisted to (warm start)
+        refresh_interval: Seconds before a snapshot is stale
+        fail_open: Treat licenses as valid while no CRL was ever loaded
+        token_cache: Cache invalidated when the revoked set changes
+            (default: the shared one)
+        timeout: HTTP timeout for CRL fetches
+        transport: httpx transport (e.g. httpx.MockTransport in tests)
+        clock: Wall clock
+        delta_url: Delta feed URL (None: always fetch the full CRL)
+        journal_limit: Journaled deltas before the persisted CRL is
+            rewritten from the index
+    """
+
+    def __init__(self, crl_url: Optional[str] = None, cache_path: Optional[str] = None,
+                 refresh_interval: float = 3600.0, fail_open: bool = True,
+                 token_cache: Optional[VerifiedTokenCache] = None, timeout: float = 5.0,
+                 transport: Any = None, clock=time.time, delta_url: Optional[str] = None,
+                 journal_limit: int = 1000):
+        self.crl_url = crl_url
+        self.delta_url = delta_url
+        self.journal_limit = journal_limit
+        self._journaled = 0
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.refresh_interval = refresh_interval
+        self.fail_open = fail_open
+        self.token_cache = token_cache if token_cache is not None else default_token_cache()
+        self.timeout = timeout
+        self.transport = transport
+        self.clock = clock
+        self._snapshot = RevocationSnapshot()
+        self._client: Optional[httpx.AsyncClient] = None
+        # The one background refresh in flight (loop, stale lookups, startup)
+        self._refreshing: Optional[asyncio.Task] = None
+        # Held for a whole fetch + apply: refreshes never overlap
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._warm_start()
+
+    @classmethod
+    def from_env(cls, crl_url: Optional[str] = None, **kwargs) -> "RevocationService":
+        """Service configured by CRL_URL, CRL_DELTA_URL, SEATRACE_CRL_CACHE
+        and CRL_REFRESH_SECONDS."""
+        kwargs.setdefault("delta_url", os.getenv("CRL_DELTA_URL") or None)
+        kwargs.setdefault("cache_path", os.getenv("SEATRACE_CRL_CACHE") or None)
+        kwargs.setdefault("refresh_interval", float(os.getenv("CRL_REFRESH_SECONDS", "3600")))
+        return cls(crl_url=crl_url or os.getenv("CRL_URL"), **kwargs)
+
+    # ========================================
+    # LOOKUP (request path - no I/O)
+    # ========================================
+
+    @property
+    def snapshot(self) -> RevocationSnapshot:
+        return self._snapshot
+
+    def is_revoked(self, license_id: Optional[str]) -> bool:
+        """True if the license is on the current CRL.
+
+        Raises:
+            RevocationUnavailable: Fail-closed and no CRL loaded yet
+        """
+        snapshot = self._snapshot
+        if not snapshot.loaded and not self.fail_open and self.crl_url:
+            raise RevocationUnavailable("Revocation list not loaded")
+        return bool(license_id) and license_id in snapshot.revoked
+
+    def reason(self, license_id: str) -> Optional[str]:
+        return self._snapshot.revoked.get(license_id)
+
+    def is_stale(self) -> bool:
+        return self.clock() - self._snapshot.fetched_at > self.refresh_interval
+
+    def refresh_if_stale(self) -> None:
+        """Start one background refresh if the snapshot is stale (never waits)."""
+        if not self.crl_url or not self.is_stale():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._background_refresh()
+
+    def _background_refresh(self) -> asyncio.Task:
+        """The background refresh in flight, or a new one."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.get_running_loop().create_task(self._refresh_logged())
+        return self._refreshing
+
+    # ========================================
+    # LOADING / REFRESH
+    # ========================================
+
+    def load(self, document: Mapping[str, Any], etag: Optional[str] = None,
+             fetched_at: Optional[float] = None, persist: bool = True) -> bool:
+        """Index a CRL document and swap it in.
+
+        Returns:
+            True if the revoked set changed (the token cache is cleared)
+
+        Raises:
+            ValueError: Not a CRL document (the current snapshot stays)
+        """
+        revoked = parse_crl(document)
+        changed = revoked.keys() != self._snapshot.revoked.keys()
+        self._swap(revoked, changed, etag, fetched_at, document.get("sequence"))
+        if persist:
+            self._persist(self._snapshot)
+        return changed
+
+    def _swap(self, revoked: Dict[str, Optional[str]], changed: bool, etag: Optional[str],
+              fetched_at: Optional[float], sequence: Optional[int]) -> None:
+        """Make an indexed CRL the active snapshot (O(1) - the index is built)."""
+        snapshot = RevocationSnapshot.build(
+            revoked, etag, self.clock() if fetched_at is None else fetched_at, sequence=sequence,
+        )
+        self._snapshot = snapshot
+        if changed:
+            self.token_cache.invalidate("crl")
+        CRL_ENTRIES.set(len(revoked))
+        CRL_AGE.set(snapshot.fetched_at)
+
+    def apply_delta(self, delta: Mapping[str, Any], fetched_at: Optional[float] = None,
+                    persist: bool = True) -> bool:
+        """Apply a delta feed response to the index in place.
+
+        Returns:
+            True if the revoked set changed
+
+        Raises:
+            CRLGap: The delta does not start at the current sequence
+        """
+        snapshot = self._snapshot
+        if snapshot.sequence is None or delta.get("from") != snapshot.sequence:
+            raise CRLGap(f"Delta from {delta.get('from')} does not follow sequence {snapshot.sequence}")
+        added = _entries(delta.get("added", []))
+        removed = [license_id for license_id in delta.get("removed", []) if license_id in snapshot.revoked]
+        revoked = snapshot.revoked
+        changed = bool(removed) or any(license_id not in revoked for license_id in added)
+        for license_id in removed:
+            del revoked[license_id]
+        revoked.update(added)
+        self._snapshot = replace(
+            snapshot,
+            sequence=delta.get("to", snapshot.sequence),
+            fetched_at=self.clock() if fetched_at is None else fetched_at,
+        )
+        CRL_DELTA_CHANGES.labels(op="added").inc(len(added))
+        CRL_DELTA_CHANGES.labels(op="removed").inc(len(removed))
+        CRL_ENTRIES.set(len(revoked))
+        CRL_AGE.set(self._snapshot.fetched_at)
+        if changed:
+            self.token_cache.invalidate("crl")
+        if persist and self._journal(delta):
+            self._compact()
+        return changed
+
+    async def refresh(self) -> bool:
+        """Fetch the CRL changes (delta feed) or the full CRL now.
+
+        Returns:
+            True if the revoked set changed
+
+        Raises:
+            httpx.HTTPError / ValueError: Fetch or parse failed (the
+            current snapshot stays active)
+        """
+        if not self.crl_url:
+            return False
+        async with self._refresh_lock:
+            return await self._refresh_locked()
+
+    async def _refresh_locked(self) -> bool:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=self.transport)
+        if self.delta_url and self._snapshot.sequence is not None:
+            try:
+                return await self._refresh_delta()
+            except CRLGap as e:
+                CRL_REFRESH.labels(result="gap").inc()
+                logger.warning("crl_delta_gap", url=self.delta_url, error=str(e))
+                # Unconditional: our index is not the one the ETag names
+                return await self._refresh_full(conditional=False)
+        return await self._refresh_full()
+
+    async def _refresh_delta(self) -> bool:
+        response = await self._client.get(self.delta_url, params={"since": self._snapshot.sequence})
+        if response.status_code == 410:
+            raise CRLGap(f"Sequence {self._snapshot.sequence} is no longer served")
+        response.raise_for_status()
+        delta = response.json()
+        if delta.get("to") == self._snapshot.sequence:
+            self._snapshot = replace(self._snapshot, fetched_at=self.clock())
+            CRL_REFRESH.labels(result="not_modified").inc()
+            return False
+        changed = self.apply_delta(delta, persist=False)
+        if self._journal(delta):
+            # Rewriting the whole index takes seconds at scale - not on the loop
+            await asyncio.to_thread(self._compact)
+        CRL_REFRESH.labels(result="delta").inc()
+        if changed:
+            logger.info("crl_delta_applied", sequence=self._snapshot.sequence,
+                        added=len(delta.get("added", [])), removed=len(delta.get("removed", [])))
+        return changed
+
+    async def _refresh_full(self, conditional: bool = True) -> bool:
+        etag = self._snapshot.etag if conditional else None
+        response = await self._client.get(self.crl_url, headers={"If-None-Match": etag} if etag else {})
+        if response.status_code == 304:
+            # Same list - only the freshness moves
+            self._snapshot = replace(self._snapshot, fetched_at=self.clock())
+            CRL_REFRESH.labels(result="not_modified").inc()
+            return False
+        response.raise_for_status()
+        etag = response.headers.get("etag")
+        # Parse, index and persist in a worker thread (seconds for a
+        # large CRL); only the finished index is swapped in on the loop
+        document, revoked, changed = await asyncio.to_thread(
+            _index_crl, response.content, self._snapshot.revoked
+        )
+        self._swap(revoked, changed, etag, None, document.get("sequence"))
+        await asyncio.to_thread(self._persist, self._snapshot)
+        CRL_REFRESH.labels(result="updated" if changed else "unchanged").inc()
+        if changed:
+            logger.info("crl_refreshed", url=self.crl_url, revoked=len(self._snapshot.revoked))
+        return changed
+
+    async def _refresh_logged(self) -> None:
+        try:
+            await self.refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            CRL_REFRESH.labels(result="error").inc()
+            logger.error("crl_fetch_failed", url=self.crl_url, error=str(e))
+
+    async def ensure_loaded(self) -> bool:
+        """Fetch the CRL once now unless one is already loaded (warm start).
+
+        Call during startup so a fail-open service does not serve its
+        first requests with an empty list. A failed fetch is logged and
+        left to the background refresh.
+
+        Returns:
+            True if a CRL is loaded
+        """
+        if self.crl_url and not self._snapshot.loaded:
+            await self._background_refresh()
+        return self._snapshot.loaded
+
+    async def _refresh_loop(self) -> None:
+        # A freshly loaded snapshot (warm start, ensure_loaded) is not refetched
+        age = self.clock() - self._snapshot.fetched_at
+        if self._snapshot.loaded and age < self.refresh_interval:
+            await asyncio.sleep(self.refresh_interval - age)
+        while True:
+            # Shared with refresh_if_stale(), so a stale lookup joins this fetch
+            await self._background_refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """Refresh in the background every refresh_interval seconds."""
+        if self.crl_url and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background refresh and close the HTTP client."""
+        for task in (self._task, self._refreshing):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._refreshing = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ========================================
+    # PERSISTENCE
+    # ========================================
+
+    @property
+    def _journal_path(self) -> Path:
+        return self.cache_path.with_suffix(self.cache_path.suffix + ".delta")
+
+    def _persist(self, snapshot: RevocationSnapshot) -> None:
+        # The index is written in slices of PERSIST_CHUNK entries: one
+        # json.dumps of a large CRL would hold the GIL for seconds
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+            items = iter(list(snapshot.revoked.items()))
+            with tmp.open("w") as f:
+                f.write(f'{{"etag": {json.dumps(snapshot.etag)}, "fetched_at": {json.dumps(snapshot.fetched_at)}, '
+                        f'"crl": {{"sequence": {json.dumps(snapshot.sequence)}, "revoked": [')
+                separator = ""
+                while True:
+                    chunk = [{"license_id": k, "reason": v} for k, v in itertools.islice(items, PERSIST_CHUNK)]
+                    if not chunk:
+                        break
+                    f.write(separator + json.dumps(chunk)[1:-1])
+                    separator = ", "
+                f.write("]}}")
+            os.replace(tmp, self.cache_path)
+            # The new base already contains every journaled delta
+            self._journal_path.unlink(missing_ok=True)
+            self._journaled = 0
+        except OSError as e:
+            logger.warning("crl_persist_failed", path=str(self.cache_path), error=str(e))
+
+    def _journal(self, delta: Mapping[str, Any]) -> bool:
+        # Append one delta; True instead when the journal is due for compaction
+        if self.cache_path is None:
+            return False
+        if self._journaled >= self.journal_limit:
+            return True
+        self._journaled += 1
+        try:
+            with self._journal_path.open("a") as journal:
+                journal.write(json.dumps(dict(delta, fetched_at=self._snapshot.fetched_at)) + "\n")
+        except OSError as e:
+            logger.warning("crl_journal_failed", path=str(self._journal_path), error=str(e))
+        return False
+
+    def _compact(self) -> None:
+        self._persist(self._snapshot)
+
+    def _replay_journal(self) -> None:
+        if not self._journal_path.exists():
+            return
+        deltas: List[Mapping[str, Any]] = []
+        for line in self._journal_path.read_text().splitlines():
+            if line.strip():
+                deltas.append(json.loads(line))
+        for delta in deltas:
+            self.apply_delta(delta, delta.get("fetched_at"), persist=False)
+        self._journaled = len(deltas)
+
+    def _warm_start(self) -> None:
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            cached = json.loads(self.cache_path.read_text())
+            self.load(cached["crl"], cached.get("etag"), cached.get("fetched_at"), persist=False)
+            self._replay_journal()
+            logger.info("crl_warm_start", path=str(self.cache_path), revoked=len(self._snapshot.revoked))
+        except (OSError, KeyError, TypeError, ValueError, CRLGap) as e:
+            logger.warning("crl_warm_start_failed", path=str(self.cache_path), error=str(e))
@@ -0,0 +1,142 @@
+"""Compiled route-template matching for SeaTrace-ODOO licensing.
+
+License scopes are lists of ``"METHOD:/path"`` route signatures taken
+from the app's routes, so they contain path templates such as
+``GET:/api/v1/retrieve/{packet_id}``. ``RouteTrie`` compiles them once
+into a per-method trie of path segments; a request path is then matched
+segment by segment, in O(path segments) for any number of routes.
+Routes without templates are also kept in a plain dict, so the common
+case is a single lookup.
+
+Template segments follow Starlette's convertors: ``{name}`` (and
+``{name:str}``) match one non-empty segment, ``{name:int}``,
+``{name:float}`` and ``{name:uuid}`` match one segment of that form, and
+``{name:path}`` matches the rest of the path. Literal segments win over
+template segments, as they do in the router.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Starlette convertor regexes (one segment unless noted)
+_CONVERTORS: Dict[str, Optional[Pattern[str]]] = {
+    "str": None,  # any non-empty segment
+    "int": re.compile(r"[0-9]+"),
+    "float": re.compile(r"[0-9]+(\.[0-9]+)?"),
+    "uuid": re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"),
+}
+_TEMPLATE = re.compile(r"\{([a-zA-Z_][a-zA-Z0-9_]*)(?::([a-z]+))?\}")
+
+
+def _segments(path: str) -> List[str]:
+    # "/" -> [""], "/a/" -> ["a", ""] - trailing slashes stay significant
+    return path.split("/")[1:]
+
+
+class _Node:
+    __slots__ = ("literals", "params", "rest", "route")
+
+    def __init__(self):
+        self.literals: Dict[str, "_Node"] = {}
+        # (convertor pattern or None for str, child), in insertion order
+        self.params: List[Tuple[Optional[Pattern[str]], "_Node"]] = []
+        # route of a trailing {name:path} segment
+        self.rest: Optional[str] = None
+        self.route: Optional[str] = None
+
+
+class RouteTrie:
+    """Set of ``"METHOD:/path"`` route signatures with template matching.
+
+    Args:
+        routes: Route signatures, e.g. ``"GET:/api/v1/retrieve/{packet_id}"``
+
+    Raises:
+        ValueError: A template segment uses an unknown convertor
+    """
+
+    def __init__(self, routes: Iterable[str] = ()):
+        self._methods: Dict[str, _Node] = {}
+        # "METHOD:/path" -> route, for routes without templates
+        self._static: Dict[str, str] = {}
+        self._routes: set = set()
+        for route in routes:
+            self.add(route)
+
+    def add(self, route_sig: str) -> None:
+        """Compile one route signature into the trie."""
+        method, _, path = route_sig.partition(":")
+        method = method.upper()
+        self._routes.add(route_sig)
+        if "{" not in path:
+            self._static[f"{method}:{path}"] = route_sig
+            return
+        node = self._methods.setdefault(method, _Node())
+        segments = _segments(path)
+        for i, segment in enumerate(segments):
+            template = _TEMPLATE.fullmatch(segment)
+            if template is None:
+                node = node.literals.setdefault(segment, _Node())
+                continue
+            convertor = template.group(2) or "str"
+            if convertor == "path":
+                if i != len(segments) - 1:
+                    raise ValueError(f"{{{template.group(1)}:path}} must be the last segment: {route_sig}")
+                node.rest = route_sig
+                return
+            if convertor not in _CONVERTORS:
+                raise ValueError(f"Unknown path convertor '{convertor}' in {route_sig}")
+            pattern = _CONVERTORS[convertor]
+            child = next((c for p, c in node.params if p is pattern), None)
+            if child is None:
+                child = _Node()
+                node.params.append((pattern, child))
+            node = child
+        node.route = route_sig
+
+    def match(self, method: str, path: str) -> Optional[str]:
+        """Route signature matching a request, or None.
+
+        Args:
+            method: HTTP method
+            path: Request path (no query string)
+
+        Returns:
+            The matching route signature (as given to ``add``)
+        """
+        route = self._static.get(f"{method}:{path}")
+        if route is not None:
+            return route
+        node = self._methods.get(method)
+        if node is None:
+            return None
+        return self._match(node, _segments(path), 0)
+
+    def _match(self, node: _Node, segments: List[str], i: int) -> Optional[str]:
+        if i == len(segments):
+            return node.route
+        segment = segments[i]
+        child = node.literals.get(segment)
+        if child is not None:
+            route = self._match(child, segments, i + 1)
+            if route is not None:
+                return route
+        if segment:
+            for pattern, child in node.params:
+                if pattern is None or pattern.fullmatch(segment):
+                    route = self._match(child, segments, i + 1)
+                    if route is not None:
+                        return route
+        return node.rest
+
+    def __contains__(self, route_sig: str) -> bool:
+        if route_sig in self._static:
+            return True
+        method, _, path = route_sig.partition(":")
+        return self.match(method, path) is not None
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def __iter__(self):
+        return iter(sorted(self._routes))
@@ -0,0 +1,176 @@
+"""Verified license token cache for SeaTrace-ODOO.
+
+Clients reuse one license token for thousands of calls. The first call
+pays for parsing and Ed25519 verification; later calls find the parsed
+claims by token digest until the token's ``exp`` (or ``max_ttl``,
+whichever comes first).
+
+The cache is shared by ``LicenseMiddleware`` and ``Ed25519Verifier``.
+Entries are namespaced by the verifying key set, so a token verified
+under one key never counts as verified under another. Any change to a
+revocation list clears the cache (``invalidate()``).
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+# Prometheus metrics
+TOKEN_CACHE_LOOKUPS = Counter(
+    'license_token_cache_total',
+    'Verified license token cache lookups',
+    ['result']  # hit, miss, expired
+)
+TOKEN_CACHE_INVALIDATIONS = Counter(
+    'license_token_cache_invalidations_total',
+    'Verified license token cache invalidations',
+    ['reason']
+)
+TOKEN_CACHE_ENTRIES = Gauge(
+    'license_token_cache_entries',
+    'Verified license tokens cached'
+)
+
+# (namespace, token digest)
+TokenKey = Tuple[str, bytes]
+
+
+def key_namespace(*keys: Any) -> str:
+    """Short fingerprint of the verifying key(s), used as a cache namespace.
+
+    Args:
+        keys: Key material (strings, bytes or anything with a stable repr)
+
+    Returns:
+        Hex fingerprint
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for key in keys:
+        h.update(key if isinstance(key, bytes) else repr(key).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified token claims.
+
+    Only successful verifications are stored. Cached claims are shared
+    between requests and must be treated as read-only.
+
+    Args:
+        capacity: Tokens kept (0 disables the cache)
+        max_ttl: Seconds a token stays cached at most
+        clock: Wall clock (``time.time``), compared with ``exp``
+    """
+
+    def __init__(self, capacity: int = 10000, max_ttl: float = 300.0,
+                 clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[TokenKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hit = TOKEN_CACHE_LOOKUPS.labels(result='hit')
+        self._miss = TOKEN_CACHE_LOOKUPS.labels(result='miss')
+        self._expired = TOKEN_CACHE_LOOKUPS.labels(result='expired')
+
+    @classmethod
+    def from_env(cls) -> "VerifiedTokenCache":
+        """Cache sized by LICENSE_TOKEN_CACHE_SIZE and LICENSE_TOKEN_CACHE_TTL."""
+        return cls(
+            capacity=int(os.getenv("LICENSE_TOKEN_CACHE_SIZE", "10000")),
+            max_ttl=float(os.getenv("LICENSE_TOKEN_CACHE_TTL", "300")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def _key(token: str, namespace: str) -> TokenKey:
+        return namespace, hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str, namespace: str = "") -> Optional[Any]:
+        """Claims cached for a token, or None.
+
+        Args:
+            token: Token as received
+            namespace: Verifying key fingerprint (``key_namespace()``)
+        """
+        if not self.capacity:
+            return None
+        key = self._key(token, namespace)
+        counter = self._miss
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            elif entry[0] <= self.clock():
+                del self._entries[key]
+                self.misses += 1
+                counter = self._expired
+                entry = None
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                counter = self._hit
+        counter.inc()
+        return entry[1] if entry is not None else None
+
+    def put(self, token: str, namespace: str, claims: Any, exp: Optional[float] = None) -> None:
+        """Store the claims of a verified token.
+
+        Args:
+            token: Token as received
+            namespace: Verifying key fingerprint
+            claims: Parsed claims to return on later hits
+            exp: Token expiry (epoch seconds), if any
+        """
+        if not self.capacity:
+            return
+        now = self.clock()
+        expires = now + self.max_ttl
+        if isinstance(exp, (int, float)) and exp:
+            expires = min(expires, exp)
+        if expires <= now:
+            return
+        key = self._key(token, namespace)
+        with self._lock:
+            self._entries[key] = (expires, claims)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+            TOKEN_CACHE_ENTRIES.set(len(self._entries))
+
+    def invalidate(self, reason: str = "crl") -> None:
+        """Drop every cached token (e.g. after a revocation list change)."""
+        with self._lock:
+            self._entries.clear()
+        TOKEN_CACHE_ENTRIES.set(0)
+        TOKEN_CACHE_INVALIDATIONS.labels(reason=reason).inc()
+
+
+_default_cache: Optional[VerifiedTokenCache] = None
+_default_lock = threading.Lock()
+
+
+def default_token_cache() -> VerifiedTokenCache:
+    """Process-wide cache shared by the middleware and the verifiers."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = VerifiedTokenCache.from_env()
+    return _default_cache
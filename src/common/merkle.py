@@ -0,0 +1,102 @@
+"""
+🔐 SeaTrace Merkle Trees
+For the Commons Good! 🌊
+
+Binary Merkle trees over BLAKE2b-256 with RFC 6962 domain separation:
+
+- leaf  = H(0x00 || data)
+- node  = H(0x01 || left || right)
+
+An odd node at the end of a level is promoted unchanged rather than
+duplicated, so two different leaf lists can never share a root.
+
+An inclusion path is a list of ``(side, sibling_hash)`` pairs from the
+leaf up; ``side`` is "L" when the sibling sits on the left.
+"""
+
+import hashlib
+from typing import List, Sequence, Tuple
+
+DIGEST_SIZE = 32
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+MerklePath = List[Tuple[str, bytes]]
+
+
+def leaf_hash(data) -> bytes:
+    """Hash of one leaf (accepts any bytes-like object, e.g. an mmap slice)"""
+    h = hashlib.blake2b(LEAF_PREFIX, digest_size=DIGEST_SIZE)
+    h.update(data)
+    return h.digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.blake2b(NODE_PREFIX + left + right, digest_size=DIGEST_SIZE).digest()
+
+
+def _next_level(level: Sequence[bytes]) -> List[bytes]:
+    parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    """
+    Root of a list of leaf hashes
+
+    Returns:
+        32-byte root (the hash of the empty string for no leaves)
+    """
+    if not leaves:
+        return hashlib.blake2b(b"", digest_size=DIGEST_SIZE).digest()
+    level = list(leaves)
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+def merkle_path(leaves: Sequence[bytes], index: int) -> MerklePath:
+    """
+    Inclusion path of ``leaves[index]``
+
+    Raises:
+        IndexError: index outside the leaf list
+    """
+    if not 0 <= index < len(leaves):
+        raise IndexError(f"Leaf {index} not in tree of {len(leaves)}")
+    path: MerklePath = []
+    level = list(leaves)
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(("L" if sibling < index else "R", level[sibling]))
+        level = _next_level(level)
+        index //= 2
+    return path
+
+
+def merkle_paths(leaves: Sequence[bytes]) -> List[MerklePath]:
+    """Inclusion paths of every leaf, building the tree once (O(n log n))"""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        levels.append(_next_level(levels[-1]))
+    paths: List[MerklePath] = []
+    for index in range(len(leaves)):
+        path: MerklePath = []
+        for level in levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(("L" if sibling < index else "R", level[sibling]))
+            index //= 2
+        paths.append(path)
+    return paths
+
+
+def verify_path(leaf: bytes, path: Sequence[Tuple[str, bytes]], root: bytes) -> bool:
+    """True if ``leaf`` hashes up ``path`` to ``root``"""
+    current = leaf
+    for side, sibling in path:
+        current = node_hash(sibling, current) if side == "L" else node_hash(current, sibling)
+    return current == root
@@ -0,0 +1,107 @@
+"""
+📈 SeaTrace Online Statistics
+For the Commons Good! 🌊
+
+O(1)-memory running statistics for streaming baselines:
+
+- Welford mean/variance over everything seen (long-run baseline)
+- EWMA mean/variance (recent behaviour, follows drift)
+- ``upper`` - a data-driven alarm threshold (mean + k·std) kept as a
+  plain float attribute, so a hot-path check is one attribute read.
+  Until ``min_samples`` values have been seen it holds ``fallback``.
+
+``merge()`` folds in pre-aggregated (count, mean, M2) groups (Chan et
+al.), which is how batch backfills seed baselines.
+"""
+
+import math
+from typing import Optional
+
+
+class OnlineStats:
+    """
+    Running statistics of one series
+
+    Args:
+        alpha: EWMA smoothing factor (weight of the newest value)
+        k: Standard deviations above the mean for ``upper``
+        min_samples: Values needed before ``upper`` follows the data
+        fallback: ``upper`` until then (e.g. a hand-picked limit)
+    """
+
+    __slots__ = ("n", "mean", "m2", "ewma", "ewm_var", "alpha", "k", "min_samples", "upper")
+
+    def __init__(self, alpha: float = 0.05, k: float = 4.0, min_samples: int = 30,
+                 fallback: float = math.inf):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ewma = 0.0
+        self.ewm_var = 0.0
+        self.alpha = alpha
+        self.k = k
+        self.min_samples = min_samples
+        self.upper = fallback
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def update(self, x: float) -> None:
+        """Fold one value into both baselines"""
+        self.n += 1
+        if self.n == 1:
+            self.mean = self.ewma = x
+        else:
+            delta = x - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (x - self.mean)
+
+            # EWMA variance (West 1979 incremental form)
+            diff = x - self.ewma
+            incr = self.alpha * diff
+            self.ewma += incr
+            self.ewm_var = (1.0 - self.alpha) * (self.ewm_var + diff * incr)
+        if self.n >= self.min_samples:
+            self.upper = self.mean + self.k * self.std
+
+    def merge(self, n: int, mean: float, m2: float) -> None:
+        """Fold in an aggregated group of ``n`` values (mean, sum of squared deviations)"""
+        if n <= 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.m2 = n, mean, m2
+            self.ewma = mean
+            self.ewm_var = m2 / (n - 1) if n > 1 else 0.0
+        else:
+            total = self.n + n
+            delta = mean - self.mean
+            self.m2 += m2 + delta * delta * self.n * n / total
+            self.mean += delta * n / total
+            self.n = total
+        if self.n >= self.min_samples:
+            self.upper = self.mean + self.k * self.std
+
+    def zscore(self, x: float) -> Optional[float]:
+        """Distance from the long-run mean in standard deviations (None while warming up)"""
+        if self.n < self.min_samples:
+            return None
+        std = self.std
+        if std == 0.0:
+            return 0.0 if x == self.mean else math.inf
+        return (x - self.mean) / std
+
+    def ewm_zscore(self, x: float) -> Optional[float]:
+        """Distance from the recent (EWMA) mean in recent standard deviations"""
+        if self.n < self.min_samples:
+            return None
+        if self.ewm_var == 0.0:
+            return 0.0 if x == self.ewma else math.inf
+        return (x - self.ewma) / math.sqrt(self.ewm_var)
+
+    def __repr__(self) -> str:
+        return f"OnlineStats(n={self.n}, mean={self.mean:.4g}, std={self.std:.4g}, ewma={self.ewma:.4g})"
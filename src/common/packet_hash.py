@@ -0,0 +1,193 @@
+"""
+🔐 SeaTrace Packet Hash Propagation
+For the Commons Good! 🌊
+
+The canonical packet hash is computed once, at the router, and travels
+with the packet to the pillar services:
+
+- single packets: ``X-Packet-Hash`` plus the hashed fields the payload
+  does not carry (``X-Correlation-ID``, ``X-Packet-Timestamp``,
+  ``X-Packet-Signature``)
+- micro-batches: the same fields as keys of each batch entry
+
+A pillar rebuilds the packet from those fields and adopts the forwarded
+hash instead of re-encoding and re-hashing the payload. It only verifies
+the hash on a sample of packets (``PACKET_HASH_VERIFY_RATE``, default
+1%), and the adopted hash is pinned to the payload as received: if the
+pillar changes the payload, the next ``hash()`` is computed for real.
+
+Pillars trust the router's network. Set ``PACKET_HASH_VERIFY_RATE=1`` on
+a pillar that is reachable by anything else.
+"""
+
+import hmac
+import os
+import random
+import re
+from typing import Any, Dict, Mapping, Optional
+
+import structlog
+from prometheus_client import Counter
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+PACKET_HASH_CHECKS = Counter(
+    'packet_hash_checks_total',
+    'Packet hashes received from the previous hop',
+    ['result']  # trusted, verified, mismatch, computed
+)
+
+HASH_HEADER = "X-Packet-Hash"
+CORRELATION_HEADER = "X-Correlation-ID"
+TIMESTAMP_HEADER = "X-Packet-Timestamp"
+SIGNATURE_HEADER = "X-Packet-Signature"
+
+# BLAKE2b-512 hex, as produced by common.canonical.digest()
+_DIGEST_FORMAT = re.compile(r"[0-9a-f]{128}")
+
+
+class PacketHashMismatch(ValueError):
+    """The forwarded hash does not match the packet"""
+
+
+def hop_headers(packet: Any) -> Dict[str, str]:
+    """
+    Headers that carry a packet's hash (and the hashed fields outside
+    its payload) to the next hop
+
+    Args:
+        packet: Packet with a memoized hash()
+    """
+    if packet.signature is not None and not isinstance(packet.signature, str):
+        # Not representable as a header - the next hop hashes for itself
+        return {CORRELATION_HEADER: packet.correlation_id}
+    headers = {
+        CORRELATION_HEADER: packet.correlation_id,
+        HASH_HEADER: packet.hash(),
+        TIMESTAMP_HEADER: packet.timestamp,
+    }
+    if packet.signature is not None:
+        headers[SIGNATURE_HEADER] = packet.signature
+    return headers
+
+
+def hop_entry(packet: Any) -> Dict[str, Any]:
+    """Micro-batch entry with the same fields as hop_headers()"""
+    return {
+        "correlation_id": packet.correlation_id,
+        "packet_hash": packet.hash(),
+        "timestamp": packet.timestamp,
+        "signature": packet.signature,
+        "payload": packet.payload,
+    }
+
+
+def hop_fields(headers: Mapping[str, str]) -> Optional[Dict[str, Any]]:
+    """
+    Forwarded fields from request headers
+
+    Returns:
+        Fields in hop_entry() form, or None for a request that carries
+        no hash (a direct client)
+    """
+    packet_hash = headers.get(HASH_HEADER)
+    if not packet_hash:
+        return None
+    return {
+        "correlation_id": headers.get(CORRELATION_HEADER),
+        "packet_hash": packet_hash,
+        "timestamp": headers.get(TIMESTAMP_HEADER),
+        "signature": headers.get(SIGNATURE_HEADER),
+    }
+
+
+class HashTrust:
+    """
+    🛡️ LAZY HASH CHECK - adopt forwarded hashes, verify a sample
+
+    Args:
+        verify_rate: Share of forwarded hashes recomputed and compared
+                     (0 = never, 1 = always)
+    """
+
+    def __init__(self, verify_rate: float = 0.01):
+        self.verify_rate = verify_rate
+
+    @classmethod
+    def from_env(cls) -> "HashTrust":
+        """Verify rate from PACKET_HASH_VERIFY_RATE"""
+        return cls(verify_rate=float(os.getenv("PACKET_HASH_VERIFY_RATE", "0.01")))
+
+    def receive(self, packet_cls: Any, source: str, payload: Any,
+                hop: Optional[Mapping[str, Any]] = None) -> Any:
+        """
+        Packet for a payload received from the previous hop
+
+        Args:
+            packet_cls: Packet class (IncomingPacket, CompactPacket)
+            source: Packet source of this pillar
+            payload: Received payload
+            hop: Forwarded fields (hop_entry() / hop_fields() form), or None
+
+        Returns:
+            The packet, its hash adopted or computed
+
+        Raises:
+            PacketHashMismatch: A verified hash does not match
+        """
+        fields = {"source": source, "payload": payload}
+        claimed = hop.get("packet_hash") if hop else None
+        if claimed:
+            # Rebuild exactly the fields the ingress hash covers
+            fields["correlation_id"] = hop.get("correlation_id")
+            fields["timestamp"] = hop.get("timestamp")
+            fields["signature"] = hop.get("signature")
+        else:
+            fields["signature"] = payload.get("signature")
+            if hop and hop.get("correlation_id"):
+                fields["correlation_id"] = hop["correlation_id"]
+        packet = packet_cls(**fields)
+        self.adopt(packet, claimed)
+        return packet
+
+    def adopt(self, packet: Any, claimed: Optional[str]) -> str:
+        """
+        Give a packet the hash computed upstream
+
+        Args:
+            packet: Packet with CanonicalPacketMixin
+            claimed: Forwarded hash, or None to compute it here
+
+        Returns:
+            The packet hash
+
+        Raises:
+            PacketHashMismatch: The claimed hash is malformed, or sampled
+                                and wrong
+        """
+        if not claimed:
+            PACKET_HASH_CHECKS.labels(result="computed").inc()
+            return packet.canonical_digest()
+
+        if not _DIGEST_FORMAT.fullmatch(claimed):
+            PACKET_HASH_CHECKS.labels(result="mismatch").inc()
+            raise PacketHashMismatch("Malformed packet hash")
+
+        if self.verify_rate > 0 and random.random() < self.verify_rate:
+            actual = packet.canonical_digest()
+            if not hmac.compare_digest(actual, claimed):
+                PACKET_HASH_CHECKS.labels(result="mismatch").inc()
+                logger.warning(
+                    "packet_hash_mismatch",
+                    correlation_id=packet.correlation_id,
+                    claimed=claimed,
+                    actual=actual
+                )
+                raise PacketHashMismatch("Packet hash does not match the packet")
+            PACKET_HASH_CHECKS.labels(result="verified").inc()
+            return actual
+
+        packet.adopt_digest(claimed)
+        PACKET_HASH_CHECKS.labels(result="trusted").inc()
+        return claimed
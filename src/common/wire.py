@@ -0,0 +1,227 @@
+"""
+📡 SeaTrace Wire Formats
+For the Commons Good! 🌊
+
+Content negotiation between JSON and MessagePack for packet endpoints.
+
+Vessels uplink over metered satellite links, so besides the usual map
+form (same keys as the JSON body) a packet may be sent as a positional
+MessagePack array::
+
+    [source, payload, signature?, correlation_id?, timestamp?, packet_type?]
+
+which leaves every key name off the wire. Signatures may travel as raw
+``bin`` bytes; they are turned into the same hex string the JSON form
+carries, so the canonical packet hash never depends on the wire format.
+
+msgpack is optional (``pip install .[perf]``); without it MessagePack
+requests are answered with 415.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from starlette.responses import Response
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised when msgpack is absent
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = frozenset({"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"})
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Positional (array) packet form, in wire order
+PACKET_ARRAY_FIELDS = ("source", "payload", "signature", "correlation_id", "timestamp", "packet_type")
+
+
+class WireFormatError(ValueError):
+    """Body cannot be decoded in its declared format"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """``"application/msgpack; charset=x"`` → ``"application/msgpack"``"""
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    return media_type(content_type) in MSGPACK_TYPES
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """
+    True if the Accept header prefers MessagePack over JSON
+
+    Ties go to JSON, so ``*/*`` and missing headers keep today's responses.
+    """
+    if not accept or msgpack is None:
+        return False
+    best_msgpack = best_json = 0.0
+    for item in accept.split(","):
+        kind, _, params = item.partition(";")
+        kind = kind.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if kind in MSGPACK_TYPES:
+            best_msgpack = max(best_msgpack, q)
+        elif kind in (JSON, "application/*", "*/*"):
+            best_json = max(best_json, q)
+    return best_msgpack > best_json
+
+
+def _reject_ext(code: int, data: bytes) -> Any:
+    raise WireFormatError(f"Unsupported MessagePack extension type {code}")
+
+
+def unpackb(data: bytes) -> Any:
+    """
+    Decode a MessagePack body (str keys only, no extension types)
+
+    Raises:
+        WireFormatError: msgpack missing (415) or malformed body (400)
+    """
+    if msgpack is None:
+        raise WireFormatError("MessagePack support is not installed", status_code=415)
+    try:
+        return msgpack.unpackb(data, raw=False, strict_map_key=True, ext_hook=_reject_ext)
+    except WireFormatError:
+        raise
+    except Exception as e:
+        raise WireFormatError(f"Malformed MessagePack body: {e}")
+
+
+def packb(obj: Any) -> bytes:
+    """Encode a response as MessagePack (floats stay 64-bit)"""
+    if msgpack is None:
+        raise WireFormatError("MessagePack support is not installed", status_code=415)
+    return msgpack.packb(obj, use_bin_type=True, default=_encode_default)
+
+
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
+
+
+def decode_body(body: bytes, content_type: Optional[str]) -> Any:
+    """
+    Decode a request body by its Content-Type (JSON unless MessagePack)
+
+    Raises:
+        WireFormatError: Malformed body
+    """
+    if is_msgpack(content_type):
+        return unpackb(body)
+    try:
+        return json.loads(body) if body else None
+    except ValueError as e:
+        raise WireFormatError(f"Malformed JSON body: {e}")
+
+
+def packet_fields(obj: Any) -> Dict[str, Any]:
+    """
+    Normalize a decoded packet (map or positional array) to its field dict
+
+    Raises:
+        WireFormatError: Neither a map nor a valid positional array
+    """
+    if isinstance(obj, list):
+        if not 2 <= len(obj) <= len(PACKET_ARRAY_FIELDS):
+            raise WireFormatError(
+                f"Positional packet needs 2-{len(PACKET_ARRAY_FIELDS)} fields, got {len(obj)}"
+            )
+        fields = {name: value for name, value in zip(PACKET_ARRAY_FIELDS, obj) if value is not None}
+    elif isinstance(obj, dict):
+        fields = obj
+    else:
+        raise WireFormatError("Packet must be a map or a positional array")
+
+    signature = fields.get("signature")
+    if isinstance(signature, (bytes, bytearray)):
+        fields = dict(fields, signature=bytes(signature).hex())
+    return fields
+
+
+# ========================================
+# FASTAPI HELPERS
+# ========================================
+
+async def read_body(request: Any) -> Any:
+    """Decode a request body by its Content-Type, as an HTTPException on failure"""
+    try:
+        return decode_body(await request.body(), request.headers.get("content-type"))
+    except WireFormatError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+
+def parse_batch_body(body: bytes, content_type: Optional[str]) -> List[Any]:
+    """
+    Split a batch request body into raw packet entries
+
+    JSON arrays and MessagePack arrays are parsed in one pass (MessagePack
+    entries may be maps or positional arrays). NDJSON bodies are parsed
+    line by line; a malformed line or entry becomes an exception entry
+    instead of failing the whole batch.
+
+    Raises:
+        HTTPException: The body as a whole is malformed or not an array
+    """
+    if media_type(content_type) in NDJSON_TYPES:
+        entries: List[Any] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError as e:
+                entries.append(ValueError(f"Malformed NDJSON line: {e}"))
+        return entries
+
+    if is_msgpack(content_type):
+        try:
+            entries = unpackb(body) if body else []
+        except WireFormatError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        if not isinstance(entries, list):
+            raise HTTPException(status_code=400, detail="MessagePack batch must be an array")
+        parsed: List[Any] = []
+        for entry in entries:
+            try:
+                parsed.append(packet_fields(entry))
+            except WireFormatError as e:
+                parsed.append(e)
+        return parsed
+
+    try:
+        entries = json.loads(body) if body else []
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed JSON batch: {e}")
+
+    if not isinstance(entries, list):
+        raise HTTPException(
+            status_code=400,
+            detail="Batch body must be a JSON array or NDJSON"
+        )
+    return entries
+
+
+def respond(request: Any, content: Any) -> Any:
+    """MessagePack response when the client's Accept prefers it, else ``content`` as is (JSON)"""
+    if wants_msgpack(request.headers.get("accept")):
+        return Response(content=packb(content), media_type=MSGPACK)
+    return content
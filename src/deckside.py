@@ -9,13 +9,14 @@ Receives packets from WildFisheriesPacketSwitcher
 from fastapi import FastAPI, Request, HTTPException
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
-from typing import Dict, Any
 import os
 
 # Import packet switching handler
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from packet_switching.handler import IncomingPacket, WildFisheriesPacketSwitcher
+from common.packet_hash import HashTrust, PacketHashMismatch, hop_fields
+from common.wire import read_body, respond
 
 app = FastAPI(
     title="DeckSide - Processing",
@@ -26,6 +27,9 @@ app = FastAPI(
 # Initialize packet switcher
 packet_switcher = WildFisheriesPacketSwitcher()
 
+# Forwarded packet hashes are adopted, a sample re-verified (PACKET_HASH_VERIFY_RATE)
+hash_trust = HashTrust.from_env()
+
 # Prometheus metrics
 requests_total = Counter('deckside_requests_total', 'Total requests', ['method', 'endpoint'])
 request_duration = Histogram('deckside_request_duration_seconds', 'Request duration')
@@ -53,19 +57,19 @@ async def root():
     }
 
 @app.post("/ingest/packet")
-async def ingest_packet(packet_data: Dict[str, Any]):
+async def ingest_packet(request: Request):
     """
     🏈 HANDOFF - Process catch recording packet
     
     PUBLIC KEY INCOMING - Verify and record catch data
     """
+    packet_data = await read_body(request)
+    if not isinstance(packet_data, dict):
+        raise HTTPException(status_code=400, detail="Packet must be a JSON object or MessagePack map")
+    
     try:
-        # Create incoming packet
-        packet = IncomingPacket(
-            source="catch",
-            payload=packet_data,
-            signature=packet_data.get("signature")
-        )
+        # Create incoming packet (with the router's hash when forwarded)
+        packet = hash_trust.receive(IncomingPacket, "catch", packet_data, hop_fields(request.headers))
         
         # Process through packet switcher
         result = await packet_switcher._handle_deckside(packet)
@@ -73,16 +77,49 @@ async def ingest_packet(packet_data: Dict[str, Any]):
         # Update metrics
         packets_processed.labels(source="catch", status="success").inc()
         
-        return {
+        return respond(request, {
             **result,
             "correlation_id": packet.correlation_id,
             "packet_hash": packet.hash()
-        }
+        })
         
+    except PacketHashMismatch as e:
+        packets_processed.labels(source="catch", status="error").inc()
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         packets_processed.labels(source="catch", status="error").inc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/ingest/batch")
+async def ingest_batch(request: Request):
+    """
+    🏈 NO-HUDDLE - Ingest a micro-batch forwarded by the packet router
+
+    Each entry is {"correlation_id", "packet_hash", "timestamp",
+    "signature", "payload"}; the router's packet_hash is adopted, not
+    recomputed. Results keep the order of the request; one bad entry
+    never fails the batch.
+    """
+    entries = await read_body(request)
+    if not isinstance(entries, list) or not all(isinstance(e, dict) for e in entries):
+        raise HTTPException(status_code=400, detail="Batch must be an array of entries")
+    results = []
+    for entry in entries:
+        try:
+            packet = hash_trust.receive(IncomingPacket, "catch", entry.get("payload", {}), entry)
+            result = await packet_switcher._handle_deckside(packet)
+            packets_processed.labels(source="catch", status="success").inc()
+            results.append({
+                **result,
+                "correlation_id": packet.correlation_id,
+                "packet_hash": packet.hash()
+            })
+        except Exception as e:
+            packets_processed.labels(source="catch", status="error").inc()
+            results.append({"correlation_id": entry.get("correlation_id"), "status": "error", "error": str(e)})
+
+    return respond(request, {"results": results})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8002)
@@ -19,9 +19,16 @@ from .handler import (
     BlockchainLogger,
     AnomalyDetector
 )
+from .compact import CompactPacket, PacketView
+from .forwarder import PillarForwarder, PillarTarget
+from .pipeline import CompiledPipeline
+from .sharding import HashRing, ShardPool
+from .staged import StagedPipeline
 
 __all__ = [
     "IncomingPacket",
+    "CompactPacket",
+    "PacketView",
     "WildFisheriesPacketSwitcher",
     "RateLimitGuard",
     "JWTValidator",
@@ -31,5 +38,11 @@ __all__ = [
     "LicenseChecker",
     "DataIntegrityHash",
     "BlockchainLogger",
-    "AnomalyDetector"
+    "AnomalyDetector",
+    "CompiledPipeline",
+    "StagedPipeline",
+    "HashRing",
+    "ShardPool",
+    "PillarForwarder",
+    "PillarTarget"
 ]
@@ -0,0 +1,256 @@
+"""
+🏈 SeaTrace Streaming Anomaly Detection (Free Safety)
+For the Commons Good! 🌊
+
+Per-vessel and per-species baselines of catch weight, plus per-vessel
+reporting intervals, kept as O(1)-memory OnlineStats.
+
+A value is flagged only when it is an outlier against both the long-run
+(Welford) baseline and the recent (EWMA) one. That way a vessel whose
+pattern is shifting slowly is not flagged on every packet. Flags are
+written to ``packet.annotations["anomalies"]``; the packet is never
+rejected, so detection does not block the route.
+
+``backfill()`` seeds baselines from historical arrays and
+``score_batch()`` scores thousands of records at once (NumPy, optional).
+
+Vessel and species ids come from clients, so every table is capped at
+``max_keys`` entries; past that, the least recently seen key is evicted
+(its baseline starts cold if it comes back).
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+from prometheus_client import Counter
+
+from common.online_stats import OnlineStats
+
+# Prometheus metrics
+ANOMALIES_FLAGGED = Counter(
+    'packet_anomalies_flagged_total',
+    'Packet values flagged as outliers',
+    ['feature', 'scope']
+)
+ANOMALY_EVICTED = Counter(
+    'packet_anomaly_baselines_evicted_total',
+    'Least recently seen baselines dropped at max_keys'
+)
+
+FEATURE_WEIGHT = "catch_weight"
+FEATURE_INTERVAL = "report_interval"
+
+
+def _group_moments(keys: Sequence[str], values: "np.ndarray") -> Tuple[List[str], Any, Any, Any]:
+    """Per-key (count, mean, M2) of a value array, fully vectorized"""
+    unique, inverse = np.unique(np.asarray(keys, dtype=object).astype(str), return_inverse=True)
+    counts = np.bincount(inverse)
+    means = np.bincount(inverse, weights=values) / counts
+    deviations = values - means[inverse]
+    m2 = np.bincount(inverse, weights=deviations * deviations)
+    return unique.tolist(), counts, means, m2
+
+
+class StreamingAnomalyDetector:
+    """
+    Online outlier detection over catch packets
+
+    Args:
+        z_threshold: |z| above which a value is an outlier
+        min_samples: Observations before a baseline may flag anything
+        alpha: EWMA smoothing factor
+        clock: Arrival clock for reporting intervals (seconds)
+        max_keys: Entries kept per table (LRU beyond that)
+    """
+
+    def __init__(self, z_threshold: float = 4.0, min_samples: int = 30, alpha: float = 0.05,
+                 clock=time.time, max_keys: int = 100000):
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self.clock = clock
+        self.max_keys = max_keys
+        self.vessel_weight: "OrderedDict[str, OnlineStats]" = OrderedDict()
+        self.species_weight: "OrderedDict[str, OnlineStats]" = OrderedDict()
+        self.vessel_interval: "OrderedDict[str, OnlineStats]" = OrderedDict()
+        self._last_seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def _put(self, table: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+        """Set as most recently seen; evict the least recent past max_keys"""
+        table[key] = value
+        table.move_to_end(key)
+        if len(table) > self.max_keys:
+            table.popitem(last=False)
+            ANOMALY_EVICTED.inc()
+
+    def _baseline(self, table: "OrderedDict[str, OnlineStats]", key: str) -> OnlineStats:
+        stats = table.get(key)
+        if stats is None:
+            stats = OnlineStats(alpha=self.alpha, k=self.z_threshold, min_samples=self.min_samples)
+            self._put(table, key, stats)
+        else:
+            table.move_to_end(key)
+        return stats
+
+    def _score(self, flags: List[Dict[str, Any]], feature: str, scope: str,
+               stats: OnlineStats, value: float) -> None:
+        z = stats.zscore(value)
+        if z is not None and abs(z) > self.z_threshold:
+            recent = stats.ewm_zscore(value)
+            if abs(recent) > self.z_threshold:
+                flags.append({
+                    "feature": feature,
+                    "scope": scope,
+                    "value": value,
+                    "baseline_mean": round(stats.mean, 6),
+                    "z": round(z, 2) if math.isfinite(z) else None,
+                })
+                ANOMALIES_FLAGGED.labels(feature=feature, scope=scope.partition(":")[0]).inc()
+        stats.update(value)
+
+    def observe(self, vessel_id: Optional[str], species: Optional[str],
+                weight: Optional[float], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Score one record against the baselines, then fold it in
+
+        Returns:
+            Flags raised by this record (empty when nothing is unusual)
+        """
+        flags: List[Dict[str, Any]] = []
+        if weight is not None:
+            if vessel_id is not None:
+                self._score(flags, FEATURE_WEIGHT, f"vessel:{vessel_id}",
+                            self._baseline(self.vessel_weight, vessel_id), weight)
+            if species is not None:
+                self._score(flags, FEATURE_WEIGHT, f"species:{species}",
+                            self._baseline(self.species_weight, species), weight)
+        if vessel_id is not None:
+            now = self.clock() if now is None else now
+            last = self._last_seen.get(vessel_id)
+            self._put(self._last_seen, vessel_id, now)
+            if last is not None and now >= last:
+                self._score(flags, FEATURE_INTERVAL, f"vessel:{vessel_id}",
+                            self._baseline(self.vessel_interval, vessel_id), now - last)
+        return flags
+
+    def process(self, packet: Any) -> Any:
+        """SECONDARY processor: annotate outliers, always pass the packet on"""
+        payload = packet.payload
+        vessel_id = payload.get("vessel_id")
+        species = payload.get("species") if packet.source == "catch" else None
+        weight = payload.get("weight", payload.get("weight_kg")) if packet.source == "catch" else None
+        try:
+            weight = float(weight) if weight is not None else None
+        except (TypeError, ValueError):
+            weight = None
+        if weight is not None and not math.isfinite(weight):
+            weight = None
+
+        flags = self.observe(
+            str(vessel_id) if vessel_id is not None else None,
+            str(species) if species is not None else None,
+            weight,
+        )
+        if flags:
+            if packet.annotations is None:
+                packet.annotations = {}
+            packet.annotations["anomalies"] = flags
+        return packet
+
+    # ========================================
+    # BATCH API (backfills)
+    # ========================================
+
+    def backfill(self, vessel_ids: Sequence[str], species: Sequence[str], weights: Sequence[float],
+                 timestamps: Optional[Sequence[float]] = None) -> int:
+        """
+        Seed baselines from historical records
+
+        Args:
+            vessel_ids, species, weights: Parallel arrays of catch records
+            timestamps: Optional report times (seconds) for interval baselines
+
+        Returns:
+            Number of records folded in
+        """
+        if np is None:
+            for i, (vessel_id, name, weight) in enumerate(zip(vessel_ids, species, weights)):
+                self._baseline(self.vessel_weight, vessel_id).update(float(weight))
+                self._baseline(self.species_weight, name).update(float(weight))
+                if timestamps is not None:
+                    last = self._last_seen.get(vessel_id)
+                    if last is not None and timestamps[i] >= last:
+                        self._baseline(self.vessel_interval, vessel_id).update(timestamps[i] - last)
+                    self._put(self._last_seen, vessel_id, timestamps[i])
+            return len(weights)
+
+        values = np.asarray(weights, dtype=float)
+        for table, keys in ((self.vessel_weight, vessel_ids), (self.species_weight, species)):
+            for key, n, mean, m2 in zip(*_group_moments(keys, values)):
+                self._baseline(table, key).merge(int(n), float(mean), float(m2))
+
+        if timestamps is not None:
+            vessels = np.asarray(vessel_ids, dtype=object).astype(str)
+            times = np.asarray(timestamps, dtype=float)
+            order = np.lexsort((times, vessels))
+            vessels, times = vessels[order], times[order]
+            same_vessel = vessels[1:] == vessels[:-1]
+            intervals = np.diff(times)[same_vessel]
+            if len(intervals):
+                interval_keys = vessels[1:][same_vessel]
+                for key, n, mean, m2 in zip(*_group_moments(interval_keys, intervals)):
+                    self._baseline(self.vessel_interval, key).merge(int(n), float(mean), float(m2))
+            # Last report per vessel, so live intervals continue from the history
+            last_index = np.append(~same_vessel, True)
+            for key, ts in zip(vessels[last_index].tolist(), times[last_index].tolist()):
+                self._put(self._last_seen, key, max(ts, self._last_seen.get(key, ts)))
+        return len(values)
+
+    def score_batch(self, vessel_ids: Sequence[str], species: Sequence[str],
+                    weights: Sequence[float]) -> Dict[str, Any]:
+        """
+        Score many catch weights against the current baselines (read-only)
+
+        Returns:
+            {"vessel_z", "species_z", "flagged"} arrays; z is NaN where a
+            baseline is still warming up
+        """
+        if np is None:
+            def z_list(table, keys):
+                zs = []
+                for key, weight in zip(keys, weights):
+                    stats = table.get(key)
+                    z = stats.zscore(float(weight)) if stats is not None else None
+                    zs.append(math.nan if z is None else z)
+                return zs
+            vessel_z = z_list(self.vessel_weight, vessel_ids)
+            species_z = z_list(self.species_weight, species)
+            flagged = [abs(a) > self.z_threshold or abs(b) > self.z_threshold
+                       for a, b in zip(vessel_z, species_z)]
+            return {"vessel_z": vessel_z, "species_z": species_z, "flagged": flagged}
+
+        values = np.asarray(weights, dtype=float)
+
+        def z_array(table: Dict[str, OnlineStats], keys: Sequence[str]) -> "np.ndarray":
+            unique, inverse = np.unique(np.asarray(keys, dtype=object).astype(str), return_inverse=True)
+            means = np.full(len(unique), np.nan)
+            stds = np.full(len(unique), np.nan)
+            for i, key in enumerate(unique.tolist()):
+                stats = table.get(key)
+                if stats is not None and stats.n >= stats.min_samples:
+                    means[i], stds[i] = stats.mean, stats.std
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return (values - means[inverse]) / stds[inverse]
+
+        vessel_z = z_array(self.vessel_weight, vessel_ids)
+        species_z = z_array(self.species_weight, species)
+        with np.errstate(invalid="ignore"):
+            flagged = (np.abs(vessel_z) > self.z_threshold) | (np.abs(species_z) > self.z_threshold)
+        return {"vessel_z": vessel_z, "species_z": species_z, "flagged": flagged}
@@ -0,0 +1,165 @@
+"""
+🏈 SeaTrace Compact Packet
+For the Commons Good! 🌊
+
+Low-allocation packet for the switcher hot path.
+
+IncomingPacket eagerly builds a uuid4 string and an ISO timestamp string
+through dataclass default factories and copies itself into a dict for
+logging. CompactPacket is slotted (no per-instance __dict__), stores the
+creation time as a float, and only materializes correlation_id and
+timestamp strings when they are first read. to_dict() returns a
+read-only view over the slots instead of a copy.
+"""
+
+import time
+import uuid
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from common.canonical import CanonicalPacketMixin
+from common.wire import packb, packet_fields, unpackb
+
+PACKET_FIELDS = ("correlation_id", "source", "payload", "signature", "timestamp", "packet_type")
+
+
+class PacketView(Mapping):
+    """
+    Zero-copy, read-only mapping over a packet's fields
+
+    Reads go straight to the packet; use ``dict(view)`` when a real
+    dict is required (e.g. for json.dumps).
+    """
+
+    __slots__ = ("_packet",)
+
+    def __init__(self, packet: Any):
+        self._packet = packet
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in PACKET_FIELDS:
+            raise KeyError(key)
+        return getattr(self._packet, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PACKET_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PACKET_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"PacketView({dict(self)!r})"
+
+
+class CompactPacket(CanonicalPacketMixin):
+    """
+    Slotted EM packet with lazily materialized correlation_id/timestamp
+
+    Drop-in for IncomingPacket in WildFisheriesPacketSwitcher: same
+    attributes, same to_dict() keys and the same canonical hash for the
+    same field values.
+    """
+
+    __slots__ = (
+        "source", "payload", "signature", "packet_type",
+        "annotations", "_correlation_id", "_created", "_timestamp", "_canonical_cache",
+    )
+
+    CANONICAL_FIELDS = PACKET_FIELDS
+
+    def __init__(
+        self,
+        source: str = "",
+        payload: Optional[Dict[str, Any]] = None,
+        signature: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        timestamp: Optional[str] = None,
+        packet_type: str = "EM",
+    ):
+        setter = object.__setattr__
+        setter(self, "_canonical_cache", None)
+        setter(self, "source", source)
+        self.payload = payload if payload is not None else {}
+        setter(self, "signature", signature)
+        setter(self, "packet_type", packet_type)
+        setter(self, "annotations", None)
+        setter(self, "_correlation_id", correlation_id)
+        setter(self, "_timestamp", timestamp)
+        setter(self, "_created", time.time())
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactPacket":
+        """Build a packet from a raw request dict"""
+        return cls(
+            source=data.get("source", ""),
+            payload=data.get("payload", {}),
+            signature=data.get("signature"),
+            correlation_id=data.get("correlation_id"),
+            timestamp=data.get("timestamp"),
+            packet_type=data.get("packet_type", "EM"),
+        )
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> "CompactPacket":
+        """Build a packet from a MessagePack map or positional array"""
+        return cls.from_dict(packet_fields(unpackb(data)))
+
+    def to_msgpack(self) -> bytes:
+        """
+        Positional MessagePack form - no key names on the wire, unset
+        trailing fields left off, a lowercase hex signature sent as raw bytes
+        """
+        signature = self.signature
+        if isinstance(signature, str):
+            try:
+                raw = bytes.fromhex(signature)
+            except ValueError:
+                raw = None
+            if raw is not None and raw.hex() == signature:
+                signature = raw
+        fields = [
+            self.source, self.payload, signature, self._correlation_id, self._timestamp,
+            self.packet_type if self.packet_type != "EM" else None,
+        ]
+        while fields[-1] is None:
+            fields.pop()
+        return packb(fields)
+
+    @property
+    def correlation_id(self) -> str:
+        cid = self._correlation_id
+        if cid is None:
+            cid = str(uuid.uuid4())
+            object.__setattr__(self, "_correlation_id", cid)
+        return cid
+
+    @correlation_id.setter
+    def correlation_id(self, value: str) -> None:
+        object.__setattr__(self, "_correlation_id", value)
+
+    @property
+    def timestamp(self) -> str:
+        ts = self._timestamp
+        if ts is None:
+            ts = datetime.utcfromtimestamp(self._created).isoformat()
+            object.__setattr__(self, "_timestamp", ts)
+        return ts
+
+    @timestamp.setter
+    def timestamp(self, value: str) -> None:
+        object.__setattr__(self, "_timestamp", value)
+
+    def to_dict(self) -> PacketView:
+        """Zero-copy view of the packet for logging"""
+        return PacketView(self)
+
+    def hash(self) -> str:
+        """Generate BLAKE2 hash for integrity verification (memoized)"""
+        return self.canonical_digest()
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactPacket(source={self.source!r}, correlation_id={self._correlation_id!r}, "
+            f"packet_type={self.packet_type!r})"
+        )
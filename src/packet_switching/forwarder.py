@@ -0,0 +1,315 @@
+"""
+🏈 SeaTrace Pillar Forwarder
+For the Commons Good! 🌊
+
+Delivers routed packets to the real pillar services (ports 8001-8004).
+
+Each pillar gets one long-lived, pooled ``httpx.AsyncClient`` and one
+dispatcher task:
+
+1. ``forward()`` puts the packet on the pillar's bounded queue and waits
+   for the delivery result. When the queue stays full for
+   ``enqueue_timeout`` seconds (pillar too slow), the caller gets a 503
+   instead of piling up more work - that is our backpressure.
+2. The dispatcher drains up to ``batch_size`` packets within
+   ``batch_window`` seconds and sends them as one ``/ingest/batch``
+   request when the pillar supports it, else one ``/ingest/packet``
+   request per packet.
+3. A per-pillar semaphore caps the requests in flight; the dispatcher
+   stops draining while the pillar is at its limit, so the queue fills
+   and backpressure kicks in.
+
+Every packet carries its router-computed hash and the other hashed
+fields (``common.packet_hash``), so pillars adopt the hash instead of
+hashing the payload again.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import structlog
+from fastapi import HTTPException
+from prometheus_client import Counter, Gauge, Histogram
+
+from common.packet_hash import hop_entry, hop_headers
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+FORWARDED = Counter(
+    'router_forwarded_packets_total',
+    'Packets forwarded to pillar services',
+    ['pillar', 'status']
+)
+FORWARD_DURATION = Histogram(
+    'router_forward_duration_seconds',
+    'Duration of pillar delivery requests',
+    ['pillar', 'mode']
+)
+FORWARD_BATCH_SIZE = Histogram(
+    'router_forward_batch_size',
+    'Packets per pillar delivery request',
+    ['pillar'],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250)
+)
+FORWARD_QUEUE_DEPTH = Gauge(
+    'router_forward_queue_depth',
+    'Packets waiting for delivery per pillar',
+    ['pillar']
+)
+FORWARD_IN_FLIGHT = Gauge(
+    'router_forward_in_flight',
+    'Delivery requests in flight per pillar',
+    ['pillar']
+)
+
+# Pillar name → (env var, default base URL)
+DEFAULT_PILLAR_URLS = {
+    "seaside": ("SEASIDE_URL", "http://localhost:8001"),
+    "deckside": ("DECKSIDE_URL", "http://localhost:8002"),
+    "dockside": ("DOCKSIDE_URL", "http://localhost:8003"),
+    "marketside": ("MARKETSIDE_URL", "http://localhost:8004"),
+}
+
+
+@dataclass
+class PillarTarget:
+    """Delivery settings for one pillar service"""
+    name: str
+    base_url: str
+    max_in_flight: int = 16
+    queue_size: int = 1024
+    batch_size: int = 50
+    batch_window: float = 0.002
+    supports_batch: bool = True
+    timeout: float = 5.0
+    enqueue_timeout: float = 1.0
+    packet_path: str = "/ingest/packet"
+    batch_path: str = "/ingest/batch"
+
+
+class _PillarChannel:
+    """Queue, pooled client and dispatcher for one pillar"""
+
+    def __init__(self, target: PillarTarget, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.target = target
+        self.batch_size = target.batch_size if target.supports_batch else 1
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=target.queue_size)
+        self.slots = asyncio.Semaphore(target.max_in_flight)
+        self.client = httpx.AsyncClient(
+            base_url=target.base_url,
+            timeout=target.timeout,
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=target.max_in_flight,
+                max_keepalive_connections=target.max_in_flight,
+            ),
+        )
+        self.queue_depth = FORWARD_QUEUE_DEPTH.labels(pillar=target.name)
+        self.in_flight = FORWARD_IN_FLIGHT.labels(pillar=target.name)
+        self.sends: set = set()
+        self.dispatcher = asyncio.create_task(self._dispatch())
+
+    async def submit(self, packet: Any) -> Dict[str, Any]:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(
+                self.queue.put((packet, future)), timeout=self.target.enqueue_timeout
+            )
+        except asyncio.TimeoutError:
+            FORWARDED.labels(pillar=self.target.name, status="rejected").inc()
+            raise HTTPException(
+                status_code=503,
+                detail=f"Pillar {self.target.name} saturated, retry later"
+            )
+        self.queue_depth.set(self.queue.qsize())
+        return await future
+
+    async def _dispatch(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            try:
+                if self.batch_size > 1:
+                    self._drain(batch)
+                    if len(batch) < self.batch_size:
+                        # Hold the batch open for one window, then take what arrived
+                        await asyncio.sleep(self.target.batch_window)
+                        self._drain(batch)
+                self.queue_depth.set(self.queue.qsize())
+
+                # Wait for a slot before taking more work off the queue
+                await self.slots.acquire()
+            except asyncio.CancelledError:
+                self._fail(batch, HTTPException(503, f"Pillar {self.target.name} forwarder closed"))
+                raise
+            task = asyncio.create_task(self._send(batch))
+            self.sends.add(task)
+            task.add_done_callback(self.sends.discard)
+
+    def _drain(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+
+    async def _send(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        name = self.target.name
+        self.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            if len(batch) == 1:
+                results = [await self._post_packet(batch[0][0])]
+                mode = "packet"
+            else:
+                results = await self._post_batch([packet for packet, _ in batch])
+                mode = "batch"
+            FORWARD_DURATION.labels(pillar=name, mode=mode).observe(time.perf_counter() - start)
+            FORWARD_BATCH_SIZE.labels(pillar=name).observe(len(batch))
+            failed = 0
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, dict) and result.get("status") == "error":
+                    # Same outcome as a rejected single packet
+                    failed += 1
+                    if not future.done():
+                        future.set_exception(HTTPException(status_code=502, detail=result.get("error")))
+                elif not future.done():
+                    future.set_result(result)
+            if failed:
+                logger.warning("pillar_entries_rejected", pillar=name, packets=failed)
+                FORWARDED.labels(pillar=name, status="failed").inc(failed)
+            FORWARDED.labels(pillar=name, status="delivered").inc(len(batch) - failed)
+        except Exception as e:
+            logger.warning("pillar_forward_failed", pillar=name, packets=len(batch), error=str(e))
+            FORWARDED.labels(pillar=name, status="failed").inc(len(batch))
+            self._fail(batch, e if isinstance(e, HTTPException) else HTTPException(
+                status_code=502, detail=f"Delivery to {name} failed: {e}"
+            ))
+        finally:
+            self.in_flight.dec()
+            self.slots.release()
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Any, asyncio.Future]], error: Exception) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _check(self, response: httpx.Response) -> None:
+        if response.status_code >= 400:
+            raise HTTPException(
+                status_code=502,
+                detail=f"Pillar {self.target.name} answered {response.status_code}"
+            )
+
+    async def _post_packet(self, packet: Any) -> Dict[str, Any]:
+        response = await self.client.post(
+            self.target.packet_path, json=packet.payload, headers=hop_headers(packet)
+        )
+        self._check(response)
+        return response.json()
+
+    async def _post_batch(self, packets: List[Any]) -> List[Dict[str, Any]]:
+        body = [hop_entry(p) for p in packets]
+        response = await self.client.post(self.target.batch_path, json=body)
+        self._check(response)
+        results = response.json().get("results", [])
+        if len(results) != len(packets):
+            raise HTTPException(
+                status_code=502,
+                detail=f"Pillar {self.target.name} returned {len(results)} results for {len(packets)} packets"
+            )
+        return results
+
+    async def close(self) -> None:
+        self.dispatcher.cancel()
+        try:
+            await self.dispatcher
+        except asyncio.CancelledError:
+            pass
+        if self.sends:
+            await asyncio.gather(*self.sends, return_exceptions=True)
+        # Fail whatever never left the queue
+        leftover = []
+        while not self.queue.empty():
+            leftover.append(self.queue.get_nowait())
+        self._fail(leftover, HTTPException(503, f"Pillar {self.target.name} forwarder closed"))
+        await self.client.aclose()
+
+
+class PillarForwarder:
+    """
+    🚚 PILLAR DELIVERY - pooled, batched, back-pressured forwarding
+
+    Channels are created lazily on first use, inside the running event
+    loop. Call ``close()`` on shutdown to drain in-flight deliveries and
+    release the connection pools.
+    """
+
+    def __init__(
+        self,
+        targets: Dict[str, PillarTarget],
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.targets = targets
+        self.transport = transport
+        self._channels: Dict[str, _PillarChannel] = {}
+
+    @classmethod
+    def from_env(cls) -> "PillarForwarder":
+        """
+        Build a forwarder from environment variables
+
+        <PILLAR>_URL sets each pillar's base URL; FORWARD_MAX_IN_FLIGHT,
+        FORWARD_QUEUE_SIZE, FORWARD_BATCH_SIZE, FORWARD_BATCH_WINDOW_MS and
+        FORWARD_TIMEOUT apply to all pillars. FORWARD_NO_BATCH lists
+        pillars (comma separated) without an /ingest/batch endpoint.
+        """
+        no_batch = {p.strip() for p in os.getenv("FORWARD_NO_BATCH", "").split(",") if p.strip()}
+        targets = {
+            name: PillarTarget(
+                name=name,
+                base_url=os.getenv(env_var, default_url),
+                max_in_flight=int(os.getenv("FORWARD_MAX_IN_FLIGHT", "16")),
+                queue_size=int(os.getenv("FORWARD_QUEUE_SIZE", "1024")),
+                batch_size=int(os.getenv("FORWARD_BATCH_SIZE", "50")),
+                batch_window=float(os.getenv("FORWARD_BATCH_WINDOW_MS", "2")) / 1000,
+                timeout=float(os.getenv("FORWARD_TIMEOUT", "5")),
+                supports_batch=name not in no_batch,
+            )
+            for name, (env_var, default_url) in DEFAULT_PILLAR_URLS.items()
+        }
+        return cls(targets)
+
+    def _channel(self, pillar: str) -> _PillarChannel:
+        channel = self._channels.get(pillar)
+        if channel is None:
+            target = self.targets.get(pillar)
+            if target is None:
+                raise HTTPException(status_code=500, detail=f"No delivery target for pillar: {pillar}")
+            channel = self._channels[pillar] = _PillarChannel(target, self.transport)
+        return channel
+
+    async def forward(self, pillar: str, packet: Any) -> Dict[str, Any]:
+        """
+        Deliver a packet to its pillar service
+
+        Args:
+            pillar: Pillar name (seaside, deckside, dockside, marketside)
+            packet: Routed packet
+
+        Returns:
+            The pillar service's response for this packet
+
+        Raises:
+            HTTPException: 503 when the pillar is saturated, 502 when
+                           delivery fails
+        """
+        return await self._channel(pillar).submit(packet)
+
+    async def close(self) -> None:
+        """Drain in-flight deliveries and close every pillar's client"""
+        channels, self._channels = self._channels, {}
+        for channel in channels.values():
+            await channel.close()
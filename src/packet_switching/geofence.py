@@ -0,0 +1,426 @@
+"""
+🏈 SeaTrace Geo-Fencing (Defensive End)
+For the Commons Good! 🌊
+
+Point-in-polygon checks of packet locations against EEZ, closed-area and
+FAO polygons loaded from local GeoJSON.
+
+Polygons are indexed on a uniform lon/lat grid. For every cell a polygon
+touches we store whether the cell is fully inside it (answered with no
+geometry at all) or crossed by its boundary (answered with an even-odd
+ray cast against that polygon only). A lookup therefore costs one dict
+probe plus the few boundary polygons of one cell, no matter how many
+polygons are loaded.
+
+The same index generalizes precise GPS to the public FAO major area
+(``catch_area_general``, e.g. "Eastern Pacific, FAO 77") at ingest, so
+nothing downstream has to see or re-derive coordinates.
+
+NumPy (optional) powers the batch API; without it the batch calls fall
+back to per-point lookups.
+"""
+
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+from prometheus_client import Counter
+
+# Prometheus metrics
+GEOFENCE_REJECTED = Counter(
+    'packet_geofence_rejected_total',
+    'Packets reported inside a closed area'
+)
+
+# Zone kinds
+ZONE_EEZ = "eez"
+ZONE_CLOSED = "closed"
+ZONE_FAO = "fao"
+
+# FAO major fishing areas → public region label
+FAO_REGION_NAMES = {
+    "18": "Arctic Sea",
+    "21": "Northwest Atlantic",
+    "27": "Northeast Atlantic",
+    "31": "Western Central Atlantic",
+    "34": "Eastern Central Atlantic",
+    "37": "Mediterranean and Black Sea",
+    "41": "Southwest Atlantic",
+    "47": "Southeast Atlantic",
+    "48": "Antarctic Atlantic",
+    "51": "Western Indian Ocean",
+    "57": "Eastern Indian Ocean",
+    "58": "Antarctic Indian Ocean",
+    "61": "Northwest Pacific",
+    "67": "Northeast Pacific",
+    "71": "Western Central Pacific",
+    "77": "Eastern Pacific",
+    "81": "Southwest Pacific",
+    "87": "Southeast Pacific",
+    "88": "Antarctic Pacific",
+}
+
+Ring = Sequence[Tuple[float, float]]
+
+
+class Zone:
+    """A named area (EEZ, closed area or FAO area) made of one or more polygons"""
+
+    __slots__ = ("zone_id", "kind", "name", "code", "properties")
+
+    def __init__(self, zone_id: str, kind: str, name: str = "", code: Optional[str] = None,
+                 properties: Optional[Dict[str, Any]] = None):
+        self.zone_id = zone_id
+        self.kind = kind
+        self.name = name
+        self.code = code
+        self.properties = properties or {}
+
+    @property
+    def general_area(self) -> Optional[str]:
+        """Public label of the FAO major area this zone belongs to"""
+        if self.kind != ZONE_FAO or not self.code:
+            return None
+        major = str(self.code).split(".")[0]
+        return f"{FAO_REGION_NAMES.get(major, self.name or 'FAO Area')}, FAO {major}"
+
+    def __repr__(self) -> str:
+        return f"Zone({self.zone_id!r}, kind={self.kind!r})"
+
+
+def _ring_contains(ring: Ring, x: float, y: float) -> bool:
+    """Even-odd ray cast against one ring"""
+    inside = False
+    xj, yj = ring[-1]
+    for xi, yi in ring:
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        xj, yj = xi, yi
+    return inside
+
+
+class _Polygon:
+    """One polygon (exterior ring plus holes) of a zone"""
+
+    __slots__ = ("zone", "zone_index", "rings", "bbox", "_edges")
+
+    def __init__(self, zone: Zone, zone_index: int, rings: List[Ring]):
+        self.zone = zone
+        self.zone_index = zone_index
+        self.rings = rings
+        xs = [x for ring in rings for x, _ in ring]
+        ys = [y for ring in rings for _, y in ring]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self._edges = None
+
+    def contains(self, x: float, y: float) -> bool:
+        # Even-odd across all rings handles holes
+        inside = False
+        for ring in self.rings:
+            if _ring_contains(ring, x, y):
+                inside = not inside
+        return inside
+
+    def edges(self):
+        """Edge endpoint arrays (x1, y1, x2, y2) for vectorized tests"""
+        if self._edges is None:
+            segments = [
+                (ring[i - 1][0], ring[i - 1][1], ring[i][0], ring[i][1])
+                for ring in self.rings for i in range(len(ring))
+            ]
+            self._edges = np.asarray(segments, dtype=float).T
+        return self._edges
+
+    def contains_many(self, xs: "np.ndarray", ys: "np.ndarray") -> "np.ndarray":
+        """Vectorized even-odd test for many points"""
+        x1, y1, x2, y2 = self.edges()
+        inside = np.zeros(len(xs), dtype=bool)
+        # Bound the points x edges matrix to ~1M cells per chunk
+        chunk = max(1, 1_000_000 // max(1, len(x1)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for start in range(0, len(xs), chunk):
+                px = xs[start:start + chunk, None]
+                py = ys[start:start + chunk, None]
+                straddles = (y1 > py) != (y2 > py)
+                crossing_x = (x2 - x1) * (py - y1) / (y2 - y1) + x1
+                crossings = np.count_nonzero(straddles & (px < crossing_x), axis=1)
+                inside[start:start + chunk] = crossings % 2 == 1
+        return inside
+
+
+class GeoFenceIndex:
+    """
+    Grid index over zone polygons
+
+    Args:
+        cell_size: Grid cell size in degrees
+    """
+
+    def __init__(self, cell_size: float = 1.0):
+        self.cell_size = cell_size
+        self._nx = int(math.ceil(360.0 / cell_size))
+        self._ny = int(math.ceil(180.0 / cell_size))
+        self.zones: List[Zone] = []
+        # cell → (polygons fully covering the cell, polygons crossing it)
+        self._cells: Dict[int, Tuple[List[_Polygon], List[_Polygon]]] = {}
+
+    # ========================================
+    # LOADING
+    # ========================================
+
+    @classmethod
+    def from_geojson(cls, sources: Iterable[Tuple[str, Optional[str]]],
+                     cell_size: float = 1.0) -> "GeoFenceIndex":
+        """
+        Build an index from GeoJSON files
+
+        Args:
+            sources: (path, kind) pairs; kind None takes each feature's
+                     ``kind`` property
+            cell_size: Grid cell size in degrees
+        """
+        index = cls(cell_size=cell_size)
+        for path, kind in sources:
+            with open(path, "r", encoding="utf-8") as f:
+                index.add_geojson(json.load(f), kind=kind)
+        return index
+
+    @classmethod
+    def from_env(cls) -> "GeoFenceIndex":
+        """
+        Build an index from GEOFENCE_PATHS
+
+        Comma-separated ``kind=path`` or plain ``path`` entries, e.g.
+        "closed=data/geofence/closures.geojson,fao=data/geofence/fao.geojson".
+        GEOFENCE_CELL_SIZE sets the grid cell size (degrees).
+        """
+        sources = []
+        for entry in filter(None, (e.strip() for e in os.getenv("GEOFENCE_PATHS", "").split(","))):
+            kind, sep, path = entry.partition("=")
+            sources.append((path, kind) if sep else (entry, None))
+        return cls.from_geojson(sources, cell_size=float(os.getenv("GEOFENCE_CELL_SIZE", "1.0")))
+
+    def add_geojson(self, data: Dict[str, Any], kind: Optional[str] = None) -> int:
+        """
+        Add every Polygon/MultiPolygon feature of a GeoJSON object
+
+        Zone metadata comes from feature properties: ``kind``, ``name``
+        (or NAME/NAME_EN) and ``code`` (or F_CODE/F_AREA for FAO data).
+
+        Returns:
+            Number of zones added
+        """
+        features = data.get("features", [data] if data.get("type") == "Feature" else [])
+        added = 0
+        for feature in features:
+            geometry = feature.get("geometry") or {}
+            gtype = geometry.get("type")
+            if gtype == "Polygon":
+                polygons = [geometry["coordinates"]]
+            elif gtype == "MultiPolygon":
+                polygons = geometry["coordinates"]
+            else:
+                continue
+            props = feature.get("properties") or {}
+            zone_kind = props.get("kind") or kind
+            if zone_kind is None:
+                raise ValueError("GeoJSON feature has no kind and no default kind was given")
+            code = props.get("code") or props.get("F_CODE") or props.get("F_AREA")
+            self.add_zone(
+                zone_id=str(feature.get("id") or props.get("id") or f"{zone_kind}-{len(self.zones)}"),
+                kind=zone_kind,
+                polygons=polygons,
+                name=props.get("name") or props.get("NAME") or props.get("NAME_EN") or "",
+                code=str(code) if code is not None else None,
+                properties=props,
+            )
+            added += 1
+        return added
+
+    def add_zone(self, zone_id: str, kind: str, polygons: Sequence[Sequence[Ring]],
+                 name: str = "", code: Optional[str] = None,
+                 properties: Optional[Dict[str, Any]] = None) -> Zone:
+        """
+        Add a zone from GeoJSON-style polygon coordinates
+
+        Args:
+            polygons: List of polygons, each a list of rings of [lon, lat]
+        """
+        zone = Zone(zone_id, kind, name, code, properties)
+        zone_index = len(self.zones)
+        self.zones.append(zone)
+        for rings in polygons:
+            clean = [[(float(x), float(y)) for x, y, *_ in ring] for ring in rings if len(ring) >= 3]
+            if clean:
+                self._index_polygon(_Polygon(zone, zone_index, clean))
+        return zone
+
+    def _cell_range(self, lo: float, hi: float, origin: float, limit: int) -> range:
+        first = min(max(int((lo + origin) // self.cell_size), 0), limit - 1)
+        last = min(max(int((hi + origin) // self.cell_size), 0), limit - 1)
+        return range(first, last + 1)
+
+    def _index_polygon(self, polygon: _Polygon) -> None:
+        min_x, min_y, max_x, max_y = polygon.bbox
+        size = self.cell_size
+
+        # Cells touched by the boundary (conservatively: by edge bboxes)
+        boundary = set()
+        for ring in polygon.rings:
+            xj, yj = ring[-1]
+            for xi, yi in ring:
+                for ix in self._cell_range(min(xi, xj), max(xi, xj), 180.0, self._nx):
+                    for iy in self._cell_range(min(yi, yj), max(yi, yj), 90.0, self._ny):
+                        boundary.add(ix * self._ny + iy)
+                xj, yj = xi, yi
+
+        # Remaining cells of the bbox are entirely inside or entirely outside;
+        # the cell centre tells which
+        for ix in self._cell_range(min_x, max_x, 180.0, self._nx):
+            cx = (ix + 0.5) * size - 180.0
+            for iy in self._cell_range(min_y, max_y, 90.0, self._ny):
+                key = ix * self._ny + iy
+                if key in boundary:
+                    self._cells.setdefault(key, ([], []))[1].append(polygon)
+                elif polygon.contains(cx, (iy + 0.5) * size - 90.0):
+                    self._cells.setdefault(key, ([], []))[0].append(polygon)
+
+    # ========================================
+    # LOOKUPS
+    # ========================================
+
+    def _cell_key(self, lon: float, lat: float) -> int:
+        ix = min(max(int((lon + 180.0) // self.cell_size), 0), self._nx - 1)
+        iy = min(max(int((lat + 90.0) // self.cell_size), 0), self._ny - 1)
+        return ix * self._ny + iy
+
+    def _polygons_at(self, lon: float, lat: float) -> List[_Polygon]:
+        entry = self._cells.get(self._cell_key(lon, lat))
+        if entry is None:
+            return []
+        full, partial = entry
+        return full + [p for p in partial if p.contains(lon, lat)]
+
+    def zones_at(self, lon: float, lat: float) -> List[Zone]:
+        """All zones containing the point"""
+        return [p.zone for p in self._polygons_at(lon, lat)]
+
+    def catch_area_general(self, lon: float, lat: float) -> Optional[str]:
+        """Generalized FAO major area for a precise position"""
+        for zone in self.zones_at(lon, lat):
+            if zone.kind == ZONE_FAO:
+                return zone.general_area
+        return None
+
+    def evaluate(self, lon: float, lat: float) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Geo-fence verdict and public annotations for one position
+
+        Returns:
+            (allowed, annotations) - allowed is False inside a closed
+            area; annotations carry catch_area_general and eez when known
+        """
+        allowed = True
+        annotations: Dict[str, Any] = {}
+        for zone in self.zones_at(lon, lat):
+            if zone.kind == ZONE_CLOSED:
+                allowed = False
+                annotations["closed_area"] = zone.zone_id
+            elif zone.kind == ZONE_FAO and "catch_area_general" not in annotations:
+                annotations["catch_area_general"] = zone.general_area
+            elif zone.kind == ZONE_EEZ and "eez" not in annotations:
+                annotations["eez"] = zone.name or zone.zone_id
+        return allowed, annotations
+
+    # ========================================
+    # BATCH API
+    # ========================================
+
+    def first_zone_many(self, lons: Sequence[float], lats: Sequence[float],
+                        kind: str) -> "np.ndarray | List[int]":
+        """
+        Index into ``zones`` of the first zone of ``kind`` containing each point
+
+        Points are grouped by grid cell; fully covering polygons assign
+        the whole group at once and boundary polygons are tested with
+        one vectorized ray cast per polygon. -1 marks no zone.
+        """
+        if np is None:
+            return [
+                next((p.zone_index for p in self._polygons_at(lon, lat) if p.zone.kind == kind), -1)
+                for lon, lat in zip(lons, lats)
+            ]
+
+        xs = np.asarray(lons, dtype=float)
+        ys = np.asarray(lats, dtype=float)
+        result = np.full(len(xs), -1, dtype=np.int64)
+        ix = np.clip(((xs + 180.0) // self.cell_size).astype(np.int64), 0, self._nx - 1)
+        iy = np.clip(((ys + 90.0) // self.cell_size).astype(np.int64), 0, self._ny - 1)
+        keys = ix * self._ny + iy
+
+        order = np.argsort(keys, kind="stable")
+        unique_keys, starts = np.unique(keys[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        for n, key in enumerate(unique_keys.tolist()):
+            entry = self._cells.get(key)
+            if entry is None:
+                continue
+            members = order[bounds[n]:bounds[n + 1]]
+            full, partial = entry
+            covering = next((p for p in full if p.zone.kind == kind), None)
+            if covering is not None:
+                result[members] = covering.zone_index
+                continue
+            for polygon in partial:
+                if polygon.zone.kind != kind:
+                    continue
+                pending = members[result[members] < 0]
+                if not len(pending):
+                    break
+                hit = polygon.contains_many(xs[pending], ys[pending])
+                result[pending[hit]] = polygon.zone_index
+        return result
+
+    def closed_many(self, lons: Sequence[float], lats: Sequence[float]) -> "np.ndarray | List[bool]":
+        """True for every point inside a closed area"""
+        matches = self.first_zone_many(lons, lats, ZONE_CLOSED)
+        if np is None:
+            return [m >= 0 for m in matches]
+        return matches >= 0
+
+    def catch_area_general_many(self, lons: Sequence[float], lats: Sequence[float]) -> List[Optional[str]]:
+        """Generalized FAO major area for every point (None outside FAO data)"""
+        matches = self.first_zone_many(lons, lats, ZONE_FAO)
+        labels = [zone.general_area for zone in self.zones]
+        return [labels[m] if m >= 0 else None for m in (matches.tolist() if np is not None else matches)]
+
+
+def packet_position(payload: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """
+    (lon, lat) reported in a packet payload, or None when absent
+
+    Accepts ``location: {lat, lon|lng}`` / ``{latitude, longitude}``,
+    top-level lat/lon and precise_gps_lat/precise_gps_lon.
+
+    Raises:
+        ValueError: Malformed or out-of-range coordinates
+    """
+    location = payload.get("location")
+    if isinstance(location, dict):
+        lat = location.get("lat", location.get("latitude"))
+        lon = location.get("lon", location.get("lng", location.get("longitude")))
+    else:
+        lat = payload.get("lat", payload.get("precise_gps_lat"))
+        lon = payload.get("lon", payload.get("precise_gps_lon"))
+    if lat is None or lon is None:
+        return None
+    lon, lat = float(lon), float(lat)
+    if not (-180.0 <= lon <= 180.0 and -90.0 <= lat <= 90.0):
+        raise ValueError(f"Position out of range: lat={lat}, lon={lon}")
+    return lon, lat
@@ -6,29 +6,58 @@ PUBLIC KEY ADMINISTRATION - Incoming packet verification and routing
 Routes EM (Enterprise Message) packets to appropriate 4-pillar handlers
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Awaitable, Optional, Tuple, Union
 from fastapi import HTTPException
 from dataclasses import dataclass, field
 from datetime import datetime
+import asyncio
+import inspect
+import time
 import uuid
-import hashlib
-import json
+
+from common.canonical import CanonicalPacketMixin, canonical_bytes
+
+from .anomaly import StreamingAnomalyDetector
+from .forwarder import PillarForwarder
+from .pipeline import (
+    DEFENSIVE_LINE,
+    LAYER_DURATION,
+    LINEBACKERS,
+    SECONDARY,
+    STAGE_DURATION,
+    CompiledPipeline,
+)
+from .geofence import GEOFENCE_REJECTED, GeoFenceIndex, packet_position
+from .ledger import HashChainLog
+from .quota import QUOTA_REJECTED, QuotaLedger, catch_entry
+from .rate_limit import TokenBucketLimiter
+from .staged import StagedPipeline
 
 
 @dataclass
-class IncomingPacket:
+class IncomingPacket(CanonicalPacketMixin):
     """
     Incoming data packet with correlation tracking
     
     EM (Enterprise Message) → ER (Enterprise Resource)
     PUBLIC key verification for incoming assessments
+    
+    The canonical encoding and hash are computed once and cached until a
+    hashed field is reassigned or the payload is mutated.
     """
+    CANONICAL_FIELDS = (
+        "correlation_id", "source", "payload", "signature", "timestamp", "packet_type"
+    )
+    
     correlation_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     source: str = ""  # "vessel", "catch", "processor", "market"
     payload: Dict[str, Any] = field(default_factory=dict)
     signature: Optional[str] = None
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     packet_type: str = "EM"  # Enterprise Message
+    # Facts derived by the defensive layers (e.g. catch_area_general);
+    # not hashed, merged into the routing response
+    annotations: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert packet to dictionary for logging"""
@@ -42,9 +71,15 @@ class IncomingPacket:
         }
     
     def hash(self) -> str:
-        """Generate BLAKE2 hash for integrity verification"""
-        data = json.dumps(self.to_dict(), sort_keys=True)
-        return hashlib.blake2b(data.encode()).hexdigest()
+        """Generate BLAKE2 hash for integrity verification (memoized)"""
+        return self.canonical_digest()
+
+
+async def _resolve(result: Any) -> Any:
+    """Await results of async layers; pass through results of sync ones"""
+    if inspect.isawaitable(result):
+        return await result
+    return result
 
 
 class WildFisheriesPacketSwitcher:
@@ -57,9 +92,21 @@ class WildFisheriesPacketSwitcher:
     1. DEFENSIVE LINE - Perimeter security (Rate limit, JWT, Geo-fence)
     2. LINEBACKERS - Internal validation (EMR, Quota, License)
     3. SECONDARY - Data protection (Hash, Blockchain, Anomaly)
+    
+    With ``compiled=True`` the layers are compiled into a
+    CompiledPipeline: independent checks of a layer run concurrently,
+    synchronous checks run inline, and every stage is timed.
+    
+    With ``staged=True`` every layer member becomes a stage with its
+    own bounded queue and workers (see StagedPipeline), so slow stages
+    overlap across packets; ``cpu_bound`` members run in a thread pool.
+    
+    With a ``forwarder`` the routed packet is also delivered to the real
+    pillar service and its answer is returned under ``delivery``.
     """
     
-    def __init__(self):
+    def __init__(self, compiled: bool = False, forwarder: Optional[PillarForwarder] = None,
+                 staged: bool = False, stage_options: Optional[Dict[str, Any]] = None):
         # Map sources to 4-pillar handlers
         self.pillar_routes = {
             "vessel": "seaside",      # SeaSide (QB - HOLD)
@@ -72,8 +119,43 @@ class WildFisheriesPacketSwitcher:
         self.defensive_line = []
         self.linebackers = []
         self.secondary = []
+        
+        # Compiled pipeline mode (built lazily from the layers above)
+        self.compiled = compiled
+        self._pipeline: Optional[CompiledPipeline] = None
+        
+        # Staged mode (queues and workers built lazily from the layers above)
+        self.staged = staged
+        self.stage_options = stage_options or {}
+        self._stages: Optional[StagedPipeline] = None
+        
+        # Forwarding mode - deliver to pillar services (None = route only)
+        self.forwarder = forwarder
+    
+    def compile(self) -> CompiledPipeline:
+        """
+        Compile the current defensive layers into a CompiledPipeline
+        
+        The layers are snapshotted - call again after changing
+        defensive_line, linebackers or secondary.
+        """
+        self._pipeline = CompiledPipeline.from_switcher(self)
+        self.compiled = True
+        return self._pipeline
     
-    async def process_packet(self, packet: IncomingPacket) -> Dict[str, Any]:
+    def build_stages(self) -> StagedPipeline:
+        """
+        Build the current defensive layers into a StagedPipeline
+        
+        The layers are snapshotted - call again after changing
+        defensive_line, linebackers or secondary.
+        """
+        self._stages = StagedPipeline.from_switcher(self, **self.stage_options)
+        self.staged = True
+        return self._stages
+    
+    async def process_packet(self, packet: IncomingPacket,
+                             timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """
         🏈 RUN THE PLAY - Process packet through defensive layers
         
@@ -84,26 +166,85 @@ class WildFisheriesPacketSwitcher:
         
         Args:
             packet: Incoming EM packet
+            timings: Optional dict that receives per-stage, per-layer and
+                     touchdown durations in seconds (profiled packets)
             
         Returns:
             Response with correlation ID and pillar routing
         """
-        # FIRST DOWN - Perimeter Defense
-        for guard in self.defensive_line:
-            if not await guard.check(packet):
-                raise HTTPException(429, f"Blocked by {guard.__class__.__name__}")
-        
-        # SECOND DOWN - Internal Validation
-        for lb in self.linebackers:
-            if not await lb.validate(packet):
-                raise HTTPException(401, f"Invalid at {lb.__class__.__name__}")
-        
-        # THIRD DOWN - Data Protection
-        for db in self.secondary:
-            packet = await db.process(packet)
+        # SECONDARY members with settle() (e.g. the quota ledger) learn
+        # whether the packet made it through routing and delivery
+        settlers = [db for db in self.secondary if hasattr(db, "settle")]
+        if not settlers:
+            return await self._play(packet, timings)
+        try:
+            response = await self._play(packet, timings)
+        except BaseException:
+            for db in settlers:
+                db.settle(packet, False)
+            raise
+        for db in settlers:
+            db.settle(packet, True)
+        return response
+    
+    async def _play(self, packet: IncomingPacket,
+                    timings: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        """Defensive layers, then the touchdown"""
+        if self.staged:
+            stages = self._stages or self.build_stages()
+            packet = await stages.run(packet, timings)
+        elif self.compiled:
+            pipeline = self._pipeline or self.compile()
+            packet = await pipeline.run(packet, timings)
+        elif timings is not None:
+            packet = await self._run_profiled(packet, timings)
+        else:
+            # FIRST DOWN - Perimeter Defense
+            for guard in self.defensive_line:
+                if not await _resolve(guard.check(packet)):
+                    raise HTTPException(429, f"Blocked by {guard.__class__.__name__}")
+            
+            # SECOND DOWN - Internal Validation
+            for lb in self.linebackers:
+                if not await _resolve(lb.validate(packet)):
+                    raise HTTPException(401, f"Invalid at {lb.__class__.__name__}")
+            
+            # THIRD DOWN - Data Protection
+            for db in self.secondary:
+                packet = await _resolve(db.process(packet))
         
         # TOUCHDOWN - Route to correct pillar
-        return await self.route_to_pillar(packet)
+        if timings is None:
+            return await self.route_to_pillar(packet)
+        start = time.perf_counter()
+        response = await self.route_to_pillar(packet)
+        timings["touchdown"] = time.perf_counter() - start
+        return response
+    
+    async def _run_profiled(self, packet: IncomingPacket, timings: Dict[str, float]) -> IncomingPacket:
+        """The sequential play with every stage and layer timed"""
+        plays = (
+            (DEFENSIVE_LINE, self.defensive_line, "check", 429, "Blocked by"),
+            (LINEBACKERS, self.linebackers, "validate", 401, "Invalid at"),
+            (SECONDARY, self.secondary, "process", None, None),
+        )
+        for layer, members, method, status_code, verb in plays:
+            layer_start = time.perf_counter()
+            for member in members:
+                name = member.__class__.__name__
+                start = time.perf_counter()
+                result = await _resolve(getattr(member, method)(packet))
+                elapsed = time.perf_counter() - start
+                STAGE_DURATION.labels(layer=layer, stage=name).observe(elapsed)
+                timings[f"{layer}.{name}"] = elapsed
+                if status_code is None:
+                    packet = result
+                elif not result:
+                    raise HTTPException(status_code, f"{verb} {name}")
+            elapsed = time.perf_counter() - layer_start
+            LAYER_DURATION.labels(layer=layer).observe(elapsed)
+            timings[layer] = elapsed
+        return packet
     
     async def route_to_pillar(self, packet: IncomingPacket) -> Dict[str, Any]:
         """
@@ -136,6 +277,13 @@ class WildFisheriesPacketSwitcher:
         response["correlation_id"] = packet.correlation_id
         response["packet_hash"] = packet.hash()
         
+        annotations = getattr(packet, "annotations", None)
+        if annotations:
+            response.update(annotations)
+        
+        if self.forwarder is not None:
+            response["delivery"] = await self.forwarder.forward(pillar, packet)
+        
         return response
     
     # ========================================
@@ -211,10 +359,18 @@ class WildFisheriesPacketSwitcher:
 # ========================================
 
 class RateLimitGuard:
-    """Edge Rusher - DDoS protection"""
-    async def check(self, packet: IncomingPacket) -> bool:
-        # TODO: Implement rate limiting
-        return True
+    """
+    Edge Rusher - DDoS protection
+    
+    Token bucket per source:vessel_id with per-source rate and burst.
+    In-process buckets answer inline (plain ``def``); a Redis-backed
+    limiter returns an awaitable that the switcher awaits.
+    """
+    def __init__(self, limiter: Optional[TokenBucketLimiter] = None):
+        self.limiter = limiter if limiter is not None else TokenBucketLimiter()
+    
+    def check(self, packet: IncomingPacket) -> Union[bool, Awaitable[bool]]:
+        return self.limiter.check(packet)
 
 
 class JWTValidator:
@@ -225,9 +381,33 @@ class JWTValidator:
 
 
 class GeoFenceChecker:
-    """Defensive End - Geographic validation"""
-    async def check(self, packet: IncomingPacket) -> bool:
-        # TODO: Implement geo-fencing
+    """
+    Defensive End - Geographic validation
+    
+    Rejects packets reported inside a closed area and annotates the rest
+    with the generalized FAO area (catch_area_general) and EEZ, from a
+    grid-indexed GeoFenceIndex. Packets without a position pass.
+    """
+    def __init__(self, index: Optional[GeoFenceIndex] = None):
+        self.index = index if index is not None else GeoFenceIndex.from_env()
+    
+    def check(self, packet: IncomingPacket) -> bool:
+        try:
+            position = packet_position(packet.payload)
+        except (TypeError, ValueError):
+            return False
+        if position is None:
+            return True
+        
+        allowed, annotations = self.index.evaluate(*position)
+        if not allowed:
+            GEOFENCE_REJECTED.inc()
+            return False
+        if annotations:
+            if packet.annotations is None:
+                packet.annotations = annotations
+            else:
+                packet.annotations.update(annotations)
         return True
 
 
@@ -239,10 +419,49 @@ class EMRValidator:
 
 
 class QuotaEnforcer:
-    """Will LB - Catch limit enforcement"""
-    async def validate(self, packet: IncomingPacket) -> bool:
-        # TODO: Implement quota checking
+    """
+    Will LB - Catch limit enforcement
+    
+    Works in two layers: ``validate`` (LINEBACKERS) rejects catch
+    packets that would exceed the vessel's species quota, and
+    ``process`` (SECONDARY) records accepted catch with an atomic
+    check-and-add, so concurrent packets cannot overshoot. Register the
+    same instance in both. The switcher calls ``settle`` once the packet
+    is routed and delivered; if that fails the catch is taken back off
+    the ledger, so only delivered packets count.
+    """
+    def __init__(self, ledger: Optional[QuotaLedger] = None):
+        self.ledger = ledger if ledger is not None else QuotaLedger()
+        # id(packet) -> catch recorded by process(), until settled
+        self._pending: Dict[int, Tuple[str, str, float]] = {}
+    
+    def validate(self, packet: IncomingPacket) -> bool:
+        if packet.source != "catch":
+            return True
+        try:
+            entry = catch_entry(packet.payload)
+        except (TypeError, ValueError):
+            return False
+        if entry is not None and self.ledger.would_exceed(*entry):
+            QUOTA_REJECTED.labels(species=entry[1]).inc()
+            return False
         return True
+    
+    def process(self, packet: IncomingPacket) -> IncomingPacket:
+        if packet.source == "catch":
+            entry = catch_entry(packet.payload)
+            if entry is not None:
+                if not self.ledger.try_add(*entry):
+                    QUOTA_REJECTED.labels(species=entry[1]).inc()
+                    raise HTTPException(status_code=401, detail="Invalid at QuotaEnforcer")
+                self._pending[id(packet)] = entry
+        return packet
+    
+    def settle(self, packet: IncomingPacket, accepted: bool) -> None:
+        """Keep the recorded catch if the packet was delivered, else release it"""
+        entry = self._pending.pop(id(packet), None)
+        if entry is not None and not accepted:
+            self.ledger.release(*entry)
 
 
 class LicenseChecker:
@@ -253,21 +472,55 @@ class LicenseChecker:
 
 
 class DataIntegrityHash:
-    """Corner - BLAKE2 hashing"""
-    async def process(self, packet: IncomingPacket) -> IncomingPacket:
-        # Hash is already computed in packet.hash()
+    """
+    Corner - BLAKE2 hashing
+    
+    Computes the memoized packet hash up front, so routing reuses it.
+    Marked ``cpu_bound`` - in staged mode it runs in the thread pool.
+    """
+    cpu_bound = True
+    
+    def process(self, packet: IncomingPacket) -> IncomingPacket:
+        packet.hash()
         return packet
 
 
 class BlockchainLogger:
-    """Safety - Immutable record"""
+    """
+    Safety - Immutable record
+    
+    Appends (correlation_id, source, timestamp, packet_hash) to the
+    group-committed, hash-chained ledger and holds the packet until its
+    block is on disk. The record's sequence number is returned to the
+    caller as ``ledger_seq`` for fetching its inclusion proof.
+    """
+    def __init__(self, log: Optional[HashChainLog] = None):
+        self.log = log if log is not None else HashChainLog.from_env()
+    
     async def process(self, packet: IncomingPacket) -> IncomingPacket:
-        # TODO: Implement blockchain logging
+        record = canonical_bytes({
+            "correlation_id": packet.correlation_id,
+            "source": packet.source,
+            "timestamp": packet.timestamp,
+            "packet_hash": packet.hash(),
+        })
+        seq = await asyncio.wrap_future(self.log.append(record))
+        if packet.annotations is None:
+            packet.annotations = {}
+        packet.annotations["ledger_seq"] = seq
         return packet
 
 
 class AnomalyDetector:
-    """Nickel - ML-based pattern detection"""
-    async def process(self, packet: IncomingPacket) -> IncomingPacket:
-        # TODO: Implement anomaly detection
-        return packet
+    """
+    Nickel - Streaming pattern detection
+    
+    Scores catch weight (per vessel and species) and reporting interval
+    (per vessel) against online baselines. Outliers are annotated under
+    ``anomalies`` and never stop the play - the packet is always routed.
+    """
+    def __init__(self, detector: Optional[StreamingAnomalyDetector] = None):
+        self.detector = detector if detector is not None else StreamingAnomalyDetector()
+    
+    def process(self, packet: IncomingPacket) -> IncomingPacket:
+        return self.detector.process(packet)
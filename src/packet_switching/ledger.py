@@ -0,0 +1,395 @@
+"""
+🏈 SeaTrace Hash-Chained Packet Ledger (Safety)
+For the Commons Good! 🌊
+
+An append-only local log of routed packets, group-committed:
+
+- ``append()`` queues a record and returns a future. A writer thread
+  gathers records until ``batch_records`` are waiting or
+  ``batch_interval`` seconds have passed, writes them as one block with
+  one write() and one fsync(), then resolves every future in the batch.
+  One fsync per packet would cap throughput at the disk's fsync rate.
+- Every block stores the Merkle root of its records and the hash of the
+  previous block, so altering any record breaks the chain from there on.
+- ``proof(seq)`` returns the inclusion proof of one record;
+  ``verify_log()`` re-checks a whole file through mmap without copying.
+
+Block layout (little-endian)::
+
+    header   magic "STLB" | version u8 | count u32 | first_seq u64
+             | committed_at f64 | body_len u64 | prev_hash 32 | merkle_root 32
+    body     count x (length u32 | record bytes)
+    trailer  block_hash 32 = BLAKE2b-256(header)
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+from common.merkle import DIGEST_SIZE, leaf_hash, merkle_path, merkle_root, verify_path
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+LEDGER_RECORDS = Counter(
+    'ledger_records_committed_total',
+    'Records durably committed to the packet ledger'
+)
+LEDGER_BATCH_SIZE = Histogram(
+    'ledger_commit_batch_size',
+    'Records per ledger group commit',
+    buckets=(1, 8, 32, 128, 512, 2048, 8192)
+)
+LEDGER_COMMIT_DURATION = Histogram(
+    'ledger_commit_duration_seconds',
+    'Write + fsync duration of one ledger block'
+)
+
+MAGIC = b"STLB"
+VERSION = 1
+HEADER = struct.Struct("<4sBIQdQ32s32s")
+LENGTH = struct.Struct("<I")
+GENESIS_HASH = b"\x00" * DIGEST_SIZE
+
+
+class LedgerCorruptError(ValueError):
+    """The log does not verify (tampered or damaged block)"""
+
+
+def _block_hash(header: bytes) -> bytes:
+    return hashlib.blake2b(header, digest_size=DIGEST_SIZE).digest()
+
+
+def _read_block(buf, offset: int, prev_hash: bytes, expected_seq: Optional[int] = None):
+    """
+    Parse and check the block at ``offset``
+
+    Returns:
+        (header fields, [(record_offset, record_len)], end offset, block hash),
+        or None when the block runs past the end of ``buf`` (torn tail)
+
+    Raises:
+        LedgerCorruptError: Bad magic, broken chain, or hash mismatch
+    """
+    size = len(buf)
+    if offset + HEADER.size > size:
+        return None
+    fields = HEADER.unpack_from(buf, offset)
+    magic, version, count, first_seq, committed_at, body_len, prev, root = fields
+    if magic != MAGIC or version != VERSION:
+        raise LedgerCorruptError(f"Bad block header at offset {offset}")
+    end = offset + HEADER.size + body_len + DIGEST_SIZE
+    if end > size:
+        return None
+    if prev != prev_hash:
+        raise LedgerCorruptError(f"Chain broken at offset {offset} (first_seq {first_seq})")
+    if expected_seq is not None and first_seq != expected_seq:
+        raise LedgerCorruptError(f"Sequence gap at offset {offset}: {first_seq} != {expected_seq}")
+
+    records: List[Tuple[int, int]] = []
+    leaves: List[bytes] = []
+    pos = offset + HEADER.size
+    body_end = pos + body_len
+    with memoryview(buf) as view:
+        for _ in range(count):
+            if pos + LENGTH.size > body_end:
+                raise LedgerCorruptError(f"Truncated record in block at offset {offset}")
+            (length,) = LENGTH.unpack_from(buf, pos)
+            pos += LENGTH.size
+            if pos + length > body_end:
+                raise LedgerCorruptError(f"Truncated record in block at offset {offset}")
+            records.append((pos, length))
+            leaves.append(leaf_hash(view[pos:pos + length]))
+            pos += length
+    if pos != body_end:
+        raise LedgerCorruptError(f"Trailing bytes in block at offset {offset}")
+    if merkle_root(leaves) != root:
+        raise LedgerCorruptError(f"Merkle root mismatch in block at offset {offset}")
+
+    block_hash = _block_hash(bytes(buf[offset:offset + HEADER.size]))
+    if bytes(buf[body_end:end]) != block_hash:
+        raise LedgerCorruptError(f"Block hash mismatch at offset {offset}")
+    return fields, records, end, block_hash
+
+
+def verify_log(path: str) -> Dict[str, Any]:
+    """
+    Verify every block of a ledger file
+
+    Returns:
+        {"blocks", "records", "bytes", "head"} of the verified log
+
+    Raises:
+        LedgerCorruptError: The log does not verify
+    """
+    blocks = records = 0
+    offset = 0
+    prev_hash = GENESIS_HASH
+    next_seq = 0
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                while offset < size:
+                    block = _read_block(buf, offset, prev_hash, next_seq)
+                    if block is None:
+                        raise LedgerCorruptError(f"Incomplete block at offset {offset}")
+                    fields, entries, offset, prev_hash = block
+                    blocks += 1
+                    records += len(entries)
+                    next_seq = fields[3] + len(entries)
+    return {"blocks": blocks, "records": records, "bytes": offset, "head": prev_hash.hex()}
+
+
+class HashChainLog:
+    """
+    Group-committed, hash-chained append-only log
+
+    Args:
+        path: Log file (created if missing; a torn tail block is truncated)
+        batch_records: Commit as soon as this many records are waiting
+        batch_interval: ... or this many seconds after the first one arrived
+        fsync: Disable only for tests and benchmarks
+    """
+
+    def __init__(self, path: str, batch_records: int = 512, batch_interval: float = 0.005,
+                 fsync: bool = True):
+        self.path = path
+        self.batch_records = batch_records
+        self.batch_interval = batch_interval
+        self.fsync = fsync
+
+        self._block_seqs: List[int] = []
+        self._block_offsets: List[int] = []
+        self._head = GENESIS_HASH
+        self._next_seq = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._offset = self._recover()
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._io_lock = threading.Lock()
+
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[bytes, Future]] = []
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="ledger-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def head(self) -> str:
+        """Hash of the newest block (hex)"""
+        return self._head.hex()
+
+    def __len__(self) -> int:
+        return self._next_seq
+
+    def _recover(self) -> int:
+        """Index existing blocks; drop a torn tail left by a crash mid-write"""
+        size = os.fstat(self._fd).st_size
+        offset = 0
+        if size:
+            with mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ) as buf:
+                while offset < size:
+                    try:
+                        block = _read_block(buf, offset, self._head, self._next_seq)
+                    except LedgerCorruptError:
+                        # Filesystems may extend the file before the data
+                        # lands, leaving a zero-filled tail after a crash
+                        if buf[offset:size].count(0) != size - offset:
+                            raise
+                        block = None
+                    if block is None:
+                        break
+                    fields, entries, end, self._head = block
+                    self._block_seqs.append(fields[3])
+                    self._block_offsets.append(offset)
+                    self._next_seq = fields[3] + len(entries)
+                    offset = end
+        if offset < size:
+            logger.warning("ledger_torn_tail_truncated", path=self.path, bytes=size - offset)
+            os.ftruncate(self._fd, offset)
+            os.fsync(self._fd)
+        return offset
+
+    # ========================================
+    # GROUP COMMIT
+    # ========================================
+
+    def append(self, record: bytes) -> "Future[int]":
+        """
+        Queue one record
+
+        Returns:
+            Future resolving to the record's sequence number once its
+            block is on disk
+        """
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Ledger is closed")
+            self._pending.append((record, future))
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_records:
+                self._cond.notify()
+        return future
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = time.monotonic() + self.batch_interval
+                while len(self._pending) < self.batch_records and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.batch_records]
+                del self._pending[:self.batch_records]
+            self._commit(batch)
+
+    def _commit(self, batch: List[Tuple[bytes, Future]]) -> None:
+        start = time.perf_counter()
+        records = [record for record, _ in batch]
+        first_seq = self._next_seq
+        body = b"".join(LENGTH.pack(len(r)) + r for r in records)
+        header = HEADER.pack(
+            MAGIC, VERSION, len(records), first_seq, time.time(), len(body),
+            self._head, merkle_root([leaf_hash(r) for r in records]),
+        )
+        block_hash = _block_hash(header)
+        block = header + body + block_hash
+
+        try:
+            with self._io_lock:
+                written = 0
+                while written < len(block):
+                    written += os.pwrite(self._fd, block[written:], self._offset + written)
+                if self.fsync:
+                    os.fsync(self._fd)
+        except Exception as e:
+            # Leave no partial block behind; the chain head is unchanged
+            try:
+                os.ftruncate(self._fd, self._offset)
+            except OSError:
+                pass
+            logger.error("ledger_commit_failed", path=self.path, records=len(batch), error=str(e))
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self._io_lock:
+            self._block_seqs.append(first_seq)
+            self._block_offsets.append(self._offset)
+            self._offset += len(block)
+            self._head = block_hash
+            self._next_seq = first_seq + len(records)
+
+        LEDGER_RECORDS.inc(len(records))
+        LEDGER_BATCH_SIZE.observe(len(records))
+        LEDGER_COMMIT_DURATION.observe(time.perf_counter() - start)
+        for n, (_, future) in enumerate(batch):
+            future.set_result(first_seq + n)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything appended so far is committed"""
+        with self._cond:
+            futures = [future for _, future in self._pending]
+            self._cond.notify()
+        for future in futures:
+            future.exception(timeout)
+
+    def close(self) -> None:
+        """Commit what is queued, stop the writer and close the file"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        os.close(self._fd)
+
+    # ========================================
+    # PROOFS
+    # ========================================
+
+    def proof(self, seq: int) -> Dict[str, Any]:
+        """
+        Inclusion proof of record ``seq``
+
+        Returns:
+            The record, its leaf hash, the Merkle path to the block root,
+            and the block hash that chains the root into the log
+
+        Raises:
+            KeyError: seq is not committed yet
+        """
+        with self._io_lock:
+            n = bisect.bisect_right(self._block_seqs, seq) - 1
+            if n < 0 or seq >= self._next_seq:
+                raise KeyError(seq)
+            start = self._block_offsets[n - 1] if n else 0
+            offset = self._block_offsets[n]
+            end = self._block_offsets[n + 1] if n + 1 < len(self._block_offsets) else self._offset
+            data = os.pread(self._fd, end - start, start)
+
+        # Read the previous block's trailer too, to re-check the chain link
+        prev_hash = data[offset - start - DIGEST_SIZE:offset - start] if n else GENESIS_HASH
+        block = memoryview(data)[offset - start:]
+        fields, entries, _, block_hash = _read_block(block, 0, prev_hash)
+        leaves = [leaf_hash(block[pos:pos + length]) for pos, length in entries]
+        index = seq - fields[3]
+        pos, length = entries[index]
+        return {
+            "seq": seq,
+            "record": bytes(block[pos:pos + length]).decode("utf-8", "replace"),
+            "leaf_hash": leaves[index].hex(),
+            "path": [{"side": side, "hash": sibling.hex()} for side, sibling in merkle_path(leaves, index)],
+            "merkle_root": fields[7].hex(),
+            "block": n,
+            "header": bytes(block[:HEADER.size]).hex(),
+            "block_hash": block_hash.hex(),
+            "committed_at": fields[4],
+        }
+
+    @classmethod
+    def from_env(cls) -> "HashChainLog":
+        """
+        Build a log from LEDGER_PATH (default data/ledger/packets.log),
+        LEDGER_BATCH_RECORDS (default 512) and LEDGER_BATCH_INTERVAL_MS (default 5)
+        """
+        return cls(
+            os.getenv("LEDGER_PATH", "data/ledger/packets.log"),
+            batch_records=int(os.getenv("LEDGER_BATCH_RECORDS", "512")),
+            batch_interval=float(os.getenv("LEDGER_BATCH_INTERVAL_MS", "5")) / 1000,
+        )
+
+
+def verify_proof(proof: Dict[str, Any]) -> bool:
+    """
+    Check an inclusion proof from ``HashChainLog.proof()`` on its own:
+    record -> leaf -> Merkle root -> block header -> block hash
+    """
+    leaf = leaf_hash(proof["record"].encode("utf-8"))
+    if leaf.hex() != proof["leaf_hash"]:
+        return False
+    header = bytes.fromhex(proof["header"])
+    root = HEADER.unpack(header)[7]
+    if root.hex() != proof["merkle_root"] or _block_hash(header).hex() != proof["block_hash"]:
+        return False
+    path = [(step["side"], bytes.fromhex(step["hash"])) for step in proof["path"]]
+    return verify_path(leaf, path, root)
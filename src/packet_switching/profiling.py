@@ -0,0 +1,132 @@
+"""
+🏈 SeaTrace Router Profiling (Film Room)
+For the Commons Good! 🌊
+
+Finds tail-latency offenders without turning on debug logging:
+
+- A sampled fraction of packets (``sample_rate``) is profiled: the
+  switcher fills in a per-stage, per-layer and touchdown breakdown.
+- Every packet's total duration is offered to a ``SlowPacketLog``,
+  which keeps the N slowest packets of the recent window. Sampled
+  packets carry their stage breakdown; the others carry totals only.
+
+Offering a packet that is faster than the current N-th slowest costs
+one comparison.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from prometheus_client import Histogram
+
+# Prometheus metrics
+PILLAR_DURATION = Histogram(
+    'router_pillar_duration_seconds',
+    'End-to-end routing duration per destination pillar',
+    ['pillar']
+)
+
+
+class SlowPacketLog:
+    """
+    The N slowest packets of the last one to two windows
+
+    Two generations of min-heaps rotate every ``window`` seconds, so an
+    old outlier ages out instead of hiding newer ones forever.
+    """
+
+    def __init__(self, capacity: int = 50, window: float = 300.0, clock=time.monotonic):
+        self.capacity = capacity
+        self.window = window
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._current: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._previous: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._rotate_at = clock() + window
+        self._counter = itertools.count()
+
+    def _rotate(self, now: float) -> None:
+        if now >= self._rotate_at:
+            # A whole idle window also drops the older generation
+            self._previous = self._current if now < self._rotate_at + self.window else []
+            self._current = []
+            self._rotate_at = now + self.window
+
+    def threshold(self) -> float:
+        """Duration a packet must exceed to enter the current generation"""
+        heap = self._current
+        if len(heap) < self.capacity or self.clock() >= self._rotate_at:
+            return 0.0
+        return heap[0][0]
+
+    def offer(self, duration: float, entry: Dict[str, Any]) -> bool:
+        """
+        Keep ``entry`` if it is among the slowest
+
+        Returns:
+            True if it was kept
+        """
+        with self._lock:
+            self._rotate(self.clock())
+            heap = self._current
+            if len(heap) < self.capacity:
+                heapq.heappush(heap, (duration, next(self._counter), entry))
+                return True
+            if duration <= heap[0][0]:
+                return False
+            heapq.heapreplace(heap, (duration, next(self._counter), entry))
+            return True
+
+    def slowest(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Slowest entries first"""
+        with self._lock:
+            self._rotate(self.clock())
+            items = self._current + self._previous
+        items.sort(key=lambda item: item[0], reverse=True)
+        return [entry for _, _, entry in items[:limit or self.capacity]]
+
+
+class RouterProfiler:
+    """
+    Sampling decisions plus the slow-packet log
+
+    Args:
+        sample_rate: Fraction of packets profiled stage by stage (0..1)
+        capacity: Slow packets kept
+        window: Seconds a slow packet stays "recent"
+    """
+
+    def __init__(self, sample_rate: float = 0.01, capacity: int = 50, window: float = 300.0):
+        self.sample_rate = sample_rate
+        self.slow_packets = SlowPacketLog(capacity=capacity, window=window)
+        self._random = random.random
+
+    def sample(self) -> Optional[Dict[str, float]]:
+        """A timings dict for a profiled packet, else None"""
+        if self.sample_rate > 0 and self._random() < self.sample_rate:
+            return {}
+        return None
+
+    def record(self, duration: float, packet: Any, source: str, pillar: Optional[str],
+               status: int, timings: Optional[Dict[str, float]]) -> None:
+        """Observe one routed (or rejected) packet (``packet`` is None if it was never built)"""
+        if pillar is not None:
+            PILLAR_DURATION.labels(pillar=pillar).observe(duration)
+        if duration <= self.slow_packets.threshold():
+            return
+        self.slow_packets.offer(duration, {
+            "correlation_id": getattr(packet, "correlation_id", None),
+            "source": source,
+            "pillar": pillar,
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "at": time.time(),
+            "stages_ms": (
+                {name: round(value * 1000, 3) for name, value in timings.items()}
+                if timings is not None else None
+            ),
+        })
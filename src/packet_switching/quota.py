@@ -0,0 +1,312 @@
+"""
+🏈 SeaTrace Catch-Quota Ledger (Will LB)
+For the Commons Good! 🌊
+
+Cumulative catch per vessel and species, held in memory so "would this
+packet exceed quota?" is a striped-lock dict lookup instead of a database
+round trip.
+
+- Entries are spread over N stripes, each guarded by its own lock.
+  A check-and-add is atomic per (vessel, species) key.
+- The ledger is snapshotted periodically to a JSON file (written to a
+  temp file, then atomically renamed). A restart loads the last snapshot
+  and resumes in seconds.
+- ``reload()`` swaps in a whole new season (limits and, optionally,
+  carried-over catch) in one step.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+QUOTA_REJECTED = Counter(
+    'packet_quota_rejected_total',
+    'Catch packets rejected for exceeding quota',
+    ['species']
+)
+QUOTA_SNAPSHOT_DURATION = Histogram(
+    'quota_ledger_snapshot_duration_seconds',
+    'Duration of quota ledger snapshots'
+)
+
+SNAPSHOT_VERSION = 1
+
+QuotaKey = Tuple[str, str]  # (vessel_id, species)
+
+
+class QuotaLedger:
+    """
+    Striped in-memory catch ledger
+
+    Each entry is a two-slot list ``[caught_kg, limit_kg]``; a limit of
+    None means no quota is set for that vessel and species.
+    """
+
+    def __init__(self, stripes: int = 64, snapshot_path: Optional[str] = None):
+        if stripes & (stripes - 1):
+            raise ValueError("stripes must be a power of two")
+        self._mask = stripes - 1
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._stripes: List[Dict[QuotaKey, List[Any]]] = [{} for _ in range(stripes)]
+        self.snapshot_path = snapshot_path
+        self.season: Optional[str] = None
+        self._changes = 0
+        self._snapshot_changes = 0
+        self._snapshot_stop: Optional[threading.Event] = None
+        self._snapshot_thread: Optional[threading.Thread] = None
+
+    def _stripe(self, key: QuotaKey) -> int:
+        return hash(key) & self._mask
+
+    # ========================================
+    # HOT PATH
+    # ========================================
+
+    def would_exceed(self, vessel_id: str, species: str, weight: float) -> bool:
+        """True if adding ``weight`` kg would go over the vessel's quota"""
+        key = (vessel_id, species)
+        n = self._stripe(key)
+        with self._locks[n]:
+            # Read the stripe under its lock - reload() swaps them
+            entries = self._stripes[n]
+            entry = entries.get(key)
+            return entry is not None and entry[1] is not None and entry[0] + weight > entry[1]
+
+    def try_add(self, vessel_id: str, species: str, weight: float) -> bool:
+        """
+        Atomically add ``weight`` kg unless it would exceed the quota
+
+        Returns:
+            True if recorded, False if over quota (nothing recorded)
+        """
+        key = (vessel_id, species)
+        n = self._stripe(key)
+        with self._locks[n]:
+            entries = self._stripes[n]
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = [weight, None]
+            elif entry[1] is not None and entry[0] + weight > entry[1]:
+                return False
+            else:
+                entry[0] += weight
+            self._changes += 1
+        return True
+
+    def release(self, vessel_id: str, species: str, weight: float) -> None:
+        """Take back ``weight`` kg recorded by ``try_add`` (packet not delivered)"""
+        key = (vessel_id, species)
+        n = self._stripe(key)
+        with self._locks[n]:
+            entry = self._stripes[n].get(key)
+            if entry is not None:
+                entry[0] = max(entry[0] - weight, 0.0)
+                self._changes += 1
+
+    def caught(self, vessel_id: str, species: str) -> float:
+        key = (vessel_id, species)
+        n = self._stripe(key)
+        with self._locks[n]:
+            entries = self._stripes[n]
+            entry = entries.get(key)
+            return entry[0] if entry is not None else 0.0
+
+    def remaining(self, vessel_id: str, species: str) -> Optional[float]:
+        """Remaining quota in kg (None if no quota is set)"""
+        key = (vessel_id, species)
+        n = self._stripe(key)
+        with self._locks[n]:
+            entries = self._stripes[n]
+            entry = entries.get(key)
+            if entry is None or entry[1] is None:
+                return None
+            return entry[1] - entry[0]
+
+    # ========================================
+    # SEASON RELOAD
+    # ========================================
+
+    def reload(self, quotas: Iterable[Mapping[str, Any]], season: Optional[str] = None) -> int:
+        """
+        Replace the whole ledger with a new season's quotas
+
+        Args:
+            quotas: Records with vessel_id, species, limit_kg and an
+                    optional caught_kg (carried-over catch, default 0)
+            season: Season label stored with snapshots
+
+        Returns:
+            Number of entries loaded
+        """
+        stripes: List[Dict[QuotaKey, List[Any]]] = [{} for _ in self._stripes]
+        count = 0
+        for record in quotas:
+            key = (str(record["vessel_id"]), str(record["species"]))
+            limit = record.get("limit_kg")
+            stripes[hash(key) & self._mask][key] = [
+                float(record.get("caught_kg", 0.0)),
+                float(limit) if limit is not None else None,
+            ]
+            count += 1
+
+        # Take every lock so no check-and-add straddles the swap
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            self._stripes = stripes
+            self.season = season
+            self._changes += 1
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+        logger.info("quota_ledger_reloaded", entries=count, season=season)
+        return count
+
+    def reload_file(self, path: str) -> int:
+        """Reload from a JSON season file: {"season": ..., "quotas": [...]}"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return self.reload(data.get("quotas", []), season=data.get("season"))
+
+    # ========================================
+    # SNAPSHOTS
+    # ========================================
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Consistent-per-stripe copy of every entry"""
+        records = []
+        for n, lock in enumerate(self._locks):
+            with lock:
+                items = [(key, entry[0], entry[1]) for key, entry in self._stripes[n].items()]
+            records.extend(
+                {"vessel_id": vessel_id, "species": species, "caught_kg": caught, "limit_kg": limit}
+                for (vessel_id, species), caught, limit in items
+            )
+        return records
+
+    def snapshot(self, path: Optional[str] = None) -> str:
+        """
+        Write the ledger to disk atomically (temp file + rename)
+
+        Returns:
+            Path of the snapshot
+        """
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path configured")
+
+        start = time.perf_counter()
+        changes = self._changes
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "season": self.season,
+            "taken_at": time.time(),
+            "quotas": self.records(),
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".quota-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._snapshot_changes = changes
+        QUOTA_SNAPSHOT_DURATION.observe(time.perf_counter() - start)
+        return path
+
+    def restore(self, path: Optional[str] = None) -> int:
+        """Load a snapshot written by ``snapshot()``"""
+        path = path or self.snapshot_path
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported quota snapshot version: {data.get('version')}")
+        count = self.reload(data.get("quotas", []), season=data.get("season"))
+        self._snapshot_changes = self._changes
+        return count
+
+    def start_snapshots(self, interval: float = 30.0) -> None:
+        """Snapshot every ``interval`` seconds (when changed) on a daemon thread"""
+        if self._snapshot_thread is not None:
+            return
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                if self._changes != self._snapshot_changes:
+                    try:
+                        self.snapshot()
+                    except Exception as e:
+                        logger.error("quota_snapshot_failed", error=str(e))
+
+        self._snapshot_stop = stop
+        self._snapshot_thread = threading.Thread(target=run, name="quota-snapshots", daemon=True)
+        self._snapshot_thread.start()
+
+    def stop_snapshots(self) -> None:
+        """Stop the snapshot thread and write a final snapshot"""
+        if self._snapshot_thread is None:
+            return
+        self._snapshot_stop.set()
+        self._snapshot_thread.join()
+        self._snapshot_thread = None
+        if self._changes != self._snapshot_changes:
+            self.snapshot()
+
+    @classmethod
+    def from_env(cls) -> "QuotaLedger":
+        """
+        Build a ledger from the environment
+
+        QUOTA_SNAPSHOT_PATH is restored when present; otherwise
+        QUOTA_SEASON_PATH (season file) is loaded. QUOTA_SNAPSHOT_INTERVAL
+        (seconds, default 30) starts periodic snapshots.
+        """
+        ledger = cls(snapshot_path=os.getenv("QUOTA_SNAPSHOT_PATH") or None)
+        season_path = os.getenv("QUOTA_SEASON_PATH")
+        if ledger.snapshot_path and os.path.exists(ledger.snapshot_path):
+            ledger.restore()
+        elif season_path:
+            ledger.reload_file(season_path)
+        if ledger.snapshot_path:
+            ledger.start_snapshots(float(os.getenv("QUOTA_SNAPSHOT_INTERVAL", "30")))
+        return ledger
+
+
+def catch_entry(payload: Mapping[str, Any]) -> Optional[Tuple[str, str, float]]:
+    """
+    (vessel_id, species, weight_kg) of a catch payload, or None if incomplete
+
+    Raises:
+        TypeError: Payload is not a mapping
+        ValueError: Non-numeric, non-finite or negative weight
+    """
+    if not isinstance(payload, Mapping):
+        raise TypeError(f"Catch payload must be an object, not {type(payload).__name__}")
+    vessel_id = payload.get("vessel_id")
+    species = payload.get("species")
+    weight = payload.get("weight", payload.get("weight_kg"))
+    if vessel_id is None or species is None or weight is None:
+        return None
+    weight = float(weight)
+    if not math.isfinite(weight) or weight < 0:
+        raise ValueError(f"Invalid catch weight: {weight}")
+    return str(vessel_id), str(species), weight
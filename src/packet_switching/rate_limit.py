@@ -0,0 +1,286 @@
+"""
+🏈 SeaTrace Rate Limiting (Edge Rusher)
+For the Commons Good! 🌊
+
+Token buckets keyed by ``source:vessel_id``. Each source type has its own
+sustained rate and burst (a vessel's EM feed is not a processor's batch
+upload).
+
+- ShardedTokenBucket - in-process, O(1) per check. Keys hash onto N
+  shards, each with its own small lock, so there is no global lock
+  between threads.
+- RedisTokenBucket - shared across router replicas. One atomic Lua
+  script per check against any Redis-compatible async client
+  (``redis.asyncio``).
+- InProcessRedis - stand-in that answers the token-bucket script
+  in-process, so the Redis path can be exercised without a server.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Union
+
+from prometheus_client import Counter
+
+# Prometheus metrics
+RATE_LIMITED = Counter(
+    'packet_rate_limited_total',
+    'Packets rejected by the rate limiter',
+    ['source']
+)
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """Sustained rate (tokens/second) and burst capacity of a bucket"""
+    rate: float
+    burst: float
+
+
+# Per source type - sustained packets/second and burst size
+DEFAULT_POLICIES: Dict[str, BucketPolicy] = {
+    "vessel": BucketPolicy(rate=20.0, burst=100.0),
+    "catch": BucketPolicy(rate=50.0, burst=200.0),
+    "processor": BucketPolicy(rate=100.0, burst=500.0),
+    "market": BucketPolicy(rate=200.0, burst=1000.0),
+}
+FALLBACK_POLICY = BucketPolicy(rate=10.0, burst=50.0)
+
+
+def parse_policies(spec: str) -> Dict[str, BucketPolicy]:
+    """
+    Parse a policy override string
+
+    Args:
+        spec: "source=rate:burst,..." e.g. "vessel=5:20,market=500:2000"
+
+    Returns:
+        DEFAULT_POLICIES updated with the overrides
+    """
+    policies = dict(DEFAULT_POLICIES)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        source, _, values = item.partition("=")
+        rate, _, burst = values.partition(":")
+        policies[source.strip()] = BucketPolicy(rate=float(rate), burst=float(burst or rate))
+    return policies
+
+
+class ShardedTokenBucket:
+    """
+    In-process token buckets spread over independently locked shards
+
+    Bucket state is a two-slot list ``[tokens, last_refill]``; a missing
+    bucket is a full one, so idle buckets can be dropped with
+    ``sweep()`` without changing any verdict.
+    """
+
+    def __init__(self, shards: int = 64, clock=time.monotonic):
+        if shards & (shards - 1):
+            raise ValueError("shards must be a power of two")
+        self._mask = shards - 1
+        self._shards: List[Tuple[threading.Lock, Dict[str, List[float]]]] = [
+            (threading.Lock(), {}) for _ in range(shards)
+        ]
+        self._clock = clock
+
+    def try_acquire(self, key: str, policy: BucketPolicy, cost: float = 1.0,
+                    now: Optional[float] = None) -> bool:
+        """
+        Take ``cost`` tokens from the key's bucket if available
+
+        Args:
+            key: Bucket key (e.g. "vessel:WSP-001")
+            policy: Rate and burst for this key
+            cost: Tokens to take
+            now: Clock reading (defaults to the bucket's clock)
+
+        Returns:
+            True if allowed, False if rate limited
+        """
+        if now is None:
+            now = self._clock()
+        lock, buckets = self._shards[hash(key) & self._mask]
+        with lock:
+            state = buckets.get(key)
+            if state is None:
+                tokens = policy.burst
+                state = buckets[key] = [tokens, now]
+            else:
+                tokens = state[0] + (now - state[1]) * policy.rate
+                if tokens > policy.burst:
+                    tokens = policy.burst
+                state[1] = now
+            if tokens >= cost:
+                state[0] = tokens - cost
+                return True
+            state[0] = tokens
+            return False
+
+    @property
+    def shards(self) -> int:
+        return len(self._shards)
+
+    def sweep(self, policies: Dict[str, BucketPolicy], default: BucketPolicy = FALLBACK_POLICY,
+              now: Optional[float] = None, shard: Optional[int] = None) -> int:
+        """
+        Drop buckets that have refilled completely
+
+        Keys are expected to be ``source:...`` so the refill rate can be
+        looked up. Returns the number of buckets removed.
+
+        Args:
+            shard: Sweep only this shard (None: all of them)
+        """
+        if now is None:
+            now = self._clock()
+        removed = 0
+        shards = self._shards if shard is None else (self._shards[shard],)
+        for lock, buckets in shards:
+            with lock:
+                for key in list(buckets):
+                    policy = policies.get(key.partition(":")[0], default)
+                    tokens, last = buckets[key]
+                    if tokens + (now - last) * policy.rate >= policy.burst:
+                        del buckets[key]
+                        removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for _, buckets in self._shards)
+
+
+# KEYS[1] = bucket key; ARGV = rate, burst, now (seconds), cost
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = burst
+else
+  tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+end
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return allowed
+"""
+
+
+class RedisTokenBucket:
+    """
+    Token buckets in a Redis-compatible store (shared by all replicas)
+
+    Args:
+        client: Async Redis client exposing ``eval`` (redis.asyncio.Redis)
+        prefix: Key prefix for bucket hashes
+    """
+
+    def __init__(self, client: Any, prefix: str = "ratelimit", clock=time.time):
+        self.client = client
+        self.prefix = prefix
+        self._clock = clock
+
+    async def try_acquire(self, key: str, policy: BucketPolicy, cost: float = 1.0,
+                          now: Optional[float] = None) -> bool:
+        if now is None:
+            now = self._clock()
+        allowed = await self.client.eval(
+            TOKEN_BUCKET_SCRIPT, 1, f"{self.prefix}:{key}",
+            policy.rate, policy.burst, now, cost
+        )
+        return int(allowed) == 1
+
+
+class InProcessRedis:
+    """
+    In-process stand-in for the Redis calls RedisTokenBucket makes
+
+    Only TOKEN_BUCKET_SCRIPT is understood by ``eval``; it is answered
+    with a ShardedTokenBucket using the caller's clock readings.
+    """
+
+    def __init__(self):
+        self._buckets = ShardedTokenBucket()
+        self.calls = 0
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> int:
+        if script != TOKEN_BUCKET_SCRIPT or numkeys != 1:
+            raise NotImplementedError("InProcessRedis only runs the token-bucket script")
+        self.calls += 1
+        key, rate, burst, now, cost = keys_and_args
+        policy = BucketPolicy(rate=float(rate), burst=float(burst))
+        return int(self._buckets.try_acquire(key, policy, float(cost), now=float(now)))
+
+
+def bucket_key(packet: Any) -> str:
+    """Rate-limit key for a packet: source plus vessel_id (or the source alone)"""
+    payload = packet.payload
+    # dict.get skips TrackedDict's wrapping - vessel_id is a plain string
+    vessel_id = dict.get(payload, "vessel_id") if isinstance(payload, dict) else None
+    return f"{packet.source}:{vessel_id or '*'}"
+
+
+class TokenBucketLimiter:
+    """
+    Picks the policy for a packet's source and checks its bucket
+
+    ``check()`` returns a bool for the in-process store and an awaitable
+    for RedisTokenBucket, so the in-process path never creates a
+    coroutine.
+
+    Bucket keys come from client payloads, so a store with ``sweep()``
+    (the in-process one) is swept once every ``sweep_every`` checks:
+    idle, fully refilled buckets are dropped and the store stays bounded
+    by the keys active within one refill window. The pass is spread over
+    the checks one shard at a time, so no single packet pays for a sweep
+    of the whole store. Redis expires its own keys.
+
+    Args:
+        store: ShardedTokenBucket (default) or RedisTokenBucket
+        policies: Per-source bucket policies
+        sweep_every: Checks per full sweep of an in-process store
+    """
+
+    def __init__(self, store: Any = None, policies: Optional[Dict[str, BucketPolicy]] = None,
+                 sweep_every: int = 10000):
+        self.store = store if store is not None else ShardedTokenBucket()
+        self.policies = policies if policies is not None else dict(DEFAULT_POLICIES)
+        self.sweep_every = sweep_every
+        self._sweep = getattr(self.store, "sweep", None)
+        self._shards = getattr(self.store, "shards", 1)
+        # Checks between single-shard sweeps
+        self._sweep_step = max(1, sweep_every // self._shards)
+        self._next_shard = 0
+        self._checks = 0
+
+    def check(self, packet: Any, cost: float = 1.0) -> Union[bool, Awaitable[bool]]:
+        if self._sweep is not None:
+            self._checks += 1
+            if self._checks >= self._sweep_step:
+                self._checks = 0
+                self._sweep(self.policies, shard=self._next_shard)
+                self._next_shard = (self._next_shard + 1) % self._shards
+        policy = self.policies.get(packet.source, FALLBACK_POLICY)
+        allowed = self.store.try_acquire(bucket_key(packet), policy, cost)
+        if allowed is True:
+            return True
+        if allowed is False:
+            RATE_LIMITED.labels(source=packet.source).inc()
+            return False
+        return self._count(allowed, packet.source)
+
+    @staticmethod
+    async def _count(pending: Awaitable[bool], source: str) -> bool:
+        allowed = await pending
+        if not allowed:
+            RATE_LIMITED.labels(source=source).inc()
+        return allowed
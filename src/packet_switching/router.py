@@ -6,12 +6,31 @@ Central routing hub for EM (Enterprise Message) packets
 Routes to appropriate 4-pillar microservice based on source
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import os
+import time
+
+from fastapi import FastAPI, HTTPException, Request
 from typing import Dict, Any
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
 
-from .handler import IncomingPacket, WildFisheriesPacketSwitcher
+from common.wire import WireFormatError, is_msgpack, packet_fields, parse_batch_body, read_body, respond
+
+from .compact import CompactPacket
+from .forwarder import PillarForwarder
+from .handler import (
+    AnomalyDetector,
+    BlockchainLogger,
+    GeoFenceChecker,
+    QuotaEnforcer,
+    RateLimitGuard,
+    WildFisheriesPacketSwitcher,
+)
+from .profiling import RouterProfiler
+from .quota import QuotaLedger
+from .rate_limit import RedisTokenBucket, TokenBucketLimiter, parse_policies
+from .staged import StageConfig, parse_stage_config
 
 app = FastAPI(
     title="SeaTrace Packet Router",
@@ -19,12 +38,104 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Initialize packet switcher
-packet_switcher = WildFisheriesPacketSwitcher()
+# Initialize packet switcher (ROUTER_PIPELINE_MODE=compiled for the compiled pipeline,
+# =staged for queued stages, ROUTER_FORWARDING=true to deliver packets to the pillar services)
+PIPELINE_MODE = os.getenv("ROUTER_PIPELINE_MODE", "sequential")
+packet_switcher = WildFisheriesPacketSwitcher(
+    compiled=PIPELINE_MODE == "compiled",
+    forwarder=(
+        PillarForwarder.from_env()
+        if os.getenv("ROUTER_FORWARDING", "false").lower() in ("1", "true", "yes")
+        else None
+    ),
+    staged=PIPELINE_MODE == "staged",
+    # ROUTER_STAGE_WORKERS / ROUTER_STAGE_QUEUE_SIZE set every stage,
+    # ROUTER_STAGES overrides single ones ("BlockchainLogger=2:1024")
+    stage_options={
+        "default": StageConfig(
+            workers=int(os.getenv("ROUTER_STAGE_WORKERS", "4")),
+            queue_size=int(os.getenv("ROUTER_STAGE_QUEUE_SIZE", "256")),
+        ),
+        "configs": parse_stage_config(os.getenv("ROUTER_STAGES", "")),
+        "threads": int(os.getenv("ROUTER_STAGE_THREADS", "4")),
+    }
+)
+
+def _build_rate_limit_guard() -> RateLimitGuard:
+    """
+    Edge Rusher from the environment
+
+    ROUTER_RATE_LIMIT_POLICIES overrides per-source rates
+    ("vessel=5:20,market=500:2000"). ROUTER_RATE_LIMIT_BACKEND=redis
+    shares buckets across replicas through REDIS_URL.
+    """
+    store = None
+    if os.getenv("ROUTER_RATE_LIMIT_BACKEND", "memory") == "redis":
+        import redis.asyncio as redis_asyncio
+        store = RedisTokenBucket(
+            redis_asyncio.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        )
+    policies = parse_policies(os.getenv("ROUTER_RATE_LIMIT_POLICIES", ""))
+    return RateLimitGuard(TokenBucketLimiter(store=store, policies=policies))
+
+
+# ROUTER_RATE_LIMIT=true puts the Edge Rusher on the defensive line
+if os.getenv("ROUTER_RATE_LIMIT", "false").lower() in ("1", "true", "yes"):
+    packet_switcher.defensive_line.append(_build_rate_limit_guard())
+
+# ROUTER_GEOFENCE=true adds the Defensive End (polygons from GEOFENCE_PATHS)
+if os.getenv("ROUTER_GEOFENCE", "false").lower() in ("1", "true", "yes"):
+    packet_switcher.defensive_line.append(GeoFenceChecker())
+
+# ROUTER_QUOTA=true adds the Will LB (ledger from QUOTA_SNAPSHOT_PATH / QUOTA_SEASON_PATH)
+if os.getenv("ROUTER_QUOTA", "false").lower() in ("1", "true", "yes"):
+    quota_enforcer = QuotaEnforcer(QuotaLedger.from_env())
+    packet_switcher.linebackers.append(quota_enforcer)
+    packet_switcher.secondary.append(quota_enforcer)
+
+# ROUTER_ANOMALY=true adds the Nickel (flags outliers, never blocks)
+if os.getenv("ROUTER_ANOMALY", "false").lower() in ("1", "true", "yes"):
+    packet_switcher.secondary.append(AnomalyDetector())
+
+# ROUTER_LEDGER=true adds the Safety (hash-chained log at LEDGER_PATH)
+blockchain_logger = None
+if os.getenv("ROUTER_LEDGER", "false").lower() in ("1", "true", "yes"):
+    blockchain_logger = BlockchainLogger()
+    packet_switcher.secondary.append(blockchain_logger)
 
 # Prometheus metrics
 packets_routed = Counter('router_packets_routed', 'Packets routed', ['source', 'pillar', 'status'])
 routing_duration = Histogram('router_duration_seconds', 'Routing duration')
+batch_size = Histogram(
+    'router_batch_size',
+    'Packets per /route/batch request',
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 5000)
+)
+
+# Film room - ROUTER_PROFILE_SAMPLE_RATE of packets get a stage breakdown,
+# the ROUTER_SLOW_PACKETS slowest of the last ROUTER_SLOW_PACKETS_WINDOW seconds are kept
+profiler = RouterProfiler(
+    sample_rate=float(os.getenv("ROUTER_PROFILE_SAMPLE_RATE", "0.01")),
+    capacity=int(os.getenv("ROUTER_SLOW_PACKETS", "50")),
+    window=float(os.getenv("ROUTER_SLOW_PACKETS_WINDOW", "300"))
+)
+
+# Batch routing limits
+BATCH_CONCURRENCY = int(os.getenv("ROUTER_BATCH_CONCURRENCY", "32"))
+MAX_BATCH_SIZE = int(os.getenv("ROUTER_MAX_BATCH_SIZE", "5000"))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop stage workers, drain pillar deliveries, close the pooled clients, flush quota snapshots and the ledger"""
+    if packet_switcher._stages is not None:
+        await packet_switcher._stages.close()
+    if packet_switcher.forwarder is not None:
+        await packet_switcher.forwarder.close()
+    for member in packet_switcher.linebackers:
+        if isinstance(member, QuotaEnforcer):
+            member.ledger.stop_snapshots()
+    if blockchain_logger is not None:
+        await asyncio.to_thread(blockchain_logger.log.close)
 
 @app.get("/health")
 async def health():
@@ -32,7 +143,9 @@ async def health():
     return {
         "status": "healthy",
         "service": "packet_router",
-        "pillars": list(packet_switcher.pillar_routes.values())
+        "pillars": list(packet_switcher.pillar_routes.values()),
+        # Set by the shard supervisor when running behind packet_switching.shard_router
+        "shard": os.getenv("ROUTER_SHARD")
     }
 
 @app.get("/metrics")
@@ -40,6 +153,30 @@ async def metrics():
     """Prometheus metrics endpoint"""
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
+@app.get("/ledger/proof/{seq}")
+async def ledger_proof(seq: int):
+    """Merkle inclusion proof of the record returned as ``ledger_seq``"""
+    if blockchain_logger is None:
+        raise HTTPException(status_code=404, detail="Ledger not enabled")
+    try:
+        return blockchain_logger.log.proof(seq)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Ledger record {seq} not found")
+
+@app.get("/debug/slow-packets")
+async def slow_packets(limit: int = 0):
+    """
+    🎬 FILM ROOM - Slowest recent packets
+
+    Sampled packets include their per-stage breakdown (``stages_ms``);
+    the rest report their total duration only.
+    """
+    return {
+        "sample_rate": profiler.sample_rate,
+        "window_seconds": profiler.slow_packets.window,
+        "packets": profiler.slow_packets.slowest(limit or None)
+    }
+
 @app.get("/")
 async def root():
     """Root endpoint with routing information"""
@@ -49,25 +186,32 @@ async def root():
         "routes": packet_switcher.pillar_routes,
         "endpoints": {
             "/route": "POST - Route packet to appropriate pillar",
+            "/route/batch": "POST - Route a JSON array or NDJSON batch of packets",
+            "/ledger/proof/{seq}": "GET - Inclusion proof of a ledger record",
+            "/debug/slow-packets": "GET - Slowest recent packets with stage breakdown",
             "/health": "GET - Health check",
             "/metrics": "GET - Prometheus metrics"
         }
     }
 
-@app.post("/route")
-async def route_packet(packet_data: Dict[str, Any]):
+async def _route_packet_data(packet_data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    🏈 ROUTE THE PLAY - Central packet routing
-    
-    Routes incoming EM packets to appropriate pillar:
-    - vessel → SeaSide (HOLD)
-    - catch → DeckSide (RECORD)
-    - processor → DockSide (STORE)
-    - market → MarketSide (EXCHANGE)
+    Build a CompactPacket from raw data and run it through the switcher
+
+    Shared by /route and /route/batch so both paths apply the same
+    validation, defensive layers and metrics.
     """
+    if not isinstance(packet_data, dict):
+        raise HTTPException(status_code=400, detail="Packet must be a JSON object")
+
+    start = time.perf_counter()
+    timings = profiler.sample()
+    packet = None
+    pillar = None
+    status = 200
     try:
-        # Create incoming packet
-        packet = IncomingPacket(
+        # Create incoming packet (slotted, lazy correlation_id/timestamp)
+        packet = CompactPacket(
             source=packet_data.get("source", ""),
             payload=packet_data.get("payload", {}),
             signature=packet_data.get("signature")
@@ -82,10 +226,10 @@ async def route_packet(packet_data: Dict[str, Any]):
             )
         
         # Route through packet switcher
-        result = await packet_switcher.process_packet(packet)
+        pillar = packet_switcher.pillar_routes[packet.source]
+        result = await packet_switcher.process_packet(packet, timings)
         
         # Update metrics
-        pillar = packet_switcher.pillar_routes[packet.source]
         packets_routed.labels(
             source=packet.source,
             pillar=pillar,
@@ -94,15 +238,102 @@ async def route_packet(packet_data: Dict[str, Any]):
         
         return result
         
-    except HTTPException:
+    except HTTPException as e:
+        status = e.status_code
         raise
     except Exception as e:
+        status = 500
         packets_routed.labels(
             source=packet_data.get("source", "unknown"),
             pillar="unknown",
             status="error"
         ).inc()
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        duration = time.perf_counter() - start
+        routing_duration.observe(duration)
+        profiler.record(duration, packet, packet_data.get("source", ""), pillar, status, timings)
+
+@app.post("/route")
+async def route_packet(request: Request):
+    """
+    🏈 ROUTE THE PLAY - Central packet routing
+    
+    Routes incoming EM packets to appropriate pillar:
+    - vessel → SeaSide (HOLD)
+    - catch → DeckSide (RECORD)
+    - processor → DockSide (STORE)
+    - market → MarketSide (EXCHANGE)
+    
+    Accepts JSON or MessagePack (Content-Type: application/msgpack, map
+    or positional array) and answers in MessagePack when Accept prefers it.
+    """
+    packet_data = await read_body(request)
+    if is_msgpack(request.headers.get("content-type")):
+        try:
+            packet_data = packet_fields(packet_data)
+        except WireFormatError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+    return respond(request, await _route_packet_data(packet_data))
+
+@app.post("/route/batch")
+async def route_batch(request: Request):
+    """
+    🏈 NO-HUDDLE OFFENSE - Route many packets in one request
+
+    Accepts a JSON array of packets, an NDJSON body
+    (Content-Type: application/x-ndjson) or a MessagePack array. Packets run through the
+    switcher with bounded concurrency (ROUTER_BATCH_CONCURRENCY) and
+    every packet gets its own result entry, so one bad packet never
+    fails the whole batch. Results keep the order of the request.
+    """
+    body = await request.body()
+    entries = parse_batch_body(body, request.headers.get("content-type", ""))
+
+    if len(entries) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(entries)} packets (max {MAX_BATCH_SIZE})"
+        )
+
+    batch_size.observe(len(entries))
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def route_entry(index: int, entry: Any) -> Dict[str, Any]:
+        if isinstance(entry, Exception):
+            return {"index": index, "ok": False, "status_code": 400, "error": str(entry)}
+
+        async with semaphore:
+            try:
+                result = await _route_packet_data(entry)
+            except HTTPException as e:
+                return {
+                    "index": index,
+                    "ok": False,
+                    "status_code": e.status_code,
+                    "error": e.detail
+                }
+
+        return {
+            "index": index,
+            "ok": True,
+            "pillar": result.get("pillar"),
+            "correlation_id": result.get("correlation_id"),
+            "packet_hash": result.get("packet_hash"),
+            "result": result
+        }
+
+    results = await asyncio.gather(
+        *(route_entry(i, entry) for i, entry in enumerate(entries))
+    )
+    routed = sum(1 for r in results if r["ok"])
+
+    return respond(request, {
+        "total": len(results),
+        "routed": routed,
+        "failed": len(results) - routed,
+        "results": results
+    })
 
 if __name__ == "__main__":
     import uvicorn
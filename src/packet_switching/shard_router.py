@@ -0,0 +1,225 @@
+"""
+🏈 SeaTrace Sharded Packet Router (front)
+For the Commons Good! 🌊
+
+Thin front for the sharded router mode. It decodes just enough of each
+packet to find its vessel, picks the owning worker on the hash ring and
+relays the original body over that worker's Unix socket. Routing,
+guards and per-vessel state all live in the workers
+(``packet_switching.router`` processes started by ``ShardPool``).
+
+    ROUTER_SHARDS=8 uvicorn packet_switching.shard_router:app --port 8000
+
+See ``packet_switching.sharding`` for the ring and worker settings.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+from starlette.responses import Response
+
+from common.wire import (
+    JSON, MSGPACK, WireFormatError, decode_body, is_msgpack, msgpack, packb,
+    packet_fields, parse_batch_body, respond,
+)
+
+from .sharding import ShardPool, shard_key
+
+app = FastAPI(
+    title="SeaTrace Sharded Packet Router",
+    description="Vessel-affinity front for N packet router workers",
+    version="1.0.0"
+)
+
+# Started on startup (ShardPool.from_env); tests assign their own
+pool: Optional[ShardPool] = None
+
+# Prometheus metrics
+relay_duration = Histogram('router_shard_relay_seconds', 'Front-to-worker relay duration', ['path'])
+
+MAX_BATCH_SIZE = int(os.getenv("ROUTER_MAX_BATCH_SIZE", "5000"))
+
+# Headers passed through to the workers
+RELAY_HEADERS = ("content-type", "accept", "x-correlation-id", "authorization", "x-license-id")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Start the worker processes"""
+    global pool
+    if pool is None:
+        pool = await ShardPool.from_env()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the worker processes"""
+    if pool is not None:
+        await pool.close()
+
+
+def _relay_headers(request: Request) -> Dict[str, str]:
+    return {name: request.headers[name] for name in RELAY_HEADERS if name in request.headers}
+
+
+@app.get("/health")
+async def health():
+    """Health check endpoint"""
+    shards = pool.status() if pool is not None else []
+    up = sum(1 for shard in shards if shard["up"])
+    return {
+        "status": "healthy" if shards and up == len(shards) else "degraded",
+        "service": "packet_router_front",
+        "shards_up": up,
+        "shards": len(shards)
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint (front only; see /shards/{name}/metrics)"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/shards")
+async def shards():
+    """Workers, their state and their share of the ring"""
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Shard pool not started")
+    return {"vnodes": pool.ring.vnodes, "failover": pool.failover, "shards": pool.status()}
+
+
+@app.get("/shards/{name}/metrics")
+async def shard_metrics(name: str):
+    """One worker's Prometheus metrics"""
+    if pool is None or name not in pool.shards:
+        raise HTTPException(status_code=404, detail=f"Unknown shard: {name}")
+    response = await pool.shards[name].client.get("/metrics")
+    return Response(content=response.content, media_type=CONTENT_TYPE_LATEST)
+
+
+@app.post("/route")
+async def route_packet(request: Request):
+    """
+    🏈 HAND-OFF - Relay one packet to the worker that owns its vessel
+
+    Same request and response formats as the router's /route.
+    """
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Shard pool not started")
+    body = await request.body()
+    content_type = request.headers.get("content-type")
+    try:
+        packet_data = decode_body(body, content_type)
+        if is_msgpack(content_type):
+            packet_data = packet_fields(packet_data)
+    except WireFormatError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    shard = pool.shard_for(shard_key(packet_data))
+    with relay_duration.labels(path="/route").time():
+        response = await pool.send(shard, "/route", body, _relay_headers(request))
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type")
+    )
+
+
+@app.post("/route/batch")
+async def route_batch(request: Request):
+    """
+    🏈 NO-HUDDLE OFFENSE - Split a batch by owning worker
+
+    Each worker gets one sub-batch with its vessels' packets; results are
+    merged back in request order. A worker that cannot be reached fails
+    only its own entries (503).
+    """
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Shard pool not started")
+    content_type = request.headers.get("content-type", "")
+    entries = parse_batch_body(await request.body(), content_type)
+    if len(entries) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(entries)} packets (max {MAX_BATCH_SIZE})"
+        )
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(entries)
+    groups: Dict[str, List[int]] = {}
+    for index, entry in enumerate(entries):
+        if isinstance(entry, Exception):
+            results[index] = {"index": index, "ok": False, "status_code": 400, "error": str(entry)}
+            continue
+        try:
+            shard = pool.shard_for(shard_key(entry))
+        except HTTPException as e:
+            results[index] = {"index": index, "ok": False, "status_code": e.status_code, "error": e.detail}
+            continue
+        groups.setdefault(shard.name, []).append(index)
+
+    # Sub-batches travel as MessagePack when available (packets decoded
+    # from MessagePack may carry values JSON cannot)
+    wire = MSGPACK if msgpack is not None else JSON
+    headers = dict(_relay_headers(request), **{"content-type": wire, "accept": wire})
+
+    async def relay(name: str, indices: List[int]) -> None:
+        shard = pool.shards[name]
+        sub_batch = [entries[i] for i in indices]
+        try:
+            with relay_duration.labels(path="/route/batch").time():
+                response = await pool.send(shard, "/route/batch", _encode(sub_batch, wire), headers)
+            if response.status_code != 200:
+                raise HTTPException(status_code=response.status_code, detail=_error_detail(response))
+            sub_results = _sub_results(response, len(indices))
+        except HTTPException as e:
+            sub_results = [{"ok": False, "status_code": e.status_code, "error": e.detail}] * len(indices)
+        for index, result in zip(indices, sub_results):
+            results[index] = dict(result, index=index)
+
+    await asyncio.gather(*(relay(name, indices) for name, indices in groups.items()))
+    routed = sum(1 for r in results if r["ok"])
+
+    return respond(request, {
+        "total": len(results),
+        "routed": routed,
+        "failed": len(results) - routed,
+        "results": results
+    })
+
+
+def _encode(entries: List[Any], wire: str) -> bytes:
+    if wire == MSGPACK:
+        return packb(entries)
+    return json.dumps(entries).encode()
+
+
+def _sub_results(response: Any, expected: int) -> List[Dict[str, Any]]:
+    """
+    Per-packet results of a worker's batch answer
+
+    Raises:
+        HTTPException: 502 if the answer is not one result per packet
+    """
+    try:
+        results = decode_body(response.content, response.headers.get("content-type"))["results"]
+    except (WireFormatError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=502, detail=f"Malformed shard batch response: {e!r}")
+    if (not isinstance(results, list) or len(results) != expected
+            or not all(isinstance(r, dict) and "ok" in r for r in results)):
+        raise HTTPException(
+            status_code=502,
+            detail=f"Shard batch response does not have one result per packet ({expected} sent)"
+        )
+    return results
+
+
+def _error_detail(response: Any) -> str:
+    try:
+        return decode_body(response.content, response.headers.get("content-type"))["detail"]
+    except Exception:
+        return f"Shard answered {response.status_code}"
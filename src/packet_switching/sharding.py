@@ -0,0 +1,406 @@
+"""
+🏈 SeaTrace Vessel-Affinity Sharding
+For the Commons Good! 🌊
+
+Runs the packet router as N worker processes behind a thin front
+process (``packet_switching.shard_router``). The front consistent-hashes
+each packet's vessel_id onto a ring of workers and relays the request
+over a Unix domain socket, so every packet of one vessel lands on the
+same worker:
+
+- Per-vessel state (rate-limit buckets, quota counters, anomaly
+  baselines) lives in exactly one process and stays cache-hot.
+- Routing itself spreads across all cores.
+
+Each worker owns ``vnodes`` points on the ring; adding or removing a
+worker only moves the vessels on its arcs (about 1/N of the fleet).
+
+A worker that exits is restarted by the supervisor. With ``failover``
+its vessels move to the next workers on the ring while it is down
+(their state there starts cold); without it they get 503 until it is
+back, which keeps ownership strict.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import httpx
+import structlog
+from fastapi import HTTPException
+from prometheus_client import Counter, Gauge
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+SHARD_UP = Gauge(
+    'router_shard_up',
+    'Shard worker accepting packets (1) or down (0)',
+    ['shard']
+)
+SHARD_REQUESTS = Counter(
+    'router_shard_requests_total',
+    'Requests relayed to shard workers',
+    ['shard', 'status']
+)
+SHARD_RESTARTS = Counter(
+    'router_shard_restarts_total',
+    'Shard worker restarts after an exit',
+    ['shard']
+)
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+# "{socket}" is replaced by each worker's socket path
+DEFAULT_WORKER_COMMAND = (
+    sys.executable, "-m", "uvicorn", "packet_switching.router:app",
+    "--uds", "{socket}", "--log-level", "warning", "--no-access-log",
+)
+
+# Files a worker owns exclusively (name -> default, None: off unless set).
+# Without "{shard}" in the value each worker gets its own derived path
+# (packets.log -> packets-shard0.log): N processes appending to one
+# hash chain, or overwriting one quota snapshot, would corrupt them.
+SHARD_STATE_PATHS = {
+    "LEDGER_PATH": "data/ledger/packets.log",
+    "QUOTA_SNAPSHOT_PATH": None,
+    "SEATRACE_CRL_CACHE": None,
+}
+
+
+def shard_path(path: str, shard: str) -> str:
+    """Per-worker variant of a state file path: ``dir/name-shard<N>.ext``"""
+    base, ext = os.path.splitext(path)
+    return f"{base}-shard{shard}{ext}"
+
+
+def _point(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes
+
+    Args:
+        nodes: Initial node names
+        vnodes: Points per node (more points, more even spread)
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 64):
+        self.vnodes = vnodes
+        self._nodes: set = set()
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for v in range(self.vnodes):
+            point = _point(f"{node}#{v}")
+            i = bisect.bisect_left(self._points, point)
+            self._points.insert(i, point)
+            self._owners.insert(i, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def node_for(self, key: str) -> Optional[str]:
+        """Owner of ``key``: the first point clockwise from its hash (None on an empty ring)"""
+        if not self._points:
+            return None
+        i = bisect.bisect(self._points, _point(key))
+        return self._owners[i % len(self._owners)]
+
+    def shares(self) -> Dict[str, float]:
+        """Fraction of the hash space each node owns"""
+        if not self._points:
+            return {}
+        space = 1 << 64
+        shares = dict.fromkeys(self._nodes, 0.0)
+        previous = self._points[-1] - space
+        for point, owner in zip(self._points, self._owners):
+            shares[owner] += (point - previous) / space
+            previous = point
+        return shares
+
+
+def shard_key(packet_data: Any) -> str:
+    """
+    Ring key of a raw packet: its vessel_id, else its source
+
+    Vessel-less packets share one rate-limit bucket per source
+    (``source:*``), so they stay together too.
+    """
+    if not isinstance(packet_data, dict):
+        return ""
+    payload = packet_data.get("payload")
+    vessel_id = payload.get("vessel_id") if isinstance(payload, dict) else None
+    if vessel_id is not None:
+        return str(vessel_id)
+    return str(packet_data.get("source", ""))
+
+
+@dataclass(eq=False)
+class Shard:
+    """One router worker and the pooled client that reaches it"""
+    name: str
+    client: httpx.AsyncClient
+    socket_path: Optional[str] = None
+    process: Optional[subprocess.Popen] = None
+    up: bool = True
+    restarts: int = 0
+
+
+class ShardPool:
+    """
+    🏟️ SHARDED FORMATION - router workers on one consistent-hash ring
+
+    ``spawn()`` starts real worker processes; the constructor takes
+    ready-made shards (tests hand in clients with mock transports).
+
+    Args:
+        shards: Workers on the ring
+        vnodes: Ring points per worker
+        failover: Move a down worker's vessels to its ring neighbours
+        command: Worker command line ("{socket}" → socket path)
+        env: Extra worker environment; "{shard}" in any value becomes the
+             worker's index, e.g. LEDGER_PATH=/var/lib/seatrace/ledger-{shard}.log.
+             State files in SHARD_STATE_PATHS without "{shard}" get a
+             per-worker path anyway (see ``shard_path``)
+        start_timeout: Seconds a worker may take to answer /health
+        check_interval: Seconds between supervisor checks
+    """
+
+    def __init__(self, shards: Sequence[Shard], vnodes: int = 64, failover: bool = False,
+                 command: Sequence[str] = DEFAULT_WORKER_COMMAND, env: Optional[Mapping[str, str]] = None,
+                 start_timeout: float = 30.0, check_interval: float = 1.0):
+        self.shards: Dict[str, Shard] = {shard.name: shard for shard in shards}
+        self.failover = failover
+        self.command = tuple(command)
+        self.env = dict(env or {})
+        self.start_timeout = start_timeout
+        self.check_interval = check_interval
+        self.ring = HashRing(
+            (s.name for s in shards if s.up or not failover), vnodes=vnodes
+        )
+        for shard in shards:
+            SHARD_UP.labels(shard=shard.name).set(1 if shard.up else 0)
+        self._monitor: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def spawn(cls, count: int, socket_dir: Optional[str] = None, timeout: float = 5.0,
+                    **kwargs) -> "ShardPool":
+        """
+        Start ``count`` router workers, each on its own Unix socket
+
+        Args:
+            count: Number of workers
+            socket_dir: Directory for the sockets (default: a fresh temp dir)
+            timeout: Per-request timeout towards a worker
+            **kwargs: ShardPool settings
+
+        Raises:
+            RuntimeError: A worker did not come up within ``start_timeout``
+        """
+        socket_dir = socket_dir or tempfile.mkdtemp(prefix="seatrace-shards-")
+        shards = []
+        for index in range(count):
+            path = os.path.join(socket_dir, f"shard-{index}.sock")
+            client = httpx.AsyncClient(
+                base_url="http://shard",
+                timeout=timeout,
+                transport=httpx.AsyncHTTPTransport(uds=path),
+            )
+            shards.append(Shard(name=str(index), client=client, socket_path=path, up=False))
+
+        pool = cls(shards, **kwargs)
+        try:
+            for shard in shards:
+                pool._launch(shard)
+            await asyncio.gather(*(pool._wait_ready(shard) for shard in shards))
+        except BaseException:
+            await pool.close()
+            raise
+        pool._monitor = asyncio.create_task(pool._supervise())
+        logger.info("shard_pool_started", shards=count, vnodes=pool.ring.vnodes, failover=pool.failover)
+        return pool
+
+    @classmethod
+    async def from_env(cls) -> "ShardPool":
+        """
+        Start a pool from environment variables
+
+        ROUTER_SHARDS workers (default: one per CPU) with
+        ROUTER_SHARD_VNODES ring points each; ROUTER_SHARD_FAILOVER=true
+        moves a down worker's vessels to its neighbours.
+        ROUTER_SHARD_SOCKET_DIR, ROUTER_SHARD_TIMEOUT,
+        ROUTER_SHARD_START_TIMEOUT and ROUTER_SHARD_CHECK_INTERVAL tune
+        the rest. Workers inherit the environment, so every other ROUTER_*
+        setting applies to each of them.
+        """
+        return await cls.spawn(
+            int(os.getenv("ROUTER_SHARDS", "0")) or os.cpu_count() or 1,
+            socket_dir=os.getenv("ROUTER_SHARD_SOCKET_DIR") or None,
+            timeout=float(os.getenv("ROUTER_SHARD_TIMEOUT", "5")),
+            vnodes=int(os.getenv("ROUTER_SHARD_VNODES", "64")),
+            failover=os.getenv("ROUTER_SHARD_FAILOVER", "false").lower() in ("1", "true", "yes"),
+            start_timeout=float(os.getenv("ROUTER_SHARD_START_TIMEOUT", "30")),
+            check_interval=float(os.getenv("ROUTER_SHARD_CHECK_INTERVAL", "1")),
+        )
+
+    # ========================================
+    # ROUTING
+    # ========================================
+
+    def shard_for(self, key: str) -> Shard:
+        """
+        Worker that owns ``key``
+
+        Raises:
+            HTTPException: 503 when the owner is down (or no worker is up)
+        """
+        name = self.ring.node_for(key)
+        if name is None:
+            raise HTTPException(status_code=503, detail="No shard workers available")
+        shard = self.shards[name]
+        if not shard.up:
+            raise HTTPException(status_code=503, detail=f"Shard {name} is restarting, retry later")
+        return shard
+
+    async def send(self, shard: Shard, path: str, content: bytes, headers: Dict[str, str]) -> httpx.Response:
+        """
+        POST a request body to a worker as is
+
+        Raises:
+            HTTPException: 503 when the worker cannot be reached
+        """
+        try:
+            response = await shard.client.post(path, content=content, headers=headers)
+        except httpx.TransportError as e:
+            SHARD_REQUESTS.labels(shard=shard.name, status="unreachable").inc()
+            logger.warning("shard_relay_failed", shard=shard.name, path=path, error=str(e))
+            raise HTTPException(status_code=503, detail=f"Shard {shard.name} unavailable: {e}")
+        SHARD_REQUESTS.labels(shard=shard.name, status=str(response.status_code)).inc()
+        return response
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Per-worker state and ring share"""
+        shares = self.ring.shares()
+        return [
+            {
+                "shard": shard.name,
+                "up": shard.up,
+                "pid": shard.process.pid if shard.process is not None else None,
+                "restarts": shard.restarts,
+                "ring_share": round(shares.get(shard.name, 0.0), 4),
+            }
+            for shard in self.shards.values()
+        ]
+
+    # ========================================
+    # SUPERVISION
+    # ========================================
+
+    def _set_up(self, shard: Shard, up: bool) -> None:
+        shard.up = up
+        SHARD_UP.labels(shard=shard.name).set(1 if up else 0)
+        if self.failover:
+            if up:
+                self.ring.add(shard.name)
+            else:
+                self.ring.remove(shard.name)
+
+    def _launch(self, shard: Shard) -> None:
+        if os.path.exists(shard.socket_path):
+            os.unlink(shard.socket_path)
+        env = dict(os.environ, **self.env)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(SRC_DIR), env.get("PYTHONPATH"))))
+        env["ROUTER_SHARD"] = shard.name
+        for name, default in SHARD_STATE_PATHS.items():
+            path = env.get(name) or default
+            if path and "{shard}" not in path:
+                env[name] = shard_path(path, "{shard}")
+        env = {name: value.replace("{shard}", shard.name) for name, value in env.items()}
+        shard.process = subprocess.Popen(
+            [part.replace("{socket}", shard.socket_path) for part in self.command], env=env
+        )
+
+    async def _wait_ready(self, shard: Shard) -> None:
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            if shard.process is not None and shard.process.poll() is not None:
+                raise RuntimeError(f"Shard {shard.name} exited with code {shard.process.returncode}")
+            try:
+                response = await shard.client.get("/health")
+                if response.status_code == 200:
+                    self._set_up(shard, True)
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+        raise RuntimeError(f"Shard {shard.name} did not answer /health within {self.start_timeout}s")
+
+    async def _supervise(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            for shard in self.shards.values():
+                if shard.process is None or shard.process.poll() is None:
+                    continue
+                logger.warning("shard_worker_exited", shard=shard.name, returncode=shard.process.returncode)
+                self._set_up(shard, False)
+                shard.restarts += 1
+                SHARD_RESTARTS.labels(shard=shard.name).inc()
+                self._launch(shard)
+                try:
+                    await self._wait_ready(shard)
+                except RuntimeError as e:
+                    # Stop a hung worker so the next check starts it again
+                    logger.error("shard_restart_failed", shard=shard.name, error=str(e))
+                    if shard.process.poll() is None:
+                        shard.process.kill()
+
+    async def close(self) -> None:
+        """Stop the supervisor and the workers, close the clients"""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+        running = [s.process for s in self.shards.values() if s.process is not None and s.process.poll() is None]
+        for process in running:
+            process.terminate()
+        for process in running:
+            try:
+                await asyncio.to_thread(process.wait, 10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        for shard in self.shards.values():
+            await shard.client.aclose()
+            if shard.socket_path and os.path.exists(shard.socket_path):
+                os.unlink(shard.socket_path)
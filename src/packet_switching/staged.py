@@ -0,0 +1,242 @@
+"""
+🏈 SeaTrace Staged Packet Pipeline
+For the Commons Good! 🌊
+
+Runs the switcher's layers as a chain of stages, one per guard,
+validator or processor. Each stage has its own bounded asyncio queue and
+its own pool of worker tasks:
+
+- Slow I/O in one stage (logging, persistence) overlaps across packets
+  instead of running end to end on each request's coroutine.
+- Members that set ``cpu_bound = True`` (hashing, signature checks) run
+  in a shared thread pool so they stay off the event loop. This only
+  applies to plain ``def`` methods; coroutine methods always run on the
+  loop.
+- A full queue makes the previous stage wait, so backpressure travels
+  back to the callers instead of piling up work.
+
+Every stage reports its queue depth, queue wait and service time, so
+the slowest stage shows up on /metrics.
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+from prometheus_client import Gauge, Histogram
+
+from .pipeline import DEFENSIVE_LINE, LINEBACKERS, SECONDARY, STAGE_BUCKETS
+
+# Prometheus metrics
+STAGE_QUEUE_DEPTH = Gauge(
+    'packet_switcher_stage_queue_depth',
+    'Packets waiting in each stage queue (staged mode)',
+    ['stage']
+)
+STAGE_WAIT_TIME = Histogram(
+    'packet_switcher_stage_wait_seconds',
+    'Time packets wait in each stage queue (staged mode)',
+    ['stage'],
+    buckets=STAGE_BUCKETS
+)
+STAGE_SERVICE_TIME = Histogram(
+    'packet_switcher_stage_service_seconds',
+    'Time a stage worker spends on one packet (staged mode)',
+    ['stage'],
+    buckets=STAGE_BUCKETS
+)
+
+
+@dataclass
+class StageConfig:
+    """Worker count and queue bound of one stage"""
+    workers: int = 4
+    queue_size: int = 256
+
+
+def parse_stage_config(spec: str) -> Dict[str, StageConfig]:
+    """
+    Parse per-stage overrides
+
+    Args:
+        spec: "Stage=workers:queue_size,..." e.g. "BlockchainLogger=2:1024,DataIntegrityHash=8"
+
+    Returns:
+        Stage name → StageConfig
+    """
+    configs = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, values = item.partition("=")
+        workers, _, queue_size = values.partition(":")
+        configs[name.strip()] = StageConfig(
+            workers=int(workers), queue_size=int(queue_size or StageConfig.queue_size)
+        )
+    return configs
+
+
+class _Stage:
+    """One member of a layer with its queue and workers"""
+
+    def __init__(self, layer: str, member: Any, config: StageConfig, executor: Optional[ThreadPoolExecutor]):
+        self.name = member.__class__.__name__
+        self.label = f"{layer}.{self.name}"
+        self.layer = layer
+        self.config = config
+        if layer == DEFENSIVE_LINE:
+            self.call, self.reject = member.check, (429, f"Blocked by {self.name}")
+        elif layer == LINEBACKERS:
+            self.call, self.reject = member.validate, (401, f"Invalid at {self.name}")
+        else:
+            self.call, self.reject = member.process, None
+        self.offload = (
+            executor is not None
+            and getattr(member, "cpu_bound", False)
+            and not inspect.iscoroutinefunction(self.call)
+        )
+        self.executor = executor
+        self.next: Optional["_Stage"] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self.depth = STAGE_QUEUE_DEPTH.labels(stage=self.label)
+        self.wait = STAGE_WAIT_TIME.labels(stage=self.label)
+        self.service = STAGE_SERVICE_TIME.labels(stage=self.label)
+
+    async def put(self, packet: Any, future: asyncio.Future, timings: Optional[Dict[str, float]]) -> None:
+        await self.queue.put((packet, future, timings, time.perf_counter()))
+        self.depth.set(self.queue.qsize())
+
+    async def work(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self.queue
+        while True:
+            packet, future, timings, enqueued = await queue.get()
+            self.depth.set(queue.qsize())
+            if future.done():
+                # Caller gave up (cancelled or timed out)
+                continue
+            start = time.perf_counter()
+            self.wait.observe(start - enqueued)
+            try:
+                if self.offload:
+                    result = await loop.run_in_executor(self.executor, self.call, packet)
+                else:
+                    result = self.call(packet)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as e:
+                self.service.observe(time.perf_counter() - start)
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - start
+            self.service.observe(elapsed)
+            if timings is not None:
+                timings[self.label] = elapsed
+                timings[f"{self.label}.queued"] = start - enqueued
+
+            if self.reject is not None:
+                if not result:
+                    if not future.done():
+                        future.set_exception(HTTPException(*self.reject))
+                    continue
+            else:
+                packet = result
+
+            if self.next is not None:
+                await self.next.put(packet, future, timings)
+            elif not future.done():
+                future.set_result(packet)
+
+
+class StagedPipeline:
+    """
+    🛡️ STAGED PLAY SHEET - every layer member as a queued stage
+
+    Built once by ``WildFisheriesPacketSwitcher.build_stages()``; the
+    layers are snapshotted. Stages keep play order (defensive line,
+    linebackers, secondary), and a rejection stops the packet at that
+    stage with the same status and detail as the other modes.
+
+    Args:
+        configs: Per-stage overrides keyed by class name
+        default: Config for stages without an override
+        threads: Thread pool size for ``cpu_bound`` stages
+    """
+
+    def __init__(self, defensive_line: Sequence[Any], linebackers: Sequence[Any], secondary: Sequence[Any],
+                 configs: Optional[Dict[str, StageConfig]] = None, default: Optional[StageConfig] = None,
+                 threads: int = 4):
+        configs = configs or {}
+        default = default or StageConfig()
+        members = [
+            *((DEFENSIVE_LINE, m) for m in defensive_line),
+            *((LINEBACKERS, m) for m in linebackers),
+            *((SECONDARY, m) for m in secondary),
+        ]
+        self.executor: Optional[ThreadPoolExecutor] = None
+        if any(getattr(m, "cpu_bound", False) for _, m in members):
+            self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="packet-stage")
+        self.stages: List[_Stage] = [
+            _Stage(layer, m, configs.get(m.__class__.__name__, default), self.executor)
+            for layer, m in members
+        ]
+        for stage, following in zip(self.stages, self.stages[1:]):
+            stage.next = following
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List[asyncio.Task] = []
+
+    @classmethod
+    def from_switcher(cls, switcher: Any, **kwargs) -> "StagedPipeline":
+        return cls(switcher.defensive_line, switcher.linebackers, switcher.secondary, **kwargs)
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Create queues and workers on the running loop"""
+        self._loop = loop
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.config.queue_size)
+        self._workers = [
+            loop.create_task(stage.work(), name=f"stage-{stage.label}-{n}")
+            for stage in self.stages
+            for n in range(stage.config.workers)
+        ]
+
+    async def run(self, packet: Any, timings: Optional[Dict[str, float]] = None) -> Any:
+        """
+        Push the packet through every stage
+
+        Args:
+            packet: Incoming EM packet
+            timings: Optional dict that receives each stage's service
+                     time and queue wait (``<stage>.queued``) in seconds
+
+        Returns:
+            The packet as returned by the last SECONDARY processor
+
+        Raises:
+            HTTPException: 429/401 from the rejecting stage
+        """
+        if not self.stages:
+            return packet
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._start(loop)
+        future = loop.create_future()
+        await self.stages[0].put(packet, future, timings)
+        return await future
+
+    def depths(self) -> Dict[str, int]:
+        """Current queue depth per stage"""
+        return {s.label: s.queue.qsize() if s.queue is not None else 0 for s in self.stages}
+
+    async def close(self) -> None:
+        """Stop the workers and the thread pool"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
@@ -1 +1,361 @@
-# Load JWK keys from well-known endpoint
+"""
+🔑 SeaTrace Public Keyring (JWKS)
+For the Commons Good! 🌊
+
+PUBLIC KEY INCOMING - verification keys parsed once, looked up by ``kid``.
+
+A Keyring holds an immutable snapshot of parsed Ed25519 public keys. The
+snapshot comes from a JWKS document (``{"keys": [{"kty": "OKP", "crv":
+"Ed25519", "kid": ..., "x": ...}]}``) at a URL or a local path, or from
+raw base64 keys (the ``VERIFY_KEY_*`` settings).
+
+A background task re-fetches the document every ``refresh_interval``
+seconds with ``If-None-Match`` (a local file is re-read when its mtime
+changes). A new document is parsed off to the side and swapped in with
+one assignment, so a rotation never adds latency to a request and a bad
+document never replaces a good one.
+
+Environment (``Keyring.from_env``):
+    SEATRACE_JWKS_URL / SEATRACE_JWKS_PATH   JWKS source
+    SEATRACE_JWKS_REFRESH                    Refresh interval (s, default 300)
+    SEATRACE_JWKS_DEFAULT_KID                Key for tokens without a known kid
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+import httpx
+import structlog
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from prometheus_client import Counter, Gauge
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+JWKS_REFRESH = Counter(
+    'public_keys_jwks_refresh_total',
+    'JWKS refresh attempts',
+    ['result']  # updated, not_modified, error
+)
+KEYRING_KEYS = Gauge(
+    'public_keys_keyring_keys',
+    'Verification keys in the active keyring snapshot'
+)
+
+
+def _b64url_decode(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def parse_jwk(jwk: Mapping[str, Any]) -> ed25519.Ed25519PublicKey:
+    """
+    Parse one Ed25519 JWK
+
+    Raises:
+        ValueError: Not an Ed25519 (OKP) verification key
+    """
+    if jwk.get("kty") != "OKP" or jwk.get("crv") != "Ed25519":
+        raise ValueError(f"Unsupported key type: {jwk.get('kty')}/{jwk.get('crv')}")
+    if jwk.get("use", "sig") != "sig":
+        raise ValueError(f"Not a signature key: use={jwk.get('use')}")
+    return ed25519.Ed25519PublicKey.from_public_bytes(_b64url_decode(jwk["x"]))
+
+
+def parse_jwks(document: Mapping[str, Any]) -> Dict[str, ed25519.Ed25519PublicKey]:
+    """
+    Parse a JWKS document into kid -> key
+
+    Keys that cannot be used are skipped with a warning; a document with
+    no usable key is an error, so it never replaces a working keyring.
+
+    Raises:
+        ValueError: No usable key in the document
+    """
+    keys = {}
+    for jwk in document.get("keys", []):
+        kid = jwk.get("kid")
+        try:
+            if not kid:
+                raise ValueError("missing kid")
+            keys[kid] = parse_jwk(jwk)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("jwk_skipped", kid=kid, error=str(e))
+    if not keys:
+        raise ValueError("JWKS document has no usable Ed25519 key")
+    return keys
+
+
+@dataclass(frozen=True)
+class KeySet:
+    """Immutable keyring snapshot"""
+    keys: Dict[str, ed25519.Ed25519PublicKey]
+    default_kid: Optional[str] = None
+    etag: Optional[str] = None
+    loaded_at: float = field(default_factory=time.time)
+    # Changes whenever the key material changes (token cache namespace)
+    fingerprint: str = ""
+
+    @classmethod
+    def build(cls, keys: Dict[str, ed25519.Ed25519PublicKey], default_kid: Optional[str] = None,
+              etag: Optional[str] = None) -> "KeySet":
+        h = hashlib.blake2b(digest_size=8)
+        for kid in sorted(keys):
+            h.update(kid.encode() + b"\0")
+            h.update(keys[kid].public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw))
+        h.update(b"default\0" + (default_kid or "").encode())
+        return cls(keys=keys, default_kid=default_kid, etag=etag, fingerprint=h.hexdigest())
+
+
+class Keyring:
+    """
+    🔑 KEYRING - pre-parsed verification keys by kid
+
+    Args:
+        source: JWKS URL, JWKS file path, or None for a static keyring
+        keys: Initial keys (kid -> Ed25519PublicKey)
+        default_kid: Key used when a token's kid is missing or unknown
+        refresh_interval: Seconds between background refreshes
+        timeout: HTTP timeout for JWKS fetches
+        transport: httpx transport (e.g. httpx.MockTransport in tests)
+    """
+
+    def __init__(self, source: Optional[str] = None,
+                 keys: Optional[Dict[str, ed25519.Ed25519PublicKey]] = None,
+                 default_kid: Optional[str] = None, refresh_interval: float = 300.0,
+                 timeout: float = 5.0, transport: Any = None):
+        self.source = source
+        self.default_kid = default_kid
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.transport = transport
+        self._snapshot = KeySet.build(dict(keys or {}), default_kid)
+        self._task: Optional[asyncio.Task] = None
+        KEYRING_KEYS.set(len(self._snapshot.keys))
+
+    # ========================================
+    # CONSTRUCTION
+    # ========================================
+
+    @classmethod
+    def from_keys(cls, keys_b64: Mapping[str, str], default_kid: Optional[str] = None) -> "Keyring":
+        """
+        Static keyring from raw base64 Ed25519 public keys
+
+        Invalid keys (e.g. unreplaced placeholders) are skipped with a
+        warning; tokens for their kid then fail verification.
+
+        Args:
+            keys_b64: kid -> base64 public key
+            default_kid: Key used for tokens without a known kid
+        """
+        keys = {}
+        for kid, key_b64 in keys_b64.items():
+            try:
+                keys[kid] = ed25519.Ed25519PublicKey.from_public_bytes(base64.b64decode(key_b64))
+            except (TypeError, ValueError) as e:
+                logger.warning("verify_key_invalid", kid=kid, error=str(e))
+        return cls(keys=keys, default_kid=default_kid)
+
+    @classmethod
+    def from_jwks(cls, source: str, **kwargs) -> "Keyring":
+        """
+        Keyring loaded (synchronously, once) from a JWKS URL or file
+
+        Raises:
+            OSError / httpx.HTTPError / ValueError: The first load failed
+        """
+        keyring = cls(source=source, **kwargs)
+        keyring.load()
+        return keyring
+
+    @classmethod
+    def from_env(cls, fallback_keys: Optional[Mapping[str, str]] = None,
+                 default_kid: Optional[str] = None) -> "Keyring":
+        """
+        Keyring from SEATRACE_JWKS_URL / SEATRACE_JWKS_PATH, else from
+        raw base64 fallback keys
+
+        A JWKS source that cannot be loaded now does not fail startup:
+        the keyring starts out with the fallback keys (or empty) and the
+        background refresh keeps retrying the source.
+
+        Args:
+            fallback_keys: kid -> base64 public key, used until (or
+                without) a JWKS document is loaded
+            default_kid: Default kid of the fallback keys
+
+        Returns:
+            The keyring (empty when nothing is configured)
+        """
+        keys = {kid: key for kid, key in (fallback_keys or {}).items() if key}
+        fallback = cls.from_keys(keys, default_kid=default_kid)
+        source = os.getenv("SEATRACE_JWKS_URL") or os.getenv("SEATRACE_JWKS_PATH")
+        if not source:
+            return fallback
+        keyring = cls(
+            source=source,
+            default_kid=os.getenv("SEATRACE_JWKS_DEFAULT_KID") or None,
+            refresh_interval=float(os.getenv("SEATRACE_JWKS_REFRESH", "300")),
+        )
+        keyring._snapshot = fallback.snapshot
+        KEYRING_KEYS.set(len(keyring._snapshot.keys))
+        try:
+            keyring.load()
+        except Exception as e:
+            JWKS_REFRESH.labels(result="error").inc()
+            logger.warning("jwks_initial_load_failed", source=source, error=str(e),
+                           fallback_kids=sorted(fallback.snapshot.keys))
+        return keyring
+
+    # ========================================
+    # LOOKUP (hot path - no I/O, no parsing)
+    # ========================================
+
+    @property
+    def snapshot(self) -> KeySet:
+        return self._snapshot
+
+    @property
+    def fingerprint(self) -> str:
+        """Identity of the current key material"""
+        return self._snapshot.fingerprint
+
+    def get(self, kid: Optional[str]) -> Optional[ed25519.Ed25519PublicKey]:
+        """
+        Key for a kid, falling back to the default key
+
+        Returns:
+            The parsed key, or None when neither is known
+        """
+        snapshot = self._snapshot
+        key = snapshot.keys.get(kid) if kid else None
+        if key is None and snapshot.default_kid:
+            key = snapshot.keys.get(snapshot.default_kid)
+        if key is None and kid is None and len(snapshot.keys) == 1:
+            key = next(iter(snapshot.keys.values()))
+        return key
+
+    def __contains__(self, kid: str) -> bool:
+        return kid in self._snapshot.keys
+
+    def __len__(self) -> int:
+        return len(self._snapshot.keys)
+
+    # ========================================
+    # LOADING / REFRESH
+    # ========================================
+
+    def _is_remote(self) -> bool:
+        return bool(self.source) and self.source.startswith(("http://", "https://"))
+
+    def _swap(self, document: Mapping[str, Any], etag: Optional[str]) -> None:
+        snapshot = KeySet.build(parse_jwks(document), self.default_kid, etag)
+        changed = snapshot.fingerprint != self._snapshot.fingerprint
+        self._snapshot = snapshot
+        KEYRING_KEYS.set(len(snapshot.keys))
+        JWKS_REFRESH.labels(result="updated").inc()
+        if changed:
+            logger.info("keyring_updated", source=self.source, kids=sorted(snapshot.keys))
+
+    def _file_tag(self) -> str:
+        stat = Path(self.source).stat()
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def load(self) -> None:
+        """Fetch or read the JWKS document now (blocking)"""
+        if not self.source:
+            return
+        if self._is_remote():
+            with httpx.Client(timeout=self.timeout, transport=self.transport) as client:
+                response = client.get(self.source)
+            response.raise_for_status()
+            self._swap(response.json(), response.headers.get("etag"))
+        else:
+            tag = self._file_tag()
+            self._swap(json.loads(Path(self.source).read_text()), tag)
+
+    async def refresh(self) -> bool:
+        """
+        Re-fetch the JWKS document if it changed
+
+        Returns:
+            True if a new snapshot was swapped in
+
+        Raises:
+            httpx.HTTPError / OSError / ValueError: Fetch or parse failed
+            (the current snapshot stays active)
+        """
+        if not self.source:
+            return False
+        etag = self._snapshot.etag
+        if not self._is_remote():
+            tag = self._file_tag()
+            if tag == etag:
+                JWKS_REFRESH.labels(result="not_modified").inc()
+                return False
+            self._swap(json.loads(Path(self.source).read_text()), tag)
+            return True
+
+        headers = {"If-None-Match": etag} if etag else {}
+        async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as client:
+            response = await client.get(self.source, headers=headers)
+        if response.status_code == 304:
+            JWKS_REFRESH.labels(result="not_modified").inc()
+            return False
+        response.raise_for_status()
+        self._swap(response.json(), response.headers.get("etag"))
+        return True
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                JWKS_REFRESH.labels(result="error").inc()
+                logger.warning("jwks_refresh_failed", source=self.source, error=str(e))
+
+    def start(self) -> None:
+        """Start background refresh on the running loop (no-op for static keyrings)"""
+        if self.source and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background refresh"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+_default_keyring: Optional[Keyring] = None
+_default_loaded = False
+
+
+def default_keyring() -> Optional[Keyring]:
+    """
+    Process-wide JWKS keyring from the environment (loaded on first use)
+
+    Returns:
+        The keyring for SEATRACE_JWKS_URL / SEATRACE_JWKS_PATH, or None
+        when no JWKS source is configured
+    """
+    global _default_keyring, _default_loaded
+    if not _default_loaded:
+        if os.getenv("SEATRACE_JWKS_URL") or os.getenv("SEATRACE_JWKS_PATH"):
+            _default_keyring = Keyring.from_env()
+        _default_loaded = True
+    return _default_keyring
@@ -17,9 +17,13 @@ from .rbac import Role, Permission, require_permission, ROLE_PERMISSIONS
 # Proceeding Master - Cryptographic Packet Validation
 from .packet_crypto import (
     CryptoPacket,
+    CryptoExecutor,
     PacketCryptoHandler,
-    SecurePacketSwitcher
+    SecurePacketSwitcher,
+    VerdictCache
 )
+from .key_material import KeyMaterial
+from .batch_signing import MerkleBatchSigner, verify_batch_signature, verify_signed_response
 
 __all__ = [
     # 8-Layer Security
@@ -38,6 +42,12 @@ __all__ = [
     'ROLE_PERMISSIONS',
     # Proceeding Master - Packet Crypto
     'CryptoPacket',
+    'CryptoExecutor',
     'PacketCryptoHandler',
     'SecurePacketSwitcher',
+    'VerdictCache',
+    'KeyMaterial',
+    'MerkleBatchSigner',
+    'verify_batch_signature',
+    'verify_signed_response',
 ]
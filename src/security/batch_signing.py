@@ -0,0 +1,213 @@
+"""
+🔐 SeaTrace Merkle Batch Signing
+For the Commons Good! 🌊
+
+PRIVATE KEY OUTGOING - one signature per batch instead of per response.
+
+Responses produced within a short window become the leaves of a Merkle
+tree (``common.merkle``); only the root is signed. Each response carries
+an envelope with its packet hash, its inclusion path, the root and the
+root signature:
+
+    {
+        "alg": "merkle-blake2b-256+rsa-pss-sha256",
+        "key_id": "9f0c...",
+        "packet_hash": "<hex BLAKE2b-512 of the response packet>",
+        "timestamp": "<response packet timestamp>",
+        "merkle_root": "<hex>",
+        "root_signature": "<hex>",
+        "leaf_index": 3,
+        "batch_size": 17,
+        "path": [["R", "<hex>"], ["L", "<hex>"], ...]
+    }
+
+A consumer checks the path from ``leaf_hash(packet_hash)`` to the root,
+then the root signature with the sender's public key
+(``verify_batch_signature`` / ``verify_signed_response``). A burst of n
+responses costs one public-key signature plus about n hashes.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from prometheus_client import Histogram
+
+from common.merkle import leaf_hash, merkle_paths, merkle_root, verify_path
+
+from .packet_crypto import (
+    CryptoPacket,
+    PacketCryptoHandler,
+    default_executor,
+    key_id,
+    sign_message,
+    signature_algorithm,
+    verify_message,
+)
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+MERKLE_BATCH_SIZE = Histogram(
+    'packet_crypto_merkle_batch_size',
+    'Responses covered by one signed Merkle root',
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+
+# Root signatures are domain-separated from per-packet signatures
+ROOT_CONTEXT = b"seatrace-merkle-root:v1:"
+ENVELOPE_KEY = "batch_signature"
+
+
+class MerkleBatchSigner:
+    """
+    ✍️ BATCH SIGNER - signs a Merkle root per window of responses
+
+    The first response of a batch opens a ``window``-second window; the
+    batch closes when it ends or ``max_batch`` responses are waiting. The
+    root is signed on the handler's crypto executor.
+
+    Args:
+        handler: Handler holding the private key
+        window: Seconds a batch stays open
+        max_batch: Responses per root at most
+    """
+
+    def __init__(self, handler: PacketCryptoHandler, window: float = 0.002, max_batch: int = 256):
+        if not handler.private_key:
+            raise ValueError("Private key not loaded - cannot sign batches")
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self.alg = f"merkle-blake2b-256+{signature_algorithm(handler.private_key)}"
+        self.key_id = key_id(handler.private_key.public_key())
+        self._pending: List[Tuple[CryptoPacket, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._commits: set = set()
+
+    async def sign(self, packet: CryptoPacket) -> Dict[str, Any]:
+        """
+        Add a response packet to the current batch
+
+        Args:
+            packet: Response packet (its packet_hash is the leaf)
+
+        Returns:
+            The packet's signature envelope, once its batch is signed
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._pending, self._timer = loop, [], None
+        future = loop.create_future()
+        self._pending.append((packet, future))
+        if len(self._pending) >= self.max_batch:
+            self._close_batch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._close_batch)
+        return await future
+
+    def _close_batch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = self._loop.create_task(self._commit(batch))
+            self._commits.add(task)
+            task.add_done_callback(self._commits.discard)
+
+    async def _commit(self, batch: List[Tuple[CryptoPacket, asyncio.Future]]) -> None:
+        leaves = [leaf_hash(packet.packet_hash.encode()) for packet, _ in batch]
+        root = merkle_root(leaves)
+        try:
+            executor = self.handler.executor or default_executor()
+            signature = await executor.run(
+                "sign_merkle_root", sign_message, self.handler.private_key, ROOT_CONTEXT + root
+            )
+        except Exception as e:
+            logger.error("Failed to sign Merkle batch", batch_size=len(batch), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        MERKLE_BATCH_SIZE.observe(len(batch))
+        for index, ((packet, future), path) in enumerate(zip(batch, merkle_paths(leaves))):
+            if future.done():
+                continue
+            future.set_result({
+                "alg": self.alg,
+                "key_id": self.key_id,
+                "packet_hash": packet.packet_hash,
+                "timestamp": packet.timestamp,
+                "merkle_root": root.hex(),
+                "root_signature": signature.hex(),
+                "leaf_index": index,
+                "batch_size": len(batch),
+                "path": [[side, sibling.hex()] for side, sibling in path],
+            })
+
+    async def flush(self) -> None:
+        """Sign whatever is waiting now and wait for open batches"""
+        if self._pending:
+            self._close_batch()
+        if self._commits:
+            await asyncio.gather(*self._commits, return_exceptions=True)
+
+
+# ========================================
+# CONSUMER VERIFICATION
+# ========================================
+
+def _load_public_key(public_key: Any) -> Any:
+    if isinstance(public_key, (bytes, str)):
+        data = public_key.encode() if isinstance(public_key, str) else public_key
+        return serialization.load_pem_public_key(data)
+    return public_key
+
+
+def verify_batch_signature(envelope: Dict[str, Any], public_key: Any) -> bool:
+    """
+    Check a batch signature envelope
+
+    Args:
+        envelope: Envelope as produced by MerkleBatchSigner.sign()
+        public_key: Sender's public key (key object or PEM)
+
+    Returns:
+        True if the packet hash is in the signed root
+    """
+    try:
+        root = bytes.fromhex(envelope["merkle_root"])
+        path = [(side, bytes.fromhex(sibling)) for side, sibling in envelope["path"]]
+        if not verify_path(leaf_hash(envelope["packet_hash"].encode()), path, root):
+            return False
+        verify_message(
+            _load_public_key(public_key), bytes.fromhex(envelope["root_signature"]), ROOT_CONTEXT + root
+        )
+        return True
+    except (InvalidSignature, KeyError, TypeError, ValueError):
+        return False
+
+
+def verify_signed_response(response: Dict[str, Any], public_key: Any) -> bool:
+    """
+    Check a response signed by SecurePacketSwitcher in batch mode
+
+    Recomputes the response packet hash from the response body (without
+    its envelope) before checking the envelope itself.
+    """
+    envelope = response.get(ENVELOPE_KEY)
+    if not isinstance(envelope, dict):
+        return False
+    body = {key: value for key, value in response.items() if key != ENVELOPE_KEY}
+    packet = CryptoPacket(
+        correlation_id=body.get("correlation_id"),
+        source="seatrace",
+        payload=body,
+        timestamp=envelope.get("timestamp")
+    )
+    return packet.packet_hash == envelope.get("packet_hash") and verify_batch_signature(envelope, public_key)
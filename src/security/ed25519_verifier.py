@@ -15,12 +15,16 @@ It NEVER signs tokens or handles private keys.
 import os
 import base64
 import json
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from datetime import datetime
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.exceptions import InvalidSignature
 import structlog
 
+from common.licensing.token_cache import VerifiedTokenCache, default_token_cache, key_namespace
+from public_keys.jwk_loader import Keyring, default_keyring
+
 logger = structlog.get_logger()
 
 
@@ -52,26 +56,58 @@ def _b64url_dec(s: str) -> bytes:
     return base64.urlsafe_b64decode(s + padding)
 
 
+def _exp_timestamp(exp: Any) -> float:
+    """
+    Token expiry as epoch seconds
+    
+    Args:
+        exp: 'exp' claim (epoch seconds or ISO 8601 string)
+        
+    Returns:
+        Epoch seconds
+    """
+    if isinstance(exp, str):
+        # Parse ISO format timestamp
+        exp_dt = datetime.fromisoformat(exp.replace('Z', '+00:00'))
+        return exp_dt.timestamp()
+    return exp
+
+
 class Ed25519Verifier:
     """
     Ed25519 JWS Token Verifier (PUBLIC REPO - READ-ONLY)
     
     Compatible with Proceeding Master's verify_ed25519_jws() function
     
+    Keys come from a Keyring, so tokens are checked against pre-parsed
+    keys selected by their ``kid``.
+    
     Usage:
         verifier = Ed25519Verifier()
         payload = verifier.verify_jws(token)
     """
     
-    def __init__(self, verify_key_b64: Optional[str] = None):
+    def __init__(self, verify_key_b64: Optional[str] = None,
+                 token_cache: Optional[VerifiedTokenCache] = None,
+                 keyring: Optional[Keyring] = None):
         """
-        Initialize verifier with PUBLIC key
+        Initialize verifier with PUBLIC key(s)
         
         Args:
             verify_key_b64: Base64-encoded Ed25519 public key
-                           If None, loads from SEATRACE_VERIFY_KEY env var
+                           If None, uses the JWKS keyring (SEATRACE_JWKS_URL /
+                           SEATRACE_JWKS_PATH) or the SEATRACE_VERIFY_KEY env var
+            token_cache: Verified-token cache (default: the shared one)
+            keyring: Pre-parsed verification keys (overrides verify_key_b64)
         """
-        self.public_key = None
+        self.keyring = keyring
+        self.token_cache = token_cache if token_cache is not None else default_token_cache()
+        
+        if self.keyring is None and verify_key_b64 is None:
+            self.keyring = default_keyring()
+        if self.keyring is not None:
+            logger.info("Ed25519 verifier initialized", keys=len(self.keyring), algorithm="EdDSA")
+            return
         
         # Load public key
         if verify_key_b64 is None:
@@ -87,7 +123,8 @@ class Ed25519Verifier:
         try:
             # Decode public key from base64
             verify_key_bytes = base64.b64decode(verify_key_b64)
-            self.public_key = ed25519.Ed25519PublicKey.from_public_bytes(verify_key_bytes)
+            public_key = ed25519.Ed25519PublicKey.from_public_bytes(verify_key_bytes)
+            self.keyring = Keyring(keys={"default": public_key}, default_kid="default")
             
             logger.info(
                 "Ed25519 verifier initialized",
@@ -102,6 +139,11 @@ class Ed25519Verifier:
             )
             raise ValueError(f"Invalid SEATRACE_VERIFY_KEY: {e}")
     
+    @property
+    def public_key(self) -> Optional[ed25519.Ed25519PublicKey]:
+        """Default verification key (None when verification is disabled)"""
+        return self.keyring.get(None) if self.keyring is not None else None
+    
     def verify_jws(self, token: str, require_exp: bool = False) -> Dict[str, Any]:
         """
         Verify JWS token signed with Ed25519 (PUBLIC KEY ONLY)
@@ -118,7 +160,7 @@ class Ed25519Verifier:
         Raises:
             ValueError: If signature is invalid, token malformed, or expired
         """
-        if not self.public_key:
+        if self.keyring is None:
             logger.warning(
                 "Token verification skipped - no public key configured",
                 security_risk="Accepting unsigned token"
@@ -130,6 +172,52 @@ class Ed25519Verifier:
             except Exception as e:
                 raise ValueError(f"Invalid JWS format: {e}")
         
+        # Tokens are reused for many calls - verified ones are cached
+        # (namespaced by the key material, so a key rotation starts afresh)
+        namespace = key_namespace("jws", self.keyring.fingerprint)
+        payload = self.token_cache.get(token, namespace)
+        if payload is None:
+            payload = self._verify_signature(token)
+            exp = payload.get('exp')
+            try:
+                exp = _exp_timestamp(exp) if exp else None
+            except (TypeError, ValueError):
+                exp = None
+            self.token_cache.put(token, namespace, payload, exp)
+        
+        # Check expiration (if required)
+        if require_exp:
+            exp = payload.get('exp')
+            if not exp:
+                raise ValueError("Token missing 'exp' field")
+            
+            exp = _exp_timestamp(exp)
+            now = datetime.utcnow().timestamp()
+            if exp < now:
+                expired_seconds = int(now - exp)
+                logger.warning(
+                    "Token expired",
+                    exp=exp,
+                    now=now,
+                    expired_seconds=expired_seconds
+                )
+                raise ValueError(f"Token expired {expired_seconds} seconds ago")
+        
+        return payload
+    
+    def _verify_signature(self, token: str) -> Dict[str, Any]:
+        """
+        Parse a JWS token and verify its Ed25519 signature
+        
+        Args:
+            token: JWS token in format header.payload.signature
+            
+        Returns:
+            Decoded payload dict
+            
+        Raises:
+            ValueError: If signature is invalid or token malformed
+        """
         # Parse JWS token
         try:
             header_b64, payload_b64, signature_b64 = token.split('.')
@@ -149,10 +237,15 @@ class Ed25519Verifier:
         if alg != 'EdDSA':
             raise ValueError(f"Unsupported algorithm: {alg} (expected EdDSA)")
         
+        # Select the pre-parsed key by kid
+        public_key = self.keyring.get(header.get('kid'))
+        if public_key is None:
+            raise ValueError(f"Unknown key id (kid): {header.get('kid')}")
+        
         # Verify signature
         message = f"{header_b64}.{payload_b64}".encode('utf-8')
         try:
-            self.public_key.verify(signature, message)
+            public_key.verify(signature, message)
         except InvalidSignature:
             logger.warning(
                 "Invalid JWS signature",
@@ -161,28 +254,6 @@ class Ed25519Verifier:
             )
             raise ValueError("Invalid signature")
         
-        # Check expiration (if required)
-        if require_exp:
-            exp = payload.get('exp')
-            if not exp:
-                raise ValueError("Token missing 'exp' field")
-            
-            if isinstance(exp, str):
-                # Parse ISO format timestamp
-                exp_dt = datetime.fromisoformat(exp.replace('Z', '+00:00'))
-                exp = exp_dt.timestamp()
-            
-            now = datetime.utcnow().timestamp()
-            if exp < now:
-                expired_seconds = int(now - exp)
-                logger.warning(
-                    "Token expired",
-                    exp=exp,
-                    now=now,
-                    expired_seconds=expired_seconds
-                )
-                raise ValueError(f"Token expired {expired_seconds} seconds ago")
-        
         logger.info(
             "JWS token verified",
             algorithm=alg,
@@ -197,7 +268,8 @@ class Ed25519Verifier:
     def verify_packet_signature(
         self,
         packet_data: Dict[str, Any],
-        signature_b64: str
+        signature_b64: str,
+        kid: Optional[str] = None
     ) -> bool:
         """
         Verify Ed25519 signature on raw packet data
@@ -205,21 +277,27 @@ class Ed25519Verifier:
         Args:
             packet_data: Dictionary to verify
             signature_b64: Base64-encoded signature
+            kid: Signing key id (default key if None or unknown)
             
         Returns:
             True if signature is valid, False otherwise
         """
-        if not self.public_key:
+        if self.keyring is None:
             logger.warning("Signature verification skipped - no public key")
             return True  # Allow unsigned in development
         
+        public_key = self.keyring.get(kid)
+        if public_key is None:
+            logger.warning("Unknown packet signing key", kid=kid)
+            return False
+        
         try:
             # Serialize packet data (deterministic)
             message = json.dumps(packet_data, sort_keys=True).encode('utf-8')
             signature = base64.b64decode(signature_b64)
             
             # Verify signature
-            self.public_key.verify(signature, message)
+            public_key.verify(signature, message)
             
             logger.info(
                 "Packet signature verified",
@@ -257,6 +335,12 @@ def get_verifier() -> Ed25519Verifier:
     return _verifier_instance
 
 
+@lru_cache(maxsize=32)
+def _verifier_for_key(verify_key_b64: str) -> Ed25519Verifier:
+    """Verifier per explicit key (the key is parsed once, not per call)"""
+    return Ed25519Verifier(verify_key_b64=verify_key_b64)
+
+
 def verify_ed25519_jws(token: str, verify_key_b64: Optional[str] = None) -> Dict[str, Any]:
     """
     Verify JWS token (convenience function compatible with Proceeding Master)
@@ -280,8 +364,8 @@ def verify_ed25519_jws(token: str, verify_key_b64: Optional[str] = None) -> Dict
         'fisher@example.com'
     """
     if verify_key_b64:
-        # Use provided key
-        verifier = Ed25519Verifier(verify_key_b64=verify_key_b64)
+        # Use provided key (parsed once per key)
+        verifier = _verifier_for_key(verify_key_b64)
     else:
         # Use global instance
         verifier = get_verifier()
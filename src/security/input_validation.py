@@ -61,7 +61,7 @@ def sanitize_string(value: str, max_length: int = 10000) -> str:
 
 class LicenseKeyInput(BaseModel):
     """Validated license key input"""
-    license_key: str = Field(..., regex=r'^[A-Za-z0-9\-]{36}$')
+    license_key: str = Field(..., pattern=r'^[A-Za-z0-9\-]{36}$')
     
     @validator('license_key')
     def validate_uuid_format(cls, v: str) -> str:
@@ -73,7 +73,7 @@ class LicenseKeyInput(BaseModel):
 class UserInput(BaseModel):
     """Validated user input"""
     user_id: str = Field(..., min_length=1, max_length=100)
-    email: Optional[str] = Field(None, regex=r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    email: Optional[str] = Field(None, pattern=r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
     
     @validator('user_id', 'email')
     def sanitize_user_fields(cls, v: Optional[str]) -> Optional[str]:
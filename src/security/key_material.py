@@ -0,0 +1,161 @@
+"""
+🔑 SeaTrace Key Material Loader
+For the Commons Good! 🌊
+
+Loads packet signing keys on first use instead of at import time, and
+parses them once per process.
+
+For ``KeyMaterial.from_env("SEASIDE")`` each key comes from the first of:
+
+1. ``SEASIDE_PUBLIC_KEY`` / ``SEASIDE_PRIVATE_KEY`` - PEM in a secret
+   (read through SecretManager, so it may be Fernet-encrypted)
+2. ``SEASIDE_PUBLIC_KEY_PATH`` / ``SEASIDE_PRIVATE_KEY_PATH`` - PEM file
+3. Development only (``SEASIDE_KEY_DEV_GENERATE=true``): a key pair
+   generated once and persisted under ``SEASIDE_KEY_DEV_DIR``
+   (default ``~/.seatrace/dev-keys/seaside``); later starts reuse it
+
+With none of these configured the service runs without signature
+verification, as before.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from .packet_crypto import PacketCryptoHandler
+
+logger = structlog.get_logger()
+
+DEV_PUBLIC_FILE = "public.pem"
+DEV_PRIVATE_FILE = "private.pem"
+
+
+class KeyMaterial:
+    """
+    Lazily loaded PEM key pair and the crypto handler built from it
+
+    Args:
+        name: Label for logs (service name)
+        public_pem: Public key PEM (takes precedence over the path)
+        private_pem: Private key PEM
+        public_path: Public key PEM file
+        private_path: Private key PEM file
+        dev_dir: Directory for the generated development pair
+        dev_generate: Generate and persist a pair when nothing is configured
+        algorithm: Algorithm of a generated pair ("rsa" or "ed25519")
+    """
+
+    def __init__(self, name: str = "packet", public_pem: Optional[bytes] = None,
+                 private_pem: Optional[bytes] = None, public_path: Optional[str] = None,
+                 private_path: Optional[str] = None, dev_dir: Optional[str] = None,
+                 dev_generate: bool = False, algorithm: str = "rsa"):
+        self.name = name
+        self._public_pem = public_pem
+        self._private_pem = private_pem
+        self.public_path = public_path
+        self.private_path = private_path
+        self.dev_dir = Path(dev_dir) if dev_dir else Path.home() / ".seatrace" / "dev-keys" / name
+        self.dev_generate = dev_generate
+        self.algorithm = algorithm
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._handler: Optional[PacketCryptoHandler] = None
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "KeyMaterial":
+        """
+        Key sources from ``<PREFIX>_*`` environment variables (nothing is read from disk yet)
+
+        Args:
+            prefix: Variable prefix, e.g. "SEASIDE"
+        """
+        from .secret_manager import get_secret
+
+        def pem(name: str) -> Optional[bytes]:
+            value = get_secret(name) if os.getenv(name) else None
+            return value.encode() if value else None
+
+        return cls(
+            name=prefix.lower(),
+            public_pem=pem(f"{prefix}_PUBLIC_KEY"),
+            private_pem=pem(f"{prefix}_PRIVATE_KEY"),
+            public_path=os.getenv(f"{prefix}_PUBLIC_KEY_PATH") or None,
+            private_path=os.getenv(f"{prefix}_PRIVATE_KEY_PATH") or None,
+            dev_dir=os.getenv(f"{prefix}_KEY_DEV_DIR") or None,
+            dev_generate=os.getenv(f"{prefix}_KEY_DEV_GENERATE", "false").lower() in ("1", "true", "yes"),
+            algorithm=os.getenv(f"{prefix}_KEY_DEV_ALGORITHM", "rsa"),
+        )
+
+    @property
+    def configured(self) -> bool:
+        """True if any key source is set (without loading anything)"""
+        return bool(
+            self._public_pem or self._private_pem or self.public_path or self.private_path or self.dev_generate
+        )
+
+    def handler(self) -> Optional[PacketCryptoHandler]:
+        """
+        Crypto handler for the configured keys, built on first call
+
+        Returns:
+            The cached handler, or None when no key is configured
+
+        Raises:
+            OSError: A configured key file cannot be read
+            ValueError: A configured key is not valid PEM
+        """
+        if self._loaded:
+            return self._handler
+        with self._lock:
+            if not self._loaded:
+                self._handler = self._load()
+                self._loaded = True
+        return self._handler
+
+    def _load(self) -> Optional[PacketCryptoHandler]:
+        public_pem = self._public_pem or self._read(self.public_path)
+        private_pem = self._private_pem or self._read(self.private_path)
+        if public_pem is None and private_pem is None and self.dev_generate:
+            private_pem, public_pem = self._dev_pair()
+        if public_pem is None and private_pem is None:
+            logger.info("packet_keys_not_configured", service=self.name)
+            return None
+        handler = PacketCryptoHandler(public_key_pem=public_pem, private_key_pem=private_pem)
+        logger.info(
+            "packet_keys_loaded",
+            service=self.name,
+            key_id=handler.key_id,
+            can_verify=handler.public_key is not None,
+            can_sign=handler.private_key is not None
+        )
+        return handler
+
+    @staticmethod
+    def _read(path: Optional[str]) -> Optional[bytes]:
+        if not path:
+            return None
+        return Path(path).read_bytes()
+
+    def _dev_pair(self) -> tuple:
+        """Development pair from dev_dir, generated on the first start"""
+        public_file = self.dev_dir / DEV_PUBLIC_FILE
+        private_file = self.dev_dir / DEV_PRIVATE_FILE
+        if public_file.exists() and private_file.exists():
+            return private_file.read_bytes(), public_file.read_bytes()
+
+        private_pem, public_pem = PacketCryptoHandler.generate_keypair(self.algorithm)
+        self.dev_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(private_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(private_pem)
+        public_file.write_bytes(public_pem)
+        logger.warning(
+            "dev_packet_keys_generated",
+            service=self.name,
+            path=str(self.dev_dir),
+            note="development only - configure real keys in production"
+        )
+        return private_pem, public_pem
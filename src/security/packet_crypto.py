@@ -4,19 +4,39 @@ For the Commons Good! 🌊
 
 Proceeding Master Integration - Cryptographic packet validation
 Combines WildFisheriesPacketSwitcher with advanced cryptography
+
+RSA signing and verification take hundreds of microseconds to
+milliseconds. Async callers use ``sign_packet_async`` /
+``verify_signature_async``, which run the same code on a bounded thread
+pool (``CryptoExecutor``); ``cryptography`` releases the GIL, so
+signatures run in parallel while the event loop keeps serving requests.
+
+Keys may be RSA (PSS/SHA-256) or Ed25519. Verdicts are cached per
+(packet_hash, signature, key id) in a bounded LRU (``VerdictCache``),
+so retransmitted packets and replayed batches skip the public-key math;
+``verify_many`` verifies a whole batch in parallel.
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple, TypeVar
 from dataclasses import dataclass
 from datetime import datetime
-import hashlib
-import json
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa, padding
 from cryptography.exceptions import InvalidSignature
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 import structlog
 
+from common.canonical import CanonicalPacketMixin
+from common.wire import WireFormatError, packb, unpackb
+
 logger = structlog.get_logger()
 
 # Prometheus metrics
@@ -30,16 +50,236 @@ PACKET_CRYPTO_DURATION = Histogram(
     'Duration of cryptographic operations',
     ['operation']
 )
+CRYPTO_EXECUTOR_WAIT = Histogram(
+    'packet_crypto_executor_wait_seconds',
+    'Time crypto operations wait for an executor thread',
+    ['operation'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+CRYPTO_EXECUTOR_PENDING = Gauge(
+    'packet_crypto_executor_pending',
+    'Crypto operations queued or running on the executor'
+)
+CRYPTO_EXECUTOR_REJECTED = Counter(
+    'packet_crypto_executor_rejected_total',
+    'Crypto operations refused because the executor queue stayed full',
+    ['operation']
+)
+
+SIGNATURE_CACHE_LOOKUPS = Counter(
+    'packet_crypto_signature_cache_total',
+    'Verified-signature cache lookups',
+    ['result']
+)
+
+T = TypeVar("T")
+VerdictKey = Tuple[str, bytes, str]  # (packet_hash, signature, key_id)
+
+
+class CryptoBusyError(RuntimeError):
+    """Crypto executor queue stayed full for ``acquire_timeout`` seconds"""
+
+
+class CryptoExecutor:
+    """
+    Thread pool for signature work with a bounded queue
+    
+    At most ``max_pending`` operations are queued or running; further
+    callers wait for a slot (backpressure) and get CryptoBusyError once
+    ``acquire_timeout`` passes. The pool is created on first use.
+    
+    Args:
+        workers: Pool threads (default: one per CPU)
+        max_pending: Operations queued or running at once
+        acquire_timeout: Seconds to wait for a slot (None: no limit)
+    """
+    
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 256,
+                 acquire_timeout: Optional[float] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.acquire_timeout = acquire_timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # asyncio primitives belong to one loop
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+    
+    @classmethod
+    def from_env(cls) -> "CryptoExecutor":
+        """CRYPTO_WORKERS, CRYPTO_MAX_PENDING and CRYPTO_ACQUIRE_TIMEOUT_MS (0: no limit)"""
+        timeout_ms = float(os.getenv("CRYPTO_ACQUIRE_TIMEOUT_MS", "0"))
+        return cls(
+            workers=int(os.getenv("CRYPTO_WORKERS", "0")) or None,
+            max_pending=int(os.getenv("CRYPTO_MAX_PENDING", "256")),
+            acquire_timeout=timeout_ms / 1000 if timeout_ms > 0 else None,
+        )
+    
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="packet-crypto")
+            return self._pool
+    
+    async def run(self, operation: str, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``fn(*args)`` on the pool
+        
+        Args:
+            operation: Metric label (sign_packet, verify_signature, ...)
+        
+        Raises:
+            CryptoBusyError: No slot within ``acquire_timeout``
+        """
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+        
+        submitted = time.perf_counter()
+        try:
+            await asyncio.wait_for(slots.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            CRYPTO_EXECUTOR_REJECTED.labels(operation=operation).inc()
+            raise CryptoBusyError(f"Crypto executor saturated ({self.max_pending} operations pending)")
+        
+        def call() -> T:
+            CRYPTO_EXECUTOR_WAIT.labels(operation=operation).observe(time.perf_counter() - submitted)
+            return fn(*args)
+        
+        CRYPTO_EXECUTOR_PENDING.inc()
+        try:
+            return await loop.run_in_executor(self._executor(), call)
+        finally:
+            CRYPTO_EXECUTOR_PENDING.dec()
+            slots.release()
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool threads (a later run() starts a new pool)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+_default_executor: Optional[CryptoExecutor] = None
+
+
+def default_executor() -> CryptoExecutor:
+    """Process-wide executor for handlers without their own (configured from env)"""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = CryptoExecutor.from_env()
+    return _default_executor
+
+
+class VerdictCache:
+    """
+    Bounded LRU of signature verdicts
+    
+    Keyed by (packet_hash, signature, key id). The signed message is the
+    packet hash, so a key always verifies the same way. Only definite
+    verdicts are stored; errors are retried.
+    
+    Args:
+        capacity: Entries kept (0 disables the cache)
+    """
+    
+    def __init__(self, capacity: int = 16384):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[VerdictKey, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hit = SIGNATURE_CACHE_LOOKUPS.labels(result='hit')
+        self._miss = SIGNATURE_CACHE_LOOKUPS.labels(result='miss')
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: VerdictKey) -> Optional[bool]:
+        """Cached verdict, or None"""
+        if not self.capacity:
+            return None
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        (self._hit if verdict is not None else self._miss).inc()
+        return verdict
+    
+    def put(self, key: VerdictKey, verdict: bool) -> None:
+        if not self.capacity:
+            return
+        with self._lock:
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def key_id(public_key: Any) -> str:
+    """Short fingerprint of a public key (BLAKE2b of its SubjectPublicKeyInfo)"""
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return hashlib.blake2b(der, digest_size=8).hexdigest()
+
+
+# RSA signatures use PSS with SHA-256
+_PSS = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH)
+
+
+def sign_message(private_key: Any, message: bytes) -> bytes:
+    """Sign raw bytes with an RSA (PSS/SHA-256) or Ed25519 private key"""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(message)
+    return private_key.sign(message, _PSS, hashes.SHA256())
+
+
+def verify_message(public_key: Any, signature: bytes, message: bytes) -> None:
+    """
+    Verify raw bytes with an RSA (PSS/SHA-256) or Ed25519 public key
+    
+    Raises:
+        InvalidSignature: Signature does not match
+    """
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        public_key.verify(signature, message)
+    else:
+        public_key.verify(signature, message, _PSS, hashes.SHA256())
+
+
+def signature_algorithm(key: Any) -> str:
+    """"ed25519" or "rsa-pss-sha256" for a public or private key"""
+    if isinstance(key, (ed25519.Ed25519PublicKey, ed25519.Ed25519PrivateKey)):
+        return "ed25519"
+    return "rsa-pss-sha256"
 
 
 @dataclass
-class CryptoPacket:
+class CryptoPacket(CanonicalPacketMixin):
     """
     Cryptographically secured packet
     
     PUBLIC KEY INCOMING - Verify signatures
     PRIVATE KEY OUTGOING - Sign responses
+    
+    compute_hash() is memoized: the canonical encoding is reused until a
+    hashed field is reassigned or the payload is mutated.
     """
+    CANONICAL_FIELDS = ("correlation_id", "source", "payload", "timestamp")
+    WIRE_FIELDS = ("correlation_id", "source", "payload", "signature", "timestamp", "packet_hash")
+    
     correlation_id: str
     source: str
     payload: Dict[str, Any]
@@ -54,14 +294,8 @@ class CryptoPacket:
             self.packet_hash = self.compute_hash()
     
     def compute_hash(self) -> str:
-        """Compute BLAKE2b hash of packet contents"""
-        data = json.dumps({
-            "correlation_id": self.correlation_id,
-            "source": self.source,
-            "payload": self.payload,
-            "timestamp": self.timestamp
-        }, sort_keys=True)
-        return hashlib.blake2b(data.encode()).hexdigest()
+        """Compute BLAKE2b hash of packet contents (memoized)"""
+        return self.canonical_digest()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -73,6 +307,40 @@ class CryptoPacket:
             "timestamp": self.timestamp,
             "packet_hash": self.packet_hash
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CryptoPacket":
+        """Build a packet from to_dict() output (hex or raw signature)"""
+        signature = data.get("signature")
+        if isinstance(signature, str):
+            signature = bytes.fromhex(signature)
+        return cls(
+            correlation_id=data["correlation_id"],
+            source=data["source"],
+            payload=data.get("payload", {}),
+            signature=signature,
+            timestamp=data.get("timestamp"),
+            packet_hash=data.get("packet_hash")
+        )
+    
+    def to_msgpack(self) -> bytes:
+        """Positional MessagePack form; the signature travels as raw bytes"""
+        return packb([getattr(self, name) for name in self.WIRE_FIELDS])
+    
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> "CryptoPacket":
+        """
+        Build a packet from a MessagePack map or positional array
+        
+        Raises:
+            WireFormatError: Malformed body or missing fields
+        """
+        obj = unpackb(data)
+        if isinstance(obj, list):
+            obj = dict(zip(cls.WIRE_FIELDS, obj))
+        if not isinstance(obj, dict) or "correlation_id" not in obj or "source" not in obj:
+            raise WireFormatError("CryptoPacket needs at least correlation_id and source")
+        return cls.from_dict(obj)
 
 
 class PacketCryptoHandler:
@@ -80,22 +348,32 @@ class PacketCryptoHandler:
     🛡️ DEFENSIVE COORDINATOR - Cryptographic Packet Handler
     
     Integrates with WildFisheriesPacketSwitcher for secure packet processing
-    Uses RSA for signature verification and AES for payload encryption
+    Uses RSA or Ed25519 for signatures and AES for payload encryption
     """
     
-    def __init__(self, public_key_pem: Optional[bytes] = None, private_key_pem: Optional[bytes] = None):
+    def __init__(self, public_key_pem: Optional[bytes] = None, private_key_pem: Optional[bytes] = None,
+                 executor: Optional[CryptoExecutor] = None, verdict_cache: Optional[VerdictCache] = None):
         """
         Initialize crypto handler with optional keys
         
         Args:
-            public_key_pem: PEM-encoded public key for verification
-            private_key_pem: PEM-encoded private key for signing
+            public_key_pem: PEM-encoded public key for verification (RSA or Ed25519)
+            private_key_pem: PEM-encoded private key for signing (RSA or Ed25519)
+            executor: Pool for the async variants (default: default_executor())
+            verdict_cache: Verified-signature cache (default: a new one of
+                           CRYPTO_VERDICT_CACHE_SIZE entries)
         """
         self.public_key = None
         self.private_key = None
+        self.key_id: Optional[str] = None
+        self.executor = executor
+        self.verdict_cache = verdict_cache if verdict_cache is not None else VerdictCache(
+            int(os.getenv("CRYPTO_VERDICT_CACHE_SIZE", "16384"))
+        )
         
         if public_key_pem:
             self.public_key = serialization.load_pem_public_key(public_key_pem)
+            self.key_id = key_id(self.public_key)
         
         if private_key_pem:
             self.private_key = serialization.load_pem_private_key(
@@ -104,18 +382,26 @@ class PacketCryptoHandler:
             )
     
     @staticmethod
-    def generate_keypair() -> tuple[bytes, bytes]:
+    def generate_keypair(algorithm: str = "rsa") -> tuple[bytes, bytes]:
         """
-        Generate new RSA keypair for packet signing
+        Generate new keypair for packet signing
+        
+        Args:
+            algorithm: "rsa" (2048-bit) or "ed25519"
         
         Returns:
             Tuple of (private_key_pem, public_key_pem)
         """
         with PACKET_CRYPTO_DURATION.labels(operation='generate_keypair').time():
-            private_key = rsa.generate_private_key(
-                public_exponent=65537,
-                key_size=2048
-            )
+            if algorithm == "ed25519":
+                private_key = ed25519.Ed25519PrivateKey.generate()
+            elif algorithm == "rsa":
+                private_key = rsa.generate_private_key(
+                    public_exponent=65537,
+                    key_size=2048
+                )
+            else:
+                raise ValueError(f"Unsupported key algorithm: {algorithm}")
             public_key = private_key.public_key()
             
             private_pem = private_key.private_bytes(
@@ -152,14 +438,7 @@ class PacketCryptoHandler:
         with PACKET_CRYPTO_DURATION.labels(operation='sign_packet').time():
             try:
                 # Sign the packet hash
-                signature = self.private_key.sign(
-                    packet.packet_hash.encode(),
-                    padding.PSS(
-                        mgf=padding.MGF1(hashes.SHA256()),
-                        salt_length=padding.PSS.MAX_LENGTH
-                    ),
-                    hashes.SHA256()
-                )
+                signature = sign_message(self.private_key, packet.packet_hash.encode())
                 
                 PACKET_CRYPTO_OPERATIONS.labels(
                     operation='sign_packet',
@@ -208,17 +487,20 @@ class PacketCryptoHandler:
             )
             return False
         
+        verdict = self.verdict_cache.get(self._verdict_key(packet))
+        if verdict is not None:
+            return verdict
+        return self._verify_uncached(packet)
+    
+    def _verdict_key(self, packet: CryptoPacket) -> VerdictKey:
+        return (packet.packet_hash, bytes(packet.signature), self.key_id)
+    
+    def _verify_uncached(self, packet: CryptoPacket) -> bool:
+        """Public-key verification of a signed packet; definite verdicts are cached"""
         with PACKET_CRYPTO_DURATION.labels(operation='verify_signature').time():
             try:
-                self.public_key.verify(
-                    packet.signature,
-                    packet.packet_hash.encode(),
-                    padding.PSS(
-                        mgf=padding.MGF1(hashes.SHA256()),
-                        salt_length=padding.PSS.MAX_LENGTH
-                    ),
-                    hashes.SHA256()
-                )
+                verify_message(self.public_key, packet.signature, packet.packet_hash.encode())
+                self.verdict_cache.put(self._verdict_key(packet), True)
                 
                 PACKET_CRYPTO_OPERATIONS.labels(
                     operation='verify_signature',
@@ -234,6 +516,7 @@ class PacketCryptoHandler:
                 return True
                 
             except InvalidSignature:
+                self.verdict_cache.put(self._verdict_key(packet), False)
                 PACKET_CRYPTO_OPERATIONS.labels(
                     operation='verify_signature',
                     status='invalid'
@@ -261,6 +544,87 @@ class PacketCryptoHandler:
                 
                 return False
     
+    async def sign_packet_async(self, packet: CryptoPacket) -> bytes:
+        """
+        sign_packet() on the crypto executor, off the event loop
+        
+        Raises:
+            CryptoBusyError: Executor queue full past its timeout
+        """
+        if not self.private_key:
+            raise ValueError("Private key not loaded - cannot sign packets")
+        return await (self.executor or default_executor()).run("sign_packet", self.sign_packet, packet)
+    
+    async def verify_signature_async(self, packet: CryptoPacket) -> bool:
+        """
+        verify_signature() on the crypto executor, off the event loop
+        
+        Packets that need no public-key work (no key loaded, no signature,
+        cached verdict) are answered inline.
+        
+        Raises:
+            CryptoBusyError: Executor queue full past its timeout
+        """
+        if not self.public_key or not packet.signature:
+            return self.verify_signature(packet)
+        verdict = self.verdict_cache.get(self._verdict_key(packet))
+        if verdict is not None:
+            return verdict
+        return await (self.executor or default_executor()).run("verify_signature", self._verify_uncached, packet)
+    
+    async def verify_many(self, packets: Sequence[CryptoPacket]) -> List[bool]:
+        """
+        Verify a batch of packets in parallel
+        
+        Cached verdicts and repeats within the batch cost one lookup; the
+        remaining signatures are split into one chunk per executor thread.
+        
+        Args:
+            packets: Packets to verify
+        
+        Returns:
+            One verdict per packet, in order (same rules as verify_signature)
+        
+        Raises:
+            CryptoBusyError: Executor queue full past its timeout
+        """
+        if not self.public_key:
+            return [self.verify_signature(packet) for packet in packets]
+        
+        verdicts: List[Optional[bool]] = [None] * len(packets)
+        pending: Dict[VerdictKey, List[int]] = {}
+        for index, packet in enumerate(packets):
+            if not packet.signature:
+                verdicts[index] = self.verify_signature(packet)
+                continue
+            key = self._verdict_key(packet)
+            if key in pending:
+                pending[key].append(index)
+                continue
+            verdict = self.verdict_cache.get(key)
+            if verdict is not None:
+                verdicts[index] = verdict
+            else:
+                pending[key] = [index]
+        
+        if pending:
+            executor = self.executor or default_executor()
+            groups = list(pending.values())
+            size = -(-len(groups) // executor.workers)
+            chunks = [groups[i:i + size] for i in range(0, len(groups), size)]
+            results = await asyncio.gather(*(
+                executor.run("verify_signature", self._verify_chunk, [packets[g[0]] for g in chunk])
+                for chunk in chunks
+            ))
+            for chunk, chunk_verdicts in zip(chunks, results):
+                for group, verdict in zip(chunk, chunk_verdicts):
+                    for index in group:
+                        verdicts[index] = verdict
+        return verdicts
+    
+    def _verify_chunk(self, packets: List[CryptoPacket]) -> List[bool]:
+        return [self._verify_uncached(packet) for packet in packets]
+    
     def validate_packet_integrity(self, packet: CryptoPacket) -> bool:
         """
         Validate packet hash integrity
@@ -312,10 +676,15 @@ class SecurePacketSwitcher:
     Enhanced packet switcher with cryptographic validation
     
     Combines WildFisheriesPacketSwitcher with PacketCryptoHandler
+    
+    With a ``batch_signer`` (security.batch_signing.MerkleBatchSigner)
+    responses carry a Merkle batch envelope under "batch_signature"
+    instead of an individual "signature".
     """
     
-    def __init__(self, crypto_handler: PacketCryptoHandler):
+    def __init__(self, crypto_handler: PacketCryptoHandler, batch_signer: Optional[Any] = None):
         self.crypto = crypto_handler
+        self.batch_signer = batch_signer
         
         # Import packet switcher
         from packet_switching.handler import WildFisheriesPacketSwitcher
@@ -327,7 +696,7 @@ class SecurePacketSwitcher:
         
         DEFENSIVE LAYERS:
         1. Hash integrity check (BLAKE2)
-        2. Signature verification (RSA)
+        2. Signature verification (RSA, on the crypto executor)
         3. Packet switching validation (3-layer defense)
         4. Pillar routing
         
@@ -341,8 +710,8 @@ class SecurePacketSwitcher:
         if not self.crypto.validate_packet_integrity(packet):
             raise ValueError("Packet integrity check failed")
         
-        # Layer 2: Verify signature (if present)
-        if packet.signature and not self.crypto.verify_signature(packet):
+        # Layer 2: Verify signature (if present), off the event loop
+        if packet.signature and not await self.crypto.verify_signature_async(packet):
             raise ValueError("Invalid packet signature")
         
         # Layer 3: Convert to IncomingPacket for switcher
@@ -365,6 +734,9 @@ class SecurePacketSwitcher:
                 source="seatrace",
                 payload=response
             )
-            response["signature"] = self.crypto.sign_packet(response_packet).hex()
+            if self.batch_signer is not None:
+                response["batch_signature"] = await self.batch_signer.sign(response_packet)
+            else:
+                response["signature"] = (await self.crypto.sign_packet_async(response_packet)).hex()
         
-        return response 🌊
\ No newline at end of file
+        return response
@@ -2,6 +2,7 @@
 import structlog
 from datetime import datetime
 from typing import Dict, Tuple
+from common.online_stats import OnlineStats
 from .models import VesselData, ValidationResult, ValidationError
 
 logger = structlog.get_logger()
@@ -17,6 +18,10 @@ class DeckSideProcessor:
         "Mackerel", "Sardine", "Anchovy", "Haddock"
     }
     
+    # "Unusually large" = mean + 4 std of valid catches seen so far
+    # (500,000 kg until 100 catches have been recorded)
+    CATCH_WEIGHT_BASELINE = OnlineStats(k=4.0, min_samples=100, fallback=500000.0)
+    
     @staticmethod
     def validate_vessel_data(vessel_data: VesselData) -> Tuple[ValidationResult, Dict]:
         """
@@ -45,7 +50,8 @@ class DeckSideProcessor:
             ))
         
         # Warn if catch is unusually large (but still valid)
-        if vessel_data.catch_weight > 500000:
+        baseline = DeckSideProcessor.CATCH_WEIGHT_BASELINE
+        if vessel_data.catch_weight > baseline.upper:
             warnings.append("Unusually large catch detected - verify with vessel operator")
         
         # Validate species
@@ -88,6 +94,17 @@ class DeckSideProcessor:
         
         return validation_result, enriched_data
     
+    @staticmethod
+    def record_catch(vessel_data: VesselData) -> None:
+        """
+        Add an accepted catch to the "unusually large" baseline.
+        
+        Validation itself is side-effect free (the standalone validate
+        endpoint must not move the baseline); call this only for records
+        that were processed and passed validation.
+        """
+        DeckSideProcessor.CATCH_WEIGHT_BASELINE.update(vessel_data.catch_weight)
+    
     @staticmethod
     def enrich_vessel_data(vessel_data: VesselData, validation_result: ValidationResult) -> Dict:
         """
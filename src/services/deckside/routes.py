@@ -77,6 +77,7 @@ async def process_packet(
         
         # Determine processing status
         if validation_result.valid:
+            DeckSideProcessor.record_catch(request.vessel_data)
             status = "processed"
             next_step = "route_to_dockside"
         else:
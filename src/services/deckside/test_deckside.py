@@ -82,6 +82,30 @@ def test_validate_endpoint():
     assert "validation_results" in data
 
 
+def test_only_processed_catches_move_baseline():
+    """Validation and rejected packets leave the catch-weight baseline alone"""
+    from services.deckside.processor import DeckSideProcessor
+
+    baseline = DeckSideProcessor.CATCH_WEIGHT_BASELINE
+    seen = baseline.n
+    vessel_data = {"vessel_id": "WSP-004", "catch_weight": 300.0, "species": "Cod"}
+
+    client.post("/api/v1/validate", json=vessel_data)
+    client.post("/api/v1/process", json={
+        "packet_id": "test-004",
+        "vessel_data": dict(vessel_data, species="Kraken"),
+        "verified": True
+    })
+    assert baseline.n == seen
+
+    client.post("/api/v1/process", json={
+        "packet_id": "test-005",
+        "vessel_data": vessel_data,
+        "verified": True
+    })
+    assert baseline.n == seen + 1
+
+
 def test_correlation_id_propagation():
     """Test that correlation IDs are propagated"""
     response = client.get(
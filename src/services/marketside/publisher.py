@@ -2,12 +2,25 @@
 import structlog
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
-import hashlib
-import json
+
+from common.canonical import canonical_bytes, digest
+from common.merkle import leaf_hash, merkle_root
 
 logger = structlog.get_logger()
 
 
+def chain_root(traceability_chain: List[Dict]) -> str:
+    """
+    Merkle root over a traceability chain
+
+    Every entry is hashed once in canonical form - a client-supplied
+    packet_hash is covered like any other field, never trusted in place
+    of the entry's contents.
+    """
+    leaves = [leaf_hash(digest(canonical_bytes(entry)).encode()) for entry in traceability_chain]
+    return merkle_root(leaves).hex()
+
+
 class MarketPublisher:
     """Publishes data to external markets with PRIVATE KEY OUTGOING"""
     
@@ -94,18 +107,19 @@ class MarketPublisher:
                 "certificate_id": certificate_id,
                 "packet_id": packet_id,
                 "vessel_id": vessel_id,
-                "traceability_chain": traceability_chain,
+                "chain_root": chain_root(traceability_chain),
                 "issued_at": datetime.utcnow().isoformat(),
                 "valid_until": (datetime.utcnow() + timedelta(days=90)).isoformat(),
                 "issuer": "SeaTrace-ODOO MarketSide",
                 "type": "certificate"
             }
             
-            # Generate signature (PRIVATE KEY OUTGOING)
+            # Generate signature (PRIVATE KEY OUTGOING) over the certificate
+            # header; the chain is covered by chain_root, not hashed in full
             # In production: use PacketCryptoHandler with private key
-            certificate_json = json.dumps(certificate, sort_keys=True)
-            signature = hashlib.sha256(certificate_json.encode()).hexdigest()
+            signature = digest(canonical_bytes(certificate))
             certificate["signature"] = signature
+            certificate["traceability_chain"] = traceability_chain
             
             self._published_items[certificate_id] = certificate
             
@@ -120,6 +134,7 @@ class MarketPublisher:
                 "success": True,
                 "certificate_id": certificate_id,
                 "signature": signature,
+                "chain_root": certificate["chain_root"],
                 "valid_until": certificate["valid_until"]
             }
             
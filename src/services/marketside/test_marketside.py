@@ -85,6 +85,32 @@ def test_publish_certificate():
     assert data["signature"] is not None
 
 
+def test_certificate_chain_root_covers_entries(monkeypatch):
+    """Chain entries are hashed one by one; the certificate never encodes the whole chain"""
+    from common import canonical
+    from services.marketside import publisher as publisher_module
+
+    encoded = []
+    original = publisher_module.canonical_bytes
+    monkeypatch.setattr(publisher_module, "canonical_bytes", lambda obj: encoded.append(set(obj)) or original(obj))
+    chain = [{"pillar": "seaside", "packet_hash": canonical.digest(b"catch"), "payload": {"weight": 120}}]
+
+    response = client.post("/api/v1/publish", json={
+        "packet_id": "test-004",
+        "correlation_id": "corr-004",
+        "publish_type": "certificate",
+        "data": {"vessel_id": "WSP-001", "traceability_chain": chain},
+        "signature_required": True
+    })
+
+    assert response.status_code == 200
+    assert encoded and all("traceability_chain" not in keys for keys in encoded)
+    # A reused packet_hash does not hide a changed payload
+    assert publisher_module.chain_root(chain) != publisher_module.chain_root(
+        [dict(chain[0], payload={"weight": 9000})]
+    )
+
+
 def test_verify_valid_pm_token():
     """Test verifying a valid PM token"""
     request_data = {
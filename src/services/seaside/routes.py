@@ -3,6 +3,8 @@
 
 from fastapi import APIRouter, HTTPException, status
 from datetime import datetime
+import base64
+import binascii
 import uuid
 import sys
 from pathlib import Path
@@ -18,7 +20,8 @@ from services.seaside.models import (
 
 # Try to import crypto handler (optional for basic testing)
 try:
-    from security.packet_crypto import PacketCryptoHandler, CryptoPacket
+    from security.packet_crypto import CryptoPacket
+    from security.key_material import KeyMaterial
     CRYPTO_AVAILABLE = True
 except ImportError:
     CRYPTO_AVAILABLE = False
@@ -26,16 +29,24 @@ except ImportError:
 
 router = APIRouter()
 
-# Global crypto handler (will be initialized if available)
-crypto_handler = None
+# Vessel public key, loaded on the first signed packet (SEASIDE_PUBLIC_KEY /
+# SEASIDE_PUBLIC_KEY_PATH, see security.key_material) - nothing is generated at import
+key_material = KeyMaterial.from_env("SEASIDE") if CRYPTO_AVAILABLE else None
 
-if CRYPTO_AVAILABLE:
+
+def get_crypto_handler():
+    """Crypto handler for the configured keys (None when not configured)"""
+    if key_material is None:
+        return None
+    return key_material.handler()
+
+
+def _signature_bytes(signature: str) -> bytes:
+    """Packet signatures arrive as hex (router/JSON form) or base64"""
     try:
-        # Initialize with test keys for now (in production, load from secure storage)
-        crypto_handler = PacketCryptoHandler.generate_keypair()
-        print("✅ Crypto handler initialized")
-    except Exception as e:
-        print(f"⚠️  Could not initialize crypto handler: {e}")
+        return bytes.fromhex(signature)
+    except ValueError:
+        return base64.b64decode(signature, validate=True)
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -69,31 +80,35 @@ async def ingest_packet(packet: IncomingPacket):
         # Generate packet ID
         packet_id = str(uuid.uuid4())
         
-        # Verify signature if crypto is available and signature provided
+        # Verify signature if a public key is configured and a signature provided
         verified = False
-        if CRYPTO_AVAILABLE and crypto_handler and packet.signature:
+        crypto_handler = get_crypto_handler() if packet.signature else None
+        if crypto_handler is not None and crypto_handler.public_key is not None:
             try:
-                # Create CryptoPacket from incoming packet
-                crypto_packet = CryptoPacket(
-                    correlation_id=packet.correlation_id,
-                    source=packet.source,
-                    payload=packet.payload
+                signature = _signature_bytes(packet.signature)
+            except (binascii.Error, ValueError):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Malformed packet signature (expected hex or base64)"
                 )
-                crypto_packet.signature = packet.signature.encode() if isinstance(packet.signature, str) else packet.signature
-                
-                # Verify signature
-                verified = crypto_handler.verify_signature(crypto_packet)
-                
-                if not verified:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Invalid packet signature"
-                    )
-            except Exception as e:
-                print(f"⚠️  Signature verification failed: {e}")
+            
+            # The signature covers the packet hash, timestamp included
+            crypto_packet = CryptoPacket(
+                correlation_id=packet.correlation_id,
+                source=packet.source,
+                payload=packet.payload,
+                signature=signature,
+                timestamp=packet.timestamp
+            )
+            
+            # Verify signature (off the event loop)
+            verified = await crypto_handler.verify_signature_async(crypto_packet)
+            
+            if not verified:
+                print(f"⚠️  Signature verification failed: {packet.correlation_id}")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail=f"Signature verification error: {str(e)}"
+                    detail="Invalid packet signature"
                 )
         
         # Process packet (in production, this would route to DeckSide)
@@ -148,5 +163,6 @@ async def get_metrics():
         "packets_ingested_total": 0,
         "packets_verified_total": 0,
         "packets_rejected_total": 0,
-        "crypto_available": CRYPTO_AVAILABLE
+        "crypto_available": CRYPTO_AVAILABLE,
+        "keys_configured": bool(key_material and key_material.configured)
     }
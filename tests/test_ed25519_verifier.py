@@ -0,0 +1,77 @@
+# 🔐 SeaTrace Ed25519 Verifier Tests
+# For the Commons Good! 🌊
+
+import base64
+import json
+import time
+
+import nacl.signing
+import pytest
+from src.security.ed25519_verifier import Ed25519Verifier, Keyring, VerifiedTokenCache
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def make_token(signing_key: nacl.signing.SigningKey, **claims) -> str:
+    header = b64url(json.dumps({"alg": "EdDSA", "kid": "k1"}).encode())
+    payload = b64url(json.dumps(claims).encode())
+    signature = signing_key.sign(f"{header}.{payload}".encode()).signature
+    return f"{header}.{payload}.{b64url(signature)}"
+
+
+@pytest.fixture
+def signing_key():
+    return nacl.signing.SigningKey.generate()
+
+
+@pytest.fixture
+def verify_key_b64(signing_key):
+    return base64.b64encode(bytes(signing_key.verify_key)).decode()
+
+
+class TestEd25519VerifierCache:
+    """Test suite for cached packet-path token verification"""
+
+    def test_repeated_token_verified_once(self, signing_key, verify_key_b64, monkeypatch):
+        """verify_jws answers repeated tokens from the cache"""
+        verifier = Ed25519Verifier(verify_key_b64, token_cache=VerifiedTokenCache())
+        token = make_token(signing_key, user="fisher@example.com", exp=time.time() + 3600)
+        calls = []
+        original = verifier._verify_signature
+        monkeypatch.setattr(verifier, "_verify_signature", lambda t: calls.append(t) or original(t))
+
+        assert verifier.verify_jws(token)["user"] == "fisher@example.com"
+        assert verifier.verify_jws(token, require_exp=True)["user"] == "fisher@example.com"
+        assert len(calls) == 1
+
+    def test_expired_token_rejected_even_when_cached(self, signing_key, verify_key_b64):
+        """require_exp is enforced on cache hits too"""
+        verifier = Ed25519Verifier(verify_key_b64, token_cache=VerifiedTokenCache())
+        token = make_token(signing_key, user="fisher@example.com")
+        verifier.verify_jws(token)
+
+        with pytest.raises(ValueError):
+            verifier.verify_jws(token, require_exp=True)
+
+
+class TestEd25519VerifierKeyring:
+    """Test suite for keyring-backed verification"""
+
+    def test_key_selected_by_kid(self, signing_key, verify_key_b64):
+        """Tokens and packets are checked with the key for their kid"""
+        other = nacl.signing.SigningKey.generate()
+        keyring = Keyring.from_keys({
+            "k0": base64.b64encode(bytes(other.verify_key)).decode(),
+            "k1": verify_key_b64,
+        })
+        verifier = Ed25519Verifier(keyring=keyring, token_cache=VerifiedTokenCache())
+        packet = {"vessel_id": "WSP-001"}
+        signature = base64.b64encode(
+            signing_key.sign(json.dumps(packet, sort_keys=True).encode()).signature
+        ).decode()
+
+        assert verifier.verify_jws(make_token(signing_key, user="fisher@example.com"))["user"] == "fisher@example.com"
+        assert verifier.verify_packet_signature(packet, signature, kid="k1") is True
+        assert verifier.verify_packet_signature(packet, signature, kid="k0") is False
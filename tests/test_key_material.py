@@ -0,0 +1,139 @@
+# 🔑 SeaTrace Key Material Tests
+# For the Commons Good! 🌊
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from src.security.key_material import KeyMaterial
+from src.security.packet_crypto import PacketCryptoHandler
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+@pytest.fixture(scope="module")
+def keypair():
+    """One RSA keypair for the module"""
+    return PacketCryptoHandler.generate_keypair()
+
+
+def run_python(code: str, env: dict = None) -> subprocess.CompletedProcess:
+    """Run a snippet in a fresh interpreter with src/ on the path"""
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=SRC,
+        env=dict(os.environ, PYTHONPATH=str(SRC), **(env or {})),
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+
+
+class TestKeyMaterial:
+    """Test suite for the lazy key loader"""
+
+    def test_nothing_read_until_first_use(self, tmp_path):
+        """Paths are only read when the handler is first needed"""
+        material = KeyMaterial(public_path=str(tmp_path / "missing.pem"))
+
+        assert material.configured
+        with pytest.raises(OSError):
+            material.handler()
+
+    def test_handler_is_parsed_once(self, tmp_path, keypair):
+        """The parsed handler is cached"""
+        _, public_pem = keypair
+        (tmp_path / "public.pem").write_bytes(public_pem)
+        material = KeyMaterial(public_path=str(tmp_path / "public.pem"))
+
+        handler = material.handler()
+
+        assert handler.public_key is not None and handler.private_key is None
+        assert material.handler() is handler
+
+    def test_not_configured(self):
+        """No key source means no handler"""
+        material = KeyMaterial()
+
+        assert not material.configured
+        assert material.handler() is None
+
+    def test_pem_from_env_secret(self, monkeypatch, keypair):
+        """<PREFIX>_PUBLIC_KEY carries the PEM itself"""
+        _, public_pem = keypair
+        monkeypatch.setenv("TESTSVC_PUBLIC_KEY", public_pem.decode())
+
+        handler = KeyMaterial.from_env("TESTSVC").handler()
+
+        assert handler.key_id == PacketCryptoHandler(public_key_pem=public_pem).key_id
+
+    def test_dev_pair_generated_once(self, tmp_path, monkeypatch):
+        """The development pair is persisted and reused on the next start"""
+        first = KeyMaterial(dev_dir=str(tmp_path), dev_generate=True, algorithm="ed25519").handler()
+
+        assert (tmp_path / "private.pem").stat().st_mode & 0o777 == 0o600
+
+        def no_keygen(*args, **kwargs):
+            raise AssertionError("key generated again")
+        monkeypatch.setattr(PacketCryptoHandler, "generate_keypair", staticmethod(no_keygen))
+        second = KeyMaterial(dev_dir=str(tmp_path), dev_generate=True).handler()
+
+        assert second.key_id == first.key_id
+
+
+class TestSeaSideStartup:
+    """Startup-time guards for the SeaSide service"""
+
+    def test_import_generates_no_keys(self):
+        """Importing the app never generates a key and stays fast"""
+        result = run_python("""
+            import time
+            from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+            def no_keygen(*args, **kwargs):
+                raise SystemExit("key generated at import")
+            rsa.generate_private_key = no_keygen
+            ed25519.Ed25519PrivateKey.generate = no_keygen
+
+            start = time.perf_counter()
+            import services.seaside.main
+            print("IMPORT_SECONDS", time.perf_counter() - start)
+        """)
+
+        assert result.returncode == 0, result.stderr
+        seconds = float(result.stdout.split("IMPORT_SECONDS")[1].split()[0])
+        assert seconds < 10
+
+    def test_signed_packet_verified(self, tmp_path, keypair):
+        """A packet signed with the configured key is accepted, a forged one is not"""
+        private_pem, public_pem = keypair
+        (tmp_path / "public.pem").write_bytes(public_pem)
+        (tmp_path / "private.pem").write_bytes(private_pem)
+
+        result = run_python("""
+            import json, os
+            from fastapi.testclient import TestClient
+            from security.packet_crypto import CryptoPacket, PacketCryptoHandler
+            from services.seaside.main import app
+
+            signer = PacketCryptoHandler(private_key_pem=open(os.environ["PRIVATE"], "rb").read())
+            packet = CryptoPacket(correlation_id="c-1", source="vessel", payload={"vessel_id": "WSP-001"})
+            body = {
+                "correlation_id": packet.correlation_id,
+                "source": packet.source,
+                "payload": packet.payload,
+                "timestamp": packet.timestamp,
+                "signature": signer.sign_packet(packet).hex(),
+            }
+            client = TestClient(app)
+            good = client.post("/api/v1/ingest", json=body)
+            forged = client.post("/api/v1/ingest", json=dict(body, payload={"vessel_id": "WSP-666"}))
+            print("RESULT", json.dumps([good.status_code, good.json().get("verified"), forged.status_code]))
+        """, env={"SEASIDE_PUBLIC_KEY_PATH": str(tmp_path / "public.pem"), "PRIVATE": str(tmp_path / "private.pem")})
+
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout.split("RESULT")[1]) == [201, True, 401]
@@ -1,10 +1,16 @@
 # 🔐 SeaTrace Packet Cryptography Tests
 # For the Commons Good! 🌊
 
+import asyncio
+import threading
+
 import pytest
 from src.security.packet_crypto import (
     PacketCryptoHandler,
-    CryptoPacket
+    CryptoPacket,
+    CryptoBusyError,
+    CryptoExecutor,
+    VerdictCache
 )
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
@@ -191,6 +197,236 @@ class TestCryptoPacket:
         new_hash = packet.compute_hash()
         
         assert new_hash != original_hash
+    
+    def test_msgpack_round_trip(self, crypto_handler, sample_packet):
+        """MessagePack keeps the hash and carries the raw signature"""
+        sample_packet.signature = crypto_handler.sign_packet(sample_packet)
+        
+        wire = sample_packet.to_msgpack()
+        decoded = CryptoPacket.from_msgpack(wire)
+        
+        assert decoded.compute_hash() == sample_packet.packet_hash
+        assert decoded.signature == sample_packet.signature
+        assert crypto_handler.verify_signature(decoded)
+        assert len(wire) < len(str(sample_packet.to_dict()))
+    
+    def test_from_dict_matches_msgpack(self, sample_packet):
+        """JSON (hex signature) and MessagePack decode to the same packet"""
+        sample_packet.signature = b"\x01\x02"
+        
+        from_json = CryptoPacket.from_dict(sample_packet.to_dict())
+        from_wire = CryptoPacket.from_msgpack(sample_packet.to_msgpack())
+        
+        assert from_json == from_wire
+
+
+class TestAsyncCrypto:
+    """Test suite for the executor-backed async crypto API"""
+    
+    @pytest.mark.asyncio
+    async def test_async_sign_and_verify(self, crypto_handler, sample_packet):
+        """Async variants sign and verify like the sync ones"""
+        sample_packet.signature = await crypto_handler.sign_packet_async(sample_packet)
+        
+        assert len(sample_packet.signature) == 256
+        assert await crypto_handler.verify_signature_async(sample_packet) is True
+        
+        sample_packet.signature = b"\x00" * 256
+        assert await crypto_handler.verify_signature_async(sample_packet) is False
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_verifications(self, crypto_handler, sample_packet):
+        """Many verifications run concurrently on the executor"""
+        crypto_handler.executor = CryptoExecutor(workers=4, max_pending=8)
+        sample_packet.signature = crypto_handler.sign_packet(sample_packet)
+        
+        results = await asyncio.gather(
+            *(crypto_handler.verify_signature_async(sample_packet) for _ in range(32))
+        )
+        
+        assert all(results)
+        crypto_handler.executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self):
+        """Work runs on a pool thread, not the loop's thread"""
+        executor = CryptoExecutor(workers=1)
+        
+        ident = await executor.run("test", threading.get_ident)
+        
+        assert ident != threading.get_ident()
+        executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_raises_busy(self):
+        """Callers past max_pending give up after acquire_timeout"""
+        executor = CryptoExecutor(workers=1, max_pending=1, acquire_timeout=0.01)
+        release = threading.Event()
+        
+        blocked = asyncio.ensure_future(executor.run("test", release.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(CryptoBusyError):
+            await executor.run("test", lambda: None)
+        
+        release.set()
+        assert await blocked is True
+        executor.shutdown()
+
+
+@pytest.fixture
+def ed25519_handler():
+    """Ed25519 handler with its own small executor"""
+    private_pem, public_pem = PacketCryptoHandler.generate_keypair("ed25519")
+    handler = PacketCryptoHandler(public_pem, private_pem, executor=CryptoExecutor(workers=2))
+    yield handler
+    handler.executor.shutdown()
+
+
+def make_packets(n: int):
+    return [
+        CryptoPacket(correlation_id=f"batch-{i}", source="vessel", payload={"vessel_id": f"WSP-{i:03d}"})
+        for i in range(n)
+    ]
+
+
+class TestSignatureVerdicts:
+    """Test suite for Ed25519 keys, the verdict cache and verify_many"""
+    
+    def test_ed25519_sign_and_verify(self, ed25519_handler, sample_packet):
+        """Ed25519 keys sign and verify packets"""
+        sample_packet.signature = ed25519_handler.sign_packet(sample_packet)
+        
+        assert len(sample_packet.signature) == 64
+        assert ed25519_handler.verify_signature(sample_packet) is True
+        
+        sample_packet.signature = bytes(64)
+        assert ed25519_handler.verify_signature(sample_packet) is False
+    
+    def test_key_id_separates_keys(self, crypto_handler, ed25519_handler, sample_packet):
+        """A verdict for one key is never reused for another"""
+        sample_packet.signature = crypto_handler.sign_packet(sample_packet)
+        ed25519_handler.verdict_cache = crypto_handler.verdict_cache
+        
+        assert crypto_handler.verify_signature(sample_packet) is True
+        assert crypto_handler.key_id != ed25519_handler.key_id
+        assert ed25519_handler.verify_signature(sample_packet) is False
+    
+    def test_retransmit_hits_cache(self, crypto_handler, sample_packet):
+        """A repeated packet is answered from the cache"""
+        sample_packet.signature = crypto_handler.sign_packet(sample_packet)
+        cache = crypto_handler.verdict_cache
+        
+        assert crypto_handler.verify_signature(sample_packet) is True
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert crypto_handler.verify_signature(sample_packet) is True
+        assert (cache.hits, cache.misses) == (1, 1)
+    
+    def test_lru_eviction(self):
+        """The least recently used verdict is evicted first"""
+        cache = VerdictCache(capacity=2)
+        cache.put(("a", b"s", "k"), True)
+        cache.put(("b", b"s", "k"), True)
+        cache.get(("a", b"s", "k"))
+        cache.put(("c", b"s", "k"), False)
+        
+        assert len(cache) == 2
+        assert cache.get(("b", b"s", "k")) is None
+        assert cache.get(("a", b"s", "k")) is True
+        assert cache.get(("c", b"s", "k")) is False
+    
+    @pytest.mark.asyncio
+    async def test_verify_many(self, ed25519_handler):
+        """Batch verdicts keep order; bad and unsigned packets fail"""
+        packets = make_packets(10)
+        for packet in packets:
+            packet.signature = ed25519_handler.sign_packet(packet)
+        packets[3].signature = bytes(64)
+        packets[7].signature = None
+        
+        verdicts = await ed25519_handler.verify_many(packets)
+        
+        assert verdicts == [i not in (3, 7) for i in range(10)]
+    
+    @pytest.mark.asyncio
+    async def test_replayed_batch_is_free(self, crypto_handler):
+        """Replays and in-batch duplicates skip the public-key math"""
+        crypto_handler.executor = CryptoExecutor(workers=2)
+        packets = make_packets(6)
+        for packet in packets:
+            packet.signature = crypto_handler.sign_packet(packet)
+        cache = crypto_handler.verdict_cache
+        
+        assert all(await crypto_handler.verify_many(packets + packets[:2]))
+        assert (cache.hits, cache.misses) == (0, 6)
+        
+        assert all(await crypto_handler.verify_many(packets))
+        assert (cache.hits, cache.misses) == (6, 6)
+        crypto_handler.executor.shutdown()
+
+
+class TestMerkleBatchSigning:
+    """Test suite for Merkle-batched response signing"""
+    
+    @pytest.mark.asyncio
+    async def test_one_root_signature_per_batch(self, ed25519_handler):
+        """Concurrent responses share one signed root, each with its own path"""
+        from src.security.batch_signing import MerkleBatchSigner, verify_batch_signature
+        
+        signer = MerkleBatchSigner(ed25519_handler, window=0.01)
+        packets = make_packets(7)
+        
+        envelopes = await asyncio.gather(*(signer.sign(p) for p in packets))
+        
+        assert len({e["root_signature"] for e in envelopes}) == 1
+        assert [e["leaf_index"] for e in envelopes] == list(range(7))
+        assert all(e["batch_size"] == 7 for e in envelopes)
+        assert all(verify_batch_signature(e, ed25519_handler.public_key) for e in envelopes)
+    
+    @pytest.mark.asyncio
+    async def test_max_batch_closes_early(self, ed25519_handler):
+        """A full batch is signed without waiting for the window"""
+        from src.security.batch_signing import MerkleBatchSigner
+        
+        signer = MerkleBatchSigner(ed25519_handler, window=60, max_batch=4)
+        
+        envelopes = await asyncio.wait_for(
+            asyncio.gather(*(signer.sign(p) for p in make_packets(8))), timeout=5
+        )
+        
+        assert len({e["merkle_root"] for e in envelopes}) == 2
+    
+    @pytest.mark.asyncio
+    async def test_tampering_is_detected(self, ed25519_handler, crypto_handler):
+        """Wrong hash, wrong path or wrong key fails verification"""
+        from src.security.batch_signing import MerkleBatchSigner, verify_batch_signature
+        
+        signer = MerkleBatchSigner(ed25519_handler, window=0.005)
+        first, second = await asyncio.gather(*(signer.sign(p) for p in make_packets(2)))
+        
+        assert not verify_batch_signature(dict(first, packet_hash=second["packet_hash"]), ed25519_handler.public_key)
+        assert not verify_batch_signature(dict(first, path=second["path"]), ed25519_handler.public_key)
+        assert not verify_batch_signature(first, crypto_handler.public_key)
+    
+    @pytest.mark.asyncio
+    async def test_secure_switcher_batch_mode(self, crypto_handler, sample_packet):
+        """Batch-signed responses verify after a JSON round trip"""
+        import json
+        from src.security.batch_signing import MerkleBatchSigner, verify_signed_response
+        from src.security.packet_crypto import SecurePacketSwitcher
+        
+        switcher = SecurePacketSwitcher(crypto_handler, batch_signer=MerkleBatchSigner(crypto_handler))
+        sample_packet.signature = crypto_handler.sign_packet(sample_packet)
+        
+        response = json.loads(json.dumps(await switcher.process_secure_packet(sample_packet)))
+        
+        assert "signature" not in response
+        public_pem = crypto_handler.public_key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        assert verify_signed_response(response, public_pem)
+        response["status"] = "forged"
+        assert not verify_signed_response(response, public_pem)
 
 
 class TestSecurePacketSwitcher:
@@ -0,0 +1,138 @@
+# 🔐 SeaTrace Canonical Encoding Tests
+# For the Commons Good! 🌊
+
+import json
+import random
+
+import pytest
+
+from common import canonical
+from common.canonical import (
+    TrackedDict,
+    _stdlib_canonical,
+    canonical_bytes,
+)
+from packet_switching.handler import IncomingPacket
+
+
+@pytest.fixture
+def packet():
+    return IncomingPacket(
+        correlation_id="corr-001",
+        source="catch",
+        payload={"vessel_id": "WSP-001", "location": {"lat": 10.5, "lon": -60.3}},
+        timestamp="2025-01-20T10:00:00",
+    )
+
+
+class TestCanonicalBytes:
+    """Test suite for the canonical encoder"""
+
+    def test_compact_sorted_utf8(self):
+        """Keys sorted, no whitespace, UTF-8 text"""
+        data = canonical_bytes({"b": 1, "a": "Señor Tuna", "c": [1.5, None]})
+
+        assert data == '{"a":"Señor Tuna","b":1,"c":[1.5,null]}'.encode("utf-8")
+
+    def test_matches_stdlib_form(self):
+        """The fast path produces the stdlib canonical form"""
+        values = [float(f"{m}e{e}") for e in range(-330, 309) for m in (1, 1.5, -7.25)]
+        values += [random.uniform(-1e6, 1e6) for _ in range(2000)]
+        values += [float("nan"), float("inf"), -float("inf"), 2 ** 70, "1e+16 NaN"]
+
+        for value in values:
+            obj = {"v": value, "nested": [value, {"k": "x"}]}
+            assert canonical_bytes(obj) == _stdlib_canonical(obj)
+
+    def test_non_finite_floats_are_null(self):
+        """NaN and infinities encode as null on every path"""
+        assert canonical_bytes([float("nan"), float("inf")]) == b"[null,null]"
+        assert _stdlib_canonical({"NaN": float("-inf")}) == b'{"NaN":null}'
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Without orjson the same bytes come out"""
+        obj = {"weight": 1e16, "species": "Tuna"}
+        expected = canonical_bytes(obj)
+
+        monkeypatch.setattr(canonical, "orjson", None)
+
+        assert canonical_bytes(obj) == expected
+        assert json.loads(expected) == obj
+
+
+class TestPacketHashMemoization:
+    """Test suite for cached packet digests"""
+
+    def test_hash_is_computed_once(self, packet, monkeypatch):
+        """Repeated hash() calls reuse the cached digest"""
+        calls = []
+        real = canonical.canonical_bytes
+        monkeypatch.setattr(canonical, "canonical_bytes", lambda obj: calls.append(1) or real(obj))
+
+        first = packet.hash()
+        second = packet.hash()
+
+        assert first == second
+        assert len(first) == 128
+        assert len(calls) == 1
+
+    def test_top_level_mutation_invalidates(self, packet):
+        """Changing a payload key changes the hash"""
+        before = packet.hash()
+        packet.payload["catch_weight"] = 999
+
+        assert packet.hash() != before
+
+    def test_nested_mutation_invalidates(self, packet):
+        """Mutations through nested containers are tracked"""
+        before = packet.hash()
+        packet.payload["location"]["lat"] = 11.0
+
+        assert packet.hash() != before
+        assert isinstance(packet.payload, TrackedDict)
+
+    def test_caller_references_are_detached(self):
+        """Mutating the caller's nested objects cannot stale the cached hash"""
+        location = {"lat": 10.5, "lon": -60.3}
+        ports = ["POS"]
+        packet = IncomingPacket(
+            correlation_id="corr-001",
+            source="catch",
+            payload={"vessel_id": "WSP-001", "location": location, "ports": ports},
+            timestamp="2025-01-20T10:00:00",
+        )
+        before = packet.hash()
+
+        location["lat"] = 11.0
+        ports.append("SCA")
+
+        assert packet.hash() == before
+        assert packet.payload["location"]["lat"] == 10.5
+        assert packet.canonical_bytes() == canonical_bytes(packet.canonical_dict())
+
+    def test_field_assignment_invalidates(self, packet):
+        """Reassigning a hashed field drops the cache"""
+        before = packet.hash()
+        packet.signature = "abc"
+
+        assert packet.hash() != before
+
+    def test_payload_replacement_is_tracked(self, packet):
+        """Assigned payloads are wrapped for tracking"""
+        packet.payload = {"vessel_id": "WSP-002"}
+        before = packet.hash()
+        packet.payload["vessel_id"] = "WSP-003"
+
+        assert isinstance(packet.payload, TrackedDict)
+        assert packet.hash() != before
+
+    def test_equal_packets_hash_equal(self, packet):
+        """Hash depends on content, not on cache state"""
+        other = IncomingPacket(
+            correlation_id="corr-001",
+            source="catch",
+            payload={"location": {"lon": -60.3, "lat": 10.5}, "vessel_id": "WSP-001"},
+            timestamp="2025-01-20T10:00:00",
+        )
+
+        assert other.hash() == packet.hash()
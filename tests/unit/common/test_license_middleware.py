@@ -0,0 +1,183 @@
+# 🔐 SeaTrace License Middleware (ASGI) Tests
+# For the Commons Good! 🌊
+
+import base64
+import json
+import time
+
+import httpx
+import nacl.signing
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from common.licensing.middleware import LicenseMiddleware
+from common.licensing.revocation import RevocationService
+from common.licensing.token_cache import VerifiedTokenCache
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def make_token(signing_key: nacl.signing.SigningKey, **claims) -> str:
+    header = b64url(json.dumps({"alg": "EdDSA", "kid": "k1"}).encode())
+    payload = b64url(json.dumps(claims).encode())
+    signature = signing_key.sign(f"{header}.{payload}".encode()).signature
+    return f"{header}.{payload}.{b64url(signature)}"
+
+
+@pytest.fixture
+def signing_key():
+    return nacl.signing.SigningKey.generate()
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.get("/api/v1/retrieve/{packet_id}")
+    async def retrieve(packet_id: str):
+        return {"packet_id": packet_id}
+
+    @app.get("/api/v1/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.post("/api/v1/marketside/trade")
+    async def trade(request: Request):
+        return {"license_id": request.state.license_claims["license_id"], "body": await request.json()}
+
+    return app
+
+
+@pytest.fixture
+def client(app, signing_key):
+    middleware = LicenseMiddleware(
+        app,
+        public_scope_digest="sha256:test",
+        public_routes=["GET:/api/v1/retrieve/{packet_id}", "GET:/api/v1/stream"],
+        verify_keys_by_kid={"k1": base64.b64encode(bytes(signing_key.verify_key)).decode()},
+        token_cache=VerifiedTokenCache(capacity=8),
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+
+
+class TestLicenseMiddlewareASGI:
+    """Test suite for the pure-ASGI license middleware"""
+
+    @pytest.mark.asyncio
+    async def test_templated_public_route_without_token(self, client):
+        """Public scope entries with path parameters match concrete paths"""
+        response = await client.get("/api/v1/retrieve/PKT-42")
+
+        assert response.status_code == 200
+        assert response.json() == {"packet_id": "PKT-42"}
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_passes_through(self, client):
+        """Streaming bodies reach the client unbuffered and intact"""
+        response = await client.get("/api/v1/stream")
+
+        assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+
+    @pytest.mark.asyncio
+    async def test_licensed_request_gets_claims_and_headers(self, client, signing_key):
+        """A PL token reaches the app with its claims on request.state"""
+        token = make_token(signing_key, typ="PL", license_id="L-7", org="WSP", exp=time.time() + 3600)
+
+        response = await client.post("/api/v1/marketside/trade", json={"lot": 1},
+                                     headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.json() == {"license_id": "L-7", "body": {"lot": 1}}
+        assert response.headers["x-license-type"] == "PL"
+        assert response.headers["x-license-org"] == "WSP"
+
+    @pytest.mark.asyncio
+    async def test_rejected_before_body_is_read(self, signing_key):
+        """An unlicensed request is answered without touching the app or body"""
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope)
+
+        async def receive():
+            raise AssertionError("body read for an unlicensed request")
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = LicenseMiddleware(app, public_scope_digest="sha256:test", public_routes=[])
+        scope = {"type": "http", "method": "POST", "path": "/api/v1/marketside/trade", "headers": []}
+        await middleware(scope, receive, send)
+
+        assert calls == []
+        assert sent[0]["status"] == 403
+        assert json.loads(sent[1]["body"]) == {"detail": "License required for this endpoint"}
+
+    @pytest.mark.asyncio
+    async def test_bad_token_is_401(self, client, signing_key):
+        """Verification failures are answered with 401, not raised"""
+        token = make_token(signing_key, typ="PL", license_id="L-7")
+        forged = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+
+        response = await client.get("/api/v1/stream", headers={"X-ST-License": forged})
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_revoked_license_is_403(self, app, signing_key):
+        """Revocations come from the shared snapshot, not a per-request fetch"""
+        revocation = RevocationService(token_cache=VerifiedTokenCache())
+        revocation.load({"revoked": [{"license_id": "L-7", "reason": "stolen"}]})
+        middleware = LicenseMiddleware(
+            app,
+            public_scope_digest="sha256:test",
+            public_routes=[],
+            verify_keys_by_kid={"k1": base64.b64encode(bytes(signing_key.verify_key)).decode()},
+            token_cache=VerifiedTokenCache(),
+            revocation=revocation,
+        )
+        token = make_token(signing_key, typ="PL", license_id="L-7")
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as c:
+            response = await c.get("/api/v1/stream", headers={"X-ST-License": token})
+
+        assert response.status_code == 403
+        assert response.json() == {"detail": "License has been revoked"}
+
+    @pytest.mark.asyncio
+    async def test_own_revocation_runs_over_lifespan(self, app, signing_key):
+        """A service the middleware builds for crl_url is loaded on startup and closed on shutdown"""
+        middleware = LicenseMiddleware(
+            app,
+            public_scope_digest="sha256:test",
+            public_routes=[],
+            verify_keys_by_kid={"k1": base64.b64encode(bytes(signing_key.verify_key)).decode()},
+            token_cache=VerifiedTokenCache(),
+            crl_url="https://crl.example/revoked.json",
+        )
+        revocation = middleware.revocation
+        revocation.transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"revoked_licenses": ["L-7"]})
+        )
+        messages = [{"type": "lifespan.shutdown"}, {"type": "lifespan.startup"}]
+        sent = []
+
+        async def receive():
+            return messages.pop()
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await middleware({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, receive, send)
+
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert revocation.is_revoked("L-7")
+        assert revocation._client is None and revocation._task is None
@@ -0,0 +1,52 @@
+# 🔐 SeaTrace Merkle Tree Tests
+# For the Commons Good! 🌊
+
+import pytest
+
+from common.merkle import leaf_hash, merkle_path, merkle_paths, merkle_root, node_hash, verify_path
+
+
+def leaves(n):
+    return [leaf_hash(f"record-{i}".encode()) for i in range(n)]
+
+
+class TestMerkle:
+    """Test suite for roots and inclusion paths"""
+
+    def test_small_trees(self):
+        """Roots follow leaf/node domain separation"""
+        a, b, c = leaves(3)
+
+        assert merkle_root([a]) == a
+        assert merkle_root([a, b]) == node_hash(a, b)
+        assert merkle_root([a, b, c]) == node_hash(node_hash(a, b), c)
+
+    def test_odd_leaf_not_duplicated(self):
+        """[a, b, c] and [a, b, c, c] have different roots"""
+        a, b, c = leaves(3)
+
+        assert merkle_root([a, b, c]) != merkle_root([a, b, c, c])
+
+    @pytest.mark.parametrize("n", [1, 2, 3, 5, 8, 13, 100])
+    def test_every_path_verifies(self, n):
+        """Each leaf's path hashes up to the root"""
+        tree = leaves(n)
+        root = merkle_root(tree)
+
+        for i, leaf in enumerate(tree):
+            assert verify_path(leaf, merkle_path(tree, i), root)
+
+    @pytest.mark.parametrize("n", [1, 2, 7, 64])
+    def test_all_paths_at_once(self, n):
+        """merkle_paths matches merkle_path leaf by leaf"""
+        tree = leaves(n)
+
+        assert merkle_paths(tree) == [merkle_path(tree, i) for i in range(n)]
+
+    def test_wrong_leaf_fails(self):
+        """A path does not verify a different leaf"""
+        tree = leaves(6)
+
+        assert not verify_path(tree[1], merkle_path(tree, 2), merkle_root(tree))
+        with pytest.raises(IndexError):
+            merkle_path(tree, 6)
@@ -0,0 +1,52 @@
+# 📈 SeaTrace Online Statistics Tests
+# For the Commons Good! 🌊
+
+import random
+import statistics
+
+import pytest
+
+from common.online_stats import OnlineStats
+
+
+class TestOnlineStats:
+    """Test suite for the running baselines"""
+
+    def test_welford_matches_statistics(self):
+        """Running mean and variance match a two-pass computation"""
+        rng = random.Random(1)
+        values = [rng.gauss(50, 7) for _ in range(1000)]
+        stats = OnlineStats(min_samples=10)
+        for x in values:
+            stats.update(x)
+
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+        assert stats.upper == pytest.approx(stats.mean + 4.0 * stats.std)
+
+    def test_merge_matches_updates(self):
+        """Merging pre-aggregated groups equals updating one by one"""
+        rng = random.Random(2)
+        a = [rng.uniform(0, 10) for _ in range(300)]
+        b = [rng.uniform(5, 20) for _ in range(200)]
+        merged, sequential = OnlineStats(), OnlineStats()
+        for x in a + b:
+            sequential.update(x)
+        for group in (a, b):
+            mean = statistics.fmean(group)
+            merged.merge(len(group), mean, sum((x - mean) ** 2 for x in group))
+
+        assert merged.n == 500
+        assert merged.mean == pytest.approx(sequential.mean)
+        assert merged.variance == pytest.approx(sequential.variance)
+
+    def test_fallback_until_warm(self):
+        """upper keeps the hand-picked limit until min_samples is reached"""
+        stats = OnlineStats(min_samples=5, fallback=500000.0)
+        for x in (10, 11, 12, 13):
+            stats.update(x)
+
+        assert stats.upper == 500000.0
+        assert stats.zscore(1e6) is None
+        stats.update(14)
+        assert stats.upper < 100
@@ -0,0 +1,106 @@
+# 🔐 SeaTrace Packet Hash Propagation Tests
+# For the Commons Good! 🌊
+
+import asyncio
+
+import httpx
+import pytest
+
+from common import canonical
+from common.packet_hash import HashTrust, PacketHashMismatch, hop_entry, hop_fields, hop_headers
+from packet_switching.compact import CompactPacket
+from packet_switching.forwarder import PillarForwarder, PillarTarget
+from packet_switching.handler import IncomingPacket
+
+
+@pytest.fixture
+def ingress():
+    """Packet as built and hashed at the router"""
+    packet = CompactPacket(source="vessel", payload={"vessel_id": "WSP-001", "location": {"lat": 10.5}},
+                           signature="ab01")
+    packet.hash()
+    return packet
+
+
+@pytest.fixture
+def encodes(monkeypatch):
+    """Counts canonical encodings"""
+    calls = []
+    original = canonical.canonical_bytes
+
+    def counting(obj):
+        calls.append(obj)
+        return original(obj)
+    monkeypatch.setattr(canonical, "canonical_bytes", counting)
+    return calls
+
+
+class TestHashTrust:
+    """Test suite for adopting forwarded hashes"""
+
+    def test_forwarded_hash_is_adopted_without_encoding(self, ingress, encodes):
+        """A trusted hop costs no encoding and keeps the ingress hash"""
+        packet = HashTrust(verify_rate=0).receive(
+            IncomingPacket, "vessel", dict(ingress.payload), hop_fields(hop_headers(ingress))
+        )
+
+        assert packet.hash() == ingress.hash()
+        assert packet.correlation_id == ingress.correlation_id
+        assert encodes == []
+
+    def test_sampled_hash_is_verified(self, ingress):
+        """At rate 1 the rebuilt packet hashes to the forwarded hash"""
+        packet = HashTrust(verify_rate=1).receive(IncomingPacket, "vessel", dict(ingress.payload), hop_entry(ingress))
+
+        assert packet.hash() == ingress.hash()
+
+    def test_tampered_payload_is_caught_when_sampled(self, ingress):
+        """A payload that changed in transit fails verification"""
+        entry = dict(hop_entry(ingress), payload={"vessel_id": "WSP-666"})
+
+        with pytest.raises(PacketHashMismatch):
+            HashTrust(verify_rate=1).receive(IncomingPacket, "vessel", entry["payload"], entry)
+
+    def test_malformed_hash_is_rejected(self, ingress):
+        """Anything but a BLAKE2b-512 hex digest is refused, sampled or not"""
+        entry = dict(hop_entry(ingress), packet_hash="not-a-hash")
+
+        with pytest.raises(PacketHashMismatch):
+            HashTrust(verify_rate=0).receive(IncomingPacket, "vessel", entry["payload"], entry)
+
+    def test_mutation_drops_the_adopted_hash(self, ingress):
+        """A pillar that changes the payload gets a freshly computed hash"""
+        packet = HashTrust(verify_rate=0).receive(IncomingPacket, "vessel", dict(ingress.payload), hop_entry(ingress))
+
+        packet.payload["vessel_id"] = "WSP-002"
+
+        assert packet.hash() != ingress.hash()
+        assert packet.hash() == canonical.digest(packet.canonical_bytes())
+
+    def test_direct_client_is_hashed_locally(self):
+        """Without a forwarded hash the pillar computes its own"""
+        packet = HashTrust().receive(IncomingPacket, "vessel", {"vessel_id": "WSP-001", "signature": "cd"})
+
+        assert packet.signature == "cd"
+        assert packet.hash() == canonical.digest(packet.canonical_bytes())
+
+
+class TestPillarPropagation:
+    """Router → pillar hash propagation over the forwarder"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("count", [1, 10])
+    async def test_pillar_answers_with_the_ingress_hash(self, monkeypatch, count):
+        """Single and batched deliveries keep the router's hash"""
+        import seaside
+
+        monkeypatch.setattr(seaside, "hash_trust", HashTrust(verify_rate=1))
+        target = PillarTarget(name="seaside", base_url="http://seaside", batch_window=0.01)
+        forwarder = PillarForwarder({"seaside": target}, transport=httpx.ASGITransport(app=seaside.app))
+        packets = [CompactPacket(source="vessel", payload={"vessel_id": f"WSP-{i:03d}"}) for i in range(count)]
+
+        results = await asyncio.gather(*(forwarder.forward("seaside", p) for p in packets))
+        await forwarder.close()
+
+        assert [r["packet_hash"] for r in results] == [p.hash() for p in packets]
+        assert [r["correlation_id"] for r in results] == [p.correlation_id for p in packets]
@@ -0,0 +1,283 @@
+# 🛡️ SeaTrace License Revocation Service Tests
+# For the Commons Good! 🌊
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from common.licensing.crl_feed import RevocationFeed
+from common.licensing.revocation import (
+    BloomFilter,
+    RevocationService,
+    RevocationUnavailable,
+    parse_crl,
+)
+from common.licensing.token_cache import VerifiedTokenCache
+
+CRL_URL = "https://crl.example/revoked.json"
+
+
+class CRLServer:
+    """MockTransport handler serving a CRL with an ETag"""
+
+    def __init__(self, revoked):
+        self.revoked = revoked
+        self.version = 1
+        self.requests = []
+        self.release = None  # asyncio.Event to hold responses
+
+    async def __call__(self, request):
+        self.requests.append(request.headers.get("if-none-match"))
+        if self.release is not None:
+            await self.release.wait()
+        etag = f'"v{self.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json={"revoked_licenses": self.revoked}, headers={"ETag": etag})
+
+
+def make_service(server, **kwargs):
+    return RevocationService(CRL_URL, transport=httpx.MockTransport(server),
+                             token_cache=VerifiedTokenCache(), **kwargs)
+
+
+class TestBloomFilter:
+    """Test suite for the Bloom filter built at refresh time"""
+
+    def test_no_false_negatives(self):
+        """Every added id is reported as (possibly) present"""
+        bloom = BloomFilter.of((f"L-{i}" for i in range(1000)), capacity=1000)
+
+        assert all(f"L-{i}" in bloom for i in range(1000))
+
+    def test_false_positive_rate(self):
+        """Absent ids hit at about the configured rate"""
+        bloom = BloomFilter.of((f"L-{i}" for i in range(1000)), capacity=1000, error_rate=0.01)
+
+        hits = sum(f"X-{i}" in bloom for i in range(10000))
+        assert hits < 300
+
+
+class TestRevocationService:
+    """Test suite for the unified revocation service"""
+
+    def test_both_crl_formats(self):
+        """Middleware and Layer 7 CRL formats index the same way"""
+        revoked = parse_crl({"revoked": [{"license_id": "L-1", "reason": "stolen"}], "revoked_licenses": ["L-2"]})
+
+        assert revoked == {"L-1": "stolen", "L-2": None}
+        with pytest.raises(ValueError):
+            parse_crl({"licenses": []})
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_answers_while_refreshing(self):
+        """A lookup never waits on the fetch it triggers"""
+        server = CRLServer(["L-1"])
+        now = [1000.0]
+        service = make_service(server, refresh_interval=60, clock=lambda: now[0])
+        await service.refresh()
+
+        server.revoked = ["L-1", "L-2"]
+        server.version = 2
+        server.release = asyncio.Event()
+        now[0] += 61
+
+        assert service.is_revoked("L-2") is False  # stale answer, no wait
+        service.refresh_if_stale()
+        service.refresh_if_stale()  # one refresh in flight at a time
+        await asyncio.sleep(0)
+        server.release.set()
+        await service._refreshing
+
+        assert service.is_revoked("L-2") is True
+        assert server.requests == [None, '"v1"']
+        await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_one_refresh_in_flight(self):
+        """The interval loop, stale lookups and explicit refreshes never fetch concurrently"""
+        server = CRLServer(["L-1"])
+        server.release = asyncio.Event()
+        now = [1000.0]
+        service = make_service(server, refresh_interval=60, clock=lambda: now[0])
+
+        service.start()
+        await asyncio.sleep(0)
+        service.refresh_if_stale()
+        explicit = asyncio.ensure_future(service.refresh())
+        await asyncio.sleep(0.01)
+        in_flight = len(server.requests)
+        server.release.set()
+        await explicit
+        await service.stop()
+
+        assert in_flight == 1
+        assert len(server.requests) == 2  # the explicit refresh ran after, conditionally
+        assert server.requests[1] == '"v1"'
+
+    @pytest.mark.asyncio
+    async def test_not_modified_keeps_snapshot(self):
+        """A 304 only renews the snapshot's freshness"""
+        server = CRLServer(["L-1"])
+        service = make_service(server)
+        await service.refresh()
+        revoked = service.snapshot.revoked
+
+        assert await service.refresh() is False
+        assert service.snapshot.revoked is revoked
+        await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_warm_start_from_disk(self, tmp_path):
+        """A restarted service enforces the last CRL before fetching"""
+        path = tmp_path / "crl.json"
+        service = make_service(CRLServer(["L-1"]), cache_path=str(path))
+        await service.refresh()
+        await service.stop()
+
+        restarted = RevocationService(CRL_URL, cache_path=str(path), token_cache=VerifiedTokenCache())
+
+        assert restarted.is_revoked("L-1") is True
+        assert restarted.snapshot.etag == '"v1"'
+        assert parse_crl(json.loads(path.read_text())["crl"]) == {"L-1": None}
+
+    @pytest.mark.asyncio
+    async def test_ensure_loaded_fetches_only_without_warm_start(self, tmp_path):
+        """Startup fetches the CRL once, unless the cache already provided one"""
+        server = CRLServer(["L-1"])
+        cache = tmp_path / "crl.json"
+        service = make_service(server, cache_path=str(cache))
+
+        assert await service.ensure_loaded() is True
+        assert service.is_revoked("L-1")
+        await service.stop()
+
+        warm = make_service(server, cache_path=str(cache))
+        assert await warm.ensure_loaded() is True
+        assert len(server.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_full_refresh_indexes_and_persists_off_the_loop(self, tmp_path, monkeypatch):
+        """Parsing, indexing and writing the CRL never run on the event loop thread"""
+        from common.licensing import revocation as revocation_module
+
+        threads = []
+        index_crl, persist = revocation_module._index_crl, RevocationService._persist
+        monkeypatch.setattr(revocation_module, "_index_crl",
+                            lambda *a: threads.append(threading.get_ident()) or index_crl(*a))
+        monkeypatch.setattr(RevocationService, "_persist",
+                            lambda self, *a: threads.append(threading.get_ident()) or persist(self, *a))
+        service = make_service(CRLServer(["L-1"]), cache_path=str(tmp_path / "crl.json"))
+
+        assert await service.refresh() is True
+        await service.stop()
+
+        assert service.is_revoked("L-1") and (tmp_path / "crl.json").exists()
+        assert len(threads) == 2 and threading.get_ident() not in threads
+
+    def test_fail_closed_without_crl(self):
+        """Fail-closed services refuse to answer before the first CRL"""
+        service = RevocationService(CRL_URL, fail_open=False, token_cache=VerifiedTokenCache())
+
+        with pytest.raises(RevocationUnavailable):
+            service.is_revoked("L-1")
+        assert RevocationService(CRL_URL, token_cache=VerifiedTokenCache()).is_revoked("L-1") is False
+
+
+class TestDeltaFeed:
+    """Test suite for the sequence-numbered delta feed"""
+
+    @pytest.fixture
+    def feed(self):
+        feed = RevocationFeed(retention=5)
+        feed.revoke_many(["L-1", "L-2"], reason="stolen")
+        return feed
+
+    def make_service(self, feed, **kwargs):
+        return RevocationService(
+            "http://crl/crl/revoked.json", delta_url="http://crl/crl/delta",
+            transport=httpx.ASGITransport(app=feed.app()), token_cache=VerifiedTokenCache(), **kwargs
+        )
+
+    def test_net_changes_since(self, feed):
+        """A delta carries the net adds and removes after a sequence"""
+        feed.revoke("L-3")
+        feed.reinstate("L-1")
+        feed.revoke("L-4")
+        feed.reinstate("L-4")
+
+        delta = feed.delta(2)
+
+        assert delta["from"] == 2 and delta["to"] == 6
+        assert delta["added"] == [{"license_id": "L-3", "reason": None}]
+        assert delta["removed"] == ["L-1", "L-4"]
+        assert feed.delta(0) is None  # beyond retention
+
+    @pytest.mark.asyncio
+    async def test_refresh_applies_delta_in_place(self, feed):
+        """After the first full fetch only changes are transferred"""
+        service = self.make_service(feed)
+        await service.refresh()
+        revoked = service.snapshot.revoked
+
+        feed.revoke("L-3")
+        feed.reinstate("L-1")
+        assert await service.refresh() is True
+
+        assert service.snapshot.revoked is revoked
+        assert set(revoked) == {"L-2", "L-3"}
+        assert service.snapshot.sequence == feed.sequence
+        assert await service.refresh() is False
+        await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_gap_falls_back_to_full(self, feed):
+        """Changes beyond the retained journal trigger one full fetch"""
+        service = self.make_service(feed)
+        await service.refresh()
+
+        feed.revoke_many(f"L-{i}" for i in range(10, 20))
+        await service.refresh()
+
+        assert set(service.snapshot.revoked) == set(feed.revoked)
+        assert service.snapshot.sequence == feed.sequence
+        await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_journal_replayed_on_warm_start(self, feed, tmp_path):
+        """Deltas applied after the last full fetch survive a restart"""
+        path = str(tmp_path / "crl.json")
+        service = self.make_service(feed, cache_path=path)
+        await service.refresh()
+        feed.revoke("L-3")
+        feed.reinstate("L-2")
+        await service.refresh()
+        await service.stop()
+
+        restarted = RevocationService(cache_path=path, token_cache=VerifiedTokenCache())
+
+        assert set(restarted.snapshot.revoked) == {"L-1", "L-3"}
+        assert restarted.snapshot.sequence == feed.sequence
+
+    @pytest.mark.asyncio
+    async def test_journal_compaction(self, feed, tmp_path, monkeypatch):
+        """Past journal_limit deltas the persisted CRL is rewritten, off the event loop"""
+        threads = []
+        compact = RevocationService._compact
+        monkeypatch.setattr(RevocationService, "_compact",
+                            lambda self: threads.append(threading.get_ident()) or compact(self))
+        path = tmp_path / "crl.json"
+        service = self.make_service(feed, cache_path=str(path), journal_limit=1)
+        await service.refresh()
+        for license_id in ("L-3", "L-4"):
+            feed.revoke(license_id)
+            await service.refresh()
+        await service.stop()
+
+        assert not (tmp_path / "crl.json.delta").exists()
+        assert threads and threading.get_ident() not in threads
+        restarted = RevocationService(cache_path=str(path), token_cache=VerifiedTokenCache())
+        assert set(restarted.snapshot.revoked) == {"L-1", "L-2", "L-3", "L-4"}
@@ -0,0 +1,50 @@
+# 🔐 SeaTrace License Route Trie Tests
+# For the Commons Good! 🌊
+
+import pytest
+
+from common.licensing.route_trie import RouteTrie
+
+
+@pytest.fixture
+def routes():
+    return RouteTrie([
+        "GET:/api/health",
+        "GET:/api/v1/retrieve/{packet_id}",
+        "GET:/api/v1/retrieve/latest",
+        "GET:/api/v1/vessels/{vessel_id:int}/catches",
+        "GET:/static/{file:path}",
+        "POST:/api/v1/ingest",
+    ])
+
+
+class TestRouteTrie:
+    """Test suite for compiled route-template matching"""
+
+    def test_templated_route_matches(self, routes):
+        """A path parameter matches any single segment"""
+        assert routes.match("GET", "/api/v1/retrieve/PKT-42") == "GET:/api/v1/retrieve/{packet_id}"
+        assert "GET:/api/v1/retrieve/PKT-42" in routes
+
+    def test_literal_beats_template(self, routes):
+        """Literal segments take precedence, as in the router"""
+        assert routes.match("GET", "/api/v1/retrieve/latest") == "GET:/api/v1/retrieve/latest"
+
+    def test_segment_count_and_method_must_match(self, routes):
+        """Extra segments, empty parameters and other methods do not match"""
+        assert routes.match("GET", "/api/v1/retrieve/PKT-42/raw") is None
+        assert routes.match("GET", "/api/v1/retrieve/") is None
+        assert routes.match("POST", "/api/health") is None
+        assert routes.match("GET", "/api/health/") is None
+
+    def test_convertors(self, routes):
+        """Typed parameters match only their form; path takes the rest"""
+        assert routes.match("GET", "/api/v1/vessels/17/catches") is not None
+        assert routes.match("GET", "/api/v1/vessels/WSP-17/catches") is None
+        assert routes.match("GET", "/static/css/site.css") == "GET:/static/{file:path}"
+        assert routes.match("GET", "/static") is None
+
+    def test_unknown_convertor_rejected(self):
+        """Typos in a scope fail at compile time, not per request"""
+        with pytest.raises(ValueError):
+            RouteTrie(["GET:/api/{id:integer}"])
@@ -0,0 +1,140 @@
+# 🔐 SeaTrace Verified License Token Cache Tests
+# For the Commons Good! 🌊
+
+import base64
+import json
+import time
+
+import nacl.signing
+import pytest
+
+from common.licensing.middleware import LicenseMiddleware, LicenseValidationError
+from common.licensing.revocation import RevocationService
+from common.licensing.token_cache import VerifiedTokenCache
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def make_token(signing_key: nacl.signing.SigningKey, **claims) -> str:
+    header = b64url(json.dumps({"alg": "EdDSA", "kid": "k1"}).encode())
+    payload = b64url(json.dumps(claims).encode())
+    signature = signing_key.sign(f"{header}.{payload}".encode()).signature
+    return f"{header}.{payload}.{b64url(signature)}"
+
+
+@pytest.fixture
+def signing_key():
+    return nacl.signing.SigningKey.generate()
+
+
+@pytest.fixture
+def verify_key_b64(signing_key):
+    return base64.b64encode(bytes(signing_key.verify_key)).decode()
+
+
+@pytest.fixture
+def middleware(verify_key_b64):
+    """Middleware with its own cache (no app - only the verification path is used)"""
+    return LicenseMiddleware(
+        app=None,
+        public_scope_digest="sha256:test",
+        public_routes=[],
+        verify_key=verify_key_b64,
+        token_cache=VerifiedTokenCache(capacity=8),
+    )
+
+
+class TestVerifiedTokenCache:
+    """Test suite for the bounded token cache"""
+
+    def test_entry_expires_at_exp(self):
+        """A token is cached until its exp, then verified again"""
+        now = [1000.0]
+        cache = VerifiedTokenCache(max_ttl=300, clock=lambda: now[0])
+
+        cache.put("tok", "ns", {"sub": "a"}, exp=1010)
+
+        assert cache.get("tok", "ns") == {"sub": "a"}
+        now[0] = 1010
+        assert cache.get("tok", "ns") is None
+        assert len(cache) == 0
+
+    def test_max_ttl_caps_long_lived_tokens(self):
+        """Tokens without exp (or far exp) stay at most max_ttl"""
+        now = [0.0]
+        cache = VerifiedTokenCache(max_ttl=60, clock=lambda: now[0])
+
+        cache.put("tok", "ns", "claims")
+        now[0] = 61
+
+        assert cache.get("tok", "ns") is None
+
+    def test_namespaces_are_separate(self):
+        """A token verified under one key is unknown under another"""
+        cache = VerifiedTokenCache()
+        cache.put("tok", "key-a", "claims")
+
+        assert cache.get("tok", "key-b") is None
+
+    def test_lru_bound(self):
+        """The least recently used token is evicted first"""
+        cache = VerifiedTokenCache(capacity=2)
+        cache.put("a", "", 1)
+        cache.put("b", "", 2)
+        cache.get("a", "")
+        cache.put("c", "", 3)
+
+        assert cache.get("b", "") is None
+        assert cache.get("a", "") == 1
+
+    def test_hit_rate(self):
+        """Hits and misses are counted"""
+        cache = VerifiedTokenCache()
+        cache.get("tok", "")
+        cache.put("tok", "", "claims")
+        cache.get("tok", "")
+        cache.get("tok", "")
+
+        assert cache.hit_rate == pytest.approx(2 / 3)
+
+
+class TestLicenseMiddlewareCache:
+    """Test suite for cached license verification"""
+
+    def test_repeated_token_verified_once(self, middleware, signing_key, monkeypatch):
+        """The second call is a cache lookup, not a signature check"""
+        token = make_token(signing_key, typ="PL", license_id="L-1", exp=time.time() + 3600)
+        verifications = []
+        original = middleware._verify_jws
+        monkeypatch.setattr(middleware, "_verify_jws", lambda t: verifications.append(t) or original(t))
+
+        first = middleware._verify_cached(token)
+        second = middleware._verify_cached(token)
+
+        assert second == first
+        assert len(verifications) == 1
+
+    def test_bad_signature_not_cached(self, middleware, signing_key):
+        """Failed verifications are retried every time"""
+        token = make_token(signing_key, typ="PL", license_id="L-1")
+        forged = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+
+        for _ in range(2):
+            with pytest.raises(LicenseValidationError):
+                middleware._verify_cached(forged)
+        assert len(middleware.token_cache) == 0
+
+    def test_crl_change_invalidates(self, middleware, signing_key):
+        """A changed revoked set clears the cache; an unchanged one does not"""
+        revocation = RevocationService(token_cache=middleware.token_cache)
+        revocation.load({"revoked": []})
+        middleware._verify_cached(make_token(signing_key, typ="PL", license_id="L-1"))
+
+        revocation.load({"revoked": []})
+        assert len(middleware.token_cache) == 1
+
+        revocation.load({"revoked": [{"license_id": "L-1", "reason": "stolen"}]})
+        assert len(middleware.token_cache) == 0
+        assert revocation.reason("L-1") == "stolen"
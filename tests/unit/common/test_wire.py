@@ -0,0 +1,64 @@
+# 📡 SeaTrace Wire Format Tests
+# For the Commons Good! 🌊
+
+import json
+
+import msgpack
+import pytest
+
+from common.wire import WireFormatError, decode_body, packet_fields, wants_msgpack
+from packet_switching.compact import CompactPacket
+
+PACKET = {
+    "source": "catch",
+    "payload": {"catch_id": "C-1", "species": "Tuna", "weight_kg": 120.5, "hooks": [1, 2, 3]},
+    "signature": "0aff",
+    "correlation_id": "c0ffee00-0000-0000-0000-000000000001",
+    "timestamp": "2026-01-01T00:00:00",
+}
+
+
+class TestWireFormats:
+    """Test suite for JSON / MessagePack negotiation"""
+
+    def test_hash_independent_of_wire_format(self):
+        """JSON, MessagePack map and positional array hash identically"""
+        from_json = CompactPacket.from_dict(decode_body(json.dumps(PACKET).encode(), "application/json"))
+        from_map = CompactPacket.from_dict(packet_fields(decode_body(msgpack.packb(PACKET), "application/msgpack")))
+        positional = [PACKET["source"], PACKET["payload"], bytes.fromhex(PACKET["signature"]),
+                      PACKET["correlation_id"], PACKET["timestamp"]]
+        from_array = CompactPacket.from_msgpack(msgpack.packb(positional, use_bin_type=True))
+
+        assert from_json.hash() == from_map.hash() == from_array.hash()
+        assert from_array.signature == "0aff"
+
+    def test_positional_round_trip(self):
+        """to_msgpack() is smaller than JSON and decodes to the same packet"""
+        packet = CompactPacket.from_dict(PACKET)
+
+        wire = packet.to_msgpack()
+
+        assert len(wire) < len(json.dumps(PACKET))
+        assert CompactPacket.from_msgpack(wire).hash() == packet.hash()
+
+    def test_malformed_bodies(self):
+        """Bad bodies and extension types become WireFormatError"""
+        with pytest.raises(WireFormatError):
+            decode_body(b"\xc1", "application/msgpack")
+        with pytest.raises(WireFormatError):
+            decode_body(msgpack.packb(msgpack.ExtType(5, b"x")), "application/msgpack")
+        with pytest.raises(WireFormatError):
+            packet_fields(["vessel"])
+        with pytest.raises(WireFormatError):
+            decode_body(b"{nope", "application/json")
+
+    @pytest.mark.parametrize("accept,expected", [
+        (None, False),
+        ("*/*", False),
+        ("application/msgpack", True),
+        ("application/json, application/msgpack;q=0.5", False),
+        ("application/json;q=0.5, application/x-msgpack", True),
+    ])
+    def test_accept_negotiation(self, accept, expected):
+        """MessagePack responses only when the client prefers them"""
+        assert wants_msgpack(accept) is expected
@@ -0,0 +1,160 @@
+# 🏈 SeaTrace Streaming Anomaly Detection Tests
+# For the Commons Good! 🌊
+
+import random
+
+import pytest
+
+from packet_switching.compact import CompactPacket
+from packet_switching.anomaly import StreamingAnomalyDetector
+from packet_switching.handler import AnomalyDetector, WildFisheriesPacketSwitcher
+
+
+def catch(weight, vessel="WSP-001", species="Tuna"):
+    return CompactPacket(source="catch", payload={
+        "catch_id": "C-1", "vessel_id": vessel, "species": species, "weight": weight
+    })
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def detector(clock):
+    return StreamingAnomalyDetector(z_threshold=4.0, min_samples=30, clock=clock)
+
+
+def warm_up(detector, clock, n=200, seed=3):
+    """Regular hourly reports of ~1000 kg"""
+    rng = random.Random(seed)
+    for _ in range(n):
+        clock.now += 3600 + rng.uniform(-60, 60)
+        detector.process(catch(rng.gauss(1000, 50)))
+
+
+class TestStreamingAnomalyDetector:
+    """Test suite for the Nickel"""
+
+    def test_normal_traffic_not_flagged(self, detector, clock):
+        """Steady catches and report intervals raise no flags"""
+        warm_up(detector, clock)
+        clock.now += 3600
+        packet = detector.process(catch(1020))
+
+        assert packet.annotations is None
+
+    def test_heavy_catch_flagged(self, detector, clock):
+        """A catch far above the vessel and species baselines is annotated"""
+        warm_up(detector, clock)
+        clock.now += 3600
+        packet = detector.process(catch(5000))
+
+        flags = packet.annotations["anomalies"]
+        assert {(f["feature"], f["scope"]) for f in flags} == {
+            ("catch_weight", "vessel:WSP-001"),
+            ("catch_weight", "species:Tuna"),
+        }
+        assert all(f["z"] > 4 for f in flags)
+
+    def test_reporting_gap_flagged(self, detector, clock):
+        """A long silence before a report is flagged on the interval baseline"""
+        warm_up(detector, clock)
+        clock.now += 3 * 86400
+        packet = detector.process(CompactPacket(source="vessel", payload={"vessel_id": "WSP-001"}))
+
+        assert packet.annotations["anomalies"][0]["feature"] == "report_interval"
+
+    def test_warm_up_never_flags(self, detector, clock):
+        """New vessels are not flagged before min_samples observations"""
+        for weight in (1, 1e6, 3, 5e5):
+            clock.now += 1
+            assert detector.process(catch(weight, vessel="WSP-NEW", species="Cod")).annotations is None
+
+    def test_malformed_weight_ignored(self, detector):
+        """Bad weights are skipped, not raised"""
+        packet = detector.process(catch("heavy"))
+
+        assert packet.annotations is None
+        assert detector.vessel_weight == {}
+
+    def test_backfill_matches_streaming(self, clock):
+        """Vectorized backfill builds the same baselines as replaying the stream"""
+        rng = random.Random(5)
+        vessels = [rng.choice(["A", "B", "C"]) for _ in range(3000)]
+        species = [rng.choice(["Tuna", "Cod"]) for _ in range(3000)]
+        weights = [rng.lognormvariate(6, 0.4) for _ in range(3000)]
+        times = sorted(rng.uniform(0, 1e7) for _ in range(3000))
+
+        batch = StreamingAnomalyDetector(clock=clock)
+        streamed = StreamingAnomalyDetector(clock=clock)
+        assert batch.backfill(vessels, species, weights, times) == 3000
+        for v, s, w, t in zip(vessels, species, weights, times):
+            streamed.observe(v, s, w, now=t)
+
+        for table in ("vessel_weight", "species_weight", "vessel_interval"):
+            for key, stats in getattr(streamed, table).items():
+                other = getattr(batch, table)[key]
+                assert other.n == stats.n
+                assert other.mean == pytest.approx(stats.mean)
+                assert other.variance == pytest.approx(stats.variance)
+        assert dict(batch._last_seen) == dict(streamed._last_seen)
+
+    def test_tables_are_bounded(self, clock):
+        """A flood of fresh ids keeps at most max_keys baselines, evicting the least recent"""
+        detector = StreamingAnomalyDetector(clock=clock, max_keys=100)
+        for i in range(1000):
+            clock.now += 1
+            detector.observe("WSP-001", "Tuna", 1000.0)
+            detector.observe(f"SPOOF-{i}", f"Species-{i}", 1000.0)
+
+        for table in (detector.vessel_weight, detector.species_weight, detector.vessel_interval,
+                      detector._last_seen):
+            assert len(table) <= 100
+        # The vessel that keeps reporting keeps its baselines
+        assert detector.vessel_weight["WSP-001"].n == 1000
+        assert detector.vessel_interval["WSP-001"].n == 999
+        assert "SPOOF-0" not in detector.vessel_weight
+
+    def test_score_batch(self, detector, clock):
+        """Batch scoring flags the same outliers as the streaming path"""
+        warm_up(detector, clock)
+        result = detector.score_batch(["WSP-001", "WSP-001", "WSP-NEW"], ["Tuna", "Tuna", "Cod"], [1010, 5000, 9e9])
+
+        assert list(result["flagged"]) == [False, True, False]
+        assert result["vessel_z"][1] > 4
+
+    def test_score_batch_without_numpy(self, detector, clock, monkeypatch):
+        """Batch scoring falls back to a loop without NumPy"""
+        from packet_switching import anomaly
+        warm_up(detector, clock)
+        monkeypatch.setattr(anomaly, "np", None)
+
+        result = detector.score_batch(["WSP-001", "WSP-001"], ["Tuna", "Tuna"], [1010, 5000])
+
+        assert result["flagged"] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_switcher_routes_flagged_packet(self, detector, clock):
+        """Flags ride along in the response; the packet is still routed"""
+        warm_up(detector, clock)
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.secondary = [AnomalyDetector(detector)]
+        packet = catch(5000)
+        unannotated_hash = packet.hash()
+        clock.now += 3600
+
+        response = await switcher.process_packet(packet)
+
+        assert response["pillar"] == "DeckSide"
+        assert len(response["anomalies"]) == 2
+        assert response["packet_hash"] == unannotated_hash
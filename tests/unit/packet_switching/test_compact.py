@@ -0,0 +1,81 @@
+# 🏈 SeaTrace Compact Packet Tests
+# For the Commons Good! 🌊
+
+import json
+
+import pytest
+
+from packet_switching.compact import CompactPacket, PacketView
+from packet_switching.handler import IncomingPacket, WildFisheriesPacketSwitcher
+
+
+class TestCompactPacket:
+    """Test suite for the slotted hot-path packet"""
+
+    def test_no_instance_dict(self):
+        """Slotted packets carry no per-instance __dict__"""
+        packet = CompactPacket(source="vessel")
+
+        assert not hasattr(packet, "__dict__")
+        with pytest.raises(AttributeError):
+            packet.unexpected = 1
+
+    def test_lazy_fields_materialize_once(self):
+        """correlation_id/timestamp are built on first read and then stable"""
+        packet = CompactPacket(source="vessel")
+
+        assert packet._correlation_id is None
+        assert packet._timestamp is None
+        cid, ts = packet.correlation_id, packet.timestamp
+        assert len(cid) == 36
+        assert "T" in ts
+        assert packet.correlation_id is cid
+        assert packet.timestamp is ts
+
+    def test_hash_matches_incoming_packet(self):
+        """Same field values hash the same as IncomingPacket"""
+        fields = dict(
+            source="catch",
+            payload={"catch_id": "C-1", "weight_kg": 12.5},
+            signature="sig",
+            correlation_id="cid-1",
+            timestamp="2025-01-01T00:00:00",
+        )
+
+        assert CompactPacket(**fields).hash() == IncomingPacket(**fields).hash()
+
+    def test_hash_invalidated_on_change(self):
+        """Reassigning fields or mutating the payload drops the cached hash"""
+        packet = CompactPacket(source="vessel", payload={"vessel_id": "A"})
+        first = packet.hash()
+
+        packet.payload["vessel_id"] = "B"
+        second = packet.hash()
+        packet.correlation_id = "fixed"
+
+        assert first != second
+        assert packet.hash() != second
+
+    def test_to_dict_is_a_view(self):
+        """to_dict() reads through to the packet instead of copying"""
+        packet = CompactPacket(source="vessel", payload={"vessel_id": "A"}, correlation_id="cid")
+        view = packet.to_dict()
+
+        assert isinstance(view, PacketView)
+        assert view["payload"] is packet.payload
+        packet.source = "catch"
+        assert view["source"] == "catch"
+        assert set(view) == set(IncomingPacket(source="x").to_dict())
+        assert json.loads(json.dumps(dict(view)))["correlation_id"] == "cid"
+
+    @pytest.mark.asyncio
+    async def test_process_packet(self):
+        """CompactPacket runs through the switcher like IncomingPacket"""
+        switcher = WildFisheriesPacketSwitcher()
+        packet = CompactPacket(source="vessel", payload={"vessel_id": "WSP-001"})
+
+        response = await switcher.process_packet(packet)
+
+        assert response["pillar"] == "SeaSide"
+        assert response["packet_hash"] == packet.hash()
+        assert response["correlation_id"] == packet.correlation_id
@@ -0,0 +1,209 @@
+# 🏈 SeaTrace Pillar Forwarder Tests
+# For the Commons Good! 🌊
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from packet_switching.compact import CompactPacket
+from packet_switching.forwarder import PillarForwarder, PillarTarget
+from packet_switching.handler import WildFisheriesPacketSwitcher
+
+
+class RecordingPillar:
+    """Mock pillar service that records the requests it receives"""
+
+    def __init__(self, delay: float = 0.0, status_code: int = 200):
+        self.delay = delay
+        self.status_code = status_code
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        body = json.loads(request.content)
+        if request.url.path == "/ingest/batch":
+            results = [{"status": "received", "correlation_id": e["correlation_id"]} for e in body]
+            return httpx.Response(self.status_code, json={"results": results})
+        return httpx.Response(self.status_code, json={
+            "status": "received",
+            "correlation_id": request.headers["X-Correlation-ID"]
+        })
+
+
+class RejectingPillar(RecordingPillar):
+    """Mock pillar that rejects one vessel's entries in a batch"""
+
+    def __init__(self, reject: str):
+        super().__init__()
+        self.reject = reject
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        results = [
+            {"correlation_id": e["correlation_id"], "status": "error",
+             "error": "Packet hash does not match the packet"}
+            if e["payload"]["vessel_id"] == self.reject else
+            {"status": "received", "correlation_id": e["correlation_id"]}
+            for e in json.loads(request.content)
+        ]
+        return httpx.Response(200, json={"results": results})
+
+
+def make_forwarder(pillar: RecordingPillar, **settings) -> PillarForwarder:
+    target = PillarTarget(name="seaside", base_url="http://seaside", **settings)
+    return PillarForwarder({"seaside": target}, transport=httpx.MockTransport(pillar))
+
+
+def make_packet(i: int = 0) -> CompactPacket:
+    return CompactPacket(source="vessel", payload={"vessel_id": f"WSP-{i:03d}"})
+
+
+class TestPillarForwarder:
+    """Test suite for pooled pillar delivery"""
+
+    @pytest.mark.asyncio
+    async def test_single_packet_uses_packet_endpoint(self):
+        """A lone packet goes to /ingest/packet with correlation headers"""
+        pillar = RecordingPillar()
+        forwarder = make_forwarder(pillar)
+        packet = make_packet()
+
+        result = await forwarder.forward("seaside", packet)
+        await forwarder.close()
+
+        assert result["correlation_id"] == packet.correlation_id
+        request = pillar.requests[0]
+        assert request.url.path == "/ingest/packet"
+        assert request.headers["X-Packet-Hash"] == packet.hash()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_packets_are_micro_batched(self):
+        """Packets arriving together share one /ingest/batch request"""
+        pillar = RecordingPillar()
+        forwarder = make_forwarder(pillar, batch_size=50, batch_window=0.01)
+        packets = [make_packet(i) for i in range(20)]
+
+        results = await asyncio.gather(*(forwarder.forward("seaside", p) for p in packets))
+        await forwarder.close()
+
+        assert len(pillar.requests) == 1
+        assert pillar.requests[0].url.path == "/ingest/batch"
+        assert [r["correlation_id"] for r in results] == [p.correlation_id for p in packets]
+
+    @pytest.mark.asyncio
+    async def test_no_batch_pillar_gets_single_requests(self):
+        """Pillars without a batch endpoint get one request per packet"""
+        pillar = RecordingPillar()
+        forwarder = make_forwarder(pillar, supports_batch=False)
+
+        await asyncio.gather(*(forwarder.forward("seaside", make_packet(i)) for i in range(5)))
+        await forwarder.close()
+
+        assert len(pillar.requests) == 5
+        assert {r.url.path for r in pillar.requests} == {"/ingest/packet"}
+
+    @pytest.mark.asyncio
+    async def test_in_flight_limit(self):
+        """No more than max_in_flight requests reach a pillar at once"""
+        pillar = RecordingPillar(delay=0.01)
+        forwarder = make_forwarder(pillar, supports_batch=False, max_in_flight=2)
+
+        await asyncio.gather(*(forwarder.forward("seaside", make_packet(i)) for i in range(8)))
+        await forwarder.close()
+
+        assert pillar.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_backpressure_rejects_when_saturated(self):
+        """A full queue in front of a slow pillar answers 503"""
+        pillar = RecordingPillar(delay=0.2)
+        forwarder = make_forwarder(
+            pillar, supports_batch=False, max_in_flight=1, queue_size=1, enqueue_timeout=0.01
+        )
+
+        results = await asyncio.gather(
+            *(forwarder.forward("seaside", make_packet(i)) for i in range(5)),
+            return_exceptions=True
+        )
+        await forwarder.close()
+
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        assert rejected and all(r.status_code == 503 for r in rejected)
+        assert any(isinstance(r, dict) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_pillar_error_is_bad_gateway(self):
+        """Pillar failures surface as 502 to every packet of the request"""
+        forwarder = make_forwarder(RecordingPillar(status_code=500))
+
+        with pytest.raises(HTTPException) as exc:
+            await forwarder.forward("seaside", make_packet())
+        await forwarder.close()
+
+        assert exc.value.status_code == 502
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_entry_is_bad_gateway(self):
+        """An entry the pillar rejects fails like a rejected single packet"""
+        pillar = RejectingPillar(reject="WSP-001")
+        forwarder = make_forwarder(pillar, batch_size=10, batch_window=0.01)
+        packets = [make_packet(i) for i in range(3)]
+
+        results = await asyncio.gather(
+            *(forwarder.forward("seaside", p) for p in packets), return_exceptions=True
+        )
+        await forwarder.close()
+
+        assert pillar.requests[0].url.path == "/ingest/batch"
+        assert isinstance(results[1], HTTPException)
+        assert results[1].status_code == 502
+        assert results[1].detail == "Packet hash does not match the packet"
+        assert [r["correlation_id"] for r in (results[0], results[2])] == [
+            packets[0].correlation_id, packets[2].correlation_id
+        ]
+
+    @pytest.mark.asyncio
+    async def test_switcher_forwarding_mode(self):
+        """process_packet returns the pillar's answer under delivery"""
+        pillar = RecordingPillar()
+        switcher = WildFisheriesPacketSwitcher(forwarder=make_forwarder(pillar))
+        packet = make_packet()
+
+        response = await switcher.process_packet(packet)
+        await switcher.forwarder.close()
+
+        assert response["pillar"] == "SeaSide"
+        assert response["delivery"]["correlation_id"] == packet.correlation_id
+
+
+class TestPillarBatchIngest:
+    """The pillar apps accept the forwarder's micro-batches"""
+
+    @pytest.mark.asyncio
+    async def test_seaside_ingest_batch(self):
+        """SeaSide /ingest/batch answers every entry in order"""
+        import seaside
+
+        target = PillarTarget(name="seaside", base_url="http://seaside")
+        forwarder = PillarForwarder(
+            {"seaside": target}, transport=httpx.ASGITransport(app=seaside.app)
+        )
+        packets = [make_packet(i) for i in range(3)]
+
+        results = await asyncio.gather(*(forwarder.forward("seaside", p) for p in packets))
+        await forwarder.close()
+
+        assert [r["vessel_id"] for r in results] == ["WSP-000", "WSP-001", "WSP-002"]
+        assert [r["correlation_id"] for r in results] == [p.correlation_id for p in packets]
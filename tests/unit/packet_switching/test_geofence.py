@@ -0,0 +1,196 @@
+# 🏈 SeaTrace Geo-Fence Tests
+# For the Commons Good! 🌊
+
+import json
+import random
+
+import pytest
+from fastapi import HTTPException
+
+from packet_switching.compact import CompactPacket
+from packet_switching.geofence import GeoFenceIndex, packet_position
+from packet_switching.handler import GeoFenceChecker, WildFisheriesPacketSwitcher
+
+
+def box(x1, y1, x2, y2):
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2], [x1, y1]]
+
+
+ZONES = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "properties": {"kind": "fao", "code": "77", "name": "Pacific, Eastern Central"},
+            "geometry": {"type": "Polygon", "coordinates": [box(-150, -25, -80, 40)]},
+        },
+        {
+            "type": "Feature",
+            "properties": {"kind": "fao", "code": "67.1", "name": "Pacific, Northeast"},
+            "geometry": {"type": "Polygon", "coordinates": [box(-175, 40, -120, 66)]},
+        },
+        {
+            "type": "Feature",
+            "id": "closure-7",
+            "properties": {"kind": "closed", "name": "Seamount closure"},
+            # Triangle with a rectangular hole (open corridor)
+            "geometry": {"type": "Polygon", "coordinates": [
+                [[-130.5, 10.2], [-120.3, 10.2], [-125.4, 20.7], [-130.5, 10.2]],
+                box(-126, 12, -125, 13),
+            ]},
+        },
+        {
+            "type": "Feature",
+            "properties": {"kind": "eez", "name": "Clipperton EEZ"},
+            "geometry": {"type": "MultiPolygon", "coordinates": [
+                [box(-112, 8, -106, 13)],
+                [box(-104.5, 5.5, -103.5, 6.5)],
+            ]},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def index():
+    idx = GeoFenceIndex(cell_size=1.0)
+    idx.add_geojson(ZONES)
+    return idx
+
+
+def brute_force(index, lon, lat, kind):
+    """Reference answer: ray cast every polygon of every zone"""
+    for n, feature in enumerate(ZONES["features"]):
+        if feature["properties"]["kind"] != kind:
+            continue
+        geometry = feature["geometry"]
+        polygons = geometry["coordinates"] if geometry["type"] == "MultiPolygon" else [geometry["coordinates"]]
+        for rings in polygons:
+            inside = False
+            for ring in rings:
+                j = len(ring) - 1
+                for i in range(len(ring)):
+                    (xi, yi), (xj, yj) = ring[i], ring[j]
+                    if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+                        inside = not inside
+                    j = i
+            if inside:
+                return n
+    return -1
+
+
+class TestGeoFenceIndex:
+    """Test suite for the grid-indexed polygon lookups"""
+
+    def test_catch_area_general(self, index):
+        """Precise GPS generalizes to the FAO major area label"""
+        assert index.catch_area_general(-118.25, 12.5) == "Eastern Pacific, FAO 77"
+        assert index.catch_area_general(-140.0, 55.0) == "Northeast Pacific, FAO 67"
+        assert index.catch_area_general(10.0, 10.0) is None
+
+    def test_closed_area_with_hole(self, index):
+        """Closed areas reject inside, the hole and the outside pass"""
+        assert index.evaluate(-125.4, 15.0)[0] is False
+        assert index.evaluate(-125.5, 12.5)[0] is True
+        assert index.evaluate(-135.0, 15.0)[0] is True
+
+    def test_evaluate_annotations(self, index):
+        """Public annotations carry the FAO area and EEZ"""
+        allowed, annotations = index.evaluate(-104.0, 6.0)
+
+        assert allowed is True
+        assert annotations == {"catch_area_general": "Eastern Pacific, FAO 77", "eez": "Clipperton EEZ"}
+
+    def test_interior_cells_need_no_ray_cast(self, index):
+        """Cells well inside a polygon are answered from the index alone"""
+        full, partial = index._cells[index._cell_key(-100.5, 0.5)]
+
+        assert [p.zone.code for p in full] == ["77"]
+        assert partial == []
+
+    def test_scalar_matches_brute_force(self, index):
+        """Index lookups agree with a full scan on random points"""
+        rng = random.Random(7)
+        for _ in range(2000):
+            lon, lat = rng.uniform(-180, -70), rng.uniform(-30, 70)
+            zones = index.zones_at(lon, lat)
+            for kind in ("fao", "closed", "eez"):
+                expected = brute_force(index, lon, lat, kind) >= 0
+                assert any(z.kind == kind for z in zones) == expected, (lon, lat, kind)
+
+    def test_batch_matches_scalar(self, index):
+        """The vectorized batch API agrees with per-point lookups"""
+        rng = random.Random(11)
+        lons = [rng.uniform(-180, -70) for _ in range(5000)]
+        lats = [rng.uniform(-30, 70) for _ in range(5000)]
+
+        closed = list(index.closed_many(lons, lats))
+        areas = index.catch_area_general_many(lons, lats)
+
+        assert closed == [not index.evaluate(x, y)[0] for x, y in zip(lons, lats)]
+        assert areas == [index.catch_area_general(x, y) for x, y in zip(lons, lats)]
+        assert any(closed)
+
+    def test_batch_without_numpy(self, index, monkeypatch):
+        """The batch API falls back to per-point lookups without NumPy"""
+        from packet_switching import geofence
+        monkeypatch.setattr(geofence, "np", None)
+
+        assert index.closed_many([-125.4, -135.0], [15.0, 15.0]) == [True, False]
+        assert index.catch_area_general_many([-118.25], [12.5]) == ["Eastern Pacific, FAO 77"]
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        """GEOFENCE_PATHS loads kind=path entries"""
+        path = tmp_path / "closures.geojson"
+        path.write_text(json.dumps({"type": "FeatureCollection", "features": [
+            {"type": "Feature", "properties": {}, "geometry": {"type": "Polygon", "coordinates": [box(0, 0, 2, 2)]}}
+        ]}))
+        monkeypatch.setenv("GEOFENCE_PATHS", f"closed={path}")
+
+        index = GeoFenceIndex.from_env()
+
+        assert index.evaluate(1.0, 1.0)[0] is False
+
+
+class TestGeoFenceChecker:
+    """Test suite for the Defensive End on the defensive line"""
+
+    def test_packet_position_formats(self):
+        """Positions come from location dicts or top-level fields"""
+        assert packet_position({"location": {"lat": 1.5, "lon": 2.5}}) == (2.5, 1.5)
+        assert packet_position({"location": {"latitude": 1, "longitude": 2}}) == (2.0, 1.0)
+        assert packet_position({"precise_gps_lat": 3, "precise_gps_lon": 4}) == (4.0, 3.0)
+        assert packet_position({"vessel_id": "A"}) is None
+        with pytest.raises(ValueError):
+            packet_position({"lat": 91, "lon": 0})
+
+    def test_malformed_position_rejected(self, index):
+        """Garbage coordinates do not get past the line"""
+        checker = GeoFenceChecker(index)
+
+        assert checker.check(CompactPacket(source="vessel", payload={"lat": "north", "lon": 1})) is False
+
+    @pytest.mark.asyncio
+    async def test_switcher_annotates_response(self, index):
+        """catch_area_general is stamped at ingest, outside the packet hash"""
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.defensive_line = [GeoFenceChecker(index)]
+        packet = CompactPacket(source="catch", payload={"catch_id": "C-1", "location": {"lat": 12.5, "lon": -118.25}})
+        unannotated_hash = packet.hash()
+
+        response = await switcher.process_packet(packet)
+
+        assert response["catch_area_general"] == "Eastern Pacific, FAO 77"
+        assert response["packet_hash"] == unannotated_hash
+
+    @pytest.mark.asyncio
+    async def test_switcher_blocks_closed_area(self, index):
+        """Packets inside a closed area are blocked with 429"""
+        switcher = WildFisheriesPacketSwitcher()
+        switcher.defensive_line = [GeoFenceChecker(index)]
+        packet = CompactPacket(source="vessel", payload={"location": {"lat": 15.0, "lon": -125.4}})
+
+        with pytest.raises(HTTPException) as exc:
+            await switcher.process_packet(packet)
+
+        assert exc.value.detail == "Blocked by GeoFenceChecker"
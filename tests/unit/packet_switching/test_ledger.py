@@ -0,0 +1,154 @@
+# 🏈 SeaTrace Hash-Chained Ledger Tests
+# For the Commons Good! 🌊
+
+import json
+import threading
+
+import pytest
+
+from packet_switching.compact import CompactPacket
+from packet_switching.handler import BlockchainLogger, WildFisheriesPacketSwitcher
+from packet_switching.ledger import (
+    HashChainLog,
+    LEDGER_BATCH_SIZE,
+    LedgerCorruptError,
+    verify_log,
+    verify_proof,
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "ledger" / "packets.log")
+
+
+@pytest.fixture
+def log(path):
+    log = HashChainLog(path, batch_records=64, batch_interval=0.01, fsync=False)
+    yield log
+    log.close()
+
+
+def append_all(log, count, prefix="r"):
+    futures = [log.append(f"{prefix}-{i}".encode()) for i in range(count)]
+    return [f.result(timeout=5) for f in futures]
+
+
+class TestHashChainLog:
+    """Test suite for the group-committed log"""
+
+    def test_sequence_numbers(self, log):
+        """Records get consecutive sequence numbers"""
+        assert append_all(log, 100) == list(range(100))
+        assert len(log) == 100
+
+    def test_group_commit_batches(self, log):
+        """Concurrent appends share blocks instead of one fsync each"""
+        before = LEDGER_BATCH_SIZE._sum.get()
+
+        threads = [threading.Thread(target=append_all, args=(log, 200, f"t{n}")) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        result = verify_log(log.path)
+        assert result["records"] == 800
+        assert result["blocks"] < 800
+        assert LEDGER_BATCH_SIZE._sum.get() - before == 800
+
+    def test_proofs_verify(self, log):
+        """Every record has an inclusion proof that checks out alone"""
+        append_all(log, 150)
+
+        for seq in (0, 63, 64, 149):
+            proof = log.proof(seq)
+            assert proof["record"] == f"r-{seq}"
+            assert verify_proof(proof)
+
+        tampered = dict(log.proof(10), record="r-11")
+        assert not verify_proof(tampered)
+        with pytest.raises(KeyError):
+            log.proof(150)
+
+    def test_reopen_continues_chain(self, log, path):
+        """A restart resumes sequence numbers and the hash chain"""
+        append_all(log, 10)
+        head = log.head
+        log.close()
+
+        reopened = HashChainLog(path, fsync=False)
+        try:
+            assert reopened.head == head
+            assert reopened.append(b"next").result(timeout=5) == 10
+        finally:
+            reopened.close()
+        assert verify_log(path)["records"] == 11
+
+    def test_torn_tail_truncated(self, log, path):
+        """A partial block from a crash mid-write is dropped on open"""
+        append_all(log, 5)
+        log.close()
+        with open(path, "ab") as f:
+            f.write(b"STLB\x01partial")
+
+        reopened = HashChainLog(path, fsync=False)
+        reopened.close()
+
+        assert verify_log(path)["records"] == 5
+
+    def test_zero_filled_tail_truncated(self, log, path):
+        """A zero-filled tail from a crash mid-write is dropped on open"""
+        append_all(log, 5)
+        log.close()
+        with open(path, "ab") as f:
+            f.write(bytes(4096))
+
+        reopened = HashChainLog(path, fsync=False)
+        try:
+            assert reopened.append(b"next").result(timeout=5) == 5
+        finally:
+            reopened.close()
+
+        assert verify_log(path)["records"] == 6
+
+    def test_garbage_tail_is_corrupt(self, log, path):
+        """A non-zero tail that is not a block is still refused"""
+        append_all(log, 5)
+        log.close()
+        with open(path, "ab") as f:
+            f.write(bytes(4095) + b"x")
+
+        with pytest.raises(LedgerCorruptError):
+            HashChainLog(path)
+
+    def test_tampering_detected(self, log, path):
+        """Editing a committed record breaks verification"""
+        append_all(log, 5)
+        log.close()
+        with open(path, "r+b") as f:
+            data = f.read()
+            f.seek(data.index(b"r-3"))
+            f.write(b"r-9")
+
+        with pytest.raises(LedgerCorruptError):
+            verify_log(path)
+        with pytest.raises(LedgerCorruptError):
+            HashChainLog(path)
+
+
+class TestBlockchainLogger:
+    """Test suite for the Safety in the secondary"""
+
+    @pytest.mark.asyncio
+    async def test_switcher_returns_ledger_seq(self, log):
+        """Routed packets are logged and their sequence comes back"""
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.secondary = [BlockchainLogger(log)]
+        packet = CompactPacket(source="catch", payload={"catch_id": "C-1", "weight": 40})
+
+        response = await switcher.process_packet(packet)
+
+        proof = log.proof(response["ledger_seq"])
+        assert json.loads(proof["record"])["packet_hash"] == response["packet_hash"]
+        assert verify_proof(proof)
@@ -0,0 +1,173 @@
+# 🏈 SeaTrace Compiled Pipeline Tests
+# For the Commons Good! 🌊
+
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+
+from packet_switching.handler import IncomingPacket, WildFisheriesPacketSwitcher
+
+
+class SlowGuard:
+    """Async guard that sleeps before answering"""
+
+    def __init__(self, delay: float, verdict: bool = True):
+        self.delay = delay
+        self.verdict = verdict
+        self.cancelled = False
+
+    async def check(self, packet):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.verdict
+
+
+class SlowGuardB(SlowGuard):
+    """Second async guard class (distinct stage name)"""
+
+
+class SyncGuard:
+    """Cheap synchronous guard"""
+
+    def __init__(self, verdict: bool = True):
+        self.verdict = verdict
+        self.calls = 0
+
+    def check(self, packet):
+        self.calls += 1
+        return self.verdict
+
+
+class TagProcessor:
+    """Processor that records its position in the play"""
+
+    def __init__(self, tag: str):
+        self.tag = tag
+
+    async def process(self, packet):
+        packet.payload.setdefault("tags", []).append(self.tag)
+        return packet
+
+
+@pytest.fixture
+def packet():
+    return IncomingPacket(source="vessel", payload={"vessel_id": "WSP-001"})
+
+
+class TestCompiledPipeline:
+    """Test suite for the compiled pipeline mode"""
+
+    @pytest.mark.asyncio
+    async def test_async_checks_run_concurrently(self, packet):
+        """Layer latency is the max of its checks, not the sum"""
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.defensive_line = [SlowGuard(0.05), SlowGuardB(0.05)]
+
+        start = time.perf_counter()
+        response = await switcher.process_packet(packet)
+        elapsed = time.perf_counter() - start
+
+        assert response["pillar"] == "SeaSide"
+        assert elapsed < 0.09
+
+    @pytest.mark.asyncio
+    async def test_first_rejection_cancels_layer(self, packet):
+        """A failing check cancels the checks still in flight"""
+        slow = SlowGuardB(1.0)
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.defensive_line = [SlowGuard(0.01, verdict=False), slow]
+
+        with pytest.raises(HTTPException) as exc:
+            await switcher.process_packet(packet)
+
+        assert exc.value.status_code == 429
+        assert "SlowGuard" in exc.value.detail
+        await asyncio.sleep(0)
+        assert slow.cancelled is True
+
+    @pytest.mark.asyncio
+    async def test_sync_check_short_circuits_before_async(self, packet):
+        """Sync checks run inline first; async checks never start on rejection"""
+        slow = SlowGuard(0.01)
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.linebackers = []
+        switcher.defensive_line = [slow, SyncGuard(verdict=False)]
+
+        with pytest.raises(HTTPException):
+            await switcher.process_packet(packet)
+
+        assert slow.cancelled is False
+
+    @pytest.mark.asyncio
+    async def test_linebacker_rejection_status(self, packet):
+        """SECOND DOWN rejections keep the 401 status"""
+
+        class FailingValidator:
+            def validate(self, packet):
+                return False
+
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.linebackers = [FailingValidator()]
+
+        with pytest.raises(HTTPException) as exc:
+            await switcher.process_packet(packet)
+
+        assert exc.value.status_code == 401
+        assert exc.value.detail == "Invalid at FailingValidator"
+
+    @pytest.mark.asyncio
+    async def test_secondary_keeps_order(self, packet):
+        """SECONDARY processors hand the packet along in order"""
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.secondary = [TagProcessor("hash"), TagProcessor("chain"), TagProcessor("anomaly")]
+
+        await switcher.process_packet(packet)
+
+        assert packet.payload["tags"] == ["hash", "chain", "anomaly"]
+
+    @pytest.mark.asyncio
+    async def test_stage_timings_recorded(self, packet):
+        """Per-stage durations land in the timings dict and histogram"""
+        guard = SyncGuard()
+        switcher = WildFisheriesPacketSwitcher()
+        switcher.defensive_line = [guard]
+        pipeline = switcher.compile()
+
+        before = REGISTRY.get_sample_value(
+            "packet_switcher_stage_duration_seconds_count",
+            {"layer": "defensive_line", "stage": "SyncGuard"}
+        ) or 0.0
+
+        timings = {}
+        await pipeline.run(packet, timings)
+
+        after = REGISTRY.get_sample_value(
+            "packet_switcher_stage_duration_seconds_count",
+            {"layer": "defensive_line", "stage": "SyncGuard"}
+        )
+        assert after == before + 1
+        assert "defensive_line.SyncGuard" in timings
+        assert {"defensive_line", "linebackers", "secondary"} <= set(timings)
+        assert guard.calls == 1
+
+
+class TestSequentialMode:
+    """The default mode keeps sequential semantics"""
+
+    @pytest.mark.asyncio
+    async def test_sequential_accepts_sync_checks(self, packet):
+        """Sync guards also work in the sequential play"""
+        guard = SyncGuard()
+        switcher = WildFisheriesPacketSwitcher()
+        switcher.defensive_line = [guard, SlowGuard(0.0)]
+
+        response = await switcher.process_packet(packet)
+
+        assert response["pillar"] == "SeaSide"
+        assert guard.calls == 1
@@ -0,0 +1,100 @@
+# 🏈 SeaTrace Router Profiling Tests
+# For the Commons Good! 🌊
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from packet_switching import router as router_module
+from packet_switching.handler import IncomingPacket, WildFisheriesPacketSwitcher
+from packet_switching.profiling import RouterProfiler, SlowPacketLog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class PassGuard:
+    def check(self, packet):
+        return True
+
+
+class PassProcessor:
+    async def process(self, packet):
+        return packet
+
+
+class TestSlowPacketLog:
+    """Test suite for the slowest-N ring"""
+
+    def test_keeps_slowest(self):
+        """Only the N slowest entries survive, slowest first"""
+        log = SlowPacketLog(capacity=3, window=60, clock=FakeClock())
+        for n, duration in enumerate([0.5, 0.1, 0.9, 0.3, 0.7, 0.2]):
+            log.offer(duration, {"n": n})
+
+        assert [e["n"] for e in log.slowest()] == [2, 4, 0]
+        assert log.threshold() == 0.5
+        assert [e["n"] for e in log.slowest(limit=1)] == [2]
+
+    def test_old_outliers_age_out(self):
+        """Entries expire after one to two windows"""
+        clock = FakeClock()
+        log = SlowPacketLog(capacity=2, window=60, clock=clock)
+        log.offer(5.0, {"n": "old"})
+
+        clock.now = 61
+        log.offer(0.1, {"n": "new"})
+        assert [e["n"] for e in log.slowest()] == ["old", "new"]
+
+        clock.now = 122
+        assert [e["n"] for e in log.slowest()] == ["new"]
+        clock.now = 300
+        assert log.slowest() == []
+
+
+class TestSwitcherTimings:
+    """Every mode fills in the same breakdown for profiled packets"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["sequential", "compiled", "staged"])
+    async def test_breakdown(self, mode):
+        """Stage, layer and touchdown timings are recorded"""
+        switcher = WildFisheriesPacketSwitcher(compiled=mode == "compiled", staged=mode == "staged")
+        switcher.defensive_line = [PassGuard()]
+        switcher.secondary = [PassProcessor()]
+        timings = {}
+
+        await switcher.process_packet(IncomingPacket(source="vessel", payload={}), timings)
+
+        assert "defensive_line.PassGuard" in timings
+        assert "secondary.PassProcessor" in timings
+        assert "touchdown" in timings
+        if mode == "staged":
+            await switcher._stages.close()
+
+
+class TestSlowPacketsEndpoint:
+    """Test suite for GET /debug/slow-packets"""
+
+    def test_slow_packets_report(self, monkeypatch):
+        """Routed and rejected packets show up with their breakdown"""
+        monkeypatch.setattr(router_module, "profiler", RouterProfiler(sample_rate=1.0, capacity=10))
+        before = REGISTRY.get_sample_value("router_duration_seconds_count") or 0.0
+        client = TestClient(router_module.app)
+
+        routed = client.post("/route", json={"source": "catch", "payload": {"catch_id": "C-1"}}).json()
+        client.post("/route", json={"source": "kraken", "payload": {}})
+        report = client.get("/debug/slow-packets").json()
+
+        assert report["sample_rate"] == 1.0
+        entries = {e["status"]: e for e in report["packets"]}
+        assert entries[200]["correlation_id"] == routed["correlation_id"]
+        assert entries[200]["pillar"] == "deckside"
+        assert "touchdown" in entries[200]["stages_ms"]
+        assert entries[400]["pillar"] is None
+        assert REGISTRY.get_sample_value("router_duration_seconds_count") == before + 2
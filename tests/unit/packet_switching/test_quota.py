@@ -0,0 +1,206 @@
+# 🏈 SeaTrace Catch-Quota Ledger Tests
+# For the Commons Good! 🌊
+
+import json
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from packet_switching.compact import CompactPacket
+from packet_switching.handler import QuotaEnforcer, WildFisheriesPacketSwitcher
+from packet_switching.quota import QuotaLedger, catch_entry
+
+SEASON = [
+    {"vessel_id": "WSP-001", "species": "Tuna", "limit_kg": 1000},
+    {"vessel_id": "WSP-001", "species": "Salmon", "limit_kg": 200, "caught_kg": 150},
+]
+
+
+@pytest.fixture
+def ledger():
+    ledger = QuotaLedger(stripes=8)
+    ledger.reload(SEASON, season="2026")
+    return ledger
+
+
+def catch(weight, species="Tuna", vessel="WSP-001"):
+    return CompactPacket(source="catch", payload={
+        "catch_id": "C-1", "vessel_id": vessel, "species": species, "weight": weight
+    })
+
+
+class TestQuotaLedger:
+    """Test suite for the striped in-memory ledger"""
+
+    def test_try_add_respects_limit(self, ledger):
+        """Catch accumulates until the quota would be exceeded"""
+        assert ledger.try_add("WSP-001", "Tuna", 600) is True
+        assert ledger.would_exceed("WSP-001", "Tuna", 500) is True
+        assert ledger.try_add("WSP-001", "Tuna", 500) is False
+        assert ledger.try_add("WSP-001", "Tuna", 400) is True
+        assert ledger.remaining("WSP-001", "Tuna") == 0
+
+    def test_carried_over_catch(self, ledger):
+        """Season files may carry catch over"""
+        assert ledger.caught("WSP-001", "Salmon") == 150
+        assert ledger.would_exceed("WSP-001", "Salmon", 60) is True
+
+    def test_no_quota_is_unlimited(self, ledger):
+        """Vessels without a quota are tracked but never rejected"""
+        assert ledger.try_add("WSP-999", "Tuna", 1e9) is True
+        assert ledger.remaining("WSP-999", "Tuna") is None
+        assert ledger.caught("WSP-999", "Tuna") == 1e9
+
+    def test_concurrent_adds_never_overshoot(self, ledger):
+        """Check-and-add is atomic across threads"""
+        def worker():
+            for _ in range(500):
+                ledger.try_add("WSP-001", "Tuna", 1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert ledger.caught("WSP-001", "Tuna") == 1000
+
+    def test_reload_resets_season(self, ledger):
+        """A bulk reload replaces limits and catch in one swap"""
+        ledger.try_add("WSP-001", "Tuna", 900)
+
+        loaded = ledger.reload([{"vessel_id": "WSP-001", "species": "Tuna", "limit_kg": 50}], season="2027")
+
+        assert loaded == 1
+        assert ledger.season == "2027"
+        assert ledger.caught("WSP-001", "Tuna") == 0
+        assert ledger.caught("WSP-001", "Salmon") == 0
+        assert ledger.would_exceed("WSP-001", "Tuna", 51) is True
+
+    def test_snapshot_round_trip(self, ledger, tmp_path):
+        """A restart resumes from the last snapshot"""
+        ledger.try_add("WSP-001", "Tuna", 321.5)
+        path = ledger.snapshot(str(tmp_path / "quota.json"))
+
+        restored = QuotaLedger()
+        restored.restore(path)
+
+        assert restored.season == "2026"
+        assert restored.caught("WSP-001", "Tuna") == 321.5
+        assert restored.remaining("WSP-001", "Salmon") == 50
+        assert [p.name for p in tmp_path.iterdir()] == ["quota.json"]
+
+    def test_from_env_prefers_snapshot(self, ledger, tmp_path, monkeypatch):
+        """QUOTA_SNAPSHOT_PATH wins over the season file on restart"""
+        ledger.try_add("WSP-001", "Tuna", 10)
+        snapshot = ledger.snapshot(str(tmp_path / "quota.json"))
+        season = tmp_path / "season.json"
+        season.write_text(json.dumps({"season": "fresh", "quotas": SEASON}))
+        monkeypatch.setenv("QUOTA_SNAPSHOT_PATH", snapshot)
+        monkeypatch.setenv("QUOTA_SEASON_PATH", str(season))
+
+        restored = QuotaLedger.from_env()
+        restored.stop_snapshots()
+
+        assert restored.caught("WSP-001", "Tuna") == 10
+        assert restored.season == "2026"
+
+    def test_catch_entry(self):
+        """Catch payloads need vessel, species and a valid weight"""
+        assert catch_entry({"vessel_id": "A", "species": "Tuna", "weight_kg": "12.5"}) == ("A", "Tuna", 12.5)
+        assert catch_entry({"vessel_id": "A", "weight": 1}) is None
+        with pytest.raises(ValueError):
+            catch_entry({"vessel_id": "A", "species": "Tuna", "weight": -1})
+        with pytest.raises(ValueError):
+            catch_entry({"vessel_id": "A", "species": "Tuna", "weight": "inf"})
+        with pytest.raises(TypeError):
+            catch_entry(["A", "Tuna", 1])
+
+
+class TestQuotaEnforcer:
+    """Test suite for the Will LB in the switcher"""
+
+    @pytest.fixture
+    def switcher(self, ledger):
+        enforcer = QuotaEnforcer(ledger)
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.linebackers = [enforcer]
+        switcher.secondary = [enforcer]
+        return switcher
+
+    @pytest.mark.asyncio
+    async def test_accepted_catch_is_recorded(self, switcher, ledger):
+        """Accepted deckside packets increment the ledger"""
+        response = await switcher.process_packet(catch(400))
+
+        assert response["pillar"] == "DeckSide"
+        assert ledger.caught("WSP-001", "Tuna") == 400
+
+    @pytest.mark.asyncio
+    async def test_over_quota_rejected_with_401(self, switcher, ledger):
+        """Packets that would exceed the quota stop at the linebackers"""
+        await switcher.process_packet(catch(900))
+
+        with pytest.raises(HTTPException) as exc:
+            await switcher.process_packet(catch(200))
+
+        assert exc.value.status_code == 401
+        assert exc.value.detail == "Invalid at QuotaEnforcer"
+        assert ledger.caught("WSP-001", "Tuna") == 900
+
+    @pytest.mark.asyncio
+    async def test_rejected_elsewhere_is_not_recorded(self, ledger):
+        """A packet rejected by another linebacker never counts"""
+
+        class FailingLicense:
+            def validate(self, packet):
+                return False
+
+        enforcer = QuotaEnforcer(ledger)
+        switcher = WildFisheriesPacketSwitcher()
+        switcher.linebackers = [enforcer, FailingLicense()]
+        switcher.secondary = [enforcer]
+
+        with pytest.raises(HTTPException):
+            await switcher.process_packet(catch(100))
+
+        assert ledger.caught("WSP-001", "Tuna") == 0
+
+    @pytest.mark.asyncio
+    async def test_undelivered_catch_is_released(self, ledger):
+        """A packet whose pillar delivery fails is taken back off the ledger"""
+
+        class DownPillar:
+            async def forward(self, pillar, packet):
+                raise HTTPException(status_code=502, detail="Pillar deckside unavailable")
+
+        enforcer = QuotaEnforcer(ledger)
+        switcher = WildFisheriesPacketSwitcher(forwarder=DownPillar())
+        switcher.linebackers = [enforcer]
+        switcher.secondary = [enforcer]
+
+        with pytest.raises(HTTPException) as exc:
+            await switcher.process_packet(catch(400))
+
+        assert exc.value.status_code == 502
+        assert ledger.caught("WSP-001", "Tuna") == 0
+        assert enforcer._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_non_object_payload_rejected_with_401(self, switcher, ledger):
+        """A catch payload that is not an object is invalid, not a server error"""
+        packet = CompactPacket(source="catch", payload={})
+        packet.payload = ["WSP-001", "Tuna", 100]
+
+        with pytest.raises(HTTPException) as exc:
+            await switcher.process_packet(packet)
+
+        assert exc.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_other_sources_pass(self, switcher):
+        """Only catch packets are metered"""
+        response = await switcher.process_packet(CompactPacket(source="vessel", payload={"vessel_id": "WSP-001"}))
+
+        assert response["pillar"] == "SeaSide"
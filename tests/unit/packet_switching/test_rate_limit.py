@@ -0,0 +1,157 @@
+# 🏈 SeaTrace Rate Limit Tests
+# For the Commons Good! 🌊
+
+import pytest
+from fastapi import HTTPException
+
+from packet_switching.compact import CompactPacket
+from packet_switching.handler import RateLimitGuard, WildFisheriesPacketSwitcher
+from packet_switching.rate_limit import (
+    BucketPolicy,
+    InProcessRedis,
+    RedisTokenBucket,
+    ShardedTokenBucket,
+    TokenBucketLimiter,
+    bucket_key,
+    parse_policies,
+)
+
+POLICY = BucketPolicy(rate=10.0, burst=5.0)
+
+
+class TestShardedTokenBucket:
+    """Test suite for the in-process buckets"""
+
+    def test_burst_then_reject(self):
+        """A fresh bucket allows exactly its burst"""
+        buckets = ShardedTokenBucket()
+
+        verdicts = [buckets.try_acquire("vessel:A", POLICY, now=0.0) for _ in range(6)]
+
+        assert verdicts == [True] * 5 + [False]
+
+    def test_refill_at_sustained_rate(self):
+        """Tokens come back at the policy rate, capped at the burst"""
+        buckets = ShardedTokenBucket()
+        for _ in range(5):
+            buckets.try_acquire("vessel:A", POLICY, now=0.0)
+
+        assert buckets.try_acquire("vessel:A", POLICY, now=0.1) is True
+        assert buckets.try_acquire("vessel:A", POLICY, now=0.1) is False
+        assert sum(buckets.try_acquire("vessel:A", POLICY, now=100.0) for _ in range(10)) == 5
+
+    def test_keys_are_independent(self):
+        """One noisy vessel does not starve another"""
+        buckets = ShardedTokenBucket()
+        for _ in range(5):
+            buckets.try_acquire("vessel:A", POLICY, now=0.0)
+
+        assert buckets.try_acquire("vessel:A", POLICY, now=0.0) is False
+        assert buckets.try_acquire("vessel:B", POLICY, now=0.0) is True
+
+    def test_sweep_drops_only_full_buckets(self):
+        """Refilled buckets are dropped; draining ones are kept"""
+        buckets = ShardedTokenBucket()
+        buckets.try_acquire("vessel:A", POLICY, now=0.0)
+        for _ in range(5):
+            buckets.try_acquire("vessel:B", POLICY, now=1.0)
+
+        removed = buckets.sweep({"vessel": POLICY}, now=1.05)
+
+        assert removed == 1
+        assert len(buckets) == 1
+
+    def test_shards_must_be_power_of_two(self):
+        """Shard selection uses a bit mask"""
+        with pytest.raises(ValueError):
+            ShardedTokenBucket(shards=10)
+
+
+class TestRedisTokenBucket:
+    """The Redis path, exercised against the in-process stand-in"""
+
+    @pytest.mark.asyncio
+    async def test_same_verdicts_as_in_process(self):
+        """Redis-backed buckets follow the same burst/refill rules"""
+        client = InProcessRedis()
+        buckets = RedisTokenBucket(client)
+
+        verdicts = [await buckets.try_acquire("vessel:A", POLICY, now=0.0) for _ in range(6)]
+        refilled = await buckets.try_acquire("vessel:A", POLICY, now=1.0)
+
+        assert verdicts == [True] * 5 + [False]
+        assert refilled is True
+        assert client.calls == 7
+
+
+class TestRateLimitGuard:
+    """Test suite for the Edge Rusher on the defensive line"""
+
+    def test_key_uses_source_and_vessel(self):
+        """Buckets are keyed by source and vessel_id"""
+        assert bucket_key(CompactPacket(source="vessel", payload={"vessel_id": "A"})) == "vessel:A"
+        assert bucket_key(CompactPacket(source="market", payload={})) == "market:*"
+
+    def test_policies_per_source(self):
+        """Overrides replace only the listed sources"""
+        policies = parse_policies("vessel=1:2, market=500")
+
+        assert policies["vessel"] == BucketPolicy(rate=1.0, burst=2.0)
+        assert policies["market"] == BucketPolicy(rate=500.0, burst=500.0)
+        assert policies["catch"].rate == 50.0
+
+    def test_in_process_check_is_inline(self):
+        """The in-process guard answers with a plain bool"""
+        guard = RateLimitGuard(TokenBucketLimiter(policies={"vessel": POLICY}))
+        packet = CompactPacket(source="vessel", payload={"vessel_id": "A"})
+
+        assert guard.check(packet) is True
+
+    def test_idle_buckets_swept_during_use(self):
+        """Buckets of vessels that went quiet are dropped as checks continue, one shard per step"""
+        now = [0.0]
+        store = ShardedTokenBucket(shards=4, clock=lambda: now[0])
+        limiter = TokenBucketLimiter(store=store, policies={"vessel": POLICY}, sweep_every=8)
+        for i in range(100):
+            limiter.check(CompactPacket(source="vessel", payload={"vessel_id": f"WSP-{i}"}))
+
+        swept = []
+        sweep = store.sweep
+        limiter._sweep = lambda policies, shard: swept.append(shard) or sweep(policies, shard=shard)
+        now[0] = 10.0  # every bucket has refilled
+        for _ in range(8):
+            limiter.check(CompactPacket(source="vessel", payload={"vessel_id": "WSP-ACTIVE"}))
+
+        assert sorted(swept) == [0, 1, 2, 3]
+        assert len(limiter.store) == 1
+
+    @pytest.mark.asyncio
+    async def test_switcher_rejects_with_429(self):
+        """An exhausted bucket blocks the packet at the defensive line"""
+        limiter = TokenBucketLimiter(policies={"vessel": BucketPolicy(rate=0.001, burst=2.0)})
+        switcher = WildFisheriesPacketSwitcher(compiled=True)
+        switcher.defensive_line = [RateLimitGuard(limiter)]
+
+        for _ in range(2):
+            await switcher.process_packet(CompactPacket(source="vessel", payload={"vessel_id": "A"}))
+        with pytest.raises(HTTPException) as exc:
+            await switcher.process_packet(CompactPacket(source="vessel", payload={"vessel_id": "A"}))
+
+        assert exc.value.status_code == 429
+        assert exc.value.detail == "Blocked by RateLimitGuard"
+
+    @pytest.mark.asyncio
+    async def test_redis_backed_guard(self):
+        """A Redis-backed guard works in the sequential play too"""
+        limiter = TokenBucketLimiter(
+            store=RedisTokenBucket(InProcessRedis()),
+            policies={"vessel": BucketPolicy(rate=0.001, burst=1.0)}
+        )
+        switcher = WildFisheriesPacketSwitcher()
+        switcher.defensive_line = [RateLimitGuard(limiter)]
+
+        await switcher.process_packet(CompactPacket(source="vessel", payload={"vessel_id": "A"}))
+        with pytest.raises(HTTPException) as exc:
+            await switcher.process_packet(CompactPacket(source="vessel", payload={"vessel_id": "A"}))
+
+        assert exc.value.status_code == 429
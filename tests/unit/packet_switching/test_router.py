@@ -0,0 +1,156 @@
+# 🏈 SeaTrace Packet Router Tests
+# For the Commons Good! 🌊
+
+import json
+
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from packet_switching import router as router_module
+
+
+@pytest.fixture
+def client():
+    """In-process client for the packet router app"""
+    return TestClient(router_module.app)
+
+
+class TestRoutePacket:
+    """Test suite for POST /route"""
+
+    def test_route_vessel_packet(self, client):
+        """Vessel packets are routed to SeaSide"""
+        response = client.post("/route", json={
+            "source": "vessel",
+            "payload": {"vessel_id": "WSP-001"}
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["pillar"] == "SeaSide"
+        assert data["vessel_id"] == "WSP-001"
+        assert len(data["packet_hash"]) == 128
+
+    def test_route_invalid_source(self, client):
+        """Unknown sources are rejected"""
+        response = client.post("/route", json={"source": "kraken", "payload": {}})
+
+        assert response.status_code == 400
+
+
+class TestRouteBatch:
+    """Test suite for POST /route/batch"""
+
+    def test_json_array_batch(self, client):
+        """Every packet in a JSON array gets an ordered result"""
+        packets = [
+            {"source": "vessel", "payload": {"vessel_id": "WSP-001"}},
+            {"source": "catch", "payload": {"catch_id": "C-1", "species": "Tuna"}},
+            {"source": "processor", "payload": {"processing_id": "P-1"}},
+            {"source": "market", "payload": {"transaction_id": "T-1"}},
+        ]
+
+        response = client.post("/route/batch", json=packets)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 4
+        assert data["routed"] == 4
+        assert [r["index"] for r in data["results"]] == [0, 1, 2, 3]
+        assert [r["pillar"] for r in data["results"]] == [
+            "SeaSide", "DeckSide", "DockSide", "MarketSide"
+        ]
+        assert all(len(r["packet_hash"]) == 128 for r in data["results"])
+
+    def test_bad_packet_does_not_fail_batch(self, client):
+        """Invalid packets produce per-packet errors"""
+        packets = [
+            {"source": "vessel", "payload": {"vessel_id": "WSP-001"}},
+            {"source": "kraken", "payload": {}},
+            "not-a-packet",
+        ]
+
+        response = client.post("/route/batch", json=packets)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["routed"] == 1
+        assert data["failed"] == 2
+        assert data["results"][0]["ok"] is True
+        assert data["results"][1]["status_code"] == 400
+        assert data["results"][2]["status_code"] == 400
+
+    def test_ndjson_batch(self, client):
+        """NDJSON bodies are routed line by line"""
+        lines = [
+            json.dumps({"source": "vessel", "payload": {"vessel_id": "WSP-002"}}),
+            "{not json",
+            "",
+            json.dumps({"source": "catch", "payload": {"catch_id": "C-2"}}),
+        ]
+
+        response = client.post(
+            "/route/batch",
+            content="\n".join(lines).encode(),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["routed"] == 2
+        assert data["results"][1]["ok"] is False
+
+    def test_non_array_body_rejected(self, client):
+        """A JSON object is not a batch"""
+        response = client.post("/route/batch", json={"source": "vessel"})
+
+        assert response.status_code == 400
+
+    def test_batch_size_limit(self, client, monkeypatch):
+        """Oversized batches are rejected up front"""
+        monkeypatch.setattr(router_module, "MAX_BATCH_SIZE", 2)
+        packets = [{"source": "vessel", "payload": {}}] * 3
+
+        response = client.post("/route/batch", json=packets)
+
+        assert response.status_code == 413
+
+
+class TestMessagePack:
+    """Test suite for MessagePack content negotiation"""
+
+    def test_route_msgpack_packet(self, client):
+        """Positional MessagePack packets route and answer in MessagePack"""
+        response = client.post(
+            "/route",
+            content=msgpack.packb(["vessel", {"vessel_id": "WSP-001"}]),
+            headers={"Content-Type": "application/msgpack", "Accept": "application/msgpack"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+        data = msgpack.unpackb(response.content)
+        assert data["pillar"] == "SeaSide"
+        assert data["vessel_id"] == "WSP-001"
+
+    def test_msgpack_batch(self, client):
+        """MessagePack batches mix maps and positional arrays"""
+        body = msgpack.packb([
+            {"source": "catch", "payload": {"catch_id": "C-1"}},
+            ["market", {"transaction_id": "T-1"}],
+            "junk",
+        ])
+
+        response = client.post("/route/batch", content=body, headers={"Content-Type": "application/msgpack"})
+
+        data = response.json()
+        assert data["routed"] == 2
+        assert data["results"][2]["status_code"] == 400
+
+    def test_malformed_msgpack(self, client):
+        """Undecodable bodies are a 400"""
+        response = client.post("/route", content=b"\xc1", headers={"Content-Type": "application/msgpack"})
+
+        assert response.status_code == 400
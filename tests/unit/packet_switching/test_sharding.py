@@ -0,0 +1,296 @@
+# 🏈 SeaTrace Vessel-Affinity Sharding Tests
+# For the Commons Good! 🌊
+
+import json
+import os
+
+import httpx
+import msgpack
+import pytest
+from fastapi import HTTPException
+
+from packet_switching import shard_router
+from packet_switching.sharding import HashRing, Shard, ShardPool, shard_key, shard_path
+
+
+class FakeWorker:
+    """Mock router worker that answers like packet_switching.router"""
+
+    def __init__(self, name: str, reachable: bool = True):
+        self.name = name
+        self.reachable = reachable
+        self.vessels = []
+        self.answer = "ok"  # "short": one result missing, "garbled": not MessagePack
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not self.reachable:
+            raise httpx.ConnectError("socket gone", request=request)
+        if request.url.path == "/route":
+            packet = json.loads(request.content)
+            self.vessels.append(packet["payload"]["vessel_id"])
+            return httpx.Response(200, json={"shard": self.name, "vessel_id": packet["payload"]["vessel_id"]})
+        entries = msgpack.unpackb(request.content)
+        self.vessels.extend(e["payload"]["vessel_id"] for e in entries)
+        results = [
+            {"index": i, "ok": True, "result": {"shard": self.name, "vessel_id": e["payload"]["vessel_id"]}}
+            for i, e in enumerate(entries)
+        ]
+        if self.answer == "short":
+            results = results[:-1]
+        elif self.answer == "garbled":
+            return httpx.Response(200, content=b"\xc1", headers={"content-type": "application/msgpack"})
+        return httpx.Response(200, content=msgpack.packb({"results": results}),
+                              headers={"content-type": "application/msgpack"})
+
+
+def make_pool(count: int = 3, failover: bool = False):
+    workers = [FakeWorker(str(i)) for i in range(count)]
+    shards = [
+        Shard(name=w.name, client=httpx.AsyncClient(base_url="http://shard", transport=httpx.MockTransport(w)))
+        for w in workers
+    ]
+    return ShardPool(shards, vnodes=64, failover=failover), workers
+
+
+def vessel(i: int) -> dict:
+    return {"source": "vessel", "payload": {"vessel_id": f"WSP-{i:03d}"}}
+
+
+class TestHashRing:
+    """Test suite for the consistent-hash ring"""
+
+    def test_keys_map_to_members(self):
+        """Every key lands on a ring member, the same one every time"""
+        ring = HashRing(["a", "b", "c"], vnodes=32)
+
+        owners = [ring.node_for(f"WSP-{i}") for i in range(500)]
+
+        assert set(owners) == {"a", "b", "c"}
+        assert owners == [ring.node_for(f"WSP-{i}") for i in range(500)]
+
+    def test_empty_ring(self):
+        """An empty ring owns nothing"""
+        assert HashRing().node_for("WSP-001") is None
+
+    def test_removing_a_node_only_moves_its_keys(self):
+        """Keys of the other nodes keep their owner"""
+        ring = HashRing(["a", "b", "c", "d"], vnodes=64)
+        keys = [f"WSP-{i}" for i in range(2000)]
+        before = {key: ring.node_for(key) for key in keys}
+
+        ring.remove("c")
+
+        for key in keys:
+            if before[key] != "c":
+                assert ring.node_for(key) == before[key]
+            else:
+                assert ring.node_for(key) in ("a", "b", "d")
+
+        ring.add("c")
+        assert {key: ring.node_for(key) for key in keys} == before
+
+    def test_shares_cover_the_ring(self):
+        """Virtual nodes spread the hash space roughly evenly"""
+        shares = HashRing([str(i) for i in range(4)], vnodes=256).shares()
+
+        assert sum(shares.values()) == pytest.approx(1.0)
+        assert all(0.15 < share < 0.35 for share in shares.values())
+
+
+class TestShardKey:
+    """Test suite for the ring key of raw packets"""
+
+    def test_vessel_id(self):
+        """Packets of one vessel share a key whatever their source"""
+        assert shard_key({"source": "vessel", "payload": {"vessel_id": "WSP-001"}}) == "WSP-001"
+        assert shard_key({"source": "catch", "payload": {"vessel_id": "WSP-001"}}) == "WSP-001"
+
+    def test_falls_back_to_source(self):
+        """Vessel-less packets are keyed by source"""
+        assert shard_key({"source": "market", "payload": {}}) == "market"
+        assert shard_key(["not", "a", "map"]) == ""
+
+
+class TestShardPool:
+    """Test suite for shard selection"""
+
+    def test_down_shard_is_503_without_failover(self):
+        """Strict ownership: the owner's vessels wait for it"""
+        pool, _ = make_pool()
+        owner = pool.shard_for("WSP-001")
+        pool._set_up(owner, False)
+
+        with pytest.raises(HTTPException) as excinfo:
+            pool.shard_for("WSP-001")
+        assert excinfo.value.status_code == 503
+
+    def test_failover_moves_vessels_to_neighbours(self):
+        """With failover the ring skips a down shard until it is back"""
+        pool, _ = make_pool(failover=True)
+        owner = pool.shard_for("WSP-001")
+
+        pool._set_up(owner, False)
+        assert pool.shard_for("WSP-001") is not owner
+
+        pool._set_up(owner, True)
+        assert pool.shard_for("WSP-001") is owner
+
+    def test_status_reports_ring_share(self):
+        """Status lists every shard with its share of the ring"""
+        pool, _ = make_pool()
+
+        status = pool.status()
+
+        assert [s["shard"] for s in status] == ["0", "1", "2"]
+        assert sum(s["ring_share"] for s in status) == pytest.approx(1.0, abs=1e-3)
+
+
+@pytest.fixture
+def front(monkeypatch):
+    """Front app wired to three mock workers (no processes, no lifespan)"""
+    pool, workers = make_pool()
+    monkeypatch.setattr(shard_router, "pool", pool)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=shard_router.app), base_url="http://front")
+    return client, pool, workers
+
+
+class TestShardRouter:
+    """Test suite for the sharded front"""
+
+    @pytest.mark.asyncio
+    async def test_vessel_sticks_to_one_worker(self, front):
+        """Every packet of a vessel reaches the same worker"""
+        client, pool, workers = front
+
+        for _ in range(3):
+            for i in range(20):
+                response = await client.post("/route", json=vessel(i))
+                assert response.status_code == 200
+
+        for worker in workers:
+            for vessel_id in set(worker.vessels):
+                assert worker.vessels.count(vessel_id) == 3
+                assert pool.shard_for(vessel_id).name == worker.name
+
+    @pytest.mark.asyncio
+    async def test_batch_is_split_and_merged_in_order(self, front):
+        """Sub-batches go to the owning workers; results keep request order"""
+        client, pool, workers = front
+        batch = [vessel(i) for i in range(30)]
+
+        response = await client.post("/route/batch", json=batch)
+
+        data = response.json()
+        assert data["routed"] == 30
+        assert [r["index"] for r in data["results"]] == list(range(30))
+        for i, result in enumerate(data["results"]):
+            assert result["result"]["vessel_id"] == f"WSP-{i:03d}"
+            assert result["result"]["shard"] == pool.shard_for(f"WSP-{i:03d}").name
+        assert sum(len(w.vessels) for w in workers) == 30
+        assert sum(1 for w in workers if w.vessels) > 1
+
+    @pytest.mark.asyncio
+    async def test_unreachable_worker_fails_only_its_entries(self, front):
+        """A dead worker's packets get 503, the rest of the batch is routed"""
+        client, pool, workers = front
+        dead = pool.shard_for("WSP-000").name
+        workers[int(dead)].reachable = False
+        batch = [vessel(i) for i in range(30)]
+
+        data = (await client.post("/route/batch", json=batch)).json()
+
+        for i, result in enumerate(data["results"]):
+            owned_by_dead = pool.shard_for(f"WSP-{i:03d}").name == dead
+            assert result["ok"] is not owned_by_dead
+            if owned_by_dead:
+                assert result["status_code"] == 503
+        assert 0 < data["failed"] < 30
+
+        response = await client.post("/route", json=vessel(0))
+        assert response.status_code == 503
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("answer", ["short", "garbled"])
+    async def test_bad_worker_answer_fails_only_its_entries(self, front, answer):
+        """A worker answering with the wrong results gets 502 for its packets only"""
+        client, pool, workers = front
+        bad = pool.shard_for("WSP-000").name
+        workers[int(bad)].answer = answer
+        batch = [vessel(i) for i in range(30)]
+
+        response = await client.post("/route/batch", json=batch)
+
+        assert response.status_code == 200
+        data = response.json()
+        for i, result in enumerate(data["results"]):
+            owned_by_bad = pool.shard_for(f"WSP-{i:03d}").name == bad
+            assert result["ok"] is not owned_by_bad
+            if owned_by_bad:
+                assert result["status_code"] == 502
+        assert 0 < data["failed"] < 30
+
+    @pytest.mark.asyncio
+    async def test_shards_endpoint(self, front):
+        """GET /shards lists the workers"""
+        client, _, _ = front
+
+        data = (await client.get("/shards")).json()
+
+        assert data["vnodes"] == 64
+        assert len(data["shards"]) == 3
+
+
+class TestShardProcesses:
+    """Test suite for real worker processes over Unix sockets"""
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_spawned_workers_route_packets(self, tmp_path):
+        """Workers start, answer over their sockets and stop on close"""
+        pool = await ShardPool.spawn(2, socket_dir=str(tmp_path), vnodes=16)
+        try:
+            assert all(shard.up for shard in pool.shards.values())
+            shard = pool.shard_for("WSP-001")
+            response = await pool.send(
+                shard, "/route", json.dumps(vessel(1)).encode(), {"content-type": "application/json"}
+            )
+            assert response.status_code == 200
+            assert response.json()["pillar"] == "SeaSide"
+
+            health = await shard.client.get("/health")
+            assert health.json()["shard"] == shard.name
+        finally:
+            await pool.close()
+
+        assert all(shard.process.poll() is not None for shard in pool.shards.values())
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_workers_get_their_own_state_files(self, tmp_path, monkeypatch):
+        """A shared LEDGER_PATH / QUOTA_SNAPSHOT_PATH becomes one file per worker"""
+        ledger = tmp_path / "packets.log"
+        snapshot = tmp_path / "quota.json"
+        monkeypatch.setenv("ROUTER_LEDGER", "true")
+        monkeypatch.setenv("ROUTER_QUOTA", "true")
+        monkeypatch.setenv("LEDGER_PATH", str(ledger))
+        monkeypatch.setenv("QUOTA_SNAPSHOT_PATH", str(snapshot))
+
+        pool = await ShardPool.spawn(2, socket_dir=str(tmp_path), vnodes=16)
+        try:
+            owners = {}
+            for i in range(100):
+                owners.setdefault(pool.shard_for(f"WSP-{i:03d}").name, i)
+            for name, i in owners.items():
+                catch = {"source": "catch", "payload": {"vessel_id": f"WSP-{i:03d}", "species": "Tuna", "weight": 10}}
+                response = await pool.send(
+                    pool.shards[name], "/route", json.dumps(catch).encode(), {"content-type": "application/json"}
+                )
+                assert response.status_code == 200
+        finally:
+            await pool.close()
+
+        assert sorted(owners) == ["0", "1"]
+        for name in owners:
+            assert os.path.getsize(shard_path(str(ledger), name)) > 0
+            assert os.path.exists(shard_path(str(snapshot), name))
+        assert not ledger.exists() and not snapshot.exists()
@@ -0,0 +1,129 @@
+# 🏈 SeaTrace Staged Pipeline Tests
+# For the Commons Good! 🌊
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+
+from packet_switching.handler import DataIntegrityHash, IncomingPacket, WildFisheriesPacketSwitcher
+from packet_switching.staged import StageConfig, StagedPipeline, parse_stage_config
+
+
+class SlowWriter:
+    """I/O-bound processor (e.g. a remote log)"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def process(self, packet):
+        await asyncio.sleep(self.delay)
+        packet.payload.setdefault("tags", []).append("written")
+        return packet
+
+
+class ThreadRecorder:
+    """CPU-bound processor that records which thread ran it"""
+    cpu_bound = True
+
+    def __init__(self):
+        self.threads = set()
+
+    def process(self, packet):
+        self.threads.add(threading.get_ident())
+        return packet
+
+
+class RejectOdd:
+    """Validator that rejects odd catch ids"""
+
+    def validate(self, packet):
+        return packet.payload["n"] % 2 == 0
+
+
+def packet(n=0):
+    return IncomingPacket(source="vessel", payload={"vessel_id": "WSP-001", "n": n})
+
+
+class TestStagedPipeline:
+    """Test suite for the staged execution mode"""
+
+    @pytest.mark.asyncio
+    async def test_io_stage_overlaps_across_packets(self):
+        """Workers of a slow stage serve several packets at once"""
+        switcher = WildFisheriesPacketSwitcher(
+            staged=True, stage_options={"default": StageConfig(workers=8)}
+        )
+        switcher.secondary = [SlowWriter(0.05)]
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(switcher.process_packet(packet(n)) for n in range(8)))
+        elapsed = time.perf_counter() - start
+
+        assert [r["pillar"] for r in responses] == ["SeaSide"] * 8
+        assert elapsed < 0.2
+        await switcher._stages.close()
+
+    @pytest.mark.asyncio
+    async def test_cpu_bound_stage_runs_off_loop(self):
+        """cpu_bound members run in the stage thread pool"""
+        recorder = ThreadRecorder()
+        switcher = WildFisheriesPacketSwitcher(staged=True)
+        switcher.secondary = [DataIntegrityHash(), recorder]
+
+        p = packet()
+        response = await switcher.process_packet(p)
+
+        assert threading.get_ident() not in recorder.threads
+        assert response["packet_hash"] == p.hash()
+        await switcher._stages.close()
+
+    @pytest.mark.asyncio
+    async def test_rejection_keeps_status(self):
+        """A rejecting stage fails only its own packet, with the usual status"""
+        switcher = WildFisheriesPacketSwitcher(staged=True)
+        switcher.linebackers = [RejectOdd()]
+
+        results = await asyncio.gather(
+            *(switcher.process_packet(packet(n)) for n in range(4)), return_exceptions=True
+        )
+
+        assert isinstance(results[0], dict) and isinstance(results[2], dict)
+        assert isinstance(results[1], HTTPException)
+        assert results[1].status_code == 401
+        assert results[1].detail == "Invalid at RejectOdd"
+        await switcher._stages.close()
+
+    @pytest.mark.asyncio
+    async def test_secondary_keeps_order_and_metrics(self):
+        """Stages run in play order and report queue and service metrics"""
+        switcher = WildFisheriesPacketSwitcher(staged=True)
+        switcher.secondary = [SlowWriter(0.0)]
+        labels = {"stage": "secondary.SlowWriter"}
+        before = REGISTRY.get_sample_value("packet_switcher_stage_service_seconds_count", labels) or 0.0
+
+        p = packet()
+        await switcher.process_packet(p)
+
+        assert p.payload["tags"] == ["written"]
+        assert REGISTRY.get_sample_value("packet_switcher_stage_service_seconds_count", labels) == before + 1
+        assert switcher._stages.depths() == {"secondary.SlowWriter": 0}
+        await switcher._stages.close()
+
+    @pytest.mark.asyncio
+    async def test_empty_pipeline_passes_through(self):
+        """No stages means no queues"""
+        pipeline = StagedPipeline([], [], [])
+
+        p = packet()
+        assert await pipeline.run(p) is p
+
+    def test_parse_stage_config(self):
+        """Overrides set workers and, optionally, the queue bound"""
+        configs = parse_stage_config("BlockchainLogger=2:1024, DataIntegrityHash=8")
+
+        assert configs["BlockchainLogger"] == StageConfig(workers=2, queue_size=1024)
+        assert configs["DataIntegrityHash"] == StageConfig(workers=8, queue_size=256)
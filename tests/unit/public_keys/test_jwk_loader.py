@@ -0,0 +1,164 @@
+# 🔑 SeaTrace JWKS Keyring Tests
+# For the Commons Good! 🌊
+
+import base64
+import json
+
+import httpx
+import nacl.signing
+import pytest
+
+from common.licensing.middleware import LicenseMiddleware, LicenseValidationError
+from common.licensing.token_cache import VerifiedTokenCache
+from public_keys.jwk_loader import Keyring, parse_jwks
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def jwk(kid: str, signing_key: nacl.signing.SigningKey) -> dict:
+    return {"kty": "OKP", "crv": "Ed25519", "use": "sig", "kid": kid, "x": b64url(bytes(signing_key.verify_key))}
+
+
+def make_token(signing_key: nacl.signing.SigningKey, kid: str, **claims) -> str:
+    header = b64url(json.dumps({"alg": "EdDSA", "kid": kid}).encode())
+    payload = b64url(json.dumps(claims).encode())
+    signature = signing_key.sign(f"{header}.{payload}".encode()).signature
+    return f"{header}.{payload}.{b64url(signature)}"
+
+
+@pytest.fixture
+def keys():
+    return {kid: nacl.signing.SigningKey.generate() for kid in ("k1", "k2")}
+
+
+class TestParseJwks:
+    """Test suite for JWKS parsing"""
+
+    def test_unusable_keys_are_skipped(self, keys):
+        """Non-Ed25519 and encryption keys are ignored"""
+        document = {"keys": [
+            jwk("k1", keys["k1"]),
+            {"kty": "RSA", "kid": "rsa", "n": "AQAB", "e": "AQAB"},
+            dict(jwk("k2", keys["k2"]), use="enc"),
+        ]}
+
+        assert list(parse_jwks(document)) == ["k1"]
+
+    def test_no_usable_key_is_an_error(self):
+        """An empty document never becomes a keyring"""
+        with pytest.raises(ValueError):
+            parse_jwks({"keys": []})
+
+
+class TestKeyring:
+    """Test suite for keyring loading and refresh"""
+
+    def test_load_from_file(self, tmp_path, keys):
+        """A JWKS file is parsed once into kid -> key"""
+        path = tmp_path / "jwks.json"
+        path.write_text(json.dumps({"keys": [jwk("k1", keys["k1"]), jwk("k2", keys["k2"])]}))
+
+        keyring = Keyring.from_jwks(str(path), default_kid="k1")
+
+        assert len(keyring) == 2 and "k2" in keyring
+        assert keyring.get("unknown") is keyring.get("k1")
+
+    @pytest.mark.asyncio
+    async def test_refresh_uses_etag(self, keys):
+        """A 304 keeps the snapshot; a new document swaps it"""
+        documents = [{"keys": [jwk("k1", keys["k1"])]}, {"keys": [jwk("k2", keys["k2"])]}]
+        requests = []
+
+        def handler(request):
+            requests.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"' and len(requests) == 2:
+                return httpx.Response(304)
+            version = 1 if len(requests) == 1 else 2
+            return httpx.Response(200, json=documents[version - 1], headers={"ETag": f'"v{version}"'})
+
+        keyring = Keyring.from_jwks("https://keys.example/jwks.json", transport=httpx.MockTransport(handler))
+        first = keyring.snapshot
+
+        assert await keyring.refresh() is False
+        assert keyring.snapshot is first
+        assert await keyring.refresh() is True
+        assert "k2" in keyring and "k1" not in keyring
+        assert keyring.fingerprint != first.fingerprint
+        assert requests == [None, '"v1"', '"v1"']
+
+    @pytest.mark.asyncio
+    async def test_bad_document_keeps_snapshot(self, tmp_path, keys):
+        """A broken rotation leaves the working keys in place"""
+        path = tmp_path / "jwks.json"
+        path.write_text(json.dumps({"keys": [jwk("k1", keys["k1"])]}))
+        keyring = Keyring.from_jwks(str(path))
+        snapshot = keyring.snapshot
+
+        path.write_text(json.dumps({"keys": [{"kty": "OKP", "crv": "Ed25519"}]}))
+        with pytest.raises(ValueError):
+            await keyring.refresh()
+
+        assert keyring.snapshot is snapshot
+
+    def test_from_keys_skips_placeholders(self, keys):
+        """Unreplaced placeholder keys do not break startup"""
+        keyring = Keyring.from_keys({
+            "kid1": "REPLACE_WITH_BASE64_ED25519_VERIFY_KEY",
+            "kid2": base64.b64encode(bytes(keys["k2"].verify_key)).decode(),
+        })
+
+        assert "kid1" not in keyring and "kid2" in keyring
+
+    @pytest.mark.asyncio
+    async def test_from_env_unreachable_jwks_falls_back(self, tmp_path, keys, monkeypatch):
+        """A JWKS source that fails at startup leaves the fallback keys until a refresh succeeds"""
+        path = tmp_path / "jwks.json"
+        monkeypatch.delenv("SEATRACE_JWKS_URL", raising=False)
+        monkeypatch.setenv("SEATRACE_JWKS_PATH", str(path))
+        fallback = {"kid1": base64.b64encode(bytes(keys["k1"].verify_key)).decode()}
+
+        keyring = Keyring.from_env(fallback_keys=fallback, default_kid="kid1")
+        assert "kid1" in keyring
+
+        keyring.start()
+        path.write_text(json.dumps({"keys": [jwk("k2", keys["k2"])]}))
+        assert await keyring.refresh() is True
+        await keyring.stop()
+
+        assert "k2" in keyring and "kid1" not in keyring
+
+    @pytest.mark.asyncio
+    async def test_from_env_without_keys_is_empty(self, monkeypatch):
+        """Nothing configured still gives a keyring that starts and stops"""
+        monkeypatch.delenv("SEATRACE_JWKS_URL", raising=False)
+        monkeypatch.delenv("SEATRACE_JWKS_PATH", raising=False)
+
+        keyring = Keyring.from_env(fallback_keys={"kid1": ""})
+        keyring.start()
+        await keyring.stop()
+
+        assert len(keyring) == 0
+
+
+class TestLicenseMiddlewareKeyring:
+    """Test suite for license verification with a keyring"""
+
+    def test_tokens_verified_by_kid(self, tmp_path, keys):
+        """Each token is checked with the key named by its kid"""
+        path = tmp_path / "jwks.json"
+        path.write_text(json.dumps({"keys": [jwk("k1", keys["k1"]), jwk("k2", keys["k2"])]}))
+        middleware = LicenseMiddleware(
+            app=None,
+            public_scope_digest="sha256:test",
+            public_routes=[],
+            keyring=Keyring.from_jwks(str(path)),
+            token_cache=VerifiedTokenCache(capacity=8),
+        )
+
+        header, payload = middleware._verify_cached(make_token(keys["k2"], "k2", typ="PL", license_id="L-2"))
+
+        assert payload["license_id"] == "L-2"
+        with pytest.raises(LicenseValidationError):
+            middleware._verify_cached(make_token(keys["k2"], "k1", typ="PL", license_id="L-2"))